@@ -0,0 +1,91 @@
+"""Split backtest curves and trades into a blob table.
+
+Revision ID: 0004_split_backtest_result_blobs
+Revises: 0003_add_trading_workspace_fields
+Create Date: 2026-10-16
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "0004_split_backtest_result_blobs"
+down_revision = "0003_add_trading_workspace_fields"
+branch_labels = None
+depends_on = None
+
+_BLOB_COLUMNS = ("equity_curve", "equity_dates", "drawdown_curve", "trades")
+
+
+def _table_names() -> set[str]:
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def _column_names(table_name: str) -> set[str]:
+    inspector = sa.inspect(op.get_bind())
+    return {column["name"] for column in inspector.get_columns(table_name)}
+
+
+def _index_names(table_name: str) -> set[str]:
+    inspector = sa.inspect(op.get_bind())
+    return {index["name"] for index in inspector.get_indexes(table_name)}
+
+
+def upgrade() -> None:
+    if "backtest_result_blobs" not in _table_names():
+        op.create_table(
+            "backtest_result_blobs",
+            sa.Column(
+                "result_id",
+                sa.String(length=36),
+                sa.ForeignKey("backtest_results.id"),
+                primary_key=True,
+            ),
+            sa.Column("equity_curve", sa.JSON(), nullable=True),
+            sa.Column("equity_dates", sa.JSON(), nullable=True),
+            sa.Column("drawdown_curve", sa.JSON(), nullable=True),
+            sa.Column("trades", sa.JSON(), nullable=True),
+        )
+
+    result_columns = _column_names("backtest_results")
+    moved = [name for name in _BLOB_COLUMNS if name in result_columns]
+    if moved:
+        columns = ", ".join(moved)
+        op.execute(
+            f"INSERT INTO backtest_result_blobs (result_id, {columns}) "
+            f"SELECT id, {columns} FROM backtest_results"
+        )
+        with op.batch_alter_table("backtest_results") as batch_op:
+            for name in moved:
+                batch_op.drop_column(name)
+
+    if "idx_backtest_tasks_user_created" not in _index_names("backtest_tasks"):
+        op.create_index(
+            "idx_backtest_tasks_user_created",
+            "backtest_tasks",
+            ["user_id", "created_at", "id"],
+            unique=False,
+        )
+
+
+def downgrade() -> None:
+    if "idx_backtest_tasks_user_created" in _index_names("backtest_tasks"):
+        op.drop_index("idx_backtest_tasks_user_created", table_name="backtest_tasks")
+
+    result_columns = _column_names("backtest_results")
+    missing = [name for name in _BLOB_COLUMNS if name not in result_columns]
+    if missing:
+        with op.batch_alter_table("backtest_results") as batch_op:
+            for name in missing:
+                batch_op.add_column(sa.Column(name, sa.JSON(), nullable=True))
+
+    if "backtest_result_blobs" in _table_names():
+        for name in _BLOB_COLUMNS:
+            op.execute(
+                f"UPDATE backtest_results SET {name} = ("
+                f"SELECT {name} FROM backtest_result_blobs "
+                "WHERE backtest_result_blobs.result_id = backtest_results.id)"
+            )
+        op.drop_table("backtest_result_blobs")
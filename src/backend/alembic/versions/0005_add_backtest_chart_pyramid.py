@@ -0,0 +1,33 @@
+"""Add precomputed chart pyramid to backtest result blobs.
+
+Revision ID: 0005_add_backtest_chart_pyramid
+Revises: 0004_split_backtest_result_blobs
+Create Date: 2026-10-16
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "0005_add_backtest_chart_pyramid"
+down_revision = "0004_split_backtest_result_blobs"
+branch_labels = None
+depends_on = None
+
+
+def _column_names(table_name: str) -> set[str]:
+    inspector = sa.inspect(op.get_bind())
+    return {column["name"] for column in inspector.get_columns(table_name)}
+
+
+def upgrade() -> None:
+    if "chart_pyramid" not in _column_names("backtest_result_blobs"):
+        op.add_column("backtest_result_blobs", sa.Column("chart_pyramid", sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    if "chart_pyramid" in _column_names("backtest_result_blobs"):
+        with op.batch_alter_table("backtest_result_blobs") as batch_op:
+            batch_op.drop_column("chart_pyramid")
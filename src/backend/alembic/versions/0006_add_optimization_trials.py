@@ -0,0 +1,64 @@
+"""Store optimization trial results one row per trial.
+
+Revision ID: 0006_add_optimization_trials
+Revises: 0005_add_backtest_chart_pyramid
+Create Date: 2026-10-17
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "0006_add_optimization_trials"
+down_revision = "0005_add_backtest_chart_pyramid"
+branch_labels = None
+depends_on = None
+
+_INDEXED_METRICS = ("total_return", "annual_return", "sharpe_ratio", "max_drawdown", "win_rate")
+
+
+def _table_names() -> set[str]:
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def upgrade() -> None:
+    # Existing tasks keep their results in optimization_tasks.results, which
+    # is still read for tasks that have no trial rows.
+    if "optimization_trials" in _table_names():
+        return
+    op.create_table(
+        "optimization_trials",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column(
+            "task_id",
+            sa.String(length=36),
+            sa.ForeignKey("optimization_tasks.id"),
+            nullable=False,
+        ),
+        sa.Column("result_index", sa.Integer(), nullable=False),
+        sa.Column("trial_index", sa.Integer(), nullable=True),
+        sa.Column("params", sa.JSON(), nullable=True),
+        sa.Column("metrics", sa.JSON(), nullable=True),
+        sa.Column("artifact_path", sa.Text(), nullable=True),
+        *(sa.Column(name, sa.Float(), nullable=True) for name in _INDEXED_METRICS),
+    )
+    op.create_index(
+        "idx_optimization_trials_task_result",
+        "optimization_trials",
+        ["task_id", "result_index"],
+        unique=True,
+    )
+    for name in _INDEXED_METRICS:
+        op.create_index(
+            f"idx_optimization_trials_task_{name}",
+            "optimization_trials",
+            ["task_id", name, "result_index"],
+            unique=False,
+        )
+
+
+def downgrade() -> None:
+    if "optimization_trials" in _table_names():
+        op.drop_table("optimization_trials")
@@ -24,6 +24,13 @@ from app.schemas.analytics import (
 )
 from app.services.analytics_service import AnalyticsService
 from app.services.backtest_service import BacktestService
+from app.services.chart_downsampling import (
+    clamp_max_points,
+    date_window,
+    merge_ohlc,
+    ohlc_buckets,
+    select_series_indices,
+)
 from app.services.log_parser_service import find_latest_log_dir, parse_data_log, parse_value_log
 from app.services.strategy_runtime_support import has_log_artifacts, latest_meaningful_log_subdir
 from app.services.strategy_service import get_strategy_dir
@@ -54,6 +61,33 @@ def _normalize_chart_date(value: Any) -> str:
     return text
 
 
+def _downsample_curves(
+    equity_curve: list[dict],
+    drawdown_curve: list[dict],
+    max_points: int | None,
+    start_date: str | None,
+    end_date: str | None,
+    pyramid: dict | None = None,
+) -> tuple[list[dict], list[dict]]:
+    """Window both curves by date and LTTB-sample them on the equity values.
+
+    Drawdown is sampled at the same bars so both charts share an x axis.
+    """
+    lo, hi = date_window([p["date"] for p in equity_curve], start_date, end_date)
+    if not max_points or hi - lo <= max_points:
+        return equity_curve[lo:hi], drawdown_curve[lo:hi]
+
+    values = [p["total_assets"] for p in equity_curve]
+    levels = ()
+    if pyramid and pyramid.get("n") == len(values):
+        levels = pyramid.get("equity_curve") or ()
+    indices = select_series_indices(values, max_points, lo, hi, levels)
+    return (
+        [equity_curve[i] for i in indices],
+        [drawdown_curve[i] for i in indices if i < len(drawdown_curve)],
+    )
+
+
 async def _resolve_log_dir(task_id: str, strategy_id: str) -> Path:
     """Resolve a task log directory (prefer DB log_dir, fallback to latest).
 
@@ -348,6 +382,9 @@ async def get_backtest_data(
 @router.get("/{task_id}/detail", response_model=BacktestDetailResponse)
 async def get_backtest_detail(
     task_id: str,
+    max_points: int | None = None,
+    start_date: str | None = None,
+    end_date: str | None = None,
     current_user=Depends(get_current_user),
     service: AnalyticsService = Depends(get_analytics_service),
     backtest_service: BacktestService = Depends(get_backtest_service),
@@ -356,13 +393,16 @@ async def get_backtest_detail(
 
     Args:
         task_id: The unique identifier for the backtest task.
+        max_points: Optional point budget; curves are LTTB-downsampled to it.
+        start_date: Optional start date of the curve window (YYYY-MM-DD).
+        end_date: Optional end date of the curve window (YYYY-MM-DD).
         current_user: Authenticated user.
         service: Analytics service dependency.
         backtest_service: Backtest service dependency.
 
     Returns:
         BacktestDetailResponse with performance metrics, equity curve,
-        drawdown curve, and trades.
+        drawdown curve, and trades. Metrics always cover the full run.
 
     Raises:
         HTTPException: If result not found (404).
@@ -376,9 +416,22 @@ async def get_backtest_detail(
     # Calculate performance metrics
     metrics = service.calculate_metrics(result)
 
+    max_points = clamp_max_points(max_points)
+    pyramid = None
+    if max_points and len(result["equity_curve"]) > max_points:
+        pyramid = await backtest_service.get_chart_pyramid(task_id)
+    raw_equity, raw_drawdown = _downsample_curves(
+        result["equity_curve"],
+        result["drawdown_curve"],
+        max_points,
+        start_date,
+        end_date,
+        pyramid,
+    )
+
     # Process data
-    equity_curve = service.process_equity_curve(result["equity_curve"])
-    drawdown_curve = service.process_drawdown_curve(result["drawdown_curve"])
+    equity_curve = service.process_equity_curve(raw_equity)
+    drawdown_curve = service.process_drawdown_curve(raw_drawdown)
     trades = service.process_trades(result["trades"])
 
     return BacktestDetailResponse(
@@ -400,6 +453,7 @@ async def get_kline_with_signals(
     task_id: str,
     start_date: str | None = None,
     end_date: str | None = None,
+    max_points: int | None = None,
     current_user=Depends(get_current_user),
     service: AnalyticsService = Depends(get_analytics_service),
     backtest_service: BacktestService = Depends(get_backtest_service),
@@ -410,6 +464,8 @@ async def get_kline_with_signals(
         task_id: The unique identifier for the backtest task.
         start_date: Optional start date filter (YYYY-MM-DD).
         end_date: Optional end date filter (YYYY-MM-DD).
+        max_points: Optional candle budget; bars are merged into OHLC buckets,
+            keeping bars with trade signals as their own candle.
         current_user: Authenticated user.
         service: Analytics service dependency.
         backtest_service: Backtest service dependency.
@@ -425,23 +481,36 @@ async def get_kline_with_signals(
     if not result:
         raise HTTPException(status_code=404, detail="Backtest result not found")
 
+    max_points = clamp_max_points(max_points)
     klines = result["klines"]
     signals = result["signals"]
 
-    # Date filtering
+    # Date filtering (bars are chronological)
+    lo, hi = date_window([k["date"] for k in klines], start_date, end_date)
     if start_date:
-        klines = [k for k in klines if k["date"] >= start_date]
         signals = [s for s in signals if s["date"] >= start_date]
     if end_date:
-        klines = [k for k in klines if k["date"] <= end_date]
         signals = [s for s in signals if s["date"] <= end_date]
 
-    # Prefer real indicators from logs, fallback to calculated MA
+    # Prefer real indicators from logs, fallback to indicators computed over
+    # the full series (cached per task) and cut to the window
     log_indicators = result.get("log_indicators", {})
     if log_indicators:
-        indicators = log_indicators
+        indicators = {name: values[lo:hi] for name, values in log_indicators.items()}
     else:
-        indicators = service.calculate_indicators(klines)
+        indicators = service.calculate_indicators(klines, lo, hi, cache_key=("backtest", task_id))
+    klines = klines[lo:hi]
+
+    if max_points and len(klines) > max_points:
+        buckets = ohlc_buckets(
+            [k["date"] for k in klines], max_points, keep_dates={s["date"] for s in signals}
+        )
+        klines = [merge_ohlc(klines, start, end) for start, end in buckets]
+        # Indicators are read at each bucket's closing bar.
+        indicators = {
+            name: [values[end - 1] if end - 1 < len(values) else None for _start, end in buckets]
+            for name, values in indicators.items()
+        }
 
     return KlineWithSignalsResponse(
         symbol=result["symbol"],
@@ -87,6 +87,7 @@ async def list_backtests(
     offset: int = Query(0, ge=0, description="Number of results to skip"),
     sort_by: str = Query("created_at", description="Sort field: created_at/strategy_id/symbol"),
     sort_order: str = Query("desc", description="Sort direction: asc/desc"),
+    cursor: str | None = Query(None, description="next_cursor of the previous page"),
 ):
     """List backtest history for the current user (supports sorting).
 
@@ -101,6 +102,7 @@ async def list_backtests(
         offset,
         sort_by,
         sort_order,
+        cursor,
     )
 
 
@@ -343,16 +343,26 @@ async def list_backtests(
         "created_at", description="Sort field: created_at/sharpe_ratio/total_return"
     ),
     sort_order: str = Query("desc", description="Sort direction: asc/desc"),
+    cursor: str | None = Query(
+        None, description="next_cursor of the previous page (created_at sort only)"
+    ),
 ):
-    """List user's backtest history (enhanced, supports sorting)."""
+    """List user's backtest history (enhanced, supports sorting).
+
+    Items are summaries: curves and trades are empty, fetch them per task.
+    """
     sort_desc = str(sort_order).lower() != "asc"
-    results = await service.list_results(
-        current_user.sub,
-        limit,
-        offset,
-        sort_by,
-        sort_desc,
-    )
+    try:
+        results = await service.list_results(
+            current_user.sub,
+            limit,
+            offset,
+            sort_by,
+            sort_desc,
+            cursor=cursor,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
     return results
 
 
@@ -84,6 +84,10 @@ async def metrics_status() -> dict:
             "backtest_failure_total",
             "live_trading_active_instances",
             "live_trading_total_trades",
+            "paper_ledger_flush_duration_seconds",
+            "paper_ledger_flushed_records_total",
+            "paper_ledger_pending_records",
+            "paper_ledger_flush_lag_seconds",
             "api_request_total",
             "api_request_duration_seconds",
             "api_request_errors_total",
@@ -12,7 +12,7 @@ Provides:
 import logging
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel, Field
 
 from app.api.deps import get_current_user
@@ -305,12 +305,20 @@ async def get_progress(
 @router.get("/results/{task_id}", summary="Get optimization results")
 async def get_results(
     task_id: str,
+    sort_by: str = Query("annual_return", description="Metric to order rows by"),
+    order: str = Query("desc", pattern="^(asc|desc)$", description="Sort direction"),
+    limit: int | None = Query(None, ge=1, le=10000, description="Return only the top N rows"),
+    offset: int = Query(0, ge=0, description="Skip the first N rows"),
     current_user=Depends(get_current_user),
 ):
-    """Return full results of an optimization task.
+    """Return results of an optimization task, sorted server-side.
 
     Args:
         task_id: The unique identifier of the optimization task.
+        sort_by: Metric (or parameter) the rows are ordered by.
+        order: ``desc`` (default) or ``asc``.
+        limit: Optional top-K cut; omitted returns every row.
+        offset: Rows to skip before the page starts.
         current_user: The authenticated user.
 
     Returns:
@@ -319,7 +327,14 @@ async def get_results(
     Raises:
         HTTPException: If the task does not exist (404).
     """
-    results = get_optimization_results(task_id, user_id=current_user.sub)
+    results = get_optimization_results(
+        task_id,
+        user_id=current_user.sub,
+        sort_by=sort_by,
+        descending=order == "desc",
+        limit=limit,
+        offset=offset,
+    )
     if not results:
         raise HTTPException(status_code=404, detail="Optimization task not found")
     return results
@@ -10,11 +10,15 @@ Aggregates data across live trading strategy instances:
 
 import logging
 import math
-from typing import Any
 
 from fastapi import APIRouter, Depends
 
 from app.api.deps import get_current_user
+from app.services.chart_downsampling import (
+    clamp_max_points,
+    date_window,
+    select_series_indices,
+)
 from app.services.live_trading_manager import LiveTradingManager, get_live_trading_manager
 from app.services.log_parser_service import (
     find_latest_log_dir,
@@ -22,6 +26,7 @@ from app.services.log_parser_service import (
     parse_trade_log,
     parse_value_log,
 )
+from app.services.portfolio_equity_service import get_portfolio_equity_service
 from app.services.strategy_service import get_strategy_dir
 
 logger = logging.getLogger(__name__)
@@ -275,6 +280,9 @@ async def get_portfolio_trades(
 
 @router.get("/equity", summary="Portfolio equity curve (live trading)")
 async def get_portfolio_equity(
+    max_points: int | None = None,
+    start_date: str | None = None,
+    end_date: str | None = None,
     current_user=Depends(get_current_user),
     mgr: LiveTradingManager = Depends(_get_manager),
 ):
@@ -283,6 +291,10 @@ async def get_portfolio_equity(
     Also returns individual strategy equity curves for stacked chart visualization.
 
     Args:
+        max_points: Optional point budget; all series are LTTB-sampled at the
+            same dates, chosen on the portfolio total.
+        start_date: Optional start date of the window.
+        end_date: Optional end date of the window.
         current_user: The authenticated user.
         mgr: The live trading manager.
 
@@ -294,93 +306,50 @@ async def get_portfolio_equity(
             - strategies: List of per-strategy equity curves
     """
     instances = mgr.list_instances()
-
-    # Each strategy's date -> value mapping
-    strategy_curves: list[dict[str, Any]] = []
-    all_dates_set: set = set()
-
-    for inst in instances:
-        try:
-            strategy_dir = get_strategy_dir(inst["strategy_id"])
-        except ValueError:
-            continue
-        log_dir = find_latest_log_dir(strategy_dir)
-        if not log_dir:
-            continue
-
-        value_data = parse_value_log(log_dir)
-        dates = value_data.get("dates", [])
-        equity = value_data.get("equity_curve", [])
-        cash = value_data.get("cash_curve", [])
-
-        if not dates:
-            continue
-
-        date_map = {}
-        for i, dt in enumerate(dates):
-            date_map[dt] = {
-                "equity": equity[i] if i < len(equity) else 0,
-                "cash": cash[i] if i < len(cash) else 0,
-            }
-        all_dates_set.update(dates)
-
-        strategy_curves.append(
-            {
-                "strategy_id": inst["strategy_id"],
-                "strategy_name": inst.get("strategy_name", inst["strategy_id"]),
-                "instance_id": inst["id"],
-                "date_map": date_map,
-                "initial": equity[0] if equity else 0,
-            }
-        )
-
-    if not all_dates_set:
+    service = get_portfolio_equity_service()
+    portfolio = service.equity(service.refresh(instances))
+    if not portfolio.dates:
         return {"dates": [], "total_equity": [], "total_drawdown": [], "strategies": []}
 
-    sorted_dates = sorted(all_dates_set)
-
-    # Aggregate
-    total_equity = []
-    strategy_series = {sc["instance_id"]: [] for sc in strategy_curves}
-
-    for dt in sorted_dates:
-        day_total = 0.0
-        for sc in strategy_curves:
-            dm = sc["date_map"]
-            if dt in dm:
-                val = dm[dt]["equity"]
-            else:
-                # No data for this strategy on this date - use last known value
-                val = sc.get("_last", sc["initial"])
-            sc["_last"] = val
-            day_total += val
-            strategy_series[sc["instance_id"]].append(_safe_round(val))
-        total_equity.append(_safe_round(day_total))
-
-    # Portfolio drawdown
-    total_drawdown = []
-    peak = 0.0
-    for v in total_equity:
-        if v > peak:
-            peak = v
-        dd = -((peak - v) / peak) if peak > 0 else 0
-        total_drawdown.append(_safe_round(dd, 6))
+    # Strategies without data on a date keep their last known value
+    sorted_dates = portfolio.dates
+    total_equity = [_safe_round(v) for v in portfolio.total.tolist()]
+    total_drawdown = [_safe_round(dd, 6) for dd in portfolio.drawdown.tolist()]
+    strategy_curves = [
+        {
+            "strategy_id": inst["strategy_id"],
+            "strategy_name": inst.get("strategy_name", inst["strategy_id"]),
+            "instance_id": inst["id"],
+        }
+        for inst in instances
+        if inst["id"] in portfolio.curves
+    ]
+
+    # Drawdown is computed on the full history before windowing/sampling.
+    lo, hi = date_window(sorted_dates, start_date, end_date)
+    max_points = clamp_max_points(max_points)
+    if max_points:
+        indices = select_series_indices(total_equity, max_points, lo, hi)
+    else:
+        indices = range(lo, hi)
+
+    def pick(series: list) -> list:
+        return [series[i] for i in indices]
 
     strategies_out = []
     for sc in strategy_curves:
+        curve = portfolio.curves[sc["instance_id"]]
         strategies_out.append(
             {
-                "strategy_id": sc["strategy_id"],
-                "strategy_name": sc["strategy_name"],
-                "instance_id": sc["instance_id"],
-                "values": strategy_series[sc["instance_id"]],
+                **sc,
+                "values": [_safe_round(float(curve[i])) for i in indices],
             }
         )
 
     return {
-        "dates": sorted_dates,
-        "total_equity": total_equity,
-        "total_drawdown": total_drawdown,
+        "dates": pick(sorted_dates),
+        "total_equity": pick(total_equity),
+        "total_drawdown": pick(total_drawdown),
         "strategies": strategies_out,
     }
 
@@ -408,21 +377,15 @@ async def get_portfolio_allocation(
                 instance_id, value, and weight percentage
     """
     instances = mgr.list_instances()
+    series = get_portfolio_equity_service().refresh(instances)
     items = []
     total = 0.0
 
     for inst in instances:
-        try:
-            strategy_dir = get_strategy_dir(inst["strategy_id"])
-        except ValueError:
-            continue
-        log_dir = find_latest_log_dir(strategy_dir)
-        if not log_dir:
+        instance_series = series.get(inst["id"])
+        if instance_series is None:
             continue
-
-        value_data = parse_value_log(log_dir)
-        equity = value_data.get("equity_curve", [])
-        final = equity[-1] if equity else 0
+        final = instance_series.last
         total += final
         items.append(
             {
@@ -5,14 +5,18 @@ Provides endpoints for the unified quote display page:
 - Data-source listing with status
 - Default + custom symbol management
 - Batch quote fetching
+- Push-based quote stream over WebSocket
 - Symbol search
 """
 
+import asyncio
+import json
 import logging
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, WebSocket, WebSocketDisconnect, status
 
-from app.api.deps import get_current_user
+from app.api.deps import get_current_user, get_websocket_current_user
+from app.config import get_settings
 from app.schemas.quote import (
     ChartDataResponse,
     CustomSymbolsRequest,
@@ -22,7 +26,14 @@ from app.schemas.quote import (
     QuoteListResponse,
     SymbolSearchResponse,
 )
+from app.services.bar_aggregator import TIMEFRAME_SECONDS
 from app.services.quote_service import QuoteService, get_quote_service
+from app.services.quote_stream_hub import (
+    QuoteStreamClient,
+    QuoteStreamHub,
+    get_quote_stream_hub,
+)
+from app.websocket_manager import ErrorMessage
 
 logger = logging.getLogger(__name__)
 
@@ -133,6 +144,149 @@ async def get_quotes(
     return svc.get_quotes(source, current_user.sub, symbol_list)
 
 
+# ==================== Quote Stream (WebSocket) ====================
+
+_STREAM_ACTIONS = ("subscribe", "unsubscribe", "subscribe_bars", "unsubscribe_bars")
+
+
+async def _handle_stream_message(
+    text: str,
+    client: QuoteStreamClient,
+    user_id: str,
+    svc: QuoteService,
+    hub: QuoteStreamHub,
+) -> None:
+    if text == "ping":
+        client.send_message({"type": "pong"})
+        return
+    try:
+        request = json.loads(text)
+    except ValueError:
+        request = None
+    if not isinstance(request, dict):
+        client.send_message(ErrorMessage("invalid_request", "Expected a JSON object").to_dict())
+        return
+
+    action = request.get("action")
+    source = str(request.get("source") or "").strip()
+    if action not in _STREAM_ACTIONS or not source:
+        client.send_message(
+            ErrorMessage("invalid_request", "Expected a known action with a source").to_dict()
+        )
+        return
+    if action == "unsubscribe":
+        hub.unsubscribe(client, source)
+        return
+    if action in ("subscribe_bars", "unsubscribe_bars"):
+        await _handle_bar_stream_message(action, source, request, client, svc, hub)
+        return
+
+    symbols = request.get("symbols")
+    if symbols is not None and not isinstance(symbols, list):
+        client.send_message(ErrorMessage("invalid_request", "symbols must be a list").to_dict())
+        return
+    symbol_list = (
+        [str(s).strip() for s in symbols if str(s).strip()] if symbols is not None else None
+    )
+    snapshot = await asyncio.to_thread(
+        svc.open_quote_stream, source, user_id, symbol_list, hub.publish
+    )
+    hub.subscribe(client, snapshot)
+
+
+async def _handle_bar_stream_message(
+    action: str,
+    source: str,
+    request: dict,
+    client: QuoteStreamClient,
+    svc: QuoteService,
+    hub: QuoteStreamHub,
+) -> None:
+    symbol = str(request.get("symbol") or "").strip()
+    timeframe = str(request.get("timeframe") or "M1").strip().upper()
+    if not symbol or timeframe not in TIMEFRAME_SECONDS:
+        client.send_message(
+            ErrorMessage("invalid_request", "Expected a symbol and a supported timeframe").to_dict()
+        )
+        return
+    if action == "unsubscribe_bars":
+        hub.unsubscribe_bars(client, (source, symbol, timeframe))
+        return
+    try:
+        count = min(max(int(request.get("count") or 200), 10), 1000)
+    except (TypeError, ValueError):
+        count = 200
+    chart = await asyncio.to_thread(
+        svc.open_bar_stream, source, symbol, timeframe, count, hub.publish_bar
+    )
+    hub.subscribe_bars(client, chart)
+
+
+@router.websocket("/ws")
+async def quote_stream_websocket(websocket: WebSocket):
+    """Stream quote updates for subscribed symbols.
+
+    URL:
+        ws://host/api/v1/quote/ws (auth: Sec-WebSocket-Protocol = access-token,<jwt>)
+
+    Client messages:
+        ``{"action": "subscribe", "source": "MT5", "symbols": [...]}`` (omit
+        *symbols* for default + custom symbols), ``{"action": "unsubscribe",
+        "source": "MT5"}``, ``{"action": "subscribe_bars", "source": "MT5",
+        "symbol": "EURUSD", "timeframe": "M1", "count": 200}``,
+        ``{"action": "unsubscribe_bars", ...}`` and ``"ping"``.
+
+    Server messages:
+        ``snapshot`` (same payload as ``/ticks``) per subscription, then
+        ``quotes`` with the changed fields of each updated symbol; ``bars``
+        (same payload as ``/chart``) per bar subscription, then ``bar`` with
+        the forming bar. Updates are throttled to ``QUOTE_STREAM_MAX_RATE``.
+        Also ``pong`` and ``error``. A client that does not keep up is
+        closed with code 1013; a failed send closes it with 1011.
+    """
+    current_user, accepted_subprotocol = get_websocket_current_user(websocket)
+    if current_user is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    await websocket.accept(subprotocol=accepted_subprotocol)
+
+    settings = get_settings()
+    svc = get_quote_service()
+    hub = get_quote_stream_hub()
+    client = QuoteStreamClient(
+        websocket.send_json,
+        max_rate=settings.QUOTE_STREAM_MAX_RATE,
+        send_timeout=settings.QUOTE_STREAM_SEND_TIMEOUT,
+    )
+    writer = asyncio.create_task(client.run())
+    try:
+        while True:
+            receive = asyncio.ensure_future(websocket.receive_text())
+            done, _pending = await asyncio.wait(
+                {receive, writer}, return_when=asyncio.FIRST_COMPLETED
+            )
+            if writer in done:
+                receive.cancel()
+                close_code = status.WS_1013_TRY_AGAIN_LATER
+                try:
+                    writer.result()
+                except WebSocketDisconnect:
+                    raise
+                except Exception:
+                    logger.exception("Quote stream writer failed")
+                    close_code = status.WS_1011_INTERNAL_ERROR
+                await websocket.close(code=close_code)
+                break
+            await _handle_stream_message(receive.result(), client, current_user.sub, svc, hub)
+    except WebSocketDisconnect:
+        logger.debug("Quote stream WebSocket disconnected")
+    except Exception:
+        logger.exception("Quote stream WebSocket error")
+    finally:
+        hub.disconnect(client)
+        writer.cancel()
+
+
 # ==================== Chart Data (P1) ====================
 
 
@@ -242,3 +242,18 @@ async def reset_daily_counters(
         "success": True,
         "message": f"Daily counters reset for instance: {instance_id or 'all'}",
     }
+
+
+@router.get("/latency", summary="Get pre-trade check latency")
+async def get_check_latency(
+    current_user=Depends(get_current_user),
+    service: RiskControlService = Depends(get_risk_service),
+) -> dict:
+    """
+    获取下单前风控检查耗时统计
+
+    按检查项返回耗时直方图(微秒)，"total" 为整条管线耗时。
+
+    需要认证。
+    """
+    return {"checks": service.get_latency_stats()}
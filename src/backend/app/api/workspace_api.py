@@ -49,6 +49,7 @@ from app.schemas.workspace import (
     WorkspaceUpdate,
 )
 from app.services.analytics_service import AnalyticsService
+from app.services.chart_downsampling import date_window
 from app.services.workspace_service import WorkspaceService
 
 router = APIRouter()
@@ -646,16 +647,17 @@ async def get_unit_optimization_result_kline(
     analytics_service = AnalyticsService()
     klines = list(payload["klines"])
     signals = list(payload["signals"])
+    lo, hi = date_window([k["date"] for k in klines], start_date, end_date)
     if start_date:
-        klines = [k for k in klines if k["date"] >= start_date]
         signals = [s for s in signals if s["date"] >= start_date]
     if end_date:
-        klines = [k for k in klines if k["date"] <= end_date]
         signals = [s for s in signals if s["date"] <= end_date]
-    indicators = payload.get("log_indicators") or analytics_service.calculate_indicators(klines)
+    indicators = payload.get("log_indicators") or analytics_service.calculate_indicators(
+        klines, lo, hi, cache_key=("optimization", workspace_id, unit_id, result_index)
+    )
     return KlineWithSignalsResponse(
         symbol=payload["symbol"],
-        klines=klines,
+        klines=klines[lo:hi],
         signals=analytics_service.process_signals(signals),
         indicators=indicators,
     )
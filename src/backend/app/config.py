@@ -38,12 +38,45 @@ class Settings(BaseSettings):
         TIMESERIES_DB_TYPE: Optional timeseries database type.
         TIMESERIES_DB_URL: Optional timeseries database URL.
         REDIS_URL: Optional Redis cache URL.
+        CACHE_STALE_TTL: Seconds an expired cache entry may still be served while it is refreshed.
+        CACHE_NEGATIVE_TTL: Seconds an empty (None) computation result stays cached.
+        CACHE_LOCK_TTL: Seconds a cache recomputation lock is held before it expires.
+        CACHE_MEMORY_MAX_BYTES: Approximate byte budget of the in-memory cache.
+        CACHE_MEMORY_SHARDS: Number of shards per in-memory cache namespace.
+        CACHE_MEMORY_NAMESPACE_QUOTAS: Comma-separated ``prefix=fraction`` budgets; keys
+            with such a prefix are evicted only against each other.
         JWT_SECRET_KEY: JWT secret key.
         JWT_ALGORITHM: JWT encryption algorithm.
         JWT_EXPIRE_MINUTES: JWT token expiration time in minutes.
         HOST: Server host address.
         PORT: Server port.
         BACKTEST_TIMEOUT: Backtest subprocess timeout in seconds.
+        BACKTEST_WORKER_POOL_SIZE: Number of warm backtest workers (0 = cold subprocess per task).
+        BACKTEST_WORKER_POOL_MIN: Warm backtest workers started with the application.
+        BACKTEST_WORKER_MAX_JOBS: Jobs a warm worker runs before it is recycled.
+        BACKTEST_WORKER_MAX_RSS_MB: Peak RSS (MiB) after which a warm worker is recycled.
+        BACKTEST_LOG_TAIL_INTERVAL: Seconds between live log polls of a running backtest.
+        OPTIMIZATION_PROGRESS_FLUSH_INTERVAL: Minimum seconds between optimization result flushes.
+        OPTIMIZATION_BATCH_SIZE: Parameter sets per in-process batch job (0/1 = one subprocess each).
+        OPTIMIZATION_BATCH_ARTIFACT_TOP_K: Best batch trials re-run to keep full log artifacts.
+        QUOTE_TICK_HISTORY_SIZE: Ticks kept in memory per symbol by each quote receiver.
+        QUOTE_BAR_HISTORY_SIZE: Chart bars kept in memory per symbol and timeframe.
+        QUOTE_SOURCE_TIMEZONES: Comma-separated ``SOURCE=zone`` (IANA name or UTC offset
+            hours) in which a gateway reports naive bar times and in which its bars are
+            floored and labelled; other sources are UTC.
+        QUOTE_STREAM_MAX_RATE: Maximum quote delta messages per second per WebSocket client.
+        QUOTE_STREAM_SEND_TIMEOUT: Seconds a quote stream send may block before the client
+            is dropped as a slow consumer.
+        PAPER_LEDGER_ENABLED: Persist paper-trading fills write-behind through a WAL
+            instead of committing each fill.
+        PAPER_LEDGER_FLUSH_INTERVAL: Seconds between paper ledger flushes.
+        PAPER_LEDGER_FLUSH_BATCH: Pending paper ledger records that trigger an early flush.
+        PAPER_ORDER_INTAKE_INTERVAL: Seconds between reloads of pending paper orders in the
+            paper ledger's writer process (orders submitted in standby workers).
+        ALERT_EVENT_DRIVEN: Evaluate alert rules on paper-trading and quote inputs when
+            those inputs change instead of on the monitoring interval.
+        ALERT_RULE_SYNC_INTERVAL: Seconds between checks for alert rules changed in other
+            workers, in the process running the alert engine.
         CORS_ORIGINS: Comma-separated list of allowed CORS origins.
         SQL_ECHO: Whether to echo SQL statements.
         ADMIN_USERNAME: Default admin username.
@@ -97,6 +130,23 @@ class Settings(BaseSettings):
 
     # Optional: Redis cache
     REDIS_URL: str | None = Field(default=None, description="Redis cache URL")
+    CACHE_STALE_TTL: int = Field(
+        default=300, description="Seconds stale cache entries are served while refreshing"
+    )
+    CACHE_NEGATIVE_TTL: int = Field(
+        default=30, description="Seconds an empty computation result stays cached (0 = never)"
+    )
+    CACHE_LOCK_TTL: int = Field(
+        default=30, description="Seconds a cache recomputation lock is held at most"
+    )
+    CACHE_MEMORY_MAX_BYTES: int = Field(
+        default=256 * 1024 * 1024, description="Approximate byte budget of the memory cache"
+    )
+    CACHE_MEMORY_SHARDS: int = Field(default=16, description="Shards per memory cache namespace")
+    CACHE_MEMORY_NAMESPACE_QUOTAS: str = Field(
+        default="backtest:result=0.5",
+        description="Comma-separated prefix=fraction byte budgets of the memory cache",
+    )
     HTTP_PROXY: str = Field(default="", description="HTTP proxy URL")
     HTTPS_PROXY: str = Field(default="", description="HTTPS proxy URL")
     SOCKS_PROXY: str = Field(default="", description="SOCKS proxy URL")
@@ -124,6 +174,84 @@ class Settings(BaseSettings):
     # Backtest subprocess timeout (seconds)
     BACKTEST_TIMEOUT: int = Field(default=300, description="Backtest subprocess timeout in seconds")
 
+    # Warm backtest worker pool (0 disables the pool)
+    BACKTEST_WORKER_POOL_SIZE: int = Field(
+        default=2, description="Number of pre-forked backtest workers (0 = disabled)"
+    )
+    BACKTEST_WORKER_POOL_MIN: int = Field(
+        default=1, description="Backtest workers spawned at startup (capped at the pool size)"
+    )
+    BACKTEST_WORKER_MAX_JOBS: int = Field(
+        default=50, description="Recycle a backtest worker after this many jobs (0 = never)"
+    )
+    BACKTEST_WORKER_MAX_RSS_MB: int = Field(
+        default=1024, description="Recycle a backtest worker above this peak RSS in MiB (0 = never)"
+    )
+
+    # Live log ingestion while a backtest runs (0 disables tailing)
+    BACKTEST_LOG_TAIL_INTERVAL: float = Field(
+        default=1.0, description="Seconds between log polls of a running backtest (0 = disabled)"
+    )
+
+    # Optimization progress: result snapshot, manifest and DB row refresh throttle
+    OPTIMIZATION_PROGRESS_FLUSH_INTERVAL: float = Field(
+        default=2.0,
+        description="Minimum seconds between optimization result flushes (0 = every trial)",
+    )
+
+    # In-process batch evaluation of optimization trials (0 or 1 disables batching)
+    OPTIMIZATION_BATCH_SIZE: int = Field(
+        default=0, description="Parameter sets evaluated in-process per pool job (0/1 = disabled)"
+    )
+    OPTIMIZATION_BATCH_ARTIFACT_TOP_K: int = Field(
+        default=5, description="Best batch trials re-run to keep full log artifacts (0 = none)"
+    )
+
+    # Per-symbol tick history ring of each gateway quote receiver
+    QUOTE_TICK_HISTORY_SIZE: int = Field(
+        default=1024, description="Ticks kept in memory per symbol by quote receivers"
+    )
+
+    # Chart bars aggregated in memory from receiver ticks
+    QUOTE_BAR_HISTORY_SIZE: int = Field(
+        default=1000, description="Chart bars kept in memory per symbol and timeframe"
+    )
+    # MT5 bars carry broker server time; brokers differ, EET is the common one
+    QUOTE_SOURCE_TIMEZONES: str = Field(
+        default="MT5=EET",
+        description="Comma-separated SOURCE=zone of naive gateway bar times (others UTC)",
+    )
+
+    # Quote WebSocket fan-out (ticks are conflated per symbol between messages)
+    QUOTE_STREAM_MAX_RATE: float = Field(
+        default=4.0, description="Quote delta messages per second per client (0 = unthrottled)"
+    )
+    QUOTE_STREAM_SEND_TIMEOUT: float = Field(
+        default=5.0, description="Seconds a quote stream send may block before dropping the client"
+    )
+
+    # Paper-trading fills are journaled and bulk-written in the background
+    PAPER_LEDGER_ENABLED: bool = Field(
+        default=True, description="Persist paper-trading fills write-behind"
+    )
+    PAPER_LEDGER_FLUSH_INTERVAL: float = Field(
+        default=0.2, description="Seconds between paper ledger flushes"
+    )
+    PAPER_LEDGER_FLUSH_BATCH: int = Field(
+        default=500, description="Pending paper ledger records that trigger an early flush"
+    )
+    PAPER_ORDER_INTAKE_INTERVAL: float = Field(
+        default=0.5, description="Seconds between reloads of pending paper orders"
+    )
+
+    # Alert rules on paper accounts/positions and quotes run on input changes
+    ALERT_EVENT_DRIVEN: bool = Field(
+        default=True, description="Evaluate alert rules when their inputs change"
+    )
+    ALERT_RULE_SYNC_INTERVAL: float = Field(
+        default=5.0, description="Seconds between checks for alert rules changed in other workers"
+    )
+
     # Monitoring check intervals (seconds)
     MONITORING_SYSTEM_INTERVAL: int = Field(
         default=300, description="System alert check interval in seconds"
@@ -1,15 +1,176 @@
 """
 Cache layer - Redis is optional, falls back to memory cache if not configured.
+
+``get_or_compute`` adds stampede protection on top of either backend:
+concurrent misses for one key share a single computation (per process, and
+across processes through the backend's lock), expired entries are served
+stale while one caller refreshes them, and empty results are cached briefly.
 """
 
 import asyncio
+import contextlib
 import json
+import logging
+import sys
+import threading
+import time
+import uuid
 from collections import OrderedDict
-from datetime import datetime, timedelta
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
 from typing import Any
 
 from app.config import get_settings
 
+logger = logging.getLogger(__name__)
+
+
+class _FrequencySketch:
+    """Count-min sketch of recent key popularity (the TinyLFU admission filter).
+
+    Counters saturate at 15 and are halved every ``10 * width`` increments so
+    the estimate tracks recent, not all-time, popularity.
+    """
+
+    DEPTH = 4
+    MAX_COUNT = 15
+    _SEEDS = (0x9E3779B1, 0x85EBCA77, 0xC2B2AE3D, 0x27D4EB2F)
+
+    def __init__(self, width: int):
+        self.width = 1 << max(width - 1, 1).bit_length()
+        self._mask = self.width - 1
+        self._table = [[0] * self.width for _ in range(self.DEPTH)]
+        self._additions = 0
+        self._sample_size = 10 * self.width
+
+    def _slots(self, key: str) -> list[int]:
+        h = hash(key)
+        return [((h ^ (h >> 17)) * seed >> 7) & self._mask for seed in self._SEEDS]
+
+    def increment(self, key: str) -> None:
+        for row, slot in zip(self._table, self._slots(key), strict=True):
+            if row[slot] < self.MAX_COUNT:
+                row[slot] += 1
+        self._additions += 1
+        if self._additions >= self._sample_size:
+            self._additions //= 2
+            for row in self._table:
+                row[:] = [count >> 1 for count in row]
+
+    def frequency(self, key: str) -> int:
+        return min(row[slot] for row, slot in zip(self._table, self._slots(key), strict=True))
+
+
+@dataclass(slots=True)
+class _Entry:
+    value: Any
+    expire_at: float | None
+    size: int
+    in_window: bool = True
+
+
+class _Shard:
+    """One W-TinyLFU segment: a small LRU admission window and a main LRU.
+
+    New keys enter the window; a key leaving it only replaces main-region
+    victims that the sketch estimates to be less popular, so one-off entries
+    cannot flush frequently read ones.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.window_bytes_limit = max(int(max_bytes * MemoryCache.WINDOW_RATIO), 1)
+        self.index: dict[str, _Entry] = {}
+        self.window: OrderedDict[str, _Entry] = OrderedDict()
+        self.main: OrderedDict[str, _Entry] = OrderedDict()
+        self.window_bytes = 0
+        self.main_bytes = 0
+        self.sketch = _FrequencySketch(max(max_bytes // MemoryCache.SKETCH_BYTES_PER_KEY, 1024))
+        self.lock = threading.Lock()
+        self.last_cleanup = time.monotonic()
+        self.evictions = 0
+        self.rejections = 0
+
+    @property
+    def used_bytes(self) -> int:
+        return self.window_bytes + self.main_bytes
+
+    def touch(self, key: str, entry: _Entry) -> None:
+        # Lock-free LRU promotion; the key may be removed concurrently.
+        with contextlib.suppress(KeyError):
+            (self.window if entry.in_window else self.main).move_to_end(key)
+
+    def remove(self, key: str) -> _Entry | None:
+        """Drop ``key`` (caller holds ``lock``)."""
+        entry = self.index.pop(key, None)
+        if entry is None:
+            return None
+        if entry.in_window:
+            del self.window[key]
+            self.window_bytes -= entry.size
+        else:
+            del self.main[key]
+            self.main_bytes -= entry.size
+        return entry
+
+    def insert(self, key: str, entry: _Entry) -> None:
+        """Add ``key`` to the window and settle the regions (caller holds ``lock``)."""
+        self.sketch.increment(key)
+        self.index[key] = entry
+        self.window[key] = entry
+        self.window_bytes += entry.size
+        while self.window_bytes > self.window_bytes_limit and self.window:
+            candidate_key, candidate = self.window.popitem(last=False)
+            self.window_bytes -= candidate.size
+            self._admit(candidate_key, candidate)
+        while self.used_bytes > self.max_bytes and self.main:
+            self._evict(next(iter(self.main)))
+
+    def _admit(self, key: str, candidate: _Entry) -> None:
+        main_limit = self.max_bytes - self.window_bytes
+        if candidate.size > main_limit:
+            del self.index[key]
+            self.rejections += 1
+            return
+        candidate_frequency = self.sketch.frequency(key)
+        while self.main_bytes + candidate.size > main_limit:
+            victim_key = next(iter(self.main))
+            if candidate_frequency <= self.sketch.frequency(victim_key):
+                del self.index[key]
+                self.rejections += 1
+                return
+            self._evict(victim_key)
+        candidate.in_window = False
+        self.main[key] = candidate
+        self.main_bytes += candidate.size
+
+    def _evict(self, key: str) -> None:
+        self.remove(key)
+        self.evictions += 1
+
+    def cleanup_expired(self, now: float) -> None:
+        """Drop expired entries (caller holds ``lock``)."""
+        self.last_cleanup = now
+        expired = [
+            k for k, e in self.index.items() if e.expire_at is not None and now > e.expire_at
+        ]
+        for key in expired:
+            self.remove(key)
+
+
+def _parse_namespace_quotas(spec: str) -> dict[str, float]:
+    """Parse ``"prefix=fraction,..."`` into a prefix -> budget fraction map."""
+    quotas: dict[str, float] = {}
+    for item in spec.split(","):
+        prefix, _, fraction = item.strip().partition("=")
+        if not prefix or not fraction:
+            continue
+        try:
+            quotas[prefix.strip()] = float(fraction)
+        except ValueError:
+            logger.warning("Ignoring invalid cache namespace quota: %s", item)
+    return quotas
+
 
 class MemoryCache:
     """In-memory cache - Default implementation, no Redis required.
@@ -17,53 +178,105 @@ class MemoryCache:
     Suitable for single-machine deployment or development environments.
 
     Features:
-    - Maximum cache entries limit to prevent unbounded memory growth
-    - Periodic cleanup of expired entries to avoid scanning on every write
-    - Uses instance variables instead of class variables to avoid sharing across instances
-    - Observability: hit/miss counts and capacity metrics
-    - Thread-safe with asyncio.Lock for async context
+    - Byte budget (approximate JSON size of values) instead of an entry count
+    - Per-namespace quotas: keys matching a configured prefix live in their own
+      pool, so large backtest results cannot evict other lookups
+    - Keys are hashed over shards; writes lock one shard, reads take no lock
+    - W-TinyLFU admission: rarely used keys do not displace popular ones
+    - Observability: hit/miss, eviction and per-namespace capacity metrics
     """
 
-    MAX_ENTRIES = 10000
     CLEANUP_INTERVAL = 300
-
-    def __init__(self):
-        self._cache: OrderedDict[str, dict[str, Any]] = OrderedDict()
-        self._last_cleanup: datetime = datetime.now()
+    WINDOW_RATIO = 0.01
+    SKETCH_BYTES_PER_KEY = 4096
+    ENTRY_OVERHEAD = 64
+    DEFAULT_NAMESPACE = "default"
+
+    def __init__(
+        self,
+        max_bytes: int | None = None,
+        shards: int | None = None,
+        namespace_quotas: dict[str, float] | None = None,
+    ):
+        settings = get_settings()
+        self.max_bytes = settings.CACHE_MEMORY_MAX_BYTES if max_bytes is None else max_bytes
+        shard_count = max(settings.CACHE_MEMORY_SHARDS if shards is None else shards, 1)
+        if namespace_quotas is None:
+            namespace_quotas = _parse_namespace_quotas(settings.CACHE_MEMORY_NAMESPACE_QUOTAS)
+
+        budgets = {
+            prefix: int(self.max_bytes * fraction)
+            for prefix, fraction in namespace_quotas.items()
+            if fraction > 0
+        }
+        budgets[self.DEFAULT_NAMESPACE] = max(self.max_bytes - sum(budgets.values()), 0)
+        # Longest prefix first, so "backtest:result" wins over "backtest".
+        self._prefixes = sorted(
+            (p for p in budgets if p != self.DEFAULT_NAMESPACE), key=len, reverse=True
+        )
+        self._pools: dict[str, list[_Shard]] = {
+            name: [_Shard(budget // shard_count) for _ in range(shard_count)]
+            for name, budget in budgets.items()
+        }
+        self._pool_budgets = budgets
         self._lock = asyncio.Lock()
+        self._locks: dict[str, tuple[str, float]] = {}
         # Observability metrics
         self._hits = 0
         self._misses = 0
 
+    def _namespace(self, key: str) -> str:
+        for prefix in self._prefixes:
+            if key.startswith(prefix):
+                return prefix
+        return self.DEFAULT_NAMESPACE
+
+    def _shard(self, key: str) -> _Shard:
+        pool = self._pools[self._namespace(key)]
+        return pool[hash(key) % len(pool)]
+
+    def _all_shards(self):
+        for pool in self._pools.values():
+            yield from pool
+
+    @staticmethod
+    def _approx_size(key: str, value: Any) -> int:
+        try:
+            payload = len(json.dumps(value, default=str))
+        except (TypeError, ValueError):
+            payload = sys.getsizeof(value)
+        return len(key) + payload + MemoryCache.ENTRY_OVERHEAD
+
     async def get_stats(self) -> dict[str, Any]:
         """Get cache statistics for observability.
 
         Returns:
-            Dictionary with hit_rate, hits, misses, entries, max_entries.
+            Dictionary with hit_rate, hits, misses, entries, bytes, max_bytes,
+            evictions, rejections and per-namespace usage.
         """
-        async with self._lock:
-            total = self._hits + self._misses
-            hit_rate = self._hits / total if total > 0 else 0.0
-            return {
-                "hits": self._hits,
-                "misses": self._misses,
-                "hit_rate": round(hit_rate, 4),
-                "entries": len(self._cache),
-                "max_entries": self.MAX_ENTRIES,
-                "type": "memory",
+        total = self._hits + self._misses
+        namespaces = {
+            name: {
+                "entries": sum(len(shard.index) for shard in pool),
+                "bytes": sum(shard.used_bytes for shard in pool),
+                "max_bytes": self._pool_budgets[name],
             }
-
-    def _cleanup_expired_unlocked(self):
-        """Clean up expired entries (must be called while holding lock)."""
-        now = datetime.now()
-        if (now - self._last_cleanup).total_seconds() < self.CLEANUP_INTERVAL:
-            return
-        self._last_cleanup = now
-        expired_keys = [
-            k for k, v in self._cache.items() if v.get("expire_at") and now > v["expire_at"]
-        ]
-        for k in expired_keys:
-            del self._cache[k]
+            for name, pool in self._pools.items()
+        }
+        shards = list(self._all_shards())
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": round(self._hits / total if total > 0 else 0.0, 4),
+            "entries": sum(ns["entries"] for ns in namespaces.values()),
+            "bytes": sum(ns["bytes"] for ns in namespaces.values()),
+            "max_bytes": self.max_bytes,
+            "evictions": sum(shard.evictions for shard in shards),
+            "rejections": sum(shard.rejections for shard in shards),
+            "shards": len(shards),
+            "namespaces": namespaces,
+            "type": "memory",
+        }
 
     async def get(self, key: str) -> Any | None:
         """Get cached value.
@@ -74,40 +287,37 @@ class MemoryCache:
         Returns:
             The cached value, or None if not found or expired.
         """
-        async with self._lock:
-            if key not in self._cache:
-                self._misses += 1
-                return None
-
-            entry = self._cache[key]
-            if entry.get("expire_at") and datetime.now() > entry["expire_at"]:
-                del self._cache[key]
-                self._misses += 1
-                return None
-
-            self._cache.move_to_end(key)
-            self._hits += 1
-            return entry["value"]
+        shard = self._shard(key)
+        shard.sketch.increment(key)
+        entry = shard.index.get(key)
+        if entry is None or (entry.expire_at is not None and time.monotonic() > entry.expire_at):
+            # Expired entries are dropped by the next write to the shard.
+            self._misses += 1
+            return None
+        shard.touch(key, entry)
+        self._hits += 1
+        return entry.value
 
     async def set(self, key: str, value: Any, ttl: int = 3600):
         """Set cached value.
 
         Args:
             key: Cache key.
-            value: Value to cache.
+            value: Value to cache (JSON-serializable values are sized exactly).
             ttl: Time-to-live in seconds (0 for no expiration).
         """
-        async with self._lock:
-            self._cleanup_expired_unlocked()
-            if key in self._cache:
-                del self._cache[key]
-            elif len(self._cache) >= self.MAX_ENTRIES:
-                self._cache.popitem(last=False)
-            expire_at = datetime.now() + timedelta(seconds=ttl) if ttl > 0 else None
-            self._cache[key] = {
-                "value": value,
-                "expire_at": expire_at,
-            }
+        now = time.monotonic()
+        entry = _Entry(
+            value=value,
+            expire_at=now + ttl if ttl > 0 else None,
+            size=self._approx_size(key, value),
+        )
+        shard = self._shard(key)
+        with shard.lock:
+            if now - shard.last_cleanup >= self.CLEANUP_INTERVAL:
+                shard.cleanup_expired(now)
+            shard.remove(key)
+            shard.insert(key, entry)
 
     async def delete(self, key: str) -> bool:
         """Delete cached value.
@@ -118,11 +328,9 @@ class MemoryCache:
         Returns:
             True if the key was deleted, False otherwise.
         """
-        async with self._lock:
-            if key in self._cache:
-                del self._cache[key]
-                return True
-            return False
+        shard = self._shard(key)
+        with shard.lock:
+            return shard.remove(key) is not None
 
     async def exists(self, key: str) -> bool:
         """Check if key exists.
@@ -137,8 +345,38 @@ class MemoryCache:
 
     async def clear(self):
         """Clear all cached values."""
+        for shard in self._all_shards():
+            with shard.lock:
+                for key in list(shard.index):
+                    shard.remove(key)
+
+    async def acquire_lock(self, key: str, ttl: int) -> str | None:
+        """Take the recomputation lock of ``key``.
+
+        Args:
+            key: Cache key the lock protects.
+            ttl: Seconds after which the lock expires on its own.
+
+        Returns:
+            A token for ``release_lock``, or None if the lock is held.
+        """
+        token = uuid.uuid4().hex
+        now = time.monotonic()
+        async with self._lock:
+            held = self._locks.get(key)
+            if held and held[1] > now:
+                return None
+            self._locks[key] = (token, now + ttl)
+        return token
+
+    async def release_lock(self, key: str, token: str) -> bool:
+        """Release a lock taken with ``acquire_lock`` if ``token`` still owns it."""
         async with self._lock:
-            self._cache.clear()
+            held = self._locks.get(key)
+            if held and held[0] == token:
+                del self._locks[key]
+                return True
+            return False
 
 
 class RedisCache:
@@ -220,6 +458,31 @@ class RedisCache:
         """
         return await self.redis.exists(key) > 0
 
+    # Delete the lock only if it still holds our token (it may have expired
+    # and been taken by another process meanwhile).
+    _RELEASE_LOCK_SCRIPT = (
+        "if redis.call('get', KEYS[1]) == ARGV[1] then "
+        "return redis.call('del', KEYS[1]) else return 0 end"
+    )
+
+    async def acquire_lock(self, key: str, ttl: int) -> str | None:
+        """Take the distributed recomputation lock of ``key`` (``SET NX``).
+
+        Args:
+            key: Cache key the lock protects.
+            ttl: Seconds after which the lock expires on its own.
+
+        Returns:
+            A token for ``release_lock``, or None if the lock is held.
+        """
+        token = uuid.uuid4().hex
+        acquired = await self.redis.set(f"lock:{key}", token, nx=True, ex=max(ttl, 1))
+        return token if acquired else None
+
+    async def release_lock(self, key: str, token: str) -> bool:
+        """Release a lock taken with ``acquire_lock`` if ``token`` still owns it."""
+        return bool(await self.redis.eval(self._RELEASE_LOCK_SCRIPT, 1, f"lock:{key}", token))
+
 
 # Cache singleton
 _cache_instance = None
@@ -241,3 +504,160 @@ def get_cache():
             _cache_instance = MemoryCache()
 
     return _cache_instance
+
+
+# ==================== Stampede protection ====================
+
+_ENTRY_MARKER = "__cache_entry__"
+_LOCK_POLL_INTERVAL = 0.05
+
+# In-flight computations of this process, keyed by (cache identity, key).
+_inflight: dict[tuple[int, str], asyncio.Task] = {}
+_background_refreshes: set[asyncio.Task] = set()
+
+
+def _pack_entry(value: Any, ttl: int) -> dict[str, Any]:
+    return {
+        _ENTRY_MARKER: 1,
+        "value": value,
+        "fresh_until": time.time() + ttl if ttl > 0 else None,
+    }
+
+
+def _unpack_entry(raw: Any) -> tuple[Any, bool]:
+    """Return ``(value, is_fresh)``; values stored without envelope count as fresh."""
+    if isinstance(raw, dict) and raw.get(_ENTRY_MARKER):
+        fresh_until = raw.get("fresh_until")
+        return raw.get("value"), fresh_until is None or time.time() < float(fresh_until)
+    return raw, True
+
+
+async def _single_flight(flight: tuple[int, str], factory: Callable[[], Awaitable[Any]]) -> Any:
+    """Run ``factory`` once per ``flight``; concurrent callers await the same result.
+
+    The computation runs in its own task, so cancelling any caller (including
+    the one that started it) leaves the others waiting on the result.
+    """
+    loop = asyncio.get_running_loop()
+    task = _inflight.get(flight)
+    if task is None or task.get_loop() is not loop:
+        task = loop.create_task(factory())
+        _inflight[flight] = task
+        task.add_done_callback(lambda done: _finish_flight(flight, done))
+    return await asyncio.shield(task)
+
+
+def _finish_flight(flight: tuple[int, str], task: asyncio.Task) -> None:
+    if _inflight.get(flight) is task:
+        del _inflight[flight]
+    if not task.cancelled():
+        # Mark retrieved: every caller may have been cancelled meanwhile.
+        task.exception()
+
+
+async def get_or_compute(
+    cache: Any,
+    key: str,
+    compute: Callable[[], Awaitable[Any]],
+    *,
+    ttl: int,
+    stale_ttl: int | None = None,
+    negative_ttl: int | None = None,
+    cache_if: Callable[[Any], bool] | None = None,
+    is_valid: Callable[[Any], bool] | None = None,
+) -> Any:
+    """Return the cached value of ``key``, computing it at most once at a time.
+
+    - Concurrent misses in this process share one ``compute()`` call; other
+      processes wait on the backend lock and read the stored result.
+    - For ``stale_ttl`` seconds after ``ttl`` expires the old value is
+      returned immediately while one background task refreshes it.
+    - A ``None`` result is cached for ``negative_ttl`` seconds.
+
+    Args:
+        cache: ``MemoryCache`` or ``RedisCache``.
+        key: Cache key.
+        compute: Coroutine factory producing the value (JSON-serializable).
+        ttl: Seconds the value is fresh (0 = never expires).
+        stale_ttl: Stale-serving window; defaults to ``CACHE_STALE_TTL``.
+        negative_ttl: Lifetime of cached ``None``; defaults to ``CACHE_NEGATIVE_TTL``.
+        cache_if: Predicate deciding whether a computed value is stored.
+        is_valid: Predicate rejecting a cached value (treated as a miss).
+
+    Returns:
+        The cached or freshly computed value.
+    """
+    settings = get_settings()
+    policy = {
+        "ttl": ttl,
+        "stale_ttl": settings.CACHE_STALE_TTL if stale_ttl is None else stale_ttl,
+        "negative_ttl": settings.CACHE_NEGATIVE_TTL if negative_ttl is None else negative_ttl,
+        "lock_ttl": settings.CACHE_LOCK_TTL,
+        "cache_if": cache_if,
+    }
+    flight = (id(cache), key)
+
+    raw = await cache.get(key)
+    if raw is not None:
+        value, fresh = _unpack_entry(raw)
+        if value is None or is_valid is None or is_valid(value):
+            if not fresh and flight not in _inflight:
+                task = asyncio.create_task(
+                    _single_flight(
+                        flight,
+                        lambda: _compute_and_store(cache, key, compute, policy, wait=False),
+                    )
+                )
+                _background_refreshes.add(task)
+                task.add_done_callback(_finish_background_refresh)
+            return value
+
+    return await _single_flight(
+        flight, lambda: _compute_and_store(cache, key, compute, policy, wait=True)
+    )
+
+
+def _finish_background_refresh(task: asyncio.Task) -> None:
+    _background_refreshes.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("Background cache refresh failed: %s", task.exception())
+
+
+async def _compute_and_store(
+    cache: Any,
+    key: str,
+    compute: Callable[[], Awaitable[Any]],
+    policy: dict[str, Any],
+    wait: bool,
+) -> Any:
+    token = await cache.acquire_lock(key, policy["lock_ttl"])
+    if token is None:
+        if not wait:
+            # Another process is already refreshing this entry.
+            return None
+        deadline = time.monotonic() + policy["lock_ttl"]
+        while time.monotonic() < deadline:
+            await asyncio.sleep(_LOCK_POLL_INTERVAL)
+            raw = await cache.get(key)
+            if raw is not None:
+                value, fresh = _unpack_entry(raw)
+                if fresh:
+                    return value
+        logger.warning("Cache lock wait for %s timed out; computing without lock", key)
+
+    try:
+        value = await compute()
+        cache_if = policy["cache_if"]
+        if value is None:
+            if policy["negative_ttl"] > 0:
+                await cache.set(
+                    key, _pack_entry(None, policy["negative_ttl"]), policy["negative_ttl"]
+                )
+        elif cache_if is None or cache_if(value):
+            ttl = policy["ttl"]
+            stored_ttl = ttl + policy["stale_ttl"] if ttl > 0 else 0
+            await cache.set(key, _pack_entry(value, ttl), stored_ttl)
+        return value
+    finally:
+        if token is not None:
+            await cache.release_lock(key, token)
@@ -126,6 +126,55 @@ def _ensure_index_if_missing(bind, table_name: str, index_name: str, column_name
     logger.warning("Added missing database index %s on %s(%s)", index_name, table_name, column_name)
 
 
+_BACKTEST_BLOB_COLUMNS = ("equity_curve", "equity_dates", "drawdown_curve", "trades")
+
+
+def _ensure_backtest_result_blobs_sync(bind) -> None:
+    """Mirror migrations 0004/0005: result curves, trades and chart pyramid in their own table."""
+    if not _has_table(bind, "backtest_results"):
+        return
+    if not _has_table(bind, "backtest_result_blobs"):
+        metadata = sa.MetaData()
+        sa.Table("backtest_results", metadata, autoload_with=bind)
+        sa.Table(
+            "backtest_result_blobs",
+            metadata,
+            sa.Column(
+                "result_id",
+                sa.String(length=36),
+                sa.ForeignKey("backtest_results.id"),
+                primary_key=True,
+            ),
+            *(sa.Column(name, sa.JSON(), nullable=True) for name in _BACKTEST_BLOB_COLUMNS),
+        ).create(bind=bind)
+        logger.warning("Added missing database table backtest_result_blobs")
+    # Migration 0005.
+    _add_column_if_missing(bind, "backtest_result_blobs", "chart_pyramid", "chart_pyramid JSON")
+
+    moved = [
+        name
+        for name in _BACKTEST_BLOB_COLUMNS
+        if name in _get_column_names(bind, "backtest_results")
+    ]
+    if not moved:
+        return
+    columns = ", ".join(moved)
+    copied = bind.execute(
+        text(
+            f"INSERT INTO backtest_result_blobs (result_id, {columns}) "
+            f"SELECT id, {columns} FROM backtest_results "
+            "WHERE id NOT IN (SELECT result_id FROM backtest_result_blobs)"
+        )
+    )
+    logger.warning("Moved %s legacy backtest results into backtest_result_blobs", copied.rowcount)
+    sqlite_version = bind.dialect.server_version_info or ()
+    if bind.dialect.name == "sqlite" and tuple(sqlite_version) < (3, 35):
+        # No DROP COLUMN before SQLite 3.35; the unmapped columns stay behind.
+        return
+    for name in moved:
+        bind.execute(text(f"ALTER TABLE backtest_results DROP COLUMN {name}"))
+
+
 def _ensure_workspace_schema_compatibility_sync(bind) -> None:
     dialect_name = bind.dialect.name
     false_literal = "FALSE" if dialect_name == "postgresql" else "0"
@@ -214,6 +263,8 @@ def _ensure_workspace_schema_compatibility_sync(bind) -> None:
                 )
             )
 
+    _ensure_backtest_result_blobs_sync(bind)
+
 
 async def ensure_schema_compatibility() -> None:
     """Patch legacy databases with columns required by the current ORM schema."""
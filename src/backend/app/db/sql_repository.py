@@ -101,6 +101,21 @@ class SQLRepository(BaseRepository[T], Generic[T]):
             )
             return refreshed.scalar_one_or_none()
 
+    async def update_if(self, id: str, expected: dict[str, Any], data: dict[str, Any]) -> bool:
+        """Update a row only while its columns still hold *expected* (compare-and-set)."""
+        async with self._session_scope() as session:
+            query = update(self.model_class).where(self.model_class.id == id)
+            for key, value in expected.items():
+                query = query.where(getattr(self.model_class, key) == value)
+            result = await session.execute(query.values(**data))
+            if not result.rowcount:
+                if self._owns_session:
+                    await session.rollback()
+                return False
+
+            await self._finalize_write(session)
+            return True
+
     async def delete(self, id: str) -> bool:
         async with self._session_scope() as session:
             result = await session.execute(
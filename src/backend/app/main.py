@@ -5,6 +5,7 @@ Includes API routing, logging, rate limiting, security headers, and WebSocket
 streaming for backtest progress updates.
 """
 
+import asyncio
 import time as _time
 from contextlib import asynccontextmanager
 
@@ -107,14 +108,76 @@ async def lifespan(app: FastAPI):
         except Exception:
             logger.exception("Failed to start akshare scheduler")
 
+    try:
+        from app.services.alert_engine import get_alert_engine
+
+        await get_alert_engine().start()
+    except Exception:
+        logger.exception("Failed to start alert engine")
+
+    if settings.PAPER_LEDGER_ENABLED:
+        try:
+            from app.services.paper_ledger import get_paper_ledger
+
+            await get_paper_ledger().start()
+        except Exception:
+            logger.exception("Failed to start paper ledger")
+
+    try:
+        from app.services.paper_ledger import get_paper_ledger
+        from app.services.paper_matching import get_matching_engine
+
+        ledger = get_paper_ledger()
+        if ledger.standby:
+            logger.info("Paper orders are settled by the paper ledger's writer process")
+        else:
+            # The writer also takes the orders submitted in standby workers
+            await get_matching_engine().start(intake=ledger.running)
+    except Exception:
+        logger.exception("Failed to start paper matching engine")
+
+    try:
+        from app.services.backtest_worker_pool import get_backtest_worker_pool
+
+        worker_pool = get_backtest_worker_pool()
+        if worker_pool is not None:
+            started = await asyncio.to_thread(worker_pool.prewarm)
+            logger.info(f"Backtest worker pool pre-warmed: {started} worker(s)")
+    except Exception:
+        logger.exception("Failed to pre-warm backtest worker pool")
+
     logger.info("Application ready - accepting requests")
     yield
     logger.info("Shutting down Backtrader Web API...")
+    try:
+        from app.services.alert_engine import get_alert_engine
+
+        await get_alert_engine().shutdown()
+    except Exception:
+        logger.exception("Failed to shutdown alert engine")
+    try:
+        from app.services.paper_matching import get_matching_engine
+
+        await get_matching_engine().shutdown()
+    except Exception:
+        logger.exception("Failed to shutdown paper matching engine")
+    try:
+        from app.services.paper_ledger import get_paper_ledger
+
+        await get_paper_ledger().shutdown()
+    except Exception:
+        logger.exception("Failed to flush paper ledger")
     if akshare_scheduler_service is not None:
         try:
             await akshare_scheduler_service.shutdown()
         except Exception:
             logger.exception("Failed to shutdown akshare scheduler")
+    try:
+        from app.services.backtest_worker_pool import shutdown_backtest_worker_pool
+
+        shutdown_backtest_worker_pool()
+    except Exception:
+        logger.exception("Failed to shutdown backtest worker pool")
     # Clean up ZMQ tick receivers
     try:
         from app.services.quote_service import get_quote_service
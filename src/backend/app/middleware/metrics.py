@@ -4,6 +4,7 @@ Metrics collection module for business and system monitoring.
 Provides Prometheus-compatible metrics for:
 - Backtest execution duration and count
 - Live trading instance status
+- Paper trading write-behind persistence
 - API request latency
 - Database query performance
 """
@@ -76,11 +77,19 @@ BACKTEST_TOTAL: MetricCounter = None
 BACKTEST_DURATION: MetricHistogram = None
 BACKTEST_SUCCESS: MetricCounter = None
 BACKTEST_FAILURE: MetricCounter = None
+WORKSPACE_STAGING_BYTES_COPIED: MetricHistogram = None
+WORKSPACE_STAGING_FILES_LINKED: MetricCounter = None
 
 # Live trading metrics
 LIVE_TRADING_ACTIVE_INSTANCES: MetricGauge = None
 LIVE_TRADING_TOTAL_TRADES: MetricCounter = None
 
+# Paper trading ledger metrics
+PAPER_LEDGER_FLUSH_DURATION: MetricHistogram = None
+PAPER_LEDGER_FLUSHED_RECORDS: MetricCounter = None
+PAPER_LEDGER_PENDING_RECORDS: MetricGauge = None
+PAPER_LEDGER_FLUSH_LAG: MetricGauge = None
+
 # ==================== System Metrics ====================
 
 # API metrics
@@ -99,7 +108,10 @@ ERROR_TOTAL: MetricCounter = None
 def _init_metrics() -> None:
     """Initialize all metrics. Called lazily on first use."""
     global BACKTEST_TOTAL, BACKTEST_DURATION, BACKTEST_SUCCESS, BACKTEST_FAILURE
+    global WORKSPACE_STAGING_BYTES_COPIED, WORKSPACE_STAGING_FILES_LINKED
     global LIVE_TRADING_ACTIVE_INSTANCES, LIVE_TRADING_TOTAL_TRADES
+    global PAPER_LEDGER_FLUSH_DURATION, PAPER_LEDGER_FLUSHED_RECORDS
+    global PAPER_LEDGER_PENDING_RECORDS, PAPER_LEDGER_FLUSH_LAG
     global API_REQUEST_TOTAL, API_REQUEST_DURATION, API_REQUEST_ERRORS
     global DB_QUERY_DURATION, DB_QUERY_TOTAL, ERROR_TOTAL
 
@@ -134,6 +146,21 @@ def _init_metrics() -> None:
         registry=_registry,
     )
 
+    WORKSPACE_STAGING_BYTES_COPIED = Histogram(
+        "workspace_staging_bytes_copied",
+        "Bytes physically copied when staging a task workspace",
+        ["kind"],  # backtest, optimization_trial
+        buckets=[0, 1024, 16384, 131072, 1048576, 16777216, 134217728],
+        registry=_registry,
+    )
+
+    WORKSPACE_STAGING_FILES_LINKED = Counter(
+        "workspace_staging_files_linked_total",
+        "Files hardlinked or symlinked instead of copied when staging workspaces",
+        ["kind"],
+        registry=_registry,
+    )
+
     # Live trading metrics
     LIVE_TRADING_ACTIVE_INSTANCES = Gauge(
         "live_trading_active_instances",
@@ -149,6 +176,32 @@ def _init_metrics() -> None:
         registry=_registry,
     )
 
+    # Paper trading ledger metrics
+    PAPER_LEDGER_FLUSH_DURATION = Histogram(
+        "paper_ledger_flush_duration_seconds",
+        "Duration of paper trading write-behind flushes in seconds",
+        buckets=[0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5],
+        registry=_registry,
+    )
+
+    PAPER_LEDGER_FLUSHED_RECORDS = Counter(
+        "paper_ledger_flushed_records_total",
+        "Paper trading records written by write-behind flushes",
+        registry=_registry,
+    )
+
+    PAPER_LEDGER_PENDING_RECORDS = Gauge(
+        "paper_ledger_pending_records",
+        "Paper trading records waiting to be flushed",
+        registry=_registry,
+    )
+
+    PAPER_LEDGER_FLUSH_LAG = Gauge(
+        "paper_ledger_flush_lag_seconds",
+        "Age of the oldest unflushed paper trading record in seconds",
+        registry=_registry,
+    )
+
     # API metrics
     API_REQUEST_TOTAL = Counter(
         "api_request_total",
@@ -271,6 +324,27 @@ def record_backtest_complete(strategy_id: str, duration_seconds: float, success:
             BACKTEST_TOTAL.labels(status="failed").inc()
 
 
+def record_workspace_staging(kind: str, bytes_copied: int, files_linked: int) -> None:
+    """Record how much data staging a task workspace actually copied.
+
+    Args:
+        kind: Workspace kind (backtest, optimization_trial).
+        bytes_copied: Bytes written as real copies.
+        files_linked: Files shared via hardlink/symlink.
+    """
+    if not PROMETHEUS_AVAILABLE:
+        return
+
+    if WORKSPACE_STAGING_BYTES_COPIED is None:
+        _init_metrics()
+
+    if WORKSPACE_STAGING_BYTES_COPIED is not None:
+        WORKSPACE_STAGING_BYTES_COPIED.labels(kind=kind).observe(bytes_copied)
+
+    if WORKSPACE_STAGING_FILES_LINKED is not None:
+        WORKSPACE_STAGING_FILES_LINKED.labels(kind=kind).inc(files_linked)
+
+
 def record_api_request(
     method: str, endpoint: str, status_code: int, duration_seconds: float
 ) -> None:
@@ -349,6 +423,46 @@ def record_live_trade(broker: str, symbol: str) -> None:
         LIVE_TRADING_TOTAL_TRADES.labels(broker=broker, symbol=symbol).inc()
 
 
+def record_paper_ledger_flush(duration_seconds: float, records: int) -> None:
+    """Record a paper trading write-behind flush.
+
+    Args:
+        duration_seconds: Flush transaction duration in seconds.
+        records: Records written.
+    """
+    if not PROMETHEUS_AVAILABLE:
+        return
+
+    if PAPER_LEDGER_FLUSH_DURATION is None:
+        _init_metrics()
+
+    if PAPER_LEDGER_FLUSH_DURATION is not None:
+        PAPER_LEDGER_FLUSH_DURATION.observe(duration_seconds)
+
+    if PAPER_LEDGER_FLUSHED_RECORDS is not None:
+        PAPER_LEDGER_FLUSHED_RECORDS.inc(records)
+
+
+def set_paper_ledger_backlog(pending_records: int, lag_seconds: float) -> None:
+    """Set the paper trading write-behind backlog.
+
+    Args:
+        pending_records: Records waiting to be flushed.
+        lag_seconds: Age of the oldest pending record.
+    """
+    if not PROMETHEUS_AVAILABLE:
+        return
+
+    if PAPER_LEDGER_PENDING_RECORDS is None:
+        _init_metrics()
+
+    if PAPER_LEDGER_PENDING_RECORDS is not None:
+        PAPER_LEDGER_PENDING_RECORDS.set(pending_records)
+
+    if PAPER_LEDGER_FLUSH_LAG is not None:
+        PAPER_LEDGER_FLUSH_LAG.set(lag_seconds)
+
+
 def record_db_query(operation: str, table: str, duration_seconds: float) -> None:
     """Record a database query.
 
@@ -439,10 +553,13 @@ __all__ = [
     "get_metrics_output",
     "record_backtest_start",
     "record_backtest_complete",
+    "record_workspace_staging",
     "record_api_request",
     "record_api_error",
     "set_live_trading_instances",
     "record_live_trade",
+    "record_paper_ledger_flush",
+    "set_paper_ledger_backlog",
     "record_db_query",
     "record_error",
     "track_db_query",
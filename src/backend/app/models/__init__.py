@@ -14,9 +14,9 @@ from app.models.akshare_mgmt import (
     TaskExecution,
 )
 from app.models.alerts import Alert, AlertNotification, AlertRule
-from app.models.backtest import BacktestResultModel, BacktestTask
+from app.models.backtest import BacktestResultBlob, BacktestResultModel, BacktestTask
 from app.models.comparison import Comparison, ComparisonShare
-from app.models.optimization import OptimizationTask
+from app.models.optimization import OptimizationTask, OptimizationTrial
 from app.models.paper_trading import Account, Order, PaperTrade, Position
 from app.models.permission import Permission, Role, user_roles
 from app.models.strategy import Strategy
@@ -33,8 +33,10 @@ __all__ = [
     "Account",
     "Alert",
     "OptimizationTask",
+    "OptimizationTrial",
     "AlertNotification",
     "AlertRule",
+    "BacktestResultBlob",
     "BacktestResultModel",
     "BacktestTask",
     "Comparison",
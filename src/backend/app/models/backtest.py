@@ -5,8 +5,8 @@ Backtest ORM models.
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import JSON, Column, DateTime, Float, ForeignKey, Integer, String, Text
-from sqlalchemy.orm import relationship
+from sqlalchemy import JSON, Column, DateTime, Float, ForeignKey, Index, Integer, String, Text
+from sqlalchemy.orm import deferred, relationship
 
 from app.db.database import Base
 
@@ -29,6 +29,10 @@ class BacktestTask(Base):
     """
 
     __tablename__ = "backtest_tasks"
+    __table_args__ = (
+        # Keyset pagination of the history list: (user_id, created_at, id).
+        Index("idx_backtest_tasks_user_created", "user_id", "created_at", "id"),
+    )
 
     id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = Column(String(36), ForeignKey("users.id"), nullable=False, index=True)
@@ -54,9 +58,29 @@ class BacktestTask(Base):
     strategy_version = relationship("StrategyVersion", back_populates="backtest_tasks")
 
 
+def _blob_attribute(name: str) -> property:
+    """Expose one ``BacktestResultBlob`` column on ``BacktestResultModel``."""
+
+    def fget(self):
+        blob = self.blob
+        value = getattr(blob, name) if blob is not None else None
+        return value if value is not None else []
+
+    def fset(self, value):
+        if self.blob is None:
+            self.blob = BacktestResultBlob()
+        setattr(self.blob, name, value)
+
+    return property(fget, fset, doc=f"``{name}`` stored in ``backtest_result_blobs``.")
+
+
 class BacktestResultModel(Base):
     """Backtest result table.
 
+    Only scalar metrics live in this table so history listings can project
+    them cheaply. Curves and trade records are stored in
+    ``backtest_result_blobs`` and exposed here as plain attributes.
+
     Attributes:
         id: Unique result identifier (UUID).
         task_id: Associated backtest task ID.
@@ -68,10 +92,10 @@ class BacktestResultModel(Base):
         total_trades: Total number of trades.
         profitable_trades: Number of profitable trades.
         losing_trades: Number of losing trades.
-        equity_curve: Equity curve data points (JSON).
-        equity_dates: Equity curve dates (JSON).
-        drawdown_curve: Drawdown curve data points (JSON).
-        trades: Trade records (JSON).
+        equity_curve: Equity curve data points (blob table).
+        equity_dates: Equity curve dates (blob table).
+        drawdown_curve: Drawdown curve data points (blob table).
+        trades: Trade records (blob table).
         created_at: Result creation timestamp.
     """
 
@@ -93,13 +117,45 @@ class BacktestResultModel(Base):
     profitable_trades = Column(Integer, default=0)
     losing_trades = Column(Integer, default=0)
 
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+
+    # Relationships
+    task = relationship("BacktestTask", back_populates="result")
+    # Loaded with the entity (minus the deferred chart pyramid); metric-only
+    # queries skip it with ``noload(BacktestResultModel.blob)``.
+    blob = relationship(
+        "BacktestResultBlob",
+        uselist=False,
+        lazy="selectin",
+        cascade="all, delete-orphan",
+    )
+
     # Data
+    equity_curve = _blob_attribute("equity_curve")
+    equity_dates = _blob_attribute("equity_dates")
+    drawdown_curve = _blob_attribute("drawdown_curve")
+    trades = _blob_attribute("trades")
+
+
+class BacktestResultBlob(Base):
+    """Large per-result payloads, split out of ``backtest_results``.
+
+    Attributes:
+        result_id: Owning backtest result ID.
+        equity_curve: Equity curve data points (JSON).
+        equity_dates: Equity curve dates (JSON).
+        drawdown_curve: Drawdown curve data points (JSON).
+        trades: Trade records (JSON).
+        chart_pyramid: Precomputed chart downsampling levels (JSON).
+    """
+
+    __tablename__ = "backtest_result_blobs"
+
+    result_id = Column(String(36), ForeignKey("backtest_results.id"), primary_key=True)
     equity_curve = Column(JSON, default=list)
     equity_dates = Column(JSON, default=list)
     drawdown_curve = Column(JSON, default=list)
     trades = Column(JSON, default=list)
-
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
-
-    # Relationships
-    task = relationship("BacktestTask", back_populates="result")
+    # {"n": len(equity_curve), "equity_curve": [[index, ...], ...]}, see chart_downsampling.
+    # Deferred: only the chart endpoint reads it, through a column select.
+    chart_pyramid = deferred(Column(JSON, nullable=True))
@@ -2,13 +2,14 @@
 Optimization task ORM model.
 
 Persists parameter optimization task state and results for multi-instance
-support and restart resilience.
+support and restart resilience. Each successful trial is one row of
+``optimization_trials`` so progress flushes append instead of rewriting.
 """
 
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import JSON, Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import JSON, Column, DateTime, Float, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import relationship
 
 from app.db.database import Base
@@ -25,7 +26,8 @@ class OptimizationTask(Base):
         total: Total number of parameter combinations.
         completed: Number of completed trials.
         failed: Number of failed trials.
-        results: JSON array of trial results.
+        results: Legacy JSON array of trial results (tasks created before
+            ``optimization_trials``; no longer written).
         param_ranges: Original parameter range specification (JSON).
         n_workers: Number of parallel workers.
         error_message: Error message if failed.
@@ -55,3 +57,52 @@ class OptimizationTask(Base):
 
     # Relationships
     user = relationship("User", back_populates="optimization_tasks")
+
+
+# Metrics copied into ``optimization_trials`` columns so results can be
+# ordered and paged in SQL; other sort keys are read from the JSON.
+INDEXED_TRIAL_METRICS = (
+    "total_return",
+    "annual_return",
+    "sharpe_ratio",
+    "max_drawdown",
+    "win_rate",
+)
+
+
+class OptimizationTrial(Base):
+    """One successful trial of an optimization task.
+
+    Attributes:
+        id: Row identifier.
+        task_id: Owning optimization task ID.
+        result_index: Position of the trial in the task's result list.
+        trial_index: Index of the parameter combination in the grid.
+        params: Trial parameters (JSON).
+        metrics: Trial metrics (JSON).
+        artifact_path: Directory holding the trial's log artifacts.
+        total_return, annual_return, sharpe_ratio, max_drawdown, win_rate:
+            Numeric copies of those metrics (None when missing or not finite).
+    """
+
+    __tablename__ = "optimization_trials"
+    __table_args__ = (
+        Index("idx_optimization_trials_task_result", "task_id", "result_index", unique=True),
+        *(
+            Index(f"idx_optimization_trials_task_{name}", "task_id", name, "result_index")
+            for name in INDEXED_TRIAL_METRICS
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    task_id = Column(String(36), ForeignKey("optimization_tasks.id"), nullable=False)
+    result_index = Column(Integer, nullable=False)
+    trial_index = Column(Integer, nullable=True)
+    params = Column(JSON, default=dict)
+    metrics = Column(JSON, default=dict)
+    artifact_path = Column(Text, nullable=True)
+    total_return = Column(Float, nullable=True)
+    annual_return = Column(Float, nullable=True)
+    sharpe_ratio = Column(Float, nullable=True)
+    max_drawdown = Column(Float, nullable=True)
+    win_rate = Column(Float, nullable=True)
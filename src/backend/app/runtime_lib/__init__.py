@@ -0,0 +1,12 @@
+"""Modules shared with strategy subprocesses.
+
+The backtest and optimization runners put this directory on the strategy
+``PYTHONPATH``, so its modules are importable from ``run.py`` as top-level
+names (``import bt_bar_cache``). They must therefore never import from ``app``.
+"""
+
+from pathlib import Path
+
+RUNTIME_LIB_DIR = Path(__file__).resolve().parent
+
+__all__ = ["RUNTIME_LIB_DIR"]
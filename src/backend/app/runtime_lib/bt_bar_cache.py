@@ -0,0 +1,249 @@
+"""
+Shared, memory-mapped bar cache for CSV data feeds.
+
+Strategies used to ``pd.read_csv`` + ``pd.to_datetime`` the same files under
+``datas/`` once per backtest and once per optimization trial. This module
+converts a source CSV once into a directory of ``.npy`` columns and serves
+later requests from memory-mapped arrays:
+
+    {cache_dir}/{key}/
+        meta.json       columns, row count, timezone, source path
+        __index__.npy   int64 nanoseconds since epoch, sorted ascending
+        <column>.npy    float64 values, one file per column
+
+``key`` hashes the absolute source path, its mtime and size, plus a caller
+supplied ``variant`` naming the normalization, so a changed CSV or a changed
+parser never serves stale bars. Entries are published atomically and built
+under a lock file, so N concurrent trials parse the CSV exactly once.
+
+Usage from a strategy ``run.py``::
+
+    try:
+        import bt_bar_cache
+    except ImportError:
+        bt_bar_cache = None
+
+    df = bt_bar_cache.load_bars(csv_path, read_my_csv, variant="my-csv-v1",
+                                start=start, end=end, bar_count=500)
+
+``read_my_csv(path)`` must return a DataFrame with a sorted ``DatetimeIndex``
+and numeric columns. This module only depends on numpy and pandas.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+CACHE_DIR_ENV = "BACKTRADER_BAR_CACHE_DIR"
+INDEX_FILE = "__index__.npy"
+META_FILE = "meta.json"
+_FORMAT_VERSION = 1
+_LOCK_STALE_SECONDS = 600.0
+_LOCK_POLL_SECONDS = 0.05
+
+
+def cache_dir() -> Path:
+    """Return the cache root (``$BACKTRADER_BAR_CACHE_DIR`` or the temp dir)."""
+    configured = os.environ.get(CACHE_DIR_ENV, "").strip()
+    if configured:
+        return Path(configured).expanduser()
+    return Path(tempfile.gettempdir()) / "bt_bar_cache"
+
+
+def source_key(csv_path: str | os.PathLike[str], variant: str = "") -> str:
+    """Fingerprint a source file: absolute path + mtime + size + parser variant."""
+    path = Path(csv_path).resolve()
+    stat = path.stat()
+    raw = f"{_FORMAT_VERSION}\0{path}\0{stat.st_mtime_ns}\0{stat.st_size}\0{variant}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _column_file(name: str) -> str:
+    safe = "".join(ch if ch.isalnum() or ch in "-_" else "_" for ch in name)
+    digest = hashlib.sha1(name.encode("utf-8")).hexdigest()[:8]
+    return f"{safe}-{digest}.npy"
+
+
+def _index_to_ns(index: pd.Index) -> tuple[np.ndarray, str | None]:
+    if not isinstance(index, pd.DatetimeIndex):
+        index = pd.DatetimeIndex(pd.to_datetime(index))
+    tz = str(index.tz) if index.tz is not None else None
+    values = index.as_unit("ns").asi8
+    return np.ascontiguousarray(values, dtype=np.int64), tz
+
+
+def _write_entry(target: Path, frame: pd.DataFrame, source: Path) -> None:
+    """Write ``frame`` into a fresh directory and atomically publish it at ``target``."""
+    if not frame.index.is_monotonic_increasing:
+        frame = frame.sort_index()
+    target.parent.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(prefix=f".{target.name}-", dir=target.parent))
+    try:
+        index_ns, tz = _index_to_ns(frame.index)
+        np.save(staging / INDEX_FILE, index_ns)
+        columns = [str(column) for column in frame.columns]
+        for column, name in zip(frame.columns, columns, strict=True):
+            values = pd.to_numeric(frame[column], errors="coerce").to_numpy(dtype=np.float64)
+            np.save(staging / _column_file(name), np.ascontiguousarray(values))
+        meta = {
+            "version": _FORMAT_VERSION,
+            "source": str(source),
+            "rows": int(len(frame)),
+            "columns": columns,
+            "index_name": frame.index.name,
+            "tz": tz,
+        }
+        (staging / META_FILE).write_text(json.dumps(meta), encoding="utf-8")
+        try:
+            os.replace(staging, target)
+        except OSError:
+            # Another process published the same key first; its entry is identical.
+            if not (target / META_FILE).is_file():
+                raise
+    finally:
+        if staging.exists():
+            shutil.rmtree(staging, ignore_errors=True)
+
+
+class _BuildLock:
+    """Cross-process lock file so only one process parses a given CSV."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._fd: int | None = None
+
+    def __enter__(self) -> _BuildLock:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        while True:
+            try:
+                self._fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                return self
+            except FileExistsError:
+                try:
+                    age = time.time() - self.path.stat().st_mtime
+                except FileNotFoundError:
+                    continue
+                if age > _LOCK_STALE_SECONDS:
+                    # Builder crashed; steal the lock.
+                    self.path.unlink(missing_ok=True)
+                    continue
+                time.sleep(_LOCK_POLL_SECONDS)
+
+    def __exit__(self, *exc: Any) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+        self.path.unlink(missing_ok=True)
+
+
+class CachedBars:
+    """Memory-mapped view over one cache entry."""
+
+    def __init__(self, entry_dir: Path) -> None:
+        self.entry_dir = entry_dir
+        self.meta = json.loads((entry_dir / META_FILE).read_text(encoding="utf-8"))
+        self.index_ns: np.ndarray = np.load(entry_dir / INDEX_FILE, mmap_mode="r")
+        self._columns: dict[str, np.ndarray] = {}
+
+    @property
+    def columns(self) -> list[str]:
+        return list(self.meta["columns"])
+
+    def __len__(self) -> int:
+        return int(self.meta["rows"])
+
+    def column(self, name: str) -> np.ndarray:
+        if name not in self._columns:
+            self._columns[name] = np.load(self.entry_dir / _column_file(name), mmap_mode="r")
+        return self._columns[name]
+
+    def _to_ns(self, value: Any) -> int | None:
+        if value is None or value == "":
+            return None
+        ts = pd.Timestamp(value)
+        if pd.isna(ts):
+            return None
+        tz = self.meta.get("tz")
+        if tz is not None:
+            ts = ts.tz_localize(tz) if ts.tzinfo is None else ts.tz_convert(tz)
+        elif ts.tzinfo is not None:
+            ts = ts.tz_convert("UTC").tz_localize(None)
+        return int(ts.as_unit("ns").value)
+
+    def slice_bounds(
+        self, start: Any = None, end: Any = None, bar_count: int | None = None
+    ) -> tuple[int, int]:
+        """Return the ``[lo, hi)`` row range for a date window and trailing bar count."""
+        lo, hi = 0, len(self)
+        start_ns = self._to_ns(start)
+        end_ns = self._to_ns(end)
+        if start_ns is not None:
+            lo = int(np.searchsorted(self.index_ns, start_ns, side="left"))
+        if end_ns is not None:
+            hi = int(np.searchsorted(self.index_ns, end_ns, side="right"))
+        hi = max(hi, lo)
+        if bar_count and bar_count > 0 and hi - lo > bar_count:
+            lo = hi - int(bar_count)
+        return lo, hi
+
+    def to_frame(
+        self,
+        start: Any = None,
+        end: Any = None,
+        bar_count: int | None = None,
+        columns: list[str] | None = None,
+    ) -> pd.DataFrame:
+        """Build a DataFrame over a zero-copy slice of the memory-mapped columns."""
+        lo, hi = self.slice_bounds(start, end, bar_count)
+        index = pd.DatetimeIndex(np.asarray(self.index_ns[lo:hi]).view("datetime64[ns]"))
+        tz = self.meta.get("tz")
+        if tz is not None:
+            index = index.tz_localize("UTC").tz_convert(tz)
+        index.name = self.meta.get("index_name")
+        data = {name: self.column(name)[lo:hi] for name in (columns or self.columns)}
+        return pd.DataFrame(data, index=index, copy=False)
+
+
+def open_bars(
+    csv_path: str | os.PathLike[str],
+    build_fn: Callable[[Path], pd.DataFrame],
+    *,
+    variant: str = "",
+    root: Path | None = None,
+) -> CachedBars:
+    """Return the cache entry for ``csv_path``, parsing it with ``build_fn`` on a miss."""
+    source = Path(csv_path).resolve()
+    key = source_key(source, variant)
+    base = root or cache_dir()
+    entry_dir = base / key
+    if not (entry_dir / META_FILE).is_file():
+        with _BuildLock(base / f".{key}.lock"):
+            if not (entry_dir / META_FILE).is_file():
+                _write_entry(entry_dir, build_fn(source), source)
+    return CachedBars(entry_dir)
+
+
+def load_bars(
+    csv_path: str | os.PathLike[str],
+    build_fn: Callable[[Path], pd.DataFrame],
+    *,
+    variant: str = "",
+    start: Any = None,
+    end: Any = None,
+    bar_count: int | None = None,
+    root: Path | None = None,
+) -> pd.DataFrame:
+    """Load bars for ``csv_path`` restricted to ``[start, end]`` and the last ``bar_count`` rows."""
+    bars = open_bars(csv_path, build_fn, variant=variant, root=root)
+    return bars.to_frame(start=start, end=end, bar_count=bar_count)
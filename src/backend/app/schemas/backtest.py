@@ -32,6 +32,9 @@ class BacktestRequest(BaseModel):
     timeframe: str = Field("1d", description="K-line timeframe e.g. 1d, 1h, 5m")
     timeframe_n: int = Field(1, ge=1, description="Timeframe multiplier")
     bar_count: int | None = Field(None, description="Number of bars to load (None = all)")
+    fidelity_bars: int | None = Field(
+        None, description="Simulate only the first N bars of the range (optimization rungs)"
+    )
     params: dict[str, Any] = Field(default_factory=dict, description="Strategy parameters")
 
     model_config = ConfigDict(
@@ -84,6 +87,7 @@ class BacktestResult(BaseModel):
     start_date: datetime
     end_date: datetime
     status: TaskStatus
+    initial_cash: float | None = Field(None, description="Initial cash of the run")
 
     # Performance metrics
     total_return: float = Field(0, description="Total return (%)")
@@ -116,5 +120,6 @@ class BacktestResult(BaseModel):
 class BacktestListResponse(BaseModel):
     """Backtest list response schema."""
 
-    total: int
+    total: int | None = None
     items: list[BacktestResult]
+    next_cursor: str | None = None
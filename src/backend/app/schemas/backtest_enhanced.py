@@ -81,6 +81,15 @@ class BacktestRequest(BaseModel):
         examples=[0.001, 0.0003, 0.01],
     )
 
+    bar_count: int | None = Field(
+        None, ge=1, description="Number of most recent bars to load (None = all)"
+    )
+    fidelity_bars: int | None = Field(
+        None,
+        ge=1,
+        description="Simulate only the first N bars of the range (optimization rungs)",
+    )
+
     # Strategy parameters (with type and range validation)
     params: dict[str, Any] = Field(
         default_factory=dict,
@@ -294,8 +303,9 @@ class BacktestResult(BaseModel):
 class BacktestListResponse(BaseModel):
     """Backtest list response schema."""
 
-    total: int = Field(..., ge=0, description="Total count")
+    total: int | None = Field(None, ge=0, description="Total count (omitted for cursor pages)")
     items: list[BacktestResult]
+    next_cursor: str | None = Field(None, description="Cursor of the next page, if any")
 
 
 class BacktestConnectedEvent(BaseModel):
@@ -327,6 +337,15 @@ class BacktestProgressEvent(BaseModel):
     data: dict[str, Any] = Field(default_factory=dict)
 
 
+class BacktestTradeEvent(BaseModel):
+    """Trade closed while the backtest is still running."""
+
+    type: Literal["trade"] = "trade"
+    task_id: str
+    status: TaskStatus = TaskStatus.RUNNING
+    trade: dict[str, Any]
+
+
 class BacktestCompletedEvent(BaseModel):
     """Backtest completed event schema."""
 
@@ -391,6 +410,21 @@ class OptimizationRequest(BaseModel):
         default=100, ge=10, le=1000, description="Number of trials (for Bayesian optimization)"
     )
 
+    # Successive halving (multi-fidelity early stopping)
+    early_stopping: bool = Field(
+        default=False,
+        description="Score candidates on short bar windows first and promote only the best",
+    )
+    halving_min_bars: int = Field(
+        default=250, ge=10, description="Bars used by the first (cheapest) rung"
+    )
+    halving_eta: int = Field(
+        default=3, ge=2, le=10, description="Reduction factor: keep the top 1/eta per rung"
+    )
+    halving_rungs: int = Field(
+        default=3, ge=2, le=6, description="Number of rungs, the last one on the full range"
+    )
+
     @model_validator(mode="after")
     def validate_optimization_config(self) -> "OptimizationRequest":
         """Validate optimization configuration.
@@ -290,6 +290,19 @@ class UnitOptimizationRequest(BaseModel):
     n_workers: int = Field(default=4, ge=1, le=32)
     mode: str = Field("grid", description="Optimization mode: grid/random")
     timeout: int = Field(0, ge=0, description="Timeout in seconds (0 = no limit)")
+    early_stopping: bool = Field(
+        default=False,
+        description="Score candidates on short bar windows first and promote only the best",
+    )
+    halving_min_bars: int = Field(
+        default=250, ge=10, description="Bars used by the first (cheapest) rung"
+    )
+    halving_eta: int = Field(
+        default=3, ge=2, le=10, description="Reduction factor: keep the top 1/eta per rung"
+    )
+    halving_rungs: int = Field(
+        default=3, ge=2, le=6, description="Number of rungs, the last one on the full range"
+    )
 
 
 class ApplyBestParamsRequest(BaseModel):
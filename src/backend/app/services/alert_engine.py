@@ -0,0 +1,757 @@
+"""
+Shared alert-rule evaluation scheduler.
+
+Alert rules used to get one asyncio task each, re-reading the rule from the
+database and resolving its metric on every interval. ``AlertEngine`` keeps
+all active rules in memory instead and runs one scheduler task:
+
+- rules are grouped into timing-wheel slots by check interval (which
+  depends on the alert type, see ``rule_interval``); the scheduler sleeps
+  until the next slot is due;
+- a due slot's rules are evaluated together: each distinct metric source
+  (paper account, live task status, backtest result, ...) is fetched once,
+  then threshold and rate conditions are compared as NumPy arrays;
+- ``MonitoringService`` pushes rule changes with ``upsert`` / ``remove``,
+  so rules are never polled from the database.
+
+In event-driven mode (``ALERT_EVENT_DRIVEN``), rules on inputs that announce
+their changes are left off the wheel and evaluated when an input changes:
+paper accounts and positions (``PaperTradingService._notify_*``) and gateway
+quotes (``QuoteService`` tick listener) call ``publish`` with the new value,
+and the rules depending on it are found through a source-key index. Live
+task and backtest metrics have no change feed and stay on the wheel. An
+event-driven threshold or rate rule fires when its condition becomes true,
+not on every change while it stays true. Quote rules start the receiver
+and gateway subscription of their symbol (``ensure_quote_feeds``) instead
+of relying on the quote page having opened them.
+
+Rules are loaded on ``start`` (application startup). Only one uvicorn
+worker runs the engine: the one holding the ``alert_engine.lock`` lease in
+the backend data directory; the others stay in standby and ignore
+``upsert`` / ``remove``. Rule changes made in any worker reach the engine
+through ``sync_rules``, which reads the rules updated since its last pass
+every ``ALERT_RULE_SYNC_INTERVAL`` seconds. Rules that fire are read again
+before the alert is raised, so a rule deleted or deactivated in another
+worker never fires from a stale copy.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import threading
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from app.config import get_settings
+from app.models.alerts import AlertRule, AlertType
+from app.services.alert_evaluation import (
+    _check_cross_trigger,
+    compare_arrays,
+    constant_metric_value,
+    fetch_metric_source,
+    metric_from_source,
+    metric_source_key,
+)
+from app.utils.backend_data_paths import get_backend_data_path
+from app.utils.process_lease import ProcessLease
+
+if TYPE_CHECKING:
+    from app.services.monitoring_service import MonitoringService
+
+logger = logging.getLogger(__name__)
+
+# Metric sources fetched concurrently per evaluation round.
+FETCH_CONCURRENCY = 16
+# Rules read per query when loading active rules on start.
+LOAD_PAGE_SIZE = 500
+# Rules read per query when looking for rules changed in other workers.
+SYNC_PAGE_SIZE = 50
+
+# Metric sources that publish their changes (see ``AlertEngine.publish``).
+EVENT_SOURCES = frozenset({"paper_account", "paper_position", "quote"})
+
+_CONSTANT = ("constant",)
+
+
+def rule_interval(rule: AlertRule) -> float:
+    """Check interval of a rule in seconds, by alert type."""
+    settings = get_settings()
+    alert_type = getattr(rule, "alert_type", None)
+    if alert_type == AlertType.SYSTEM:
+        return float(settings.MONITORING_SYSTEM_INTERVAL)
+    if alert_type in (AlertType.ACCOUNT, AlertType.POSITION):
+        return float(settings.MONITORING_ACCOUNT_INTERVAL)
+    if alert_type == AlertType.STRATEGY:
+        return float(settings.MONITORING_STRATEGY_INTERVAL)
+    return float(settings.MONITORING_DEFAULT_INTERVAL)
+
+
+def _rule_config(rule: AlertRule) -> dict[str, Any]:
+    config = getattr(rule, "trigger_config", None)
+    return config if isinstance(config, dict) else {}
+
+
+def rule_source_key(rule: AlertRule) -> tuple[str, ...] | None:
+    """Metric source a rule is evaluated on (None for config-only rules)."""
+    config = _rule_config(rule)
+    trigger_type = getattr(rule, "trigger_type", None)
+    if trigger_type not in ("threshold", "rate", "cross") or "current_value" in config:
+        return None
+    return metric_source_key(rule, config)
+
+
+def _definition(rule: AlertRule) -> tuple:
+    """Rule fields that affect evaluation and notification."""
+    return tuple(
+        getattr(rule, name, None)
+        for name in (
+            "is_active",
+            "alert_type",
+            "severity",
+            "name",
+            "description",
+            "trigger_type",
+            "trigger_config",
+            "notification_enabled",
+            "notification_channels",
+        )
+    )
+
+
+def _utc(value: datetime) -> datetime:
+    # SQLite returns naive datetimes; the app stores UTC.
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+def _float_or_nan(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+@dataclass
+class _Slot:
+    """Timing-wheel slot: all rules sharing one check interval."""
+
+    interval: float
+    due: float
+    rule_ids: set[str] = field(default_factory=set)
+
+
+class AlertEngine:
+    """In-memory alert rules evaluated by one scheduler task.
+
+    Args:
+        monitor: Service that raises alerts and owns the rule repository.
+        clock: Monotonic clock of the timing wheel.
+        event_driven: Evaluate event sources on change (``ALERT_EVENT_DRIVEN``).
+        lease_path: Lock file electing the worker that runs the engine.
+    """
+
+    def __init__(
+        self,
+        monitor: MonitoringService,
+        clock: Callable[[], float] = time.monotonic,
+        event_driven: bool | None = None,
+        lease_path: Path | None = None,
+    ) -> None:
+        settings = get_settings()
+        self.monitor = monitor
+        self.event_driven = settings.ALERT_EVENT_DRIVEN if event_driven is None else event_driven
+        self.sync_interval = settings.ALERT_RULE_SYNC_INTERVAL
+        self._lease_path = lease_path
+        self._lease: ProcessLease | None = None
+        # Started while another worker runs the engine.
+        self.standby = False
+        self._synced_at: datetime | None = None
+        self._sync_task: asyncio.Task | None = None
+        self._clock = clock
+        self._rules: dict[str, AlertRule] = {}
+        self._slots: dict[float, _Slot] = {}
+        self._rule_slot: dict[str, float] = {}
+        # Source key -> ids of the rules evaluated on it.
+        self._dependents: dict[tuple[str, ...], set[str]] = {}
+        self._rule_key: dict[str, tuple[str, ...]] = {}
+        # Quote source -> upper-cased rule symbol -> quote keys (tick routing).
+        self._quote_routes: dict[str, dict[str, set[tuple[str, ...]]]] = {}
+        # Rules added since the last round; evaluated on the next wake-up.
+        self._fresh: set[str] = set()
+        self._trigger_state: dict[str, Any] = {}
+        # Quote keys whose receiver runs and whose symbol is subscribed.
+        self._quote_feeds: set[tuple[str, ...]] = set()
+        self._feed_lock = asyncio.Lock()
+        self._feed_tasks: set[asyncio.Task] = set()
+        # Changed inputs published since the last round (any thread).
+        self._pushed: dict[tuple[str, ...], Any] = {}
+        self._push_lock = threading.Lock()
+        self._push_scheduled = False
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def rule_count(self) -> int:
+        return len(self._rules)
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    # ------------------------------------------------------------------
+    # Rule registry (change notifications)
+    # ------------------------------------------------------------------
+
+    def upsert(self, rule: AlertRule) -> None:
+        """Add or replace a rule; inactive rules are removed."""
+        if self.standby:
+            return
+        rule_id = str(rule.id)
+        if not getattr(rule, "is_active", False):
+            self.remove(rule_id)
+            return
+        key = rule_source_key(rule)
+        if self._rule_key.get(rule_id) != key:
+            self._unindex(rule_id)
+            if key is not None:
+                self._dependents.setdefault(key, set()).add(rule_id)
+                self._rule_key[rule_id] = key
+                if key[0] == "quote":
+                    routes = self._quote_routes.setdefault(key[1], {})
+                    routes.setdefault(key[2].upper(), set()).add(key)
+                    self._schedule_quote_feeds()
+
+        interval = max(rule_interval(rule), 0.001)
+        if self.event_driven and key is not None and key[0] in EVENT_SOURCES:
+            self._unslot(rule_id)
+        elif self._rule_slot.get(rule_id) != interval:
+            self._unslot(rule_id)
+            slot = self._slots.get(interval)
+            if slot is None:
+                slot = self._slots[interval] = _Slot(interval, self._clock() + interval)
+            slot.rule_ids.add(rule_id)
+            self._rule_slot[rule_id] = interval
+        self._rules[rule_id] = rule
+        self._fresh.add(rule_id)
+        self._wakeup.set()
+
+    def remove(self, rule_id: str) -> None:
+        if self.standby:
+            return
+        rule_id = str(rule_id)
+        self._unslot(rule_id)
+        self._unindex(rule_id)
+        self._rules.pop(rule_id, None)
+        self._fresh.discard(rule_id)
+        for prefix in ("rate", "cross", "edge"):
+            self._trigger_state.pop(f"{prefix}:{rule_id}", None)
+
+    async def sync_rules(self) -> int:
+        """Apply the rules changed since the last pass (in any worker).
+
+        Returns:
+            Number of rules added, replaced or removed.
+        """
+        since, newest = self._synced_at, self._synced_at
+        changed = 0
+        skip = 0
+        while True:
+            rules = await self.monitor.alert_rule_repo.list(
+                skip=skip, limit=SYNC_PAGE_SIZE, sort_by="updated_at", sort_order="desc"
+            )
+            for rule in rules:
+                updated_at = getattr(rule, "updated_at", None)
+                if updated_at is not None:
+                    updated_at = _utc(updated_at)
+                    if since is not None and updated_at < since:
+                        self._synced_at = newest
+                        return changed
+                    newest = updated_at if newest is None else max(newest, updated_at)
+                changed += self._apply(rule)
+            if len(rules) < SYNC_PAGE_SIZE:
+                self._synced_at = newest
+                return changed
+            skip += SYNC_PAGE_SIZE
+
+    def _apply(self, rule: AlertRule) -> bool:
+        """Upsert a rule read from the database if its definition changed."""
+        rule_id = str(rule.id)
+        known = self._rules.get(rule_id)
+        if known is None and not getattr(rule, "is_active", False):
+            return False
+        if known is not None and _definition(known) == _definition(rule):
+            # Only counters changed (e.g. triggered_count).
+            self._rules[rule_id] = rule
+            return False
+        self.upsert(rule)
+        return True
+
+    async def _sync(self) -> None:
+        while True:
+            await asyncio.sleep(self.sync_interval)
+            try:
+                await self.sync_rules()
+                # Retries feeds whose gateway was not up yet.
+                await self.ensure_quote_feeds()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Alert rule sync failed")
+
+    def _unindex(self, rule_id: str) -> None:
+        key = self._rule_key.pop(rule_id, None)
+        dependents = self._dependents.get(key) if key is not None else None
+        if dependents is not None:
+            dependents.discard(rule_id)
+            if not dependents:
+                del self._dependents[key]
+                if key[0] == "quote":
+                    self._unroute(key)
+
+    def _unroute(self, key: tuple[str, ...]) -> None:
+        routes = self._quote_routes.get(key[1], {})
+        keys = routes.get(key[2].upper(), set())
+        keys.discard(key)
+        if not keys:
+            routes.pop(key[2].upper(), None)
+        if not routes:
+            self._quote_routes.pop(key[1], None)
+        self._quote_feeds.discard(key)
+
+    async def ensure_quote_feeds(self) -> None:
+        """Start the receivers and gateway subscriptions the quote rules need.
+
+        Ticks only arrive for symbols subscribed on a running receiver; keys
+        whose feed could not be set up are retried on the next sync.
+        """
+        async with self._feed_lock:
+            missing: dict[str, list[tuple[str, ...]]] = {}
+            for key in self._dependents:
+                if key[0] == "quote" and key not in self._quote_feeds:
+                    missing.setdefault(key[1], []).append(key)
+            if not missing:
+                return
+            from app.services.quote_service import get_quote_service
+
+            quote_service = get_quote_service()
+            for source, keys in missing.items():
+                try:
+                    ready = await asyncio.to_thread(
+                        quote_service.ensure_symbol_feed, source, [key[2] for key in keys]
+                    )
+                except Exception:
+                    logger.exception("Failed to open the quote feed of %s for alert rules", source)
+                    continue
+                if ready:
+                    self._quote_feeds.update(key for key in keys if key in self._dependents)
+
+    def _schedule_quote_feeds(self) -> None:
+        if self._loop is None:
+            # Not started; ``start`` opens the feeds of the loaded rules.
+            return
+        task = self._loop.create_task(self.ensure_quote_feeds())
+        self._feed_tasks.add(task)
+        task.add_done_callback(self._feed_tasks.discard)
+
+    def _unslot(self, rule_id: str) -> None:
+        interval = self._rule_slot.pop(rule_id, None)
+        slot = self._slots.get(interval) if interval is not None else None
+        if slot is not None:
+            slot.rule_ids.discard(rule_id)
+            if not slot.rule_ids:
+                del self._slots[interval]
+
+    # ------------------------------------------------------------------
+    # Input change notifications
+    # ------------------------------------------------------------------
+
+    def publish(self, key: tuple[str, ...], source: Any) -> None:
+        """Announce the new value of a metric source; safe from any thread.
+
+        Rules depending on *key* are evaluated on the next scheduler turn
+        with *source* instead of fetching it; bursts are conflated to the
+        latest value per key.
+        """
+        loop = self._loop
+        if loop is None or key not in self._dependents:
+            return
+        with self._push_lock:
+            self._pushed[key] = source
+            if self._push_scheduled:
+                return
+            self._push_scheduled = True
+        try:
+            loop.call_soon_threadsafe(self._wakeup.set)
+        except RuntimeError:
+            # Event loop closed (shutdown).
+            pass
+
+    def _on_tick(self, source: str, payload: dict[str, Any]) -> None:
+        """Quote tick listener (receiver thread).
+
+        Gateway symbols may carry a broker suffix (``EURUSD.a``), so a tick
+        is routed to every rule symbol it matches the way
+        ``QuoteService.get_cached_tick`` does.
+        """
+        routes = self._quote_routes.get(str(source).upper())
+        if not routes:
+            return
+        names = {
+            str(payload.get(field_name) or "").upper() for field_name in ("symbol", "instrument_id")
+        } - {""}
+        for symbol, keys in list(routes.items()):
+            if any(name.startswith(symbol) for name in names):
+                for key in list(keys):
+                    self.publish(key, payload)
+
+    def _take_pushed(self) -> dict[tuple[str, ...], Any]:
+        with self._push_lock:
+            pushed, self._pushed = self._pushed, {}
+            self._push_scheduled = False
+        return pushed
+
+    def _dependent_rules(self, keys: Iterable[tuple[str, ...]]) -> list[AlertRule]:
+        rule_ids: set[str] = set()
+        for key in keys:
+            rule_ids.update(self._dependents.get(key, ()))
+        return [self._rules[rule_id] for rule_id in rule_ids if rule_id in self._rules]
+
+    # ------------------------------------------------------------------
+    # Scheduler
+    # ------------------------------------------------------------------
+
+    async def start(self) -> None:
+        """Load active rules and start the scheduler task.
+
+        Stays in standby while another worker runs the engine.
+        """
+        if self.running:
+            return
+        if self._lease is None:
+            self._lease = ProcessLease(
+                self._lease_path or get_backend_data_path("alert_engine.lock")
+            )
+        if not self._lease.acquire():
+            self.standby = True
+            logger.info("Alert engine standby: another worker evaluates the alert rules")
+            return
+        self.standby = False
+        # Changes committed while loading are picked up by the next sync.
+        self._synced_at = datetime.now(timezone.utc)
+        skip = 0
+        while True:
+            rules = await self.monitor.alert_rule_repo.list(
+                filters={"is_active": True}, skip=skip, limit=LOAD_PAGE_SIZE
+            )
+            for rule in rules:
+                self.upsert(rule)
+            if len(rules) < LOAD_PAGE_SIZE:
+                break
+            skip += LOAD_PAGE_SIZE
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._wakeup.set()
+        self._task = asyncio.create_task(self._run())
+        if self.sync_interval > 0:
+            self._sync_task = asyncio.create_task(self._sync())
+        if self.event_driven:
+            from app.services.quote_service import get_quote_service
+
+            get_quote_service().add_tick_listener(self._on_tick)
+        self._schedule_quote_feeds()
+        logger.info(
+            "Alert engine started with %d rules (event-driven: %s)",
+            len(self._rules),
+            self.event_driven,
+        )
+
+    async def shutdown(self) -> None:
+        self._loop = None
+        for task in (self._task, self._sync_task, *self._feed_tasks):
+            if task is not None:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._task = self._sync_task = None
+        self._feed_tasks.clear()
+        if self._lease is not None:
+            self._lease.release()
+        self.standby = False
+
+    def _next_due(self) -> float | None:
+        return min((slot.due for slot in self._slots.values()), default=None)
+
+    def take_due(self, now: float) -> list[AlertRule]:
+        """Rules whose slot is due at *now* (plus fresh ones); advances the slots."""
+        rule_ids = set(self._fresh)
+        self._fresh.clear()
+        for slot in self._slots.values():
+            if slot.due <= now:
+                rule_ids.update(slot.rule_ids)
+                # Skip missed turns instead of firing them back to back.
+                slot.due += slot.interval * (math.floor((now - slot.due) / slot.interval) + 1)
+        return [self._rules[rule_id] for rule_id in rule_ids if rule_id in self._rules]
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                next_due = self._next_due()
+                timeout = None if next_due is None else max(0.0, next_due - self._clock())
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+                pushed = self._take_pushed()
+                rules = {id(rule): rule for rule in self.take_due(self._clock())}
+                for rule in self._dependent_rules(pushed):
+                    rules[id(rule)] = rule
+                await self.evaluate(list(rules.values()), pushed)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Alert engine round failed")
+                await asyncio.sleep(1.0)
+
+    # ------------------------------------------------------------------
+    # Evaluation
+    # ------------------------------------------------------------------
+
+    async def _fetch_sources(self, keys: Iterable[tuple[str, ...]]) -> dict[tuple, Any]:
+        monitor = self.monitor
+        limit = asyncio.Semaphore(FETCH_CONCURRENCY)
+        unique = list(dict.fromkeys(keys))
+        quote_service = None
+        if any(key[0] == "quote" for key in unique):
+            from app.services.quote_service import get_quote_service
+
+            quote_service = get_quote_service()
+
+        async def fetch(key: tuple[str, ...]) -> Any:
+            async with limit:
+                try:
+                    return await fetch_metric_source(
+                        key,
+                        getattr(monitor, "paper_trading_service", None),
+                        getattr(monitor, "live_trading_service", None),
+                        getattr(monitor, "backtest_service", None),
+                        quote_service,
+                    )
+                except Exception:
+                    logger.exception("Alert metric fetch failed for %s", key[0])
+                    return None
+
+        results = await asyncio.gather(*(fetch(key) for key in unique))
+        return dict(zip(unique, results, strict=True))
+
+    async def evaluate(
+        self,
+        rules: list[AlertRule],
+        sources: dict[tuple[str, ...], Any] | None = None,
+    ) -> list[str]:
+        """Evaluate *rules* in one batch and trigger those that fire.
+
+        Args:
+            rules: Rules to evaluate.
+            sources: Already known metric sources by key (published
+                changes); only the other keys are fetched.
+
+        Returns:
+            Ids of the triggered rules.
+        """
+        if not rules:
+            return []
+
+        metric_rules: list[tuple[AlertRule, dict[str, Any], tuple]] = []
+        fired: list[tuple[AlertRule, float | None]] = []
+        for rule in rules:
+            config = _rule_config(rule)
+            trigger_type = getattr(rule, "trigger_type", None)
+            key = rule_source_key(rule)
+            if trigger_type == "cross" and key is None:
+                # Crosses between two configured values.
+                if await _check_cross_trigger(rule, config, self._trigger_state):
+                    fired.append((rule, None))
+            elif trigger_type == "cross" or (
+                trigger_type in ("threshold", "rate") and config.get("threshold") is not None
+            ):
+                if "current_value" in config and trigger_type != "cross":
+                    key = _CONSTANT
+                if key is not None:
+                    metric_rules.append((rule, config, key))
+
+        if metric_rules:
+            known = sources or {}
+            fetched = await self._fetch_sources(
+                key
+                for _rule, _config, key in metric_rules
+                if key is not _CONSTANT and key not in known
+            )
+            sources = {**fetched, **known}
+            values = np.array(
+                [
+                    _float_or_nan(
+                        constant_metric_value(config)
+                        if key is _CONSTANT
+                        else metric_from_source(rule, config, sources.get(key))
+                    )
+                    for rule, config, key in metric_rules
+                ]
+            )
+            mask = self._compare(metric_rules, values)
+            for i in np.flatnonzero(mask).tolist():
+                fired.append((metric_rules[i][0], float(values[i])))
+
+        triggered = []
+        for rule, value in await self._still_current(fired):
+            try:
+                await self.monitor._trigger_alert(rule, trigger_value=value)
+            except Exception:
+                logger.exception("Failed to trigger alert rule %s", rule.id)
+                continue
+            rule.triggered_count = (getattr(rule, "triggered_count", 0) or 0) + 1
+            triggered.append(str(rule.id))
+        return triggered
+
+    async def _still_current(
+        self, fired: list[tuple[AlertRule, float | None]]
+    ) -> list[tuple[AlertRule, float | None]]:
+        """Fired rules whose stored definition is still the evaluated one.
+
+        Rules deleted, deactivated or edited in another worker since they were
+        loaded are updated here instead of firing.
+        """
+        if not fired:
+            return []
+        ids = [str(rule.id) for rule, _value in fired]
+        stored = {
+            str(rule.id): rule
+            for rule in await self.monitor.alert_rule_repo.list(filters={"id": ids}, limit=len(ids))
+        }
+        current = []
+        for rule, value in fired:
+            row = stored.get(str(rule.id))
+            if row is None:
+                self.remove(str(rule.id))
+            elif _definition(row) != _definition(rule):
+                self.upsert(row)
+            else:
+                current.append((rule, value))
+        return current
+
+    def _compare(
+        self,
+        metric_rules: list[tuple[AlertRule, dict[str, Any], tuple]],
+        values: np.ndarray,
+    ) -> np.ndarray:
+        """Vectorized threshold, rate-of-change and cross checks."""
+        is_rate = np.array([rule.trigger_type == "rate" for rule, _c, _k in metric_rules])
+        is_cross = np.array([rule.trigger_type == "cross" for rule, _c, _k in metric_rules])
+        thresholds = np.array(
+            [_float_or_nan(config.get("threshold")) for _r, config, _k in metric_rules]
+        )
+        conditions = np.array(
+            [
+                str(
+                    config.get("condition", "gt" if rule.trigger_type == "rate" else "lt") or "lt"
+                ).lower()
+                for rule, config, _k in metric_rules
+            ]
+        )
+
+        compared = values.copy()
+        if is_rate.any():
+            state = self._trigger_state
+            keys = [f"rate:{rule.id}" for rule, _c, _k in metric_rules]
+            previous = np.array(
+                [
+                    _float_or_nan(state.get(key)) if rate else math.nan
+                    for key, rate in zip(keys, is_rate, strict=True)
+                ]
+            )
+            absolute = np.array(
+                [config.get("mode", "pct") == "abs" for _r, config, _k in metric_rules]
+            )
+            with np.errstate(divide="ignore", invalid="ignore"):
+                pct = (values - previous) / np.abs(previous)
+            pct = np.where(previous == 0, np.where(values != 0, np.inf, 0.0), pct)
+            compared = np.where(is_rate, np.where(absolute, values - previous, pct), values)
+            for i in np.flatnonzero(is_rate & ~np.isnan(values)).tolist():
+                state[keys[i]] = float(values[i])
+
+        result = compare_arrays(compared, thresholds, conditions)
+        if self.event_driven:
+            # Event-driven inputs change on every tick: fire on the edge.
+            edge = np.array([key[0] in EVENT_SOURCES for _r, _c, key in metric_rules]) & ~is_cross
+            if edge.any():
+                state = self._trigger_state
+                keys = [f"edge:{rule.id}" for rule, _c, _k in metric_rules]
+                held = np.array([bool(state.get(key)) for key in keys])
+                for i in np.flatnonzero(edge & ~np.isnan(compared)).tolist():
+                    state[keys[i]] = bool(result[i])
+                result = np.where(edge, result & ~held, result)
+        if is_cross.any():
+            result = np.where(is_cross, self._crossed(metric_rules, values, is_cross), result)
+        return result
+
+    def _crossed(
+        self,
+        metric_rules: list[tuple[AlertRule, dict[str, Any], tuple]],
+        values: np.ndarray,
+        is_cross: np.ndarray,
+    ) -> np.ndarray:
+        """Whether each metric crossed its ``value2`` / ``threshold`` level."""
+        state = self._trigger_state
+        keys = [f"cross:{rule.id}" for rule, _c, _k in metric_rules]
+        levels = np.array(
+            [
+                _float_or_nan(config.get("value2", config.get("threshold", 0.0)))
+                for _r, config, _k in metric_rules
+            ]
+        )
+        previous = np.array(
+            [
+                _float_or_nan(state.get(key)) if cross else math.nan
+                for key, cross in zip(keys, is_cross, strict=True)
+            ]
+        )
+        down = np.array(
+            [
+                str(config.get("direction", "up")).lower() == "down"
+                for _r, config, _k in metric_rules
+            ]
+        )
+        diff = values - levels
+        crossed = np.where(down, (previous >= 0) & (diff < 0), (previous <= 0) & (diff > 0))
+        for i in np.flatnonzero(is_cross & ~np.isnan(diff)).tolist():
+            state[keys[i]] = float(diff[i])
+        return crossed
+
+
+# Global singleton
+_alert_engine: AlertEngine | None = None
+
+
+def get_alert_engine() -> AlertEngine:
+    global _alert_engine
+    if _alert_engine is None:
+        from app.services.monitoring_service import MonitoringService
+
+        _alert_engine = AlertEngine(MonitoringService())
+    return _alert_engine
+
+
+def publish_metric_update(key: tuple[str, ...], source: Any) -> None:
+    """Forward a metric source change to the alert engine, if it is running."""
+    if _alert_engine is not None:
+        _alert_engine.publish(key, source)
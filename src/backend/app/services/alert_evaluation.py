@@ -3,12 +3,16 @@ Alert trigger evaluation and metric resolution.
 
 Extracted from monitoring_service.py to keep file sizes manageable.
 Contains the logic for checking trigger conditions (threshold, rate, cross)
-and resolving current metric values from various data sources.
+and resolving current metric values from various data sources. Metric
+resolution is split into a source key, a fetch and an extraction step so
+the shared alert engine can fetch each source once for many rules.
 """
 
 import logging
 from typing import Any
 
+import numpy as np
+
 from app.models.alerts import AlertRule, AlertType
 
 logger = logging.getLogger(__name__)
@@ -33,6 +37,26 @@ def compare_values(current_value: float, threshold: float, condition: str) -> bo
     return current_value < threshold
 
 
+def compare_arrays(
+    current_values: np.ndarray, thresholds: np.ndarray, conditions: np.ndarray
+) -> np.ndarray:
+    """Element-wise ``compare_values``; NaN values or thresholds never match.
+
+    Args:
+        current_values: Current metric values (NaN where unavailable).
+        thresholds: Thresholds to compare against (NaN where missing).
+        conditions: Lower-case operator strings per element.
+
+    Returns:
+        Boolean array of met conditions.
+    """
+    return np.where(
+        conditions == "gt",
+        current_values > thresholds,
+        np.where(conditions == "eq", current_values == thresholds, current_values < thresholds),
+    )
+
+
 async def check_trigger(
     rule: AlertRule,
     trigger_state: dict[str, Any],
@@ -169,131 +193,179 @@ async def get_current_metric_value(
     Returns:
         The current metric value as a float, or None if unavailable.
     """
+    # Manual/compat fallback.
+    if "current_value" in config:
+        return constant_metric_value(config)
+
+    key = metric_source_key(rule, config)
+    if key is None:
+        return None
+    source = await fetch_metric_source(
+        key, paper_trading_service, live_trading_service, backtest_service
+    )
+    return metric_from_source(rule, config, source)
+
+
+def constant_metric_value(config: dict[str, Any]) -> float | None:
+    """Value of a manual ``current_value`` config, or None if not numeric."""
+    try:
+        return float(config.get("current_value"))
+    except (TypeError, ValueError):
+        return None
+
+
+def _alert_type(rule: AlertRule) -> Any:
     alert_type = getattr(rule, "alert_type", None)
     try:
-        alert_type_enum = AlertType(alert_type)
+        return AlertType(alert_type)
     except Exception:
-        alert_type_enum = alert_type
+        return alert_type
 
-    # Manual/compat fallback.
-    if "current_value" in config:
-        try:
-            return float(config.get("current_value"))
-        except (TypeError, ValueError):
-            return None
 
-    if alert_type_enum == AlertType.ACCOUNT:
-        return await _get_account_metric(rule, config, paper_trading_service, live_trading_service)
+def metric_source_key(rule: AlertRule, config: dict[str, Any]) -> tuple[str, ...] | None:
+    """Identify the data a rule's metric is read from.
 
-    if alert_type_enum == AlertType.POSITION:
-        return await _get_position_metric(rule, config, paper_trading_service, live_trading_service)
+    Rules with equal keys share one fetch per evaluation round (e.g. cash
+    and equity alerts on the same paper account). Any rule with a
+    ``quote_source`` and ``symbol`` reads the latest gateway quote.
 
-    if alert_type_enum == AlertType.STRATEGY:
-        return await _get_strategy_metric(rule, config, backtest_service)
+    Returns:
+        A hashable key for ``fetch_metric_source``, or None when the rule
+        has no resolvable metric source.
+    """
+    quote_source = config.get("quote_source")
+    if quote_source and config.get("symbol"):
+        return ("quote", str(quote_source).strip().upper(), str(config["symbol"]))
 
-    return None
+    alert_type = _alert_type(rule)
+    account_id = config.get("account_id")
+    live_task_id = config.get("live_task_id")
 
+    if alert_type == AlertType.ACCOUNT:
+        if account_id:
+            return ("paper_account", str(account_id))
+        if live_task_id:
+            return ("live_task", str(rule.user_id), str(live_task_id))
+        return None
 
-async def _get_account_metric(
-    rule: AlertRule,
-    config: dict[str, Any],
-    paper_trading_service,
-    live_trading_service,
-) -> float | None:
-    """Resolve account-level metric value."""
-    metric = str(config.get("metric", "cash"))
-    account_id = config.get("account_id")
-    if account_id:
-        account = await paper_trading_service.get_account(account_id)
-        if not account:
+    if alert_type == AlertType.POSITION:
+        symbol = config.get("symbol")
+        if not symbol:
             return None
-        if metric == "cash":
-            return float(account.current_cash)
-        if metric in ("value", "equity"):
-            return float(account.total_equity)
+        if account_id:
+            return ("paper_position", str(account_id), str(symbol))
+        if live_task_id:
+            return ("live_task", str(rule.user_id), str(live_task_id))
         return None
 
-    live_task_id = config.get("live_task_id")
-    if live_task_id:
-        status = await live_trading_service.get_task_status(rule.user_id, live_task_id)
-        if not status:
-            return None
-        if metric == "cash":
-            return float(status.get("cash", 0.0))
-        if metric in ("value", "equity"):
-            return float(status.get("value", 0.0))
+    if alert_type == AlertType.STRATEGY:
+        backtest_task_id = config.get("backtest_task_id")
+        if backtest_task_id:
+            return ("backtest", str(rule.user_id), str(backtest_task_id))
         return None
 
     return None
 
 
-async def _get_position_metric(
-    rule: AlertRule,
-    config: dict[str, Any],
+async def fetch_metric_source(
+    key: tuple[str, ...],
     paper_trading_service,
     live_trading_service,
-) -> float | None:
-    """Resolve position-level metric value."""
-    metric = str(config.get("metric", "unrealized_pnl"))
-    symbol = config.get("symbol")
-    if not symbol:
-        return None
-
-    account_id = config.get("account_id")
-    if account_id:
+    backtest_service,
+    quote_service=None,
+) -> Any:
+    """Load the object behind a ``metric_source_key`` (None if missing)."""
+    kind = key[0]
+    if kind == "quote":
+        if quote_service is None:
+            return None
+        return quote_service.get_cached_tick(key[1], key[2])
+    if kind == "paper_account":
+        return await paper_trading_service.get_account(key[1])
+    if kind == "paper_position":
         positions, _ = await paper_trading_service.list_positions(
-            filters={"account_id": account_id, "symbol": symbol},
+            filters={"account_id": key[1], "symbol": key[2]},
             limit=1,
             offset=0,
         )
-        if not positions:
+        return positions[0] if positions else None
+    if kind == "live_task":
+        return await live_trading_service.get_task_status(key[1], key[2])
+    if kind == "backtest":
+        return await backtest_service.get_result(key[2], user_id=key[1])
+    return None
+
+
+def metric_from_source(rule: AlertRule, config: dict[str, Any], source: Any) -> float | None:
+    """Read a rule's metric from its fetched source object."""
+    if not source:
+        return None
+    if config.get("quote_source"):
+        return _quote_metric(config, source)
+    alert_type = _alert_type(rule)
+
+    if alert_type == AlertType.ACCOUNT:
+        metric = str(config.get("metric", "cash"))
+        if config.get("account_id"):
+            if metric == "cash":
+                return float(source.current_cash)
+            if metric in ("value", "equity"):
+                return float(source.total_equity)
             return None
-        pos = positions[0]
-        if metric == "market_value":
-            return float(pos.market_value)
-        if metric == "unrealized_pnl":
-            return float(pos.unrealized_pnl)
-        if metric == "unrealized_pnl_pct":
-            return float(pos.unrealized_pnl_pct)
+        if metric == "cash":
+            return float(source.get("cash", 0.0))
+        if metric in ("value", "equity"):
+            return float(source.get("value", 0.0))
         return None
 
-    live_task_id = config.get("live_task_id")
-    if live_task_id:
-        status = await live_trading_service.get_task_status(rule.user_id, live_task_id)
-        if not status:
+    if alert_type == AlertType.POSITION:
+        metric = str(config.get("metric", "unrealized_pnl"))
+        if config.get("account_id"):
+            if metric == "market_value":
+                return float(source.market_value)
+            if metric == "unrealized_pnl":
+                return float(source.unrealized_pnl)
+            if metric == "unrealized_pnl_pct":
+                return float(source.unrealized_pnl_pct)
             return None
-        positions = status.get("positions") or []
-        for p in positions:
+        symbol = config.get("symbol")
+        for p in source.get("positions") or []:
             if p.get("symbol") == symbol:
                 size = float(p.get("size", 0.0))
                 price = float(p.get("price", 0.0))
-                if metric == "market_value":
-                    return size * price
                 return size * price
         return None
 
-    return None
-
-
-async def _get_strategy_metric(
-    rule: AlertRule,
-    config: dict[str, Any],
-    backtest_service,
-) -> float | None:
-    """Resolve strategy-level metric value."""
-    metric = str(config.get("metric", "sharpe_ratio"))
-    backtest_task_id = config.get("backtest_task_id")
-    if backtest_task_id:
-        result = await backtest_service.get_result(backtest_task_id, user_id=rule.user_id)
-        if not result:
-            return None
+    if alert_type == AlertType.STRATEGY:
+        metric = str(config.get("metric", "sharpe_ratio"))
         if metric == "sharpe_ratio":
-            return float(result.sharpe_ratio)
+            return float(source.sharpe_ratio)
         if metric == "total_return":
-            return float(result.total_return)
+            return float(source.total_return)
         if metric == "max_drawdown":
-            return float(result.max_drawdown)
+            return float(source.max_drawdown)
         if metric == "win_rate":
-            return float(result.win_rate)
+            return float(source.win_rate)
+        return None
+
+    return None
+
+
+def _quote_metric(config: dict[str, Any], tick: dict[str, Any]) -> float | None:
+    """Price field of a gateway tick: ``price`` (default), ``bid`` or ``ask``."""
+    metric = str(config.get("metric", "price"))
+    fields = {
+        "price": ("price", "last_price"),
+        "bid": ("bid_price", "bid"),
+        "ask": ("ask_price", "ask"),
+    }.get(metric)
+    if fields is None:
         return None
+    for name in fields:
+        value = tick.get(name)
+        if value not in (None, ""):
+            try:
+                return float(value)
+            except (TypeError, ValueError):
+                return None
     return None
@@ -2,6 +2,8 @@
 Backtest analytics service.
 """
 
+from collections.abc import Hashable
+
 import numpy as np
 
 from app.schemas.analytics import (
@@ -14,6 +16,7 @@ from app.schemas.analytics import (
     TradeSignal,
 )
 from app.services.backtest_analyzers import FincoreAdapter
+from app.services.indicators import IndicatorEngine, get_indicator_cache
 
 
 class AnalyticsService:
@@ -268,30 +271,44 @@ class AnalyticsService:
             summary=summary,
         )
 
-    def calculate_indicators(self, klines: list[dict]) -> dict[str, list[float | None]]:
+    def calculate_indicators(
+        self,
+        klines: list[dict],
+        start: int = 0,
+        end: int | None = None,
+        cache_key: Hashable | None = None,
+    ) -> dict[str, list[float | None]]:
         """Calculate technical indicators from K-line data.
 
+        Moving averages, Bollinger bands, EMA/MACD, RSI and ATR are computed
+        with NumPy over the whole series (so the window's first bars have
+        their warm-up history) but only returned for ``klines[start:end]``.
+
         Args:
-            klines: List of K-line dictionaries with close prices.
+            klines: Chronological K-line dictionaries with close prices
+                (high/low are used for ATR when present).
+            start: First bar of the requested window.
+            end: End (exclusive) of the requested window; defaults to all bars.
+            cache_key: Identifies the series (e.g. the task id); its
+                indicators are kept in the process-wide ``IndicatorCache``.
 
         Returns:
             Dictionary mapping indicator names to lists of values.
         """
-        if not klines:
+        end = len(klines) if end is None else min(end, len(klines))
+        if not klines or start >= end:
             return {}
 
-        closes = [k.get("close", 0) for k in klines]
-
-        def ma(period: int) -> list[float | None]:
-            result = [None] * (period - 1)
-            for i in range(period - 1, len(closes)):
-                avg = sum(closes[i - period + 1 : i + 1]) / period
-                result.append(round(avg, 4))
-            return result
-
-        return {
-            "ma5": ma(5),
-            "ma10": ma(10),
-            "ma20": ma(20),
-            "ma60": ma(60) if len(closes) >= 60 else [],
-        }
+        if cache_key is None:
+            engine = IndicatorEngine.from_klines(klines)
+        else:
+            fingerprint = (
+                len(klines),
+                klines[0].get("date"),
+                klines[-1].get("date"),
+                klines[-1].get("close"),
+            )
+            engine = get_indicator_cache().get(
+                cache_key, fingerprint, lambda: IndicatorEngine.from_klines(klines)
+            )
+        return engine.window(start, end)
@@ -7,6 +7,9 @@ Collects detailed backtest data for analytics and reporting.
 import logging
 
 import backtrader as bt
+import numpy as np
+
+from app.services import metrics_engine
 
 logger = logging.getLogger(__name__)
 AnalyzerBase = getattr(bt, "Analyzer", object)  # type: ignore[misc,assignment]
@@ -302,17 +305,8 @@ class FincoreAdapter:
         if not returns:
             return 0.0
 
-        # Use manual calculation for consistency
-        import numpy as np
-
-        returns_array = np.array(returns)
-        excess_returns = returns_array - risk_free_rate
-        std_dev = np.std(excess_returns)
-
-        if std_dev == 0:
-            return 0.0
-
-        return float(np.mean(excess_returns) / std_dev)
+        returns_array = np.asarray(returns, dtype=np.float64)[None, :]
+        return float(metrics_engine.sharpe_from_returns(returns_array, risk_free_rate)[0])
 
     def calculate_max_drawdown(self, equity_curve: list) -> float:
         """Calculate maximum drawdown from an equity curve.
@@ -333,12 +327,8 @@ class FincoreAdapter:
         if len(equity_curve) < 2:
             return 0.0
 
-        # Use manual calculation for consistency
-        import numpy as np
-
-        equity_array = np.array(equity_curve)
-        peak = np.maximum.accumulate(equity_array)
-        drawdown = (equity_array - peak) / peak
+        equity_array = np.asarray(equity_curve, dtype=np.float64)[None, :]
+        _, drawdown = metrics_engine.drawdowns(equity_array)
         return float(np.min(drawdown))
 
     def calculate_total_returns(self, equity_curve: list) -> float:
@@ -422,13 +412,8 @@ class FincoreAdapter:
             return 0.0
 
         # Manual calculation (fincore doesn't have win_rate function)
-        winning_trades = sum(1 for t in trades if t.get("pnlcomm", 0) > 0)
-        total_trades = len(trades)
-
-        if total_trades == 0:
-            return 0.0
-
-        return float(winning_trades / total_trades)
+        pnl = metrics_engine.trade_arrays(trades)
+        return float(np.count_nonzero(pnl > 0) / len(pnl))
 
     def calculate_profit_factor(self, trades: list) -> float:
         """Calculate profit factor (ratio of average win to average loss).
@@ -443,14 +428,15 @@ class FincoreAdapter:
         if not trades:
             return 0.0
 
-        winning_trades = [t for t in trades if t.get("pnlcomm", 0) > 0]
-        losing_trades = [t for t in trades if t.get("pnlcomm", 0) < 0]
+        pnl = metrics_engine.trade_arrays(trades)
+        wins = pnl[pnl > 0]
+        losses = pnl[pnl < 0]
 
-        if not losing_trades or not winning_trades:
+        if not losses.size or not wins.size:
             return 0.0
 
-        avg_win = sum(t.get("pnlcomm", 0) for t in winning_trades) / len(winning_trades)
-        avg_loss = abs(sum(t.get("pnlcomm", 0) for t in losing_trades) / len(losing_trades))
+        avg_win = wins.mean()
+        avg_loss = abs(losses.mean())
 
         if avg_loss == 0:
             return 0.0
@@ -487,19 +473,8 @@ class FincoreAdapter:
         Returns:
             Maximum consecutive count.
         """
-        max_count = 0
-        current = 0
-
-        for t in trades:
-            pnl = t.get("pnlcomm", 0)
-            is_win = pnl > 0
-            if is_win == win:
-                current += 1
-                max_count = max(max_count, current)
-            else:
-                current = 0
-
-        return max_count
+        is_win = metrics_engine.trade_arrays(trades) > 0
+        return metrics_engine.max_consecutive(is_win if win else ~is_win)
 
     def calculate_max_drawdown_with_duration(self, equity_curve: list) -> tuple:
         """Calculate maximum drawdown and its duration.
@@ -513,23 +488,8 @@ class FincoreAdapter:
         if len(equity_curve) < 2:
             return 0.0, 0
 
-        import numpy as np
-
-        equity_array = np.array(equity_curve)
-        peak = equity_array[0]
-        max_dd = 0.0
-        max_dd_duration = 0
-        current_duration = 0
-
-        for value in equity_array:
-            if value > peak:
-                peak = value
-                current_duration = 0
-            else:
-                dd = (value - peak) / peak if peak > 0 else 0
-                current_duration += 1
-                if dd < max_dd:
-                    max_dd = dd
-                    max_dd_duration = current_duration
-
-        return float(max_dd), max_dd_duration
+        equity_array = np.asarray(equity_curve, dtype=np.float64)[None, :]
+        peak, drawdown = metrics_engine.drawdowns(equity_array)
+        duration = metrics_engine.drawdown_duration(equity_array, drawdown, peak)
+        max_dd = np.min(np.where(peak > 0, drawdown, 0.0))
+        return float(min(max_dd, 0.0)), int(duration[0])
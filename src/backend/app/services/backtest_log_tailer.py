@@ -0,0 +1,256 @@
+"""
+Incremental ingestion of backtest logs while the strategy is still running.
+
+The strategy subprocess appends to ``value.log`` (one line per bar) and
+``trade.log`` under its ``BACKTRADER_LOG_DIR``. ``BacktestLogTailer`` follows
+both files by byte offset, parses only complete new lines with the same row
+helpers as ``log_parser_service`` and reports what changed since the previous
+poll (bar count, new equity points, newly closed trades).
+
+When the run ends, ``finish()`` consumes the remaining tail and returns the
+accumulated sections in ``parse_log_dir(preparsed=...)`` form, so the persist
+step does not read those files again. Any layout the incremental reader cannot
+reproduce exactly (truncated file, mixed formats, undecodable line) makes the
+affected section fall back to the regular full parse.
+
+Polls run in worker threads, and cancelling the tail task does not stop one
+already in flight, so ``poll`` and ``finish`` are serialized by a lock and
+polls after ``finish`` are no-ops.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from app.services.log_parser_service import (
+    _build_value_data,
+    _is_truthy,
+    _normalize_date_text,
+    _normalize_dt_text,
+    _pipe_key_value_row,
+    _pipe_row,
+    _safe_float,
+    _trades_from_event_rows,
+    _trades_from_tsv_rows,
+    _tsv_headers,
+    _tsv_row,
+    _value_point,
+)
+
+logger = logging.getLogger(__name__)
+
+# Cap on equity points pushed per poll; the full curve arrives with the result.
+MAX_EQUITY_POINTS_PER_UPDATE = 500
+
+
+class _LogFollower:
+    """Follow one append-only log file and yield newly completed rows."""
+
+    def __init__(self, path: Path, pipe_row_fn: Callable[[str], dict[str, str] | None]) -> None:
+        self.path = path
+        self.offset = 0
+        self.mode: str | None = None
+        self.degraded = False
+        self._pipe_row_fn = pipe_row_fn
+        self._headers: list[str] | None = None
+        self._pending = b""
+        self._first_line = True
+
+    def read_rows(self, final: bool = False) -> list[dict[str, Any]]:
+        if self.degraded:
+            return []
+        try:
+            size = self.path.stat().st_size
+        except OSError:
+            return []
+        if size < self.offset:
+            # Rewritten or truncated: offsets are meaningless now.
+            self.degraded = True
+            return []
+        chunk = b""
+        if size > self.offset:
+            try:
+                with open(self.path, "rb") as handle:
+                    handle.seek(self.offset)
+                    chunk = handle.read(size - self.offset)
+            except OSError:
+                return []
+            self.offset += len(chunk)
+        data = self._pending + chunk
+        lines = data.split(b"\n")
+        self._pending = b"" if final else lines.pop()
+        rows: list[dict[str, Any]] = []
+        for raw in lines:
+            try:
+                line = raw.decode("utf-8")
+            except UnicodeDecodeError:
+                self.degraded = True
+                return []
+            row = self._parse_line(line)
+            if self.degraded:
+                return []
+            if row is not None:
+                rows.append(row)
+        return rows
+
+    def _parse_line(self, line: str) -> dict[str, Any] | None:
+        if self._first_line:
+            self._first_line = False
+            self._headers = _tsv_headers(line)
+            if self._headers is not None:
+                self.mode = "tsv"
+                return None
+        if self.mode == "tsv":
+            return _tsv_row(self._headers or [], line)
+        text = line.strip()
+        if not text:
+            return None
+        if self.mode is None:
+            try:
+                json.loads(text)
+                self.mode = "json"
+            except json.JSONDecodeError:
+                self.mode = "pipe"
+        if self.mode == "json":
+            try:
+                payload = json.loads(text)
+            except json.JSONDecodeError:
+                # The full parser would discard every JSON row and re-read as pipe lines.
+                self.degraded = True
+                return None
+            return payload if isinstance(payload, dict) else None
+        return self._pipe_row_fn(line)
+
+
+class ValueLogFollower:
+    """Follow one ``value.log`` and return its new ``(date, equity, cash)`` points.
+
+    ``degraded`` turns True when the file cannot be followed incrementally;
+    callers then fall back to ``parse_value_log``.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._follower = _LogFollower(path, _pipe_key_value_row)
+
+    @property
+    def degraded(self) -> bool:
+        return self._follower.degraded
+
+    def read_points(self) -> list[tuple[str, float, float]]:
+        return [_value_point(row) for row in self._follower.read_rows()]
+
+
+@dataclass
+class TailUpdate:
+    """What changed in the logs since the previous poll."""
+
+    bars: int = 0
+    total_bars: int | None = None
+    equity_points: list[list[Any]] = field(default_factory=list)
+    trades: list[dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.equity_points or self.trades)
+
+    @property
+    def last_equity(self) -> float | None:
+        return self.equity_points[-1][1] if self.equity_points else None
+
+
+class BacktestLogTailer:
+    """Tail ``value.log``/``trade.log`` of one running backtest.
+
+    Args:
+        log_dir: The task's ``BACKTRADER_LOG_DIR``.
+        total_bars: Expected number of bars, if known, for percentage progress.
+    """
+
+    def __init__(self, log_dir: Path, total_bars: int | None = None) -> None:
+        self.log_dir = Path(log_dir)
+        self.total_bars = total_bars if total_bars and total_bars > 0 else None
+        self._value = _LogFollower(self.log_dir / "value.log", _pipe_key_value_row)
+        self._trade = _LogFollower(self.log_dir / "trade.log", _pipe_row)
+        self._dates: list[str] = []
+        self._equity: list[float] = []
+        self._cash: list[float] = []
+        self._trade_rows: list[dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._finished = False
+
+    @property
+    def bars(self) -> int:
+        return len(self._equity)
+
+    def progress_fraction(self) -> float | None:
+        if not self.total_bars:
+            return None
+        return min(self.bars / self.total_bars, 1.0)
+
+    def poll(self, final: bool = False) -> TailUpdate:
+        """Consume newly appended lines and return the delta."""
+        with self._lock:
+            if self._finished:
+                return TailUpdate(bars=self.bars, total_bars=self.total_bars)
+            return self._poll(final)
+
+    def _poll(self, final: bool) -> TailUpdate:
+        update = TailUpdate(total_bars=self.total_bars)
+        for row in self._value.read_rows(final):
+            dt, value, cash = _value_point(row)
+            self._dates.append(dt)
+            self._equity.append(value)
+            self._cash.append(cash)
+            update.equity_points.append([dt, value])
+        for row in self._trade.read_rows(final):
+            self._trade_rows.append(row)
+            closed = self._closed_trade(row)
+            if closed is not None:
+                update.trades.append(closed)
+        update.bars = self.bars
+        if len(update.equity_points) > MAX_EQUITY_POINTS_PER_UPDATE:
+            points = update.equity_points
+            step = -(-len(points) // MAX_EQUITY_POINTS_PER_UPDATE)
+            sampled = points[::step]
+            if sampled[-1] is not points[-1]:
+                sampled.append(points[-1])
+            update.equity_points = sampled
+        return update
+
+    def _closed_trade(self, row: dict[str, Any]) -> dict[str, Any] | None:
+        if self._trade.mode == "tsv":
+            records = _trades_from_tsv_rows([row])
+            return records[0] if records else None
+        event = str(row.get("event", "")).strip().upper()
+        if not (_is_truthy(row.get("isclosed")) or event == "CLOSED"):
+            return None
+        dt = _normalize_dt_text(row.get("datetime") or row.get("event_time") or row.get("log_time"))
+        return {
+            "ref": int(_safe_float(row.get("ref", 0))),
+            "datetime": _normalize_date_text(dt),
+            "data_name": str(row.get("data_name") or row.get("data") or ""),
+            "pnl": round(_safe_float(row.get("pnl", 0.0)), 2),
+            "pnlcomm": round(_safe_float(row.get("pnlcomm", row.get("pnl", 0.0))), 2),
+        }
+
+    def finish(self) -> dict[str, Any]:
+        """Flush the remaining tail and return sections for ``parse_log_dir(preparsed=...)``."""
+        with self._lock:
+            if not self._finished:
+                self._poll(final=True)
+                self._finished = True
+        sections: dict[str, Any] = {}
+        if not self._value.degraded and self._equity:
+            sections["value"] = _build_value_data(self._dates, self._equity, self._cash)
+        if not self._trade.degraded and self._trade_rows:
+            if self._trade.mode == "tsv":
+                sections["trades"] = _trades_from_tsv_rows(self._trade_rows)
+            else:
+                sections["trades"] = _trades_from_event_rows(self._trade_rows)
+        return sections
@@ -5,17 +5,46 @@ This module stores task metadata and results in the database. Actual backtest
 execution is still launched by the API process.
 """
 
+import asyncio
 import logging
+import operator
+from datetime import datetime
 from typing import Any
 
-from sqlalchemy import delete, func, select
+from sqlalchemy import Row, and_, delete, func, or_, select
 
 from app.db.database import async_session_maker
-from app.models.backtest import BacktestResultModel, BacktestTask
+from app.models.backtest import BacktestResultBlob, BacktestResultModel, BacktestTask
 from app.schemas.backtest import BacktestRequest, TaskStatus
+from app.services.chart_downsampling import build_lttb_pyramid
 
 logger = logging.getLogger(__name__)
 
+# Columns a history listing needs; never the curve/trade blobs.
+_SUMMARY_TASK_COLUMNS = (
+    BacktestTask.id,
+    BacktestTask.strategy_id,
+    BacktestTask.symbol,
+    BacktestTask.status,
+    BacktestTask.request_data,
+    BacktestTask.error_message,
+    BacktestTask.created_at,
+)
+_SUMMARY_RESULT_COLUMNS = (
+    BacktestResultModel.total_return,
+    BacktestResultModel.annual_return,
+    BacktestResultModel.sharpe_ratio,
+    BacktestResultModel.max_drawdown,
+    BacktestResultModel.win_rate,
+    BacktestResultModel.metrics_source,
+    BacktestResultModel.total_trades,
+    BacktestResultModel.profitable_trades,
+    BacktestResultModel.losing_trades,
+)
+_SUMMARY_SORT_COLUMNS = {
+    column.key: column for column in (*_SUMMARY_TASK_COLUMNS, *_SUMMARY_RESULT_COLUMNS)
+}
+
 
 class BacktestExecutionManager:
     """Manage persisted backtest task state and result records."""
@@ -168,6 +197,11 @@ class BacktestExecutionManager:
             drawdown_curve=drawdown_curve,
             trades=trades,
         )
+        # Precompute chart downsampling levels once instead of on every chart view.
+        result.blob.chart_pyramid = {
+            "n": len(equity_curve),
+            "equity_curve": await asyncio.to_thread(build_lttb_pyramid, equity_curve),
+        }
 
         async with async_session_maker() as session:
             session.add(result)
@@ -185,6 +219,16 @@ class BacktestExecutionManager:
             )
             return result.scalars().first()
 
+    async def get_chart_pyramid(self, task_id: str) -> dict[str, Any] | None:
+        """Return the precomputed chart pyramid of one task's result, if stored."""
+        async with async_session_maker() as session:
+            result = await session.execute(
+                select(BacktestResultBlob.chart_pyramid)
+                .join(BacktestResultModel, BacktestResultModel.id == BacktestResultBlob.result_id)
+                .where(BacktestResultModel.task_id == task_id)
+            )
+            return result.scalar()
+
     async def delete_task_and_result(self, task_id: str, user_id: str) -> bool:
         """Delete a task and its result when the user owns the task."""
         async with async_session_maker() as session:
@@ -192,6 +236,13 @@ class BacktestExecutionManager:
             if not task or task.user_id != user_id:
                 return False
 
+            await session.execute(
+                delete(BacktestResultBlob).where(
+                    BacktestResultBlob.result_id.in_(
+                        select(BacktestResultModel.id).where(BacktestResultModel.task_id == task_id)
+                    )
+                )
+            )
             await session.execute(
                 delete(BacktestResultModel).where(BacktestResultModel.task_id == task_id)
             )
@@ -228,3 +279,75 @@ class BacktestExecutionManager:
 
             result = await session.execute(query)
             return list(result.scalars().all()), total
+
+    async def count_user_tasks(self, user_id: str) -> int:
+        """Return the number of persisted tasks owned by one user."""
+        async with async_session_maker() as session:
+            result = await session.execute(
+                select(func.count())
+                .select_from(BacktestTask)
+                .where(BacktestTask.user_id == user_id)
+            )
+            return int(result.scalar() or 0)
+
+    async def list_result_summaries(
+        self,
+        user_id: str,
+        limit: int = 20,
+        offset: int = 0,
+        order_by: str = "created_at",
+        order_desc: bool = True,
+        after: tuple[datetime, str] | None = None,
+    ) -> list[Row]:
+        """List tasks with their scalar result metrics, without curve/trade blobs.
+
+        Rows carry the task columns plus ``result_id`` (``None`` when the task
+        has no result yet) and the metric columns. They are ordered by
+        ``order_by`` with ``(created_at, id)`` as tie-breaker. ``after`` is the
+        ``(created_at, id)`` of the last row of the previous page; for the
+        ``created_at`` ordering it replaces ``offset`` (keyset pagination).
+
+        Raises:
+            ValueError: If ``after`` is given for any other ordering.
+        """
+        order_column = _SUMMARY_SORT_COLUMNS.get(order_by, BacktestTask.created_at)
+        if after is not None and order_column is not BacktestTask.created_at:
+            raise ValueError("cursor pagination requires sort_by=created_at")
+
+        query = (
+            select(
+                *_SUMMARY_TASK_COLUMNS,
+                BacktestResultModel.id.label("result_id"),
+                *_SUMMARY_RESULT_COLUMNS,
+            )
+            .outerjoin(BacktestResultModel, BacktestResultModel.task_id == BacktestTask.id)
+            .where(BacktestTask.user_id == user_id)
+        )
+        if after is not None:
+            created_at, task_id = after
+            beyond = operator.lt if order_desc else operator.gt
+            query = query.where(
+                or_(
+                    beyond(BacktestTask.created_at, created_at),
+                    and_(
+                        BacktestTask.created_at == created_at,
+                        beyond(BacktestTask.id, task_id),
+                    ),
+                )
+            )
+        elif offset:
+            query = query.offset(offset)
+
+        order_columns = [order_column]
+        if order_column is not BacktestTask.created_at:
+            order_columns.append(BacktestTask.created_at)
+        order_columns.append(BacktestTask.id)
+        query = query.order_by(
+            *(column.desc() if order_desc else column.asc() for column in order_columns)
+        )
+        if limit:
+            query = query.limit(limit)
+
+        async with async_session_maker() as session:
+            result = await session.execute(query)
+            return list(result.all())
@@ -5,6 +5,9 @@ Encapsulates Backtrader backtest execution and persistence.
 """
 
 import asyncio
+import base64
+import binascii
+import contextlib
 import json
 import logging
 import os
@@ -16,9 +19,11 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any
 
-from app.db.cache import get_cache
+from app.db.cache import get_cache, get_or_compute
 from app.db.sql_repository import SQLRepository
+from app.middleware.metrics import record_workspace_staging
 from app.models.backtest import BacktestResultModel, BacktestTask
+from app.runtime_lib import RUNTIME_LIB_DIR
 from app.schemas.backtest import (
     BacktestListResponse,
     BacktestRequest,
@@ -31,10 +36,15 @@ from app.schemas.backtest_enhanced import (
     BacktestCompletedEvent,
     BacktestFailedEvent,
     BacktestProgressEvent,
+    BacktestTradeEvent,
 )
+from app.services.backtest_log_tailer import BacktestLogTailer
 from app.services.backtest_manager import BacktestExecutionManager
 from app.services.backtest_runner import BacktestExecutionRunner
+from app.services.backtest_worker_pool import BacktestWorkerPool, get_backtest_worker_pool
+from app.services.optimization_halving import FIDELITY_BARS_ENV
 from app.services.strategy_runtime_support import has_log_artifacts
+from app.services.workspace_staging import stage_strategy_dir
 from app.websocket_manager import manager as ws_manager
 
 logger = logging.getLogger(__name__)
@@ -53,6 +63,7 @@ class BacktestService:
         self,
         task_manager: BacktestExecutionManager | None = None,
         task_runner: BacktestExecutionRunner | None = None,
+        worker_pool: BacktestWorkerPool | None = None,
     ) -> None:
         """Initialize the BacktestService.
 
@@ -62,12 +73,15 @@ class BacktestService:
             cache: Cache instance for storing frequently accessed results.
             task_manager: BacktestExecutionManager for database-backed task state.
             task_runner: Process-local execution runner used by the current API worker.
+            worker_pool: Optional warm worker pool; None falls back to one
+                cold subprocess per task.
         """
         self.task_repo = SQLRepository(BacktestTask)
         self.result_repo = SQLRepository(BacktestResultModel)
         self.cache = get_cache()
         self.task_manager = task_manager or BacktestExecutionManager()
         self.task_runner = task_runner or BacktestExecutionRunner()
+        self.worker_pool = worker_pool or get_backtest_worker_pool()
 
     @staticmethod
     def _get_request_data(task: BacktestTask) -> dict[str, object]:
@@ -93,6 +107,14 @@ class BacktestService:
             return value
         return task.created_at or datetime.now()
 
+    @staticmethod
+    def _get_initial_cash(task: BacktestTask) -> float | None:
+        value = BacktestService._get_request_data(task).get("initial_cash")
+        try:
+            return float(value) if value is not None else None
+        except (TypeError, ValueError):
+            return None
+
     @staticmethod
     def _normalize_trade_date(value: Any) -> str | None:
         if isinstance(value, datetime):
@@ -229,10 +251,28 @@ class BacktestService:
         normalized["trades"] = cls._sanitize_trades(normalized.get("trades", []))
         return normalized
 
+    @staticmethod
+    def _encode_list_cursor(created_at: datetime, task_id: str) -> str:
+        payload = json.dumps([created_at.isoformat(), task_id]).encode()
+        return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+    @staticmethod
+    def _decode_list_cursor(cursor: str) -> tuple[datetime, str]:
+        """Decode a history cursor; raises ``ValueError`` when malformed."""
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            created_at, task_id = json.loads(base64.urlsafe_b64decode(padded))
+            return datetime.fromisoformat(created_at), str(task_id)
+        except (binascii.Error, TypeError, ValueError) as e:
+            raise ValueError("Invalid cursor") from e
+
     @staticmethod
     def _build_backtest_result(
-        task: BacktestTask, result_model: BacktestResultModel | None
+        task: BacktestTask,
+        result_model: BacktestResultModel | None,
+        include_payload: bool = True,
     ) -> BacktestResult:
+        payload = result_model if include_payload else None
         return BacktestResult(
             task_id=task.id,
             strategy_id=task.strategy_id,
@@ -240,6 +280,7 @@ class BacktestService:
             start_date=BacktestService._get_request_date(task, "start_date"),
             end_date=BacktestService._get_request_date(task, "end_date"),
             status=TaskStatus(task.status),
+            initial_cash=BacktestService._get_initial_cash(task),
             total_return=BacktestService._coerce_float(
                 result_model.total_return if result_model else None,
                 0.0,
@@ -273,10 +314,10 @@ class BacktestService:
                 result_model.losing_trades if result_model else None,
                 0,
             ),
-            equity_curve=result_model.equity_curve if result_model else [],
-            equity_dates=result_model.equity_dates if result_model else [],
-            drawdown_curve=result_model.drawdown_curve if result_model else [],
-            trades=BacktestService._sanitize_trades(result_model.trades if result_model else []),
+            equity_curve=payload.equity_curve if payload else [],
+            equity_dates=payload.equity_dates if payload else [],
+            drawdown_curve=payload.drawdown_curve if payload else [],
+            trades=BacktestService._sanitize_trades(payload.trades if payload else []),
             created_at=task.created_at,
             error_message=task.error_message,
         )
@@ -349,15 +390,33 @@ class BacktestService:
                     self._write_temp_config(config_path, request, original_text)
 
             await self._notify_progress(task_id, 30, "Running backtest...")
-            await self._run_strategy_subprocess(task_work_dir, str(strategy_dir), task_id)
+            tailer = BacktestLogTailer(
+                task_work_dir / "logs" / f"task_{task_id}",
+                total_bars=self._expected_bar_count(task_work_dir / "config.yaml"),
+            )
+            tail_task = self._start_log_tail(task_id, tailer)
+            try:
+                await self._run_strategy_subprocess(
+                    task_work_dir,
+                    str(strategy_dir),
+                    task_id,
+                    fidelity_bars=getattr(request, "fidelity_bars", None),
+                )
+            finally:
+                if tail_task is not None:
+                    tail_task.cancel()
+                    with contextlib.suppress(asyncio.CancelledError):
+                        await tail_task
 
             await self._notify_progress(task_id, 80, "Parsing logs...")
+            preparsed = await asyncio.to_thread(tailer.finish) if tail_task is not None else None
             await self._persist_results(
                 task_id,
                 user_id,
                 task_work_dir,
                 strategy_dir,
                 persist_in_runtime_dir=use_runtime_dir,
+                preparsed=preparsed,
             )
 
         except asyncio.CancelledError:
@@ -403,6 +462,9 @@ class BacktestService:
     ) -> tuple[Path, Path]:
         """Create an isolated temp workspace for a backtest run.
 
+        The strategy directory is staged via ``stage_strategy_dir`` rather than
+        copied, so data files and caches inside it are shared, not duplicated.
+
         Returns:
             (tmp_base, task_work_dir) – the root temp directory and the
             strategy-specific working directory inside it.
@@ -412,7 +474,16 @@ class BacktestService:
         tmp_base = Path(tempfile.mkdtemp(prefix=f"bt_{task_id}_"))
         task_work_dir = tmp_base / "strategies" / strategy_id
         task_work_dir.mkdir(parents=True, exist_ok=True)
-        shutil.copytree(strategy_dir, task_work_dir, dirs_exist_ok=True)
+        # Hardlink immutable template files; only config.yaml/run.py are copied
+        staging = stage_strategy_dir(strategy_dir, task_work_dir)
+        record_workspace_staging("backtest", staging.bytes_copied, staging.files_linked)
+        logger.debug(
+            "Staged backtest workspace %s: linked=%s copied=%s bytes_copied=%s",
+            task_id,
+            staging.files_linked,
+            staging.files_copied,
+            staging.bytes_copied,
+        )
 
         # Symlink shared data directory
         project_root = STRATEGIES_DIR.parent
@@ -453,14 +524,24 @@ class BacktestService:
         task_work_dir: Path,
         strategy_dir: Path,
         persist_in_runtime_dir: bool = False,
+        preparsed: dict[str, Any] | None = None,
     ) -> None:
-        """Parse logs, calculate metrics, persist results and notify completion."""
+        """Parse logs, calculate metrics, persist results and notify completion.
+
+        ``preparsed`` carries sections already ingested by the live log tailer,
+        so only the logs it did not follow are read here.
+        """
         from app.services.fincore_metrics_helper import calculate_metrics_from_log_data
         from app.services.log_parser_service import parse_all_logs, parse_log_dir
 
         task_log_dir = task_work_dir / "logs" / f"task_{task_id}"
         if has_log_artifacts(task_log_dir):
-            log_result = parse_log_dir(task_log_dir, strategy_dir=task_work_dir)
+            log_result = parse_log_dir(
+                task_log_dir,
+                strategy_dir=task_work_dir,
+                write_artifact=True,
+                preparsed=preparsed,
+            )
         else:
             log_result = parse_all_logs(task_work_dir)
         if not log_result:
@@ -503,6 +584,76 @@ class BacktestService:
         )
         logger.info(f"Backtest completed: {task_id}, return: {log_result.get('total_return', 0)}%")
 
+    @staticmethod
+    def _expected_bar_count(config_path: Path) -> int | None:
+        """Return the configured bar limit of a run, used to scale live progress."""
+        import yaml
+
+        try:
+            config = yaml.safe_load(config_path.read_text(encoding="utf-8")) or {}
+        except (OSError, yaml.YAMLError):
+            return None
+        data = config.get("data") if isinstance(config, dict) else None
+        if not isinstance(data, dict):
+            return None
+        for key in ("bar_count", "sample_count"):
+            count = BacktestService._coerce_int(data.get(key), 0)
+            if count > 0:
+                return count
+        return None
+
+    def _start_log_tail(self, task_id: str, tailer: BacktestLogTailer) -> asyncio.Task[None] | None:
+        """Start following the task's logs, or return None when tailing is disabled."""
+        from app.config import get_settings
+
+        try:
+            interval = float(get_settings().BACKTEST_LOG_TAIL_INTERVAL)
+        except (AttributeError, TypeError, ValueError):
+            return None
+        if interval <= 0:
+            return None
+        return asyncio.create_task(self._follow_logs(task_id, tailer, interval))
+
+    async def _follow_logs(self, task_id: str, tailer: BacktestLogTailer, interval: float) -> None:
+        """Push bar progress, partial equity and closed trades while the run is alive."""
+        last_progress = 30
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                update = await asyncio.to_thread(tailer.poll)
+            except Exception as e:
+                logger.debug("Log tail poll failed for %s: %s", task_id, e)
+                continue
+            if not update.has_changes:
+                continue
+            fraction = tailer.progress_fraction()
+            if fraction is not None:
+                last_progress = max(last_progress, 30 + int(fraction * 49))
+            message = (
+                f"Processed {update.bars}/{update.total_bars} bars"
+                if update.total_bars
+                else f"Processed {update.bars} bars"
+            )
+            await ws_manager.send_to_task(
+                task_id,
+                BacktestProgressEvent(
+                    task_id=task_id,
+                    progress=last_progress,
+                    message=message,
+                    data={
+                        "bars": update.bars,
+                        "total_bars": update.total_bars,
+                        "equity": update.last_equity,
+                        "equity_points": update.equity_points,
+                    },
+                ).model_dump(mode="python"),
+            )
+            for trade in update.trades:
+                await ws_manager.send_to_task(
+                    task_id,
+                    BacktestTradeEvent(task_id=task_id, trade=trade).model_dump(mode="python"),
+                )
+
     async def _notify_progress(self, task_id: str, progress: int, message: str) -> None:
         """Send a backtest progress event via WebSocket."""
         await ws_manager.send_to_task(
@@ -626,13 +777,19 @@ class BacktestService:
         work_dir: Path,
         original_strategy_dir: str | None = None,
         task_id: str | None = None,
+        fidelity_bars: int | None = None,
     ) -> dict[str, str]:
         """Run the strategy's run.py via subprocess with PID tracking for cancellation.
 
+        When a warm worker pool is configured the script runs inside a
+        pre-started worker interpreter instead of a fresh ``python -O``; the
+        worker's process handle is registered for cancellation the same way.
+
         Args:
             work_dir: Working directory for the subprocess.
             original_strategy_dir: Original strategy directory path.
             task_id: Task ID for tracking the subprocess.
+            fidelity_bars: Ask the runtime to simulate only the first N bars.
 
         Returns:
             Dictionary containing stdout and stderr from the subprocess.
@@ -652,9 +809,18 @@ class BacktestService:
         env = dict(os.environ)
         env["BACKTRADER_DATA_DIR"] = str(project_root / "datas")
         orig_dir = original_strategy_dir or str(work_dir)
-        env["PYTHONPATH"] = os.pathsep.join([orig_dir, str(work_dir), env.get("PYTHONPATH", "")])
+        env["PYTHONPATH"] = os.pathsep.join(
+            [orig_dir, str(work_dir), str(RUNTIME_LIB_DIR), env.get("PYTHONPATH", "")]
+        )
         if task_id:
             env["BACKTRADER_LOG_DIR"] = str(work_dir / "logs" / f"task_{task_id}")
+        if fidelity_bars:
+            env[FIDELITY_BARS_ENV] = str(fidelity_bars)
+        else:
+            env.pop(FIDELITY_BARS_ENV, None)
+
+        if self.worker_pool is not None:
+            return await self._run_in_worker_pool(run_py, work_dir, env, orig_dir, task_id)
 
         def _run():
             proc = subprocess.Popen(
@@ -685,6 +851,59 @@ class BacktestService:
 
         return {"stdout": stdout, "stderr": stderr}
 
+    async def _run_in_worker_pool(
+        self,
+        run_py: Path,
+        work_dir: Path,
+        env: dict[str, str],
+        orig_dir: str,
+        task_id: str | None,
+    ) -> dict[str, str]:
+        """Run run.py on a warm pooled worker and report queue wait vs. run time."""
+        from app.config import get_settings
+
+        pool = self.worker_pool
+        env_overrides = {
+            key: value
+            for key, value in env.items()
+            if key in ("BACKTRADER_DATA_DIR", "BACKTRADER_LOG_DIR", FIDELITY_BARS_ENV)
+        }
+
+        def _register(proc) -> None:
+            # Record the worker PID so cancel_local_execution kills (and recycles) it
+            if task_id:
+                self.task_runner.register_process(task_id, proc)
+
+        def _unregister() -> None:
+            if task_id:
+                self.task_runner.unregister_process(task_id)
+
+        def _run():
+            return pool.run(
+                run_py,
+                work_dir,
+                env=env_overrides,
+                sys_path=[orig_dir, str(work_dir), str(RUNTIME_LIB_DIR)],
+                timeout=get_settings().BACKTEST_TIMEOUT,
+                on_start=_register,
+                on_finish=_unregister,
+            )
+
+        job = await asyncio.get_event_loop().run_in_executor(None, _run)
+        logger.info(
+            "Backtest %s ran on warm worker pid=%s: queue_wait=%.3fs run=%.3fs",
+            task_id,
+            job.worker_pid,
+            job.queue_wait_seconds,
+            job.run_seconds,
+        )
+
+        if job.returncode != 0:
+            err_msg = job.stderr.strip().split("\n")[-1] if job.stderr else "Unknown error"
+            raise RuntimeError(f"run.py execution failed: {err_msg}")
+
+        return {"stdout": job.stdout, "stderr": job.stderr}
+
     async def get_result(self, task_id: str, user_id: str | None = None) -> BacktestResult | None:
         """Get backtest result by task ID with optional user authorization.
 
@@ -704,90 +923,105 @@ class BacktestService:
         if user_id and task.user_id != user_id:
             return None
 
-        # After authorization, check cache
-        cache_key = f"backtest:result:{task_id}"
-        cached = await self.cache.get(cache_key)
-        if cached:
-            cached_payload = self._sanitize_cached_result_payload(dict(cached))
-            if not (
+        # After authorization, check cache. Concurrent misses share one load
+        # and an expired result is served stale while it is refreshed.
+        async def load_result() -> dict[str, Any]:
+            # Query result
+            results = await self.result_repo.list(filters={"task_id": task_id}, limit=1)
+            result_model = results[0] if results else None
+
+            if (
                 task.status == TaskStatus.COMPLETED
                 and task.log_dir
                 and (
-                    (not cached_payload.get("equity_curve") and not cached_payload.get("trades"))
-                    or str(cached_payload.get("metrics_source") or "") != "fincore"
+                    result_model is None
+                    or (
+                        not getattr(result_model, "equity_curve", None)
+                        and not getattr(result_model, "trades", None)
+                    )
+                    or str(getattr(result_model, "metrics_source", "") or "") != "fincore"
                 )
             ):
-                return BacktestResult(**cached_payload)
-
-        # Query result
-        results = await self.result_repo.list(filters={"task_id": task_id}, limit=1)
-        result_model = results[0] if results else None
-
-        if (
-            task.status == TaskStatus.COMPLETED
-            and task.log_dir
-            and (
-                result_model is None
-                or (
-                    not getattr(result_model, "equity_curve", None)
-                    and not getattr(result_model, "trades", None)
+                from app.services.fincore_metrics_helper import calculate_metrics_from_log_data
+                from app.services.log_parser_service import parse_log_dir
+
+                persisted_log_dir = Path(task.log_dir)
+                if persisted_log_dir.is_dir():
+                    log_result = parse_log_dir(persisted_log_dir)
+                    if log_result:
+                        metrics = calculate_metrics_from_log_data(log_result, use_fincore=True)
+                        result = BacktestResult(
+                            task_id=task.id,
+                            strategy_id=task.strategy_id,
+                            symbol=task.symbol,
+                            start_date=BacktestService._get_request_date(task, "start_date"),
+                            end_date=BacktestService._get_request_date(task, "end_date"),
+                            status=TaskStatus(task.status),
+                            initial_cash=BacktestService._get_initial_cash(task),
+                            total_return=BacktestService._coerce_float(
+                                metrics.get("total_return"), 0.0
+                            ),
+                            annual_return=BacktestService._coerce_float(
+                                metrics.get("annual_return"), 0.0
+                            ),
+                            sharpe_ratio=BacktestService._coerce_float(
+                                metrics.get("sharpe_ratio"), 0.0
+                            ),
+                            max_drawdown=BacktestService._coerce_float(
+                                metrics.get("max_drawdown"), 0.0
+                            ),
+                            win_rate=BacktestService._coerce_float(metrics.get("win_rate"), 0.0),
+                            metrics_source=str(metrics.get("metrics_source") or "manual"),
+                            total_trades=BacktestService._coerce_int(
+                                metrics.get("total_trades"), 0
+                            ),
+                            profitable_trades=BacktestService._coerce_int(
+                                metrics.get("profitable_trades"),
+                                0,
+                            ),
+                            losing_trades=BacktestService._coerce_int(
+                                metrics.get("losing_trades"), 0
+                            ),
+                            equity_curve=log_result.get("equity_curve", []),
+                            equity_dates=log_result.get("equity_dates", []),
+                            drawdown_curve=log_result.get("drawdown_curve", []),
+                            trades=BacktestService._sanitize_trades(log_result.get("trades", [])),
+                            created_at=task.created_at,
+                            error_message=task.error_message,
+                        )
+                        return result.model_dump(mode="json")
+
+            # Use unified result builder to avoid code duplication
+            return self._build_backtest_result(task, result_model).model_dump(mode="json")
+
+        def is_usable(payload: dict[str, Any]) -> bool:
+            payload = self._sanitize_cached_result_payload(dict(payload))
+            return not (
+                task.status == TaskStatus.COMPLETED
+                and task.log_dir
+                and (
+                    (not payload.get("equity_curve") and not payload.get("trades"))
+                    or str(payload.get("metrics_source") or "") != "fincore"
                 )
-                or str(getattr(result_model, "metrics_source", "") or "") != "fincore"
             )
-        ):
-            from app.services.fincore_metrics_helper import calculate_metrics_from_log_data
-            from app.services.log_parser_service import parse_log_dir
-
-            persisted_log_dir = Path(task.log_dir)
-            if persisted_log_dir.is_dir():
-                log_result = parse_log_dir(persisted_log_dir)
-                if log_result:
-                    metrics = calculate_metrics_from_log_data(log_result, use_fincore=True)
-                    result = BacktestResult(
-                        task_id=task.id,
-                        strategy_id=task.strategy_id,
-                        symbol=task.symbol,
-                        start_date=BacktestService._get_request_date(task, "start_date"),
-                        end_date=BacktestService._get_request_date(task, "end_date"),
-                        status=TaskStatus(task.status),
-                        total_return=BacktestService._coerce_float(
-                            metrics.get("total_return"), 0.0
-                        ),
-                        annual_return=BacktestService._coerce_float(
-                            metrics.get("annual_return"), 0.0
-                        ),
-                        sharpe_ratio=BacktestService._coerce_float(
-                            metrics.get("sharpe_ratio"), 0.0
-                        ),
-                        max_drawdown=BacktestService._coerce_float(
-                            metrics.get("max_drawdown"), 0.0
-                        ),
-                        win_rate=BacktestService._coerce_float(metrics.get("win_rate"), 0.0),
-                        metrics_source=str(metrics.get("metrics_source") or "manual"),
-                        total_trades=BacktestService._coerce_int(metrics.get("total_trades"), 0),
-                        profitable_trades=BacktestService._coerce_int(
-                            metrics.get("profitable_trades"),
-                            0,
-                        ),
-                        losing_trades=BacktestService._coerce_int(metrics.get("losing_trades"), 0),
-                        equity_curve=log_result.get("equity_curve", []),
-                        equity_dates=log_result.get("equity_dates", []),
-                        drawdown_curve=log_result.get("drawdown_curve", []),
-                        trades=BacktestService._sanitize_trades(log_result.get("trades", [])),
-                        created_at=task.created_at,
-                        error_message=task.error_message,
-                    )
-                    await self.cache.set(cache_key, result.model_dump(mode="json"), ttl=3600)
-                    return result
 
-        # Use unified result builder to avoid code duplication
-        result = self._build_backtest_result(task, result_model)
+        payload = await get_or_compute(
+            self.cache,
+            f"backtest:result:{task_id}",
+            load_result,
+            ttl=3600,
+            cache_if=lambda _payload: task.status == TaskStatus.COMPLETED,
+            is_valid=is_usable,
+        )
+        return BacktestResult(**self._sanitize_cached_result_payload(dict(payload)))
 
-        # Cache result
-        if task.status == TaskStatus.COMPLETED:
-            await self.cache.set(cache_key, result.model_dump(mode="json"), ttl=3600)
+    async def get_chart_pyramid(self, task_id: str) -> dict[str, Any] | None:
+        """Return the precomputed chart downsampling levels of a stored result.
 
-        return result
+        Callers must have authorized access to ``task_id`` already (e.g. via
+        ``get_result``).
+        """
+        return await self.task_manager.get_chart_pyramid(task_id)
 
     async def cancel_task(self, task_id: str, user_id: str) -> bool:
         """Cancel a running backtest task.
@@ -850,43 +1084,59 @@ class BacktestService:
         offset: int = 0,
         sort_by: str = "created_at",
         sort_desc: bool = True,
+        cursor: str | None = None,
     ) -> BacktestListResponse:
-        """List backtest results with sorting support.
+        """List backtest result summaries with sorting support.
 
-        Optimization: Uses batch queries to avoid N+1 query problems.
+        Only the scalar metric columns are read; curves and trades are left
+        empty (fetch them with ``get_result``). When sorting by ``created_at``
+        the response carries ``next_cursor``; passing it back as ``cursor``
+        continues after the last row (keyset pagination) and skips the total
+        count, so deep pages cost the same as the first one. Cursors only
+        exist for that ordering, so a cursor with any other ``sort_by`` is
+        rejected rather than silently restarting at page one.
 
         Args:
             user_id: The ID of the user to list results for.
             limit: Maximum number of results to return.
-            offset: Number of results to skip.
-            sort_by: Field to sort by (e.g., "created_at", "strategy_id", "symbol").
+            offset: Number of results to skip (ignored when ``cursor`` is set).
+            sort_by: Field to sort by (e.g., "created_at", "sharpe_ratio", "symbol").
             sort_desc: Whether to sort in descending order.
+            cursor: ``next_cursor`` of the previous page.
 
         Returns:
-            BacktestListResponse containing total count and list of results.
+            BacktestListResponse with the page items; ``total`` is ``None`` for
+            cursor pages.
+
+        Raises:
+            ValueError: If ``cursor`` is malformed or ``sort_by`` is not
+                ``created_at``.
         """
-        tasks = await self.task_repo.list(
-            filters={"user_id": user_id},
-            skip=offset,
+        if cursor and sort_by != "created_at":
+            raise ValueError("cursor pagination requires sort_by=created_at")
+        after = self._decode_list_cursor(cursor) if cursor else None
+        rows = await self.task_manager.list_result_summaries(
+            user_id,
             limit=limit,
+            offset=offset,
             order_by=sort_by,
             order_desc=sort_desc,
+            after=after,
         )
-        total = await self.task_repo.count(filters={"user_id": user_id})
-
-        task_ids = [str(task.id) for task in tasks]
-        result_models = (
-            await self.result_repo.list(filters={"task_id": task_ids}, limit=len(task_ids) or 1)
-            if task_ids
-            else []
-        )
-        result_by_task_id = {str(r.task_id): r for r in result_models}
+        total = None if after is not None else await self.task_manager.count_user_tasks(user_id)
 
         items = [
-            self._build_backtest_result(task, result_by_task_id.get(str(task.id))) for task in tasks
+            self._build_backtest_result(
+                row, row if row.result_id is not None else None, include_payload=False
+            )
+            for row in rows
         ]
 
-        return BacktestListResponse(total=total, items=items)
+        next_cursor = None
+        if sort_by == "created_at" and limit and len(rows) == limit and rows[-1].created_at:
+            next_cursor = self._encode_list_cursor(rows[-1].created_at, str(rows[-1].id))
+
+        return BacktestListResponse(total=total, items=items, next_cursor=next_cursor)
 
     async def delete_result(self, task_id: str, user_id: str) -> bool:
         """Delete a backtest result and associated files.
@@ -0,0 +1,169 @@
+"""
+Long-lived backtest worker process.
+
+Launched by ``BacktestWorkerPool`` as ``python -O backtest_worker.py``. The
+worker pre-imports the heavy backtest dependencies once, then executes
+strategy ``run.py`` files in-process, one job at a time.
+
+Protocol (one JSON document per line):
+    stdin  <- {"job_id", "run_py", "cwd", "env", "sys_path"}
+    stdout -> {"job_id", "returncode", "stdout", "stderr", "run_seconds", "rss_bytes"}
+
+This module deliberately imports nothing from ``app`` so that spawning a
+worker stays cheap and strategy code cannot reach into API state.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+import os
+import runpy
+import sys
+import sysconfig
+import time
+import traceback
+from typing import Any
+
+_PRELOAD_MODULES = ("yaml", "numpy", "pandas", "backtrader")
+
+
+def _preload() -> None:
+    """Import heavy dependencies once so every job starts warm."""
+    for name in _PRELOAD_MODULES:
+        try:
+            __import__(name)
+        except Exception:
+            # A missing optional dependency only means that job will fail the
+            # same way it would in a cold interpreter.
+            continue
+
+
+def interpreter_library_roots() -> tuple[str, ...]:
+    """Directories of the interpreter's standard library and site packages."""
+    roots = set()
+    for key in ("stdlib", "platstdlib", "purelib", "platlib"):
+        path = sysconfig.get_paths().get(key)
+        if path:
+            roots.add(os.path.normcase(os.path.abspath(path)))
+    return tuple(sorted(roots))
+
+
+def _current_rss_bytes() -> int | None:
+    """Return the peak resident set size of this worker, if available."""
+    try:
+        import resource
+    except ImportError:  # pragma: no cover - Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes.
+    return int(peak if sys.platform == "darwin" else peak * 1024)
+
+
+def purge_job_modules(baseline: set[str], library_roots: tuple[str, ...]) -> None:
+    """Drop modules imported by the job that do not live in the interpreter's libraries.
+
+    Strategy modules share names across strategy directories
+    (``strategy_dual_ma`` etc.), so they must be re-imported for every job.
+    Third-party modules imported lazily by the job are kept warm.
+    """
+    for name in list(sys.modules):
+        if name in baseline:
+            continue
+        module = sys.modules.get(name)
+        module_file = getattr(module, "__file__", None)
+        if module_file:
+            normalized = os.path.normcase(os.path.abspath(module_file))
+            if normalized.startswith(library_roots):
+                continue
+        sys.modules.pop(name, None)
+
+
+def run_job(job: dict[str, Any], library_roots: tuple[str, ...]) -> dict[str, Any]:
+    """Execute one ``run.py`` in-process and restore interpreter state afterwards."""
+    run_py = str(job["run_py"])
+    cwd = str(job.get("cwd") or os.path.dirname(run_py))
+    env_overrides = {str(k): str(v) for k, v in (job.get("env") or {}).items()}
+    extra_paths = [str(p) for p in (job.get("sys_path") or []) if p]
+
+    saved_cwd = os.getcwd()
+    saved_env = dict(os.environ)
+    saved_path = list(sys.path)
+    saved_argv = list(sys.argv)
+    module_baseline = set(sys.modules)
+
+    stdout_buffer = io.StringIO()
+    stderr_buffer = io.StringIO()
+    returncode = 0
+    started = time.perf_counter()
+    try:
+        os.chdir(cwd)
+        os.environ.update(env_overrides)
+        sys.path[:0] = [p for p in extra_paths if p not in sys.path]
+        sys.argv = [run_py]
+        with contextlib.redirect_stdout(stdout_buffer), contextlib.redirect_stderr(stderr_buffer):
+            try:
+                runpy.run_path(run_py, run_name="__main__")
+            except SystemExit as exc:
+                code = exc.code
+                if code is None:
+                    returncode = 0
+                elif isinstance(code, int):
+                    returncode = code
+                else:
+                    print(code, file=sys.stderr)
+                    returncode = 1
+            except BaseException:
+                traceback.print_exc()
+                returncode = 1
+    finally:
+        run_seconds = time.perf_counter() - started
+        os.chdir(saved_cwd)
+        os.environ.clear()
+        os.environ.update(saved_env)
+        sys.path[:] = saved_path
+        sys.argv = saved_argv
+        purge_job_modules(module_baseline, library_roots)
+
+    return {
+        "job_id": job.get("job_id"),
+        "returncode": returncode,
+        "stdout": stdout_buffer.getvalue(),
+        "stderr": stderr_buffer.getvalue(),
+        "run_seconds": run_seconds,
+        "rss_bytes": _current_rss_bytes(),
+    }
+
+
+def main() -> int:
+    # Keep a private handle on the protocol stream, then point fd 1 at stderr so
+    # stray writes from C extensions cannot corrupt the response channel.
+    protocol_out = os.fdopen(os.dup(sys.stdout.fileno()), "w", encoding="utf-8")
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+
+    # Running as a script puts app/services on sys.path; strategies must not see it.
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    sys.path[:] = [p for p in sys.path if os.path.abspath(p or os.curdir) != script_dir]
+
+    _preload()
+    library_roots = interpreter_library_roots()
+    protocol_out.write(json.dumps({"ready": True, "pid": os.getpid()}) + "\n")
+    protocol_out.flush()
+
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            job = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        response = run_job(job, library_roots)
+        protocol_out.write(json.dumps(response, ensure_ascii=False, default=str) + "\n")
+        protocol_out.flush()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
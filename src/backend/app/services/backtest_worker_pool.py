@@ -0,0 +1,409 @@
+"""
+Warm worker pool for backtest execution.
+
+Spawning ``python -O run.py`` per task re-imports backtrader, pandas and yaml
+every time. The pool keeps a small number of pre-forked interpreters (see
+``backtest_worker.py``) that have already paid that import cost, hands each one
+a job over its stdin pipe and reads the result back from stdout.
+
+Workers are plain ``subprocess.Popen`` handles, so ``BacktestExecutionRunner``
+can cancel a job exactly as before by killing the process; the pool notices the
+dead worker on release and replaces it lazily. ``prewarm`` starts the pool's
+minimum number of workers ahead of the first job (at application startup).
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import logging
+import queue
+import subprocess
+import sys
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+_WORKER_SCRIPT = Path(__file__).with_name("backtest_worker.py")
+_EOF = object()
+
+
+@dataclass
+class WorkerJobResult:
+    """Outcome of one job executed by a pooled worker."""
+
+    returncode: int
+    stdout: str
+    stderr: str
+    queue_wait_seconds: float
+    run_seconds: float
+    worker_pid: int | None = None
+
+
+@dataclass
+class _PoolStats:
+    jobs_completed: int = 0
+    workers_started: int = 0
+    workers_recycled: int = 0
+    total_queue_wait_seconds: float = 0.0
+    total_run_seconds: float = 0.0
+    recycle_reasons: dict[str, int] = field(default_factory=dict)
+
+
+class _BacktestWorker:
+    """One long-lived worker interpreter and its response reader thread."""
+
+    def __init__(self, popen_fn: Callable[..., subprocess.Popen]) -> None:
+        self.process = popen_fn(
+            [sys.executable, "-O", str(_WORKER_SCRIPT)],
+            cwd=str(_WORKER_SCRIPT.parent),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+            bufsize=1,
+        )
+        self.jobs_run = 0
+        self.rss_bytes: int | None = None
+        self.broken = False
+        self._responses: queue.Queue = queue.Queue()
+        self._reader = threading.Thread(
+            target=self._read_responses, name="backtest-worker-reader", daemon=True
+        )
+        self._reader.start()
+        self._ready = False
+
+    @property
+    def pid(self) -> int | None:
+        return getattr(self.process, "pid", None)
+
+    def is_alive(self) -> bool:
+        return not self.broken and self.process.poll() is None
+
+    def _read_responses(self) -> None:
+        stream = self.process.stdout
+        try:
+            for line in stream:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    self._responses.put(json.loads(line))
+                except json.JSONDecodeError:
+                    logger.debug("Ignoring malformed worker response line: %.200s", line)
+        except (OSError, ValueError):
+            pass
+        finally:
+            self._responses.put(_EOF)
+
+    def _next_response(self, timeout: float | None) -> dict[str, Any] | None:
+        try:
+            item = self._responses.get(timeout=timeout)
+        except queue.Empty:
+            raise subprocess.TimeoutExpired(str(_WORKER_SCRIPT), timeout) from None
+        if item is _EOF:
+            # Keep the sentinel visible for any later reader.
+            self._responses.put(_EOF)
+            return None
+        return item
+
+    def run(self, job: dict[str, Any], timeout: float | None) -> dict[str, Any] | None:
+        """Send one job and block until its response, death, or timeout."""
+        deadline = time.monotonic() + timeout if timeout else None
+        if not self._ready:
+            handshake = self._next_response(timeout)
+            if handshake is None:
+                self.broken = True
+                return None
+            self._ready = True
+        try:
+            self.process.stdin.write(json.dumps(job, ensure_ascii=False) + "\n")
+            self.process.stdin.flush()
+        except (BrokenPipeError, OSError, ValueError):
+            self.broken = True
+            return None
+        remaining = max(deadline - time.monotonic(), 0.0) if deadline else None
+        try:
+            response = self._next_response(remaining)
+        except subprocess.TimeoutExpired:
+            self.broken = True
+            raise
+        if response is None:
+            self.broken = True
+        else:
+            self.jobs_run += 1
+            rss = response.get("rss_bytes")
+            self.rss_bytes = int(rss) if isinstance(rss, (int, float)) else None
+        return response
+
+    def stop(self) -> None:
+        """Terminate the worker; closing stdin lets an idle worker exit cleanly."""
+        if self.broken and self.process.poll() is None:
+            self.process.kill()
+        try:
+            if self.process.stdin:
+                self.process.stdin.close()
+        except Exception:
+            pass
+        if self.is_alive():
+            try:
+                self.process.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+            except Exception:
+                pass
+
+
+class BacktestWorkerPool:
+    """Bounded pool of warm backtest interpreters.
+
+    Args:
+        size: Maximum number of concurrent workers.
+        min_workers: Workers ``prewarm`` starts ahead of demand (capped at ``size``).
+        max_jobs_per_worker: Recycle a worker after this many jobs (0 = never).
+        max_rss_mb: Recycle a worker once its peak RSS exceeds this many MiB (0 = never).
+        popen_fn: Factory used to start worker processes (injectable for tests).
+    """
+
+    def __init__(
+        self,
+        size: int,
+        max_jobs_per_worker: int = 50,
+        max_rss_mb: int = 1024,
+        *,
+        min_workers: int = 0,
+        popen_fn: Callable[..., subprocess.Popen] = subprocess.Popen,
+    ) -> None:
+        self.size = max(int(size), 1)
+        self.min_workers = min(max(int(min_workers), 0), self.size)
+        self.max_jobs_per_worker = max(int(max_jobs_per_worker), 0)
+        self.max_rss_bytes = max(int(max_rss_mb), 0) * 1024 * 1024
+        self._popen_fn = popen_fn
+        self._idle: list[_BacktestWorker] = []
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+        self._live = 0
+        self._closed = False
+        self._job_ids = itertools.count(1)
+        self._stats = _PoolStats()
+
+    # ------------------------------------------------------------------
+    # Worker lifecycle
+    # ------------------------------------------------------------------
+
+    def _spawn(self) -> _BacktestWorker:
+        worker = _BacktestWorker(self._popen_fn)
+        with self._lock:
+            self._stats.workers_started += 1
+        return worker
+
+    def _acquire(self, timeout: float | None) -> _BacktestWorker:
+        deadline = time.monotonic() + timeout if timeout else None
+        with self._available:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Backtest worker pool is shut down")
+                if self._idle:
+                    return self._idle.pop()
+                if self._live < self.size:
+                    self._live += 1
+                    break
+                remaining = deadline - time.monotonic() if deadline else None
+                if remaining is not None and remaining <= 0:
+                    raise subprocess.TimeoutExpired("backtest worker pool", timeout)
+                self._available.wait(remaining)
+        try:
+            return self._spawn()
+        except Exception:
+            with self._available:
+                self._live -= 1
+                self._available.notify()
+            raise
+
+    def _retire(self, worker: _BacktestWorker, reason: str) -> None:
+        worker.stop()
+        with self._available:
+            self._live -= 1
+            self._available.notify()
+            self._stats.workers_recycled += 1
+            self._stats.recycle_reasons[reason] = self._stats.recycle_reasons.get(reason, 0) + 1
+        logger.debug("Recycled backtest worker pid=%s (%s)", worker.pid, reason)
+
+    def _release(self, worker: _BacktestWorker) -> None:
+        if not worker.is_alive():
+            self._retire(worker, "exited")
+        elif self._closed:
+            self._retire(worker, "shutdown")
+        elif self.max_jobs_per_worker and worker.jobs_run >= self.max_jobs_per_worker:
+            self._retire(worker, "max_jobs")
+        elif self.max_rss_bytes and (worker.rss_bytes or 0) > self.max_rss_bytes:
+            self._retire(worker, "max_rss")
+        else:
+            with self._available:
+                self._idle.append(worker)
+                self._available.notify()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def prewarm(self) -> int:
+        """Start idle workers until ``min_workers`` are live.
+
+        Returns:
+            Number of workers started.
+        """
+        started = 0
+        while True:
+            with self._available:
+                if self._closed or self._live >= self.min_workers:
+                    return started
+                self._live += 1
+            try:
+                worker = self._spawn()
+            except Exception:
+                with self._available:
+                    self._live -= 1
+                    self._available.notify()
+                raise
+            with self._available:
+                self._idle.append(worker)
+                self._available.notify()
+            started += 1
+
+    def run(
+        self,
+        run_py: Path,
+        cwd: Path,
+        env: dict[str, str] | None = None,
+        sys_path: list[str] | None = None,
+        timeout: float | None = None,
+        on_start: Callable[[subprocess.Popen], None] | None = None,
+        on_finish: Callable[[], None] | None = None,
+    ) -> WorkerJobResult:
+        """Run one ``run.py`` on a warm worker, blocking the calling thread.
+
+        ``on_start`` receives the worker's process handle once the job has
+        been dispatched so callers can register it for cancellation; killing
+        that handle aborts the job and the worker is replaced afterwards.
+
+        Raises:
+            subprocess.TimeoutExpired: If no worker frees up or the job does
+                not finish within ``timeout`` seconds.
+        """
+        queued_at = time.perf_counter()
+        worker = self._acquire(timeout)
+        queue_wait = time.perf_counter() - queued_at
+        job = {
+            "job_id": next(self._job_ids),
+            "run_py": str(run_py),
+            "cwd": str(cwd),
+            "env": dict(env or {}),
+            "sys_path": list(sys_path or []),
+        }
+        remaining = max(timeout - queue_wait, 0.0) if timeout else None
+        started = time.perf_counter()
+        try:
+            if on_start is not None:
+                on_start(worker.process)
+            try:
+                response = worker.run(job, remaining)
+            except subprocess.TimeoutExpired:
+                worker.process.kill()
+                raise
+        finally:
+            if on_finish is not None:
+                on_finish()
+            self._release(worker)
+
+        if response is None:
+            # The worker died mid-job: killed for cancellation or crashed.
+            worker.process.poll()
+            returncode = worker.process.returncode
+            response = {
+                "returncode": returncode if returncode not in (None, 0) else -1,
+                "stdout": "",
+                "stderr": "Backtest worker exited unexpectedly",
+                "run_seconds": time.perf_counter() - started,
+            }
+
+        result = WorkerJobResult(
+            returncode=int(response.get("returncode", 1)),
+            stdout=str(response.get("stdout") or ""),
+            stderr=str(response.get("stderr") or ""),
+            queue_wait_seconds=queue_wait,
+            run_seconds=float(response.get("run_seconds") or 0.0),
+            worker_pid=worker.pid,
+        )
+        with self._lock:
+            self._stats.jobs_completed += 1
+            self._stats.total_queue_wait_seconds += result.queue_wait_seconds
+            self._stats.total_run_seconds += result.run_seconds
+        return result
+
+    def get_stats(self) -> dict[str, Any]:
+        """Return pool counters, including average queue wait vs. run time."""
+        with self._lock:
+            stats = self._stats
+            jobs = stats.jobs_completed
+            return {
+                "size": self.size,
+                "live_workers": self._live,
+                "idle_workers": len(self._idle),
+                "jobs_completed": jobs,
+                "workers_started": stats.workers_started,
+                "workers_recycled": stats.workers_recycled,
+                "recycle_reasons": dict(stats.recycle_reasons),
+                "avg_queue_wait_seconds": (stats.total_queue_wait_seconds / jobs) if jobs else 0.0,
+                "avg_run_seconds": (stats.total_run_seconds / jobs) if jobs else 0.0,
+            }
+
+    def shutdown(self) -> None:
+        """Stop all idle workers; busy workers are retired when released."""
+        with self._available:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._available.notify_all()
+        for worker in idle:
+            self._retire(worker, "shutdown")
+
+
+_pool: BacktestWorkerPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_backtest_worker_pool() -> BacktestWorkerPool | None:
+    """Return the process-wide worker pool, or None when it is disabled.
+
+    The pool is enabled by setting ``BACKTEST_WORKER_POOL_SIZE`` above zero.
+    """
+    global _pool
+    from app.config import get_settings
+
+    settings = get_settings()
+    size = int(getattr(settings, "BACKTEST_WORKER_POOL_SIZE", 0) or 0)
+    if size <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = BacktestWorkerPool(
+                size=size,
+                max_jobs_per_worker=settings.BACKTEST_WORKER_MAX_JOBS,
+                max_rss_mb=settings.BACKTEST_WORKER_MAX_RSS_MB,
+                min_workers=settings.BACKTEST_WORKER_POOL_MIN,
+            )
+        return _pool
+
+
+def shutdown_backtest_worker_pool() -> None:
+    """Stop the process-wide worker pool if it was started."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown()
@@ -0,0 +1,390 @@
+"""
+In-process OHLCV bar aggregation from gateway ticks.
+
+Chart requests used to round-trip a ``get_bars`` command to the gateway on
+every load. ``BarAggregator`` instead keeps one rolling NumPy series per
+(source, symbol, timeframe) that has been charted: it is seeded once from
+the gateway's history and then extended by the quote receiver's ticks, so
+later chart requests are served from memory.
+
+Ticks are read from the receiver's ``TickRing`` by sequence number, so no
+tick is lost when listener calls are conflated per batch. Bar volume is the
+increase of the tick's cumulative ``volume`` (GatewayTick reports session /
+24h volume); ticks older than the forming bar are ignored.
+
+Bar start times are epoch seconds. Gateway history dates without a
+timezone are read in the source's configured zone (``QUOTE_SOURCE_TIMEZONES``;
+MT5 reports broker server time), else as UTC. Bars are floored on the wall
+clock of that zone and labelled in it, so a broker's D1 bar starts at its
+midnight and an H4 bar at 00:00 / 04:00 server time, as in its own history.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import threading
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone, tzinfo
+from typing import Any, Protocol
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+TIMEFRAME_SECONDS: dict[str, int] = {
+    "M1": 60,
+    "M5": 300,
+    "M15": 900,
+    "M30": 1800,
+    "H1": 3600,
+    "H4": 14400,
+    "D1": 86400,
+}
+
+# (source, symbol, timeframe, bar) for every update of a forming bar
+BarListener = Callable[[str, str, str, dict[str, Any]], None]
+
+_START, _OPEN, _HIGH, _LOW, _CLOSE, _VOLUME = range(6)
+
+
+class _HistorySource(Protocol):
+    def get_history(
+        self, symbol: str, limit: int | None = None, since: int | None = None
+    ) -> tuple[dict[str, np.ndarray], int] | None: ...
+
+
+def parse_source_timezones(spec: str) -> dict[str, tzinfo]:
+    """Parse ``"SOURCE=zone,..."``; a zone is an IANA name or a UTC offset in hours."""
+    zones: dict[str, tzinfo] = {}
+    for item in spec.split(","):
+        source, _, zone = item.strip().partition("=")
+        source, zone = source.strip().upper(), zone.strip()
+        if not source or not zone:
+            continue
+        try:
+            zones[source] = timezone(timedelta(hours=float(zone)))
+            continue
+        except ValueError:
+            pass
+        try:
+            zones[source] = ZoneInfo(zone)
+        except (ZoneInfoNotFoundError, ValueError):
+            logger.warning("Ignoring invalid quote source timezone: %s", item)
+    return zones
+
+
+def bar_time(value: Any, tz: tzinfo | None = None) -> float | None:
+    """Epoch seconds of a gateway bar date (epoch s/ms or ISO string).
+
+    With *tz*, naive dates and epoch numbers are wall-clock times in that zone
+    (MT5 reports server time both ways); without it they are UTC.
+    """
+    if isinstance(value, (int, float)):
+        number = float(value)
+        if not math.isfinite(number):
+            return None
+        seconds = number / 1000.0 if number > 1e12 else number
+        if tz is None:
+            return seconds
+        wall = datetime.fromtimestamp(seconds, tz=timezone.utc).replace(tzinfo=tz)
+        return wall.timestamp()
+    text = str(value or "").strip()
+    if not text:
+        return None
+    try:
+        parsed = datetime.fromisoformat(text.replace("Z", "+00:00"))
+    except ValueError:
+        try:
+            return bar_time(float(text), tz)
+        except ValueError:
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=tz or timezone.utc)
+    return parsed.timestamp()
+
+
+def bar_start(ts: float, seconds: int, tz: tzinfo | None = None) -> float:
+    """Start of the *seconds* bar holding *ts*, floored on the wall clock of *tz*."""
+    if tz is None:
+        return ts - ts % seconds
+    local = datetime.fromtimestamp(ts, tz=tz)
+    wall = local.replace(tzinfo=timezone.utc).timestamp()
+    start = datetime.fromtimestamp(wall - wall % seconds, tz=timezone.utc)
+    return start.replace(tzinfo=tz, fold=local.fold).timestamp()
+
+
+def format_bar_time(start: float, tz: tzinfo | None = None) -> str:
+    """Bar label in the wall-clock time of *tz* (default UTC)."""
+    return datetime.fromtimestamp(start, tz=tz or timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+
+class _BarSeries:
+    """Rolling OHLCV bars of one timeframe (``capacity`` newest are kept).
+
+    Bars are floored and labelled in *tz* (the source's zone, default UTC).
+    """
+
+    __slots__ = (
+        "seconds",
+        "capacity",
+        "tz",
+        "requested",
+        "tick_key",
+        "_buf",
+        "_dates",
+        "_n",
+        "_end",
+    )
+
+    def __init__(self, seconds: int, capacity: int, tz: tzinfo | None = None) -> None:
+        self.seconds = seconds
+        self.capacity = max(1, capacity)
+        self.tz = tz
+        # Bar count the gateway history was fetched with.
+        self.requested = 0
+        self.tick_key = ""
+        # Twice the capacity so appends only compact every ``capacity`` bars.
+        self._buf = np.zeros((6, 2 * self.capacity))
+        self._dates: list[str] = []
+        self._n = 0
+        # End of the newest bar (a zone's D1 bar may last 23 or 25 hours).
+        self._end = -math.inf
+
+    def __len__(self) -> int:
+        return self._n
+
+    @property
+    def last_start(self) -> float | None:
+        return float(self._buf[_START, self._n - 1]) if self._n else None
+
+    def append(self, start: float, o: float, h: float, low: float, c: float, v: float) -> None:
+        if self._n == self._buf.shape[1]:
+            keep = self.capacity
+            self._buf[:, :keep] = self._buf[:, self._n - keep : self._n]
+            self._dates = self._dates[-keep:]
+            self._n = keep
+        self._buf[:, self._n] = (start, o, h, low, c, v)
+        self._dates.append(format_bar_time(start, self.tz))
+        self._n += 1
+        self._end = self._bar_end(start)
+
+    def _bar_end(self, start: float) -> float:
+        if self.tz is None:
+            return start + self.seconds
+        local = datetime.fromtimestamp(start, tz=self.tz).replace(tzinfo=None)
+        return (local + timedelta(seconds=self.seconds)).replace(tzinfo=self.tz).timestamp()
+
+    def update(self, ts: float, price: float, volume: float) -> bool:
+        """Fold one tick in; False for ticks older than the forming bar."""
+        last = self.last_start
+        if last is not None and last <= ts < self._end:
+            start = last
+        else:
+            start = bar_start(ts, self.seconds, self.tz)
+        if last is None or start > last:
+            self.append(start, price, price, price, price, volume)
+            return True
+        if start < last:
+            return False
+        i = self._n - 1
+        buf = self._buf
+        if price > buf[_HIGH, i]:
+            buf[_HIGH, i] = price
+        if price < buf[_LOW, i]:
+            buf[_LOW, i] = price
+        buf[_CLOSE, i] = price
+        buf[_VOLUME, i] += volume
+        return True
+
+    def rows_after(self, start: float) -> np.ndarray:
+        view = self._buf[:, : self._n]
+        return view[:, view[_START] > start].copy()
+
+    def bars(self, count: int | None = None) -> list[dict[str, Any]]:
+        lo = 0 if count is None else max(0, self._n - count)
+        columns = self._buf[:, lo : self._n].tolist()
+        return [
+            {"date": date, "open": o, "high": h, "low": low, "close": c, "volume": v}
+            for date, o, h, low, c, v in zip(self._dates[lo:], *columns[1:], strict=True)
+        ]
+
+
+@dataclass
+class _TickFeed:
+    """Read position in one receiver ring and the series it feeds."""
+
+    sequence: int = 0
+    last_volume: float = math.nan
+    series: list[tuple[str, str, str]] = field(default_factory=list)
+
+    def volume_delta(self, volume: float) -> float:
+        if math.isnan(volume):
+            return 0.0
+        previous, self.last_volume = self.last_volume, volume
+        if math.isnan(previous) or volume < previous:
+            # First tick or session reset: no baseline for this tick.
+            return 0.0
+        return volume - previous
+
+
+def _tick_prices(history: dict[str, np.ndarray]) -> np.ndarray:
+    """Last price, falling back to the bid/ask mid and then either side."""
+    price = history["price"].copy()
+    bid, ask = history["bid_price"], history["ask_price"]
+    missing = ~(price > 0)
+    if missing.any():
+        both = (bid + ask) / 2.0
+        one = np.where(np.isfinite(bid), bid, ask)
+        price[missing] = np.where(np.isfinite(both), both, one)[missing]
+    return price
+
+
+class BarAggregator:
+    """Rolling bars per charted (source, symbol, timeframe)."""
+
+    def __init__(
+        self, capacity: int = 1000, source_timezones: dict[str, tzinfo] | None = None
+    ) -> None:
+        self.capacity = capacity
+        # Zone of naive gateway history dates per source (default UTC)
+        self.source_timezones = dict(source_timezones or {})
+        self._lock = threading.Lock()
+        self._series: dict[tuple[str, str, str], _BarSeries] = {}
+        # (source, tick key) -> feed
+        self._feeds: dict[tuple[str, str], _TickFeed] = {}
+        self._listeners: list[BarListener] = []
+
+    def add_listener(self, listener: BarListener) -> None:
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def has_series(self, source: str, symbol: str, timeframe: str, count: int) -> bool:
+        """Whether a chart of *count* bars can be served from memory."""
+        series = self._series.get((source, symbol, timeframe))
+        return series is not None and series.requested >= count
+
+    def tick_key(self, source: str, symbol: str, timeframe: str) -> str | None:
+        series = self._series.get((source, symbol, timeframe))
+        return series.tick_key if series is not None else None
+
+    def seed(
+        self,
+        source: str,
+        symbol: str,
+        timeframe: str,
+        bars: Iterable[dict[str, Any]],
+        count: int,
+    ) -> bool:
+        """(Re)load gateway history, keeping newer bars already built from ticks.
+
+        Returns:
+            False (and nothing is stored) when a bar date cannot be parsed,
+            so callers can serve the gateway bars as they are.
+        """
+        seconds = TIMEFRAME_SECONDS[timeframe]
+        tz = self.source_timezones.get(source.upper())
+        rows: dict[float, tuple[float, ...]] = {}
+        for bar in bars:
+            ts = bar_time(bar.get("date"), tz)
+            if ts is None:
+                return False
+            start = bar_start(ts, seconds, tz)
+            rows[start] = (
+                start,
+                float(bar.get("open") or 0),
+                float(bar.get("high") or 0),
+                float(bar.get("low") or 0),
+                float(bar.get("close") or 0),
+                float(bar.get("volume") or 0),
+            )
+
+        key = (source, symbol, timeframe)
+        series = _BarSeries(seconds, max(self.capacity, count), tz)
+        for start in sorted(rows):
+            series.append(*rows[start])
+        series.requested = count
+        with self._lock:
+            existing = self._series.get(key)
+            if existing is not None:
+                series.tick_key = existing.tick_key
+                newer = existing.rows_after(series.last_start or -math.inf)
+                for column in newer.T.tolist():
+                    series.append(*column)
+            self._series[key] = series
+        return True
+
+    def bind(self, source: str, symbol: str, timeframe: str, tick_key: str, sequence: int) -> None:
+        """Feed a series from receiver ticks stored under *tick_key*.
+
+        *sequence* is the ring position to start from; ticks before it are
+        assumed to be covered by the seeded history.
+        """
+        key = (source, symbol, timeframe)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None or series.tick_key == tick_key:
+                return
+            old = self._feeds.get((source, series.tick_key))
+            if old is not None and key in old.series:
+                old.series.remove(key)
+                if not old.series:
+                    del self._feeds[(source, series.tick_key)]
+            series.tick_key = tick_key
+            feed = self._feeds.get((source, tick_key))
+            if feed is None:
+                feed = self._feeds[(source, tick_key)] = _TickFeed(sequence=sequence)
+            feed.series.append(key)
+
+    def watches(self, source: str, tick_key: str) -> bool:
+        return (source, tick_key) in self._feeds
+
+    def ingest(self, source: str, tick_key: str, receiver: _HistorySource) -> None:
+        """Fold ticks appended to *receiver*'s ring since the last call."""
+        updates: list[tuple[tuple[str, str, str], dict[str, Any]]] = []
+        with self._lock:
+            feed = self._feeds.get((source, tick_key))
+            if feed is None:
+                return
+            snapshot = receiver.get_history(tick_key, since=feed.sequence)
+            if snapshot is None:
+                return
+            history, feed.sequence = snapshot
+            series = [(key, self._series[key]) for key in feed.series]
+            changed: set[tuple[str, str, str]] = set()
+            for ts, price, volume in zip(
+                history["timestamp"].tolist(),
+                _tick_prices(history).tolist(),
+                history["volume"].tolist(),
+                strict=True,
+            ):
+                delta = feed.volume_delta(volume)
+                if not (price > 0) or math.isnan(ts):
+                    continue
+                for key, bars in series:
+                    if bars.update(ts, price, delta):
+                        changed.add(key)
+            for key, bars in series:
+                if key in changed:
+                    updates.append((key, bars.bars(1)[0]))
+        for (src, symbol, timeframe), bar in updates:
+            for listener in self._listeners:
+                try:
+                    listener(src, symbol, timeframe, bar)
+                except Exception:
+                    logger.exception("Bar listener failed for %s %s", src, symbol)
+
+    def chart(self, source: str, symbol: str, timeframe: str, count: int) -> dict[str, Any]:
+        """Chart payload in the ``get_chart_data`` shape (empty if unknown)."""
+        with self._lock:
+            series = self._series.get((source, symbol, timeframe))
+            bars = series.bars(count) if series is not None else []
+        return {
+            "source": source,
+            "symbol": symbol,
+            "timeframe": timeframe,
+            "bars": bars,
+            "total": len(bars),
+        }
@@ -0,0 +1,242 @@
+"""
+Viewport-aware downsampling of chart series.
+
+Charts are a few thousand pixels wide, so shipping every bar of a long,
+high-frequency backtest only costs serialization time. This module reduces
+series to roughly ``max_points`` before they reach Pydantic/JSON:
+
+- line series (equity, drawdown) use Largest-Triangle-Three-Buckets (LTTB),
+  which keeps the visually significant peaks and troughs;
+- candles are merged into OHLC buckets, with bars that carry trade signals
+  kept as their own candle so markers still land on a real bar.
+
+``build_lttb_pyramid`` precomputes progressively coarser min/max index sets
+when a result is persisted; ``select_series_indices`` runs LTTB on the
+coarsest level that still resolves the requested window (MinMaxLTTB), so
+zoomed-out and zoomed-in requests both touch only a few thousand points.
+"""
+
+import math
+from bisect import bisect_left, bisect_right
+from collections.abc import Collection, Sequence
+from typing import Any
+
+import numpy as np
+
+PYRAMID_FACTOR = 4
+PYRAMID_MIN_POINTS = 500
+# Candidates per output point handed to LTTB (MinMaxLTTB preselection).
+MINMAX_RATIO = 4
+MIN_CHART_POINTS = 3
+MAX_CHART_POINTS = 20000
+
+
+def clamp_max_points(max_points: int | None) -> int | None:
+    """Bound a client-supplied point budget; ``None``/``0`` disables sampling."""
+    if not max_points:
+        return None
+    return min(max(max_points, MIN_CHART_POINTS), MAX_CHART_POINTS)
+
+
+def _series_values(values: Sequence[float], indices: Sequence[int] | np.ndarray) -> np.ndarray:
+    if isinstance(values, np.ndarray):
+        return values[np.asarray(indices, dtype=np.int64)].astype(float)
+    return np.fromiter((values[i] for i in indices), dtype=float, count=len(indices))
+
+
+def lttb_indices(
+    values: Sequence[float],
+    max_points: int,
+    candidates: Sequence[int] | None = None,
+) -> list[int]:
+    """Indices of ``values`` kept by Largest-Triangle-Three-Buckets.
+
+    Args:
+        values: The full series; x is the bar index.
+        max_points: Number of points to keep (first and last always kept).
+        candidates: Ascending subset of indices to sample from (default: all).
+
+    Returns:
+        Ascending indices into ``values``.
+    """
+    idx = np.arange(len(values)) if candidates is None else np.asarray(candidates, dtype=np.int64)
+    n = len(idx)
+    if max_points >= n or n <= 2:
+        return idx.tolist()
+    if max_points < 3:
+        return [int(idx[0]), int(idx[-1])][: max(max_points, 0)]
+
+    # Buckets hold a handful of points, so plain floats beat per-bucket numpy calls.
+    x = idx.tolist()
+    y = _series_values(values, idx).tolist()
+    every = (n - 2) / (max_points - 2)
+    selected = [0]
+    a = 0
+    for i in range(max_points - 2):
+        start = int(i * every) + 1
+        end = min(int((i + 1) * every) + 1, n - 1)
+        next_end = min(int((i + 2) * every) + 1, n)
+        span = next_end - end
+        avg_x = sum(x[end:next_end]) / span
+        avg_y = sum(y[end:next_end]) / span
+        ax, ay = x[a], y[a]
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs((ax - avg_x) * (y[j] - ay) - (ax - x[j]) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = j, area
+        a = best
+        selected.append(a)
+    selected.append(n - 1)
+    return idx[selected].tolist()
+
+
+def minmax_indices(
+    values: Sequence[float], n_out: int, lo: int = 0, hi: int | None = None
+) -> list[int]:
+    """Vectorized preselection: the min and max bar of ``n_out // 2`` buckets.
+
+    Keeps every extreme LTTB could pick at a fraction of its cost; used to
+    build pyramid levels and to shrink large windows before running LTTB.
+    """
+    hi = len(values) if hi is None else hi
+    length = hi - lo
+    if length <= n_out:
+        return list(range(lo, hi))
+    width = math.ceil(length / max(n_out // 2, 1))
+    rows = math.ceil(length / width)
+    y = np.asarray(values[lo:hi], dtype=float)
+    low = np.full(rows * width, np.inf)
+    high = np.full(rows * width, -np.inf)
+    low[:length] = y
+    high[:length] = y
+    offsets = np.arange(rows) * width + lo
+    picked = np.concatenate(
+        (
+            offsets + low.reshape(rows, width).argmin(axis=1),
+            offsets + high.reshape(rows, width).argmax(axis=1),
+            [lo, hi - 1],
+        )
+    )
+    return np.unique(picked).tolist()
+
+
+def build_lttb_pyramid(
+    values: Sequence[float],
+    factor: int = PYRAMID_FACTOR,
+    min_points: int = PYRAMID_MIN_POINTS,
+) -> list[list[int]]:
+    """Candidate index sets, each ``factor`` times smaller than the previous one.
+
+    Level 0 holds about ``len(values) // factor`` indices; levels stop before
+    dropping below ``min_points``. Levels are min/max decimations, so
+    building the pyramid is a few vectorized passes over the data.
+    """
+    array = np.asarray(values, dtype=float)
+    levels: list[list[int]] = []
+    size = len(values)
+    while size // factor >= min_points:
+        size //= factor
+        levels.append(minmax_indices(array, size))
+    return levels
+
+
+def select_series_indices(
+    values: Sequence[float],
+    max_points: int,
+    lo: int = 0,
+    hi: int | None = None,
+    pyramid: Sequence[Sequence[int]] = (),
+) -> list[int]:
+    """Pick at most ``max_points`` indices of ``values[lo:hi]`` for display.
+
+    LTTB runs on the coarsest pyramid level that still holds
+    ``MINMAX_RATIO * max_points`` bars of the window, or on a min/max
+    preselection of the window when no level is fine enough.
+
+    Args:
+        values: The full series.
+        max_points: Point budget of the viewport.
+        lo: First index of the window.
+        hi: End of the window (exclusive); defaults to ``len(values)``.
+        pyramid: Output of ``build_lttb_pyramid`` for ``values``, if any.
+
+    Returns:
+        Ascending indices; the first and last bar of the window are kept.
+    """
+    hi = len(values) if hi is None else hi
+    if hi - lo <= max_points:
+        return list(range(lo, hi))
+
+    wanted = MINMAX_RATIO * max_points
+    candidates: list[int] | None = None
+    for level in reversed(pyramid):
+        first = bisect_left(level, lo)
+        last = bisect_left(level, hi)
+        if last - first >= wanted:
+            candidates = list(level[first:last])
+            if candidates[0] != lo:
+                candidates.insert(0, lo)
+            if candidates[-1] != hi - 1:
+                candidates.append(hi - 1)
+            break
+    if candidates is None:
+        candidates = minmax_indices(values, wanted, lo, hi)
+    return lttb_indices(values, max_points, candidates)
+
+
+def date_window(dates: Sequence[str], start: str | None, end: str | None) -> tuple[int, int]:
+    """``[lo, hi)`` index range of ascending ``dates`` within ``[start, end]``."""
+    lo = bisect_left(dates, start) if start else 0
+    hi = bisect_right(dates, end) if end else len(dates)
+    return lo, max(lo, hi)
+
+
+def ohlc_buckets(
+    dates: Sequence[str],
+    max_points: int,
+    keep_dates: Collection[str] = (),
+) -> list[tuple[int, int]]:
+    """Split bars into about ``max_points`` consecutive ``[start, end)`` buckets.
+
+    Bars whose date is in ``keep_dates`` (trade signals) always form a
+    single-bar bucket. The bucket width is widened for them, so the total
+    stays near ``max_points`` unless there are more signals than that.
+    """
+    n = len(dates)
+    if n <= max_points:
+        return [(i, i + 1) for i in range(n)]
+
+    kept = sum(1 for d in dates if d in keep_dates) if keep_dates else 0
+    slots = max(max_points - 2 * kept, max_points // 2, 1)
+    width = math.ceil(n / slots)
+
+    buckets: list[tuple[int, int]] = []
+    start = 0
+    for i, date in enumerate(dates):
+        if keep_dates and date in keep_dates:
+            if start < i:
+                buckets.append((start, i))
+            buckets.append((i, i + 1))
+            start = i + 1
+        elif i + 1 - start >= width:
+            buckets.append((start, i + 1))
+            start = i + 1
+    if start < n:
+        buckets.append((start, n))
+    return buckets
+
+
+def merge_ohlc(bars: Sequence[dict[str, Any]], start: int, end: int) -> dict[str, Any]:
+    """One candle for ``bars[start:end]``, dated at its first bar."""
+    if end - start == 1:
+        return dict(bars[start])
+    chunk = bars[start:end]
+    return {
+        "date": chunk[0]["date"],
+        "open": chunk[0]["open"],
+        "high": max(bar["high"] for bar in chunk),
+        "low": min(bar["low"] for bar in chunk),
+        "close": chunk[-1]["close"],
+        "volume": sum(bar.get("volume") or 0 for bar in chunk),
+    }
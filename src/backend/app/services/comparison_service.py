@@ -15,6 +15,7 @@ from app.schemas.comparison import (
     ComparisonUpdate,
 )
 from app.services.backtest_service import BacktestService
+from app.services.equity_alignment import align_equity_curves
 
 logger = logging.getLogger(__name__)
 
@@ -64,19 +65,16 @@ class ComparisonService:
         Raises:
             ValueError: If any of the specified backtest tasks do not exist.
         """
-        # Verify that all backtest tasks exist
+        # Verify that all backtest tasks exist and retrieve their results
+        backtest_results = {}
         for task_id in backtest_task_ids:
             result = await self.backtest_service.get_result(task_id)
             if not result:
                 raise ValueError(f"Backtest task not found: {task_id}")
-
-        # Retrieve all backtest results
-        backtest_results = {}
-        for task_id in backtest_task_ids:
-            result = await self.backtest_service.get_result(task_id)
             backtest_results[task_id] = {
                 "strategy_id": result.strategy_id,
                 "symbol": result.symbol,
+                "initial_cash": getattr(result, "initial_cash", None),
                 "total_return": result.total_return,
                 "annual_return": result.annual_return,
                 "sharpe_ratio": result.sharpe_ratio,
@@ -237,41 +235,23 @@ class ComparisonService:
 
         Returns:
             Dictionary containing aligned dates and equity curves for comparison.
-            The curves are aligned to a common date timeline for proper comparison.
+            The curves are aligned to a common date timeline for proper comparison;
+            before its first date a curve holds the run's initial capital.
         """
-        equity_comparison = {
-            "dates": [],
-            "curves": {},
+        aligned = align_equity_curves(
+            {
+                task_id: (result["equity_dates"], result["equity_curve"])
+                for task_id, result in backtest_results.items()
+            },
+            initial_capital={
+                task_id: result.get("initial_cash") for task_id, result in backtest_results.items()
+            },
+        )
+        return {
+            "dates": aligned.dates,
+            "curves": {task_id: curve.tolist() for task_id, curve in aligned.curves.items()},
         }
 
-        # Collect all dates from all backtest results
-        all_dates = set()
-        for _task_id, result in backtest_results.items():
-            all_dates.update(result["equity_dates"])
-        equity_comparison["dates"] = sorted(all_dates)
-
-        # Collect equity curve data
-        for task_id, result in backtest_results.items():
-            # Align dates
-            aligned_curve = []
-            result_dates = result["equity_dates"]
-            result_curve = result["equity_curve"]
-
-            for date in equity_comparison["dates"]:
-                if date in result_dates:
-                    index = result_dates.index(date)
-                    aligned_curve.append(result_curve[index])
-                else:
-                    # Use previous value or initial capital
-                    if aligned_curve:
-                        aligned_curve.append(aligned_curve[-1])
-                    else:
-                        aligned_curve.append(100000.0)  # Default initial capital
-
-            equity_comparison["curves"][task_id] = aligned_curve
-
-        return equity_comparison
-
     def _compare_trades(
         self,
         backtest_results: dict[str, dict[str, Any]],
@@ -366,6 +346,7 @@ class ComparisonService:
                 if result:
                     backtest_results[task_id] = {
                         "strategy_id": result.strategy_id,
+                        "initial_cash": getattr(result, "initial_cash", None),
                         "total_return": result.total_return,
                         "sharpe_ratio": result.sharpe_ratio,
                         "max_drawdown": result.max_drawdown,
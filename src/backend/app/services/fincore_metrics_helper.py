@@ -7,9 +7,18 @@ across the platform.
 """
 
 import logging
+from collections.abc import Sequence
 from typing import Any
 
-from app.services.backtest_analyzers import FincoreAdapter
+import numpy as np
+
+from app.services.metrics_engine import (
+    EquityMetrics,
+    TradeMetrics,
+    as_equity_matrix,
+    compute_equity_metrics,
+    compute_trade_metrics,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +30,49 @@ class MetricsSource:
     FINCORE = "fincore"
 
 
+def _metrics_source(use_fincore: bool) -> str:
+    """Return the source label, verifying fincore is importable if requested."""
+    if use_fincore:
+        try:
+            import fincore  # noqa: F401  # conditional import for availability check
+
+            return MetricsSource.FINCORE
+        except ImportError:
+            return MetricsSource.MANUAL
+    return MetricsSource.MANUAL
+
+
+def _compute_batch(
+    log_datas: Sequence[dict[str, Any]],
+) -> tuple[list[list[float]], EquityMetrics, TradeMetrics]:
+    """Run the vectorized engine once over every run's equity curve and trades."""
+    curves = [list(log_data.get("equity_curve", []) or []) for log_data in log_datas]
+    trades = [list(log_data.get("trades", []) or []) for log_data in log_datas]
+    matrix, lengths = as_equity_matrix(curves)
+    return curves, compute_equity_metrics(matrix, lengths), compute_trade_metrics(trades)
+
+
+def _basic_metrics(
+    row: int, equity: list[float], equity_metrics: EquityMetrics, trade_metrics: TradeMetrics
+) -> dict[str, Any]:
+    n_trades = int(trade_metrics.count[row])
+    wins = int(trade_metrics.wins[row])
+    initial_cash = equity[0] if equity else 100000.0
+    final_value = equity[-1] if equity else initial_cash
+    return {
+        "total_return": round(float(equity_metrics.total_return[row]) * 100, 4),
+        "annual_return": round(float(equity_metrics.annual_return[row]) * 100, 4),
+        "sharpe_ratio": round(float(equity_metrics.sharpe_ratio[row]), 4),
+        "max_drawdown": round(float(equity_metrics.max_drawdown[row]) * 100, 4),
+        "win_rate": round(wins / n_trades * 100, 2) if n_trades else 0.0,
+        "total_trades": n_trades,
+        "profitable_trades": wins,
+        "losing_trades": n_trades - wins,
+        "initial_cash": initial_cash,
+        "final_value": round(final_value, 2),
+    }
+
+
 def calculate_metrics_from_log_data(
     log_data: dict[str, Any], use_fincore: bool = False
 ) -> dict[str, Any]:
@@ -53,152 +105,36 @@ def calculate_metrics_from_log_data(
             - initial_cash: Initial portfolio value
             - final_value: Final portfolio value
     """
-    equity = log_data.get("equity_curve", [])
-    trades = log_data.get("trades", [])
-
-    # Verify fincore is available if requested
-    source = MetricsSource.MANUAL
-    if use_fincore:
-        try:
-            import fincore  # noqa: F401  # conditional import for availability check
-
-            source = MetricsSource.FINCORE
-        except ImportError:
-            source = MetricsSource.MANUAL
-
-    # Initialize adapter
-    adapter = FincoreAdapter(use_fincore=False)  # Always use consistent formulas
-
-    # Calculate metrics using adapter
-    total_return = _calculate_total_return(adapter, equity)
-    annual_return = _calculate_annual_return(adapter, equity)
-    sharpe_ratio = _calculate_sharpe_ratio(adapter, equity)
-    max_drawdown = _calculate_max_drawdown(adapter, equity)
-    win_rate = _calculate_win_rate(adapter, trades)
-
-    # Trade statistics
-    total_trades = len(trades)
-    profitable_trades = len([t for t in trades if t.get("pnlcomm", 0) > 0])
-    losing_trades = len([t for t in trades if t.get("pnlcomm", 0) <= 0])
-
-    # Portfolio values
-    initial_cash = equity[0] if equity else 100000.0
-    final_value = equity[-1] if equity else initial_cash
-
-    return {
-        "total_return": total_return,
-        "annual_return": annual_return,
-        "sharpe_ratio": sharpe_ratio,
-        "max_drawdown": max_drawdown,
-        "win_rate": win_rate,
-        "total_trades": total_trades,
-        "profitable_trades": profitable_trades,
-        "losing_trades": losing_trades,
-        "initial_cash": initial_cash,
-        "final_value": round(final_value, 2),
-        "metrics_source": source,
-    }
+    return calculate_metrics_batch([log_data], use_fincore=use_fincore)[0]
 
 
-def _calculate_total_return(adapter: FincoreAdapter, equity: list[float]) -> float:
-    """Calculate total return using the adapter.
+def calculate_metrics_batch(
+    log_datas: Sequence[dict[str, Any]], use_fincore: bool = False
+) -> list[dict[str, Any]]:
+    """Calculate basic metrics for many runs in one vectorized pass.
 
     Args:
-        adapter: FincoreAdapter instance.
-        equity: List of portfolio values.
+        log_datas: Parsed log data of each run (see
+            ``calculate_metrics_from_log_data``).
+        use_fincore: Same as in ``calculate_metrics_from_log_data``.
 
     Returns:
-        Total return as percentage.
+        One metrics dict per run, in input order.
     """
-    if len(equity) < 2:
-        return 0.0
-
-    result = adapter.calculate_total_returns(equity)
-    return round(result * 100, 4)  # Convert to percentage
+    source = _metrics_source(use_fincore)
+    curves, equity_metrics, trade_metrics = _compute_batch(log_datas)
+    return [
+        {**_basic_metrics(row, equity, equity_metrics, trade_metrics), "metrics_source": source}
+        for row, equity in enumerate(curves)
+    ]
 
 
-def _calculate_annual_return(adapter: FincoreAdapter, equity: list[float]) -> float:
-    """Calculate annualized return using the adapter.
+def _pct(values: np.ndarray, row: int) -> float:
+    return round(float(values[row]) * 100, 4)
 
-    Args:
-        adapter: FincoreAdapter instance.
-        equity: List of portfolio values.
 
-    Returns:
-        Annualized return as percentage.
-    """
-    if len(equity) < 2:
-        return 0.0
-
-    result = adapter.calculate_annual_returns(equity, periods_per_year=252)
-    return round(result * 100, 4)  # Convert to percentage
-
-
-def _calculate_sharpe_ratio(adapter: FincoreAdapter, equity: list[float]) -> float:
-    """Calculate Sharpe ratio using the adapter.
-
-    Args:
-        adapter: FincoreAdapter instance.
-        equity: List of portfolio values.
-
-    Returns:
-        Sharpe ratio value.
-    """
-    if len(equity) < 2:
-        return 0.0
-
-    # Calculate daily returns
-    returns = []
-    for i in range(1, len(equity)):
-        if equity[i - 1] > 0:
-            returns.append((equity[i] - equity[i - 1]) / equity[i - 1])
-
-    if not returns:
-        return 0.0
-
-    result = adapter.calculate_sharpe_ratio(returns, risk_free_rate=0.02)
-    return round(result, 4)
-
-
-def _calculate_max_drawdown(adapter: FincoreAdapter, equity: list[float]) -> float:
-    """Calculate maximum drawdown using the adapter.
-
-    Args:
-        adapter: FincoreAdapter instance.
-        equity: List of portfolio values.
-
-    Returns:
-        Maximum drawdown as percentage (negative value).
-    """
-    if len(equity) < 2:
-        return 0.0
-
-    result = adapter.calculate_max_drawdown(equity)
-    return round(result * 100, 4)  # Convert to percentage
-
-
-def _calculate_win_rate(adapter: FincoreAdapter, trades: list[dict[str, Any]]) -> float:
-    """Calculate win rate using the adapter.
-
-    Args:
-        adapter: FincoreAdapter instance.
-        trades: List of trade records.
-
-    Returns:
-        Win rate as percentage.
-    """
-    if not trades:
-        return 0.0
-
-    # Win rate calculation is straightforward - use manual calculation
-    # since fincore doesn't have a specific win_rate function
-    winning_trades = sum(1 for t in trades if t.get("pnlcomm", 0) > 0)
-    total_trades = len(trades)
-
-    if total_trades == 0:
-        return 0.0
-
-    return round((winning_trades / total_trades) * 100, 2)  # Convert to percentage
+def _ratio(numerator: float, denominator: float) -> float:
+    return numerator / denominator if denominator > 0 else 0.0
 
 
 def calculate_extended_metrics(
@@ -220,132 +156,102 @@ def calculate_extended_metrics(
     Returns:
         Dict with all metrics. Values are rounded floats; missing data → None.
     """
-    import numpy as np
-
-    equity = log_data.get("equity_curve", [])
-    trades = log_data.get("trades", [])
-
-    ic = initial_cash if initial_cash else (equity[0] if equity else 100000.0)
-    fv = equity[-1] if equity else ic
-
-    # ---- basic ----
-    basic = calculate_metrics_from_log_data(log_data, use_fincore=True)
-
-    # ---- daily returns ----
-    daily_returns: list[float] = []
-    if len(equity) >= 2:
-        for i in range(1, len(equity)):
-            prev = equity[i - 1]
-            daily_returns.append((equity[i] - prev) / prev if prev > 0 else 0.0)
-
-    dr = np.array(daily_returns) if daily_returns else np.array([0.0])
-
-    # ---- weekly / monthly returns (approximate via grouping) ----
-    def _period_returns(period_size: int) -> list[float]:
-        if len(equity) < period_size + 1:
-            return []
-        result = []
-        for start in range(0, len(equity) - 1, period_size):
-            end = min(start + period_size, len(equity) - 1)
-            v0 = equity[start]
-            v1 = equity[end]
-            if v0 > 0:
-                result.append((v1 - v0) / v0)
-        return result
-
-    weekly_returns = _period_returns(5)
-    monthly_returns = _period_returns(21)
-
-    wr = np.array(weekly_returns) if weekly_returns else np.array([0.0])
-    mr = np.array(monthly_returns) if monthly_returns else np.array([0.0])
-
-    # ---- trade-level stats ----
-    win_trades = [t for t in trades if t.get("pnlcomm", 0) > 0]
-    loss_trades = [t for t in trades if t.get("pnlcomm", 0) < 0]
-    total_win = sum(t.get("pnlcomm", 0) for t in win_trades)
-    total_loss = abs(sum(t.get("pnlcomm", 0) for t in loss_trades))
-    total_pnl = sum(t.get("pnlcomm", 0) for t in trades)
-    n_trades = len(trades)
-
-    avg_win = total_win / len(win_trades) if win_trades else 0.0
-    avg_loss = total_loss / len(loss_trades) if loss_trades else 0.0
-
-    # commission / cost
-    total_commission = sum(abs(t.get("commission", 0)) for t in trades)
-
-    # net value = final / initial
-    net_value = fv / ic if ic > 0 else 1.0
-    net_profit = fv - ic
-
-    # profit factor = gross_profit / gross_loss
-    profit_factor = total_win / total_loss if total_loss > 0 else 0.0
-    # profit rate factor = avg_win_rate / avg_loss_rate
-    avg_win_rate = (avg_win / ic * 100) if ic > 0 else 0.0
-    avg_loss_rate = (avg_loss / ic * 100) if ic > 0 else 0.0
-    profit_rate_factor = avg_win_rate / avg_loss_rate if avg_loss_rate > 0 else 0.0
-    # profit_loss_ratio = avg_win / avg_loss
-    profit_loss_ratio = avg_win / avg_loss if avg_loss > 0 else 0.0
-    # profit_loss_rate_ratio = win_rate * avg_win / (loss_rate * avg_loss)
-    win_rate_dec = len(win_trades) / n_trades if n_trades > 0 else 0.0
-    loss_rate_dec = len(loss_trades) / n_trades if n_trades > 0 else 0.0
-    odds = (win_rate_dec * avg_win - loss_rate_dec * avg_loss) / ic * 100 if ic > 0 else 0.0
-
-    # max drawdown value (absolute)
-    max_dd_value = 0.0
-    if len(equity) >= 2:
-        ea = np.array(equity)
-        peak = np.maximum.accumulate(ea)
-        dd_vals = peak - ea
-        max_dd_value = float(np.max(dd_vals))
-
-    # adjusted return/risk ratio = annual_return / abs(max_drawdown)
-    ann_ret = basic.get("annual_return", 0.0)
-    mdd = basic.get("max_drawdown", 0.0)
-    adjusted_rr = ann_ret / abs(mdd) if mdd != 0 else 0.0
-
-    # average profit per trade
-    avg_profit = total_pnl / n_trades if n_trades > 0 else 0.0
-    avg_profit_rate = (avg_profit / ic * 100) if ic > 0 else 0.0
+    return calculate_extended_metrics_batch([log_data], initial_cash=initial_cash)[0]
 
-    return {
-        # --- basic (from calculate_metrics_from_log_data) ---
-        **basic,
-        # --- extended ---
-        "initial_cash": round(ic, 2),
-        "final_value": round(fv, 2),
-        "net_value": round(net_value, 6),
-        "net_profit": round(net_profit, 2),
-        "max_leverage": None,  # requires position sizing data not yet available
-        "max_market_value": None,  # requires position sizing data
-        "max_drawdown_value": round(max_dd_value, 2),
-        "adjusted_return_risk": round(adjusted_rr, 4),
-        "avg_profit": round(avg_profit, 2),
-        "avg_profit_rate": round(avg_profit_rate, 4),
-        "total_win_amount": round(total_win, 2),
-        "total_loss_amount": round(total_loss, 2),
-        "profit_loss_ratio": round(profit_loss_ratio, 4),
-        "profit_factor": round(profit_factor, 4),
-        "profit_rate_factor": round(profit_rate_factor, 4),
-        "profit_loss_rate_ratio": round(
-            (win_rate_dec * profit_loss_ratio) / loss_rate_dec if loss_rate_dec > 0 else 0.0, 4
-        ),
-        "odds": round(odds, 4),
-        # daily
-        "daily_avg_return": round(float(np.mean(dr)) * 100, 4) if len(dr) else 0.0,
-        "daily_max_loss": round(float(np.min(dr)) * 100, 4) if len(dr) else 0.0,
-        "daily_max_profit": round(float(np.max(dr)) * 100, 4) if len(dr) else 0.0,
-        # weekly
-        "weekly_avg_return": round(float(np.mean(wr)) * 100, 4) if len(wr) else 0.0,
-        "weekly_max_loss": round(float(np.min(wr)) * 100, 4) if len(wr) else 0.0,
-        "weekly_max_profit": round(float(np.max(wr)) * 100, 4) if len(wr) else 0.0,
-        # monthly
-        "monthly_avg_return": round(float(np.mean(mr)) * 100, 4) if len(mr) else 0.0,
-        "monthly_max_loss": round(float(np.min(mr)) * 100, 4) if len(mr) else 0.0,
-        "monthly_max_profit": round(float(np.max(mr)) * 100, 4) if len(mr) else 0.0,
-        # misc
-        "trading_cost": round(total_commission, 2),
-        "trading_days": len(equity),
-    }
+
+def calculate_extended_metrics_batch(
+    log_datas: Sequence[dict[str, Any]],
+    initial_cash: float | None = None,
+) -> list[dict[str, Any]]:
+    """Calculate extended metrics for many runs in one vectorized pass.
+
+    Equity curves are stacked into a NaN-padded ``(n_runs, n_bars)`` matrix
+    and trades are concatenated, so scoring N runs costs a handful of NumPy
+    reductions instead of N Python loops.
+
+    Args:
+        log_datas: Parsed log data of each run.
+        initial_cash: Override initial cash for every run if provided.
+
+    Returns:
+        One metrics dict per run, in input order.
+    """
+    source = _metrics_source(True)
+    curves, em, tm = _compute_batch(log_datas)
+    results: list[dict[str, Any]] = []
+    for row, equity in enumerate(curves):
+        basic = _basic_metrics(row, equity, em, tm)
+        basic["metrics_source"] = source
+
+        ic = initial_cash if initial_cash else (equity[0] if equity else 100000.0)
+        fv = equity[-1] if equity else ic
+
+        n_trades = int(tm.count[row])
+        n_wins = int(tm.wins[row])
+        n_losses = int(tm.losses[row])
+        total_win = float(tm.total_win[row])
+        total_loss = float(tm.total_loss[row])
+        total_pnl = float(tm.total_pnl[row])
+
+        avg_win = total_win / n_wins if n_wins else 0.0
+        avg_loss = total_loss / n_losses if n_losses else 0.0
+        avg_win_rate = (avg_win / ic * 100) if ic > 0 else 0.0
+        avg_loss_rate = (avg_loss / ic * 100) if ic > 0 else 0.0
+        profit_loss_ratio = _ratio(avg_win, avg_loss)
+        win_rate_dec = n_wins / n_trades if n_trades > 0 else 0.0
+        loss_rate_dec = n_losses / n_trades if n_trades > 0 else 0.0
+        odds = (win_rate_dec * avg_win - loss_rate_dec * avg_loss) / ic * 100 if ic > 0 else 0.0
+
+        # adjusted return/risk ratio = annual_return / abs(max_drawdown)
+        ann_ret = basic["annual_return"]
+        mdd = basic["max_drawdown"]
+        avg_profit = total_pnl / n_trades if n_trades > 0 else 0.0
+
+        results.append(
+            {
+                # --- basic (from calculate_metrics_from_log_data) ---
+                **basic,
+                # --- extended ---
+                "initial_cash": round(ic, 2),
+                "final_value": round(fv, 2),
+                "net_value": round(fv / ic if ic > 0 else 1.0, 6),
+                "net_profit": round(fv - ic, 2),
+                "max_leverage": None,  # requires position sizing data not yet available
+                "max_market_value": None,  # requires position sizing data
+                "max_drawdown_value": round(float(em.max_drawdown_value[row]), 2),
+                "adjusted_return_risk": round(ann_ret / abs(mdd) if mdd != 0 else 0.0, 4),
+                "avg_profit": round(avg_profit, 2),
+                "avg_profit_rate": round((avg_profit / ic * 100) if ic > 0 else 0.0, 4),
+                "total_win_amount": round(total_win, 2),
+                "total_loss_amount": round(total_loss, 2),
+                "profit_loss_ratio": round(profit_loss_ratio, 4),
+                "profit_factor": round(_ratio(total_win, total_loss), 4),
+                "profit_rate_factor": round(_ratio(avg_win_rate, avg_loss_rate), 4),
+                "profit_loss_rate_ratio": round(
+                    (win_rate_dec * profit_loss_ratio) / loss_rate_dec
+                    if loss_rate_dec > 0
+                    else 0.0,
+                    4,
+                ),
+                "odds": round(odds, 4),
+                # daily
+                "daily_avg_return": _pct(em.daily[0], row),
+                "daily_max_loss": _pct(em.daily[1], row),
+                "daily_max_profit": _pct(em.daily[2], row),
+                # weekly
+                "weekly_avg_return": _pct(em.weekly[0], row),
+                "weekly_max_loss": _pct(em.weekly[1], row),
+                "weekly_max_profit": _pct(em.weekly[2], row),
+                # monthly
+                "monthly_avg_return": _pct(em.monthly[0], row),
+                "monthly_max_loss": _pct(em.monthly[1], row),
+                "monthly_max_profit": _pct(em.monthly[2], row),
+                # misc
+                "trading_cost": round(float(tm.commission[row]), 2),
+                "trading_days": len(equity),
+            }
+        )
+    return results
 
 
 def compare_calculation_methods(log_data: dict[str, Any]) -> dict[str, Any]:
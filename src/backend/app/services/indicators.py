@@ -0,0 +1,265 @@
+"""
+Vectorized technical indicators for K-line charts.
+
+Backtests that do not log their own indicators fall back to indicators
+computed from the stored bars on every ``/kline`` request. ``IndicatorEngine``
+computes them with NumPy instead of per-bar Python loops:
+
+- windowed means (MA, Bollinger bands) use cumulative sums over just the
+  requested window plus its warm-up bars;
+- recursive filters (EMA, MACD, Wilder's RSI/ATR smoothing) are evaluated
+  block by block in closed form, carrying the filter state between blocks,
+  and memoised per engine.
+
+``IndicatorCache`` keeps the engines of recently charted results, so
+zooming or paging through a long series only re-slices cached arrays.
+"""
+
+import math
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Sequence
+from typing import Any
+
+import numpy as np
+
+MA_PERIODS = (5, 10, 20, 60)
+EMA_PERIODS = (12, 26)
+MACD_SIGNAL_PERIOD = 9
+BOLL_PERIOD = 20
+BOLL_WIDTH = 2.0
+RSI_PERIOD = 14
+ATR_PERIOD = 14
+INDICATOR_CACHE_SIZE = 32
+
+# Largest factor ``(1 - alpha) ** -k`` allowed inside one closed-form block.
+_MAX_BLOCK_GAIN = 1e120
+
+
+def sma(values: np.ndarray, period: int, lo: int = 0, hi: int | None = None) -> np.ndarray:
+    """Simple moving average of ``values[lo:hi]`` (NaN until *period* bars)."""
+    hi = len(values) if hi is None else hi
+    start = max(0, lo - period + 1)
+    sums = np.concatenate(([0.0], np.cumsum(values[start:hi])))
+    out = np.full(hi - lo, np.nan)
+    first = max(lo, period - 1)
+    if first < hi:
+        ends = np.arange(first, hi) - start + 1
+        out[first - lo :] = (sums[ends] - sums[ends - period]) / period
+    return out
+
+
+def bollinger(
+    values: np.ndarray,
+    period: int = BOLL_PERIOD,
+    width: float = BOLL_WIDTH,
+    lo: int = 0,
+    hi: int | None = None,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """``(upper, mid, lower)`` bands of ``values[lo:hi]`` (population std)."""
+    hi = len(values) if hi is None else hi
+    start = max(0, lo - period + 1)
+    # Centre before summing squares so E[x^2] - E[x]^2 does not cancel.
+    offset = float(values[start:hi].mean()) if hi > start else 0.0
+    centred = values[start:hi] - offset
+    mean = sma(centred, period, lo - start)
+    mean_sq = sma(centred * centred, period, lo - start)
+    std = np.sqrt(np.maximum(mean_sq - mean * mean, 0.0))
+    mid = mean + offset
+    return mid + width * std, mid, mid - width * std
+
+
+def recursive_mean(values: np.ndarray, alpha: float, period: int) -> np.ndarray:
+    """``y[t] = y[t-1] + alpha * (x[t] - y[t-1])`` seeded with an SMA.
+
+    The seed is the mean of the first *period* values after any leading
+    NaNs; earlier outputs are NaN. Inside a block of ``k`` bars the filter
+    is ``y[s+k] = d**k * (y[s] + alpha * sum(d**-j * x[s+j]))`` with
+    ``d = 1 - alpha``, so each block is one ``cumsum``.
+    """
+    n = len(values)
+    out = np.full(n, np.nan)
+    finite = np.flatnonzero(np.isfinite(values))
+    if not len(finite) or finite[0] + period > n:
+        return out
+    seed_at = int(finite[0]) + period - 1
+    state = float(values[finite[0] : seed_at + 1].mean())
+    out[seed_at] = state
+    decay = 1.0 - alpha
+    if decay <= 0.0:
+        out[seed_at + 1 :] = values[seed_at + 1 :]
+        return out
+
+    block = max(1, int(math.log(_MAX_BLOCK_GAIN) / -math.log(decay)))
+    steps = np.arange(1, min(block, n) + 1)
+    growth = decay ** -steps.astype(float)
+    shrink = decay ** steps.astype(float)
+    pos = seed_at + 1
+    while pos < n:
+        m = min(block, n - pos)
+        acc = np.cumsum(values[pos : pos + m] * growth[:m])
+        out[pos : pos + m] = shrink[:m] * (state + alpha * acc)
+        state = float(out[pos + m - 1])
+        pos += m
+    return out
+
+
+def ema(values: np.ndarray, period: int) -> np.ndarray:
+    return recursive_mean(values, 2.0 / (period + 1), period)
+
+
+def wilder(values: np.ndarray, period: int) -> np.ndarray:
+    """Wilder's smoothing (RSI/ATR), an EMA with ``alpha = 1 / period``."""
+    return recursive_mean(values, 1.0 / period, period)
+
+
+def macd(
+    closes: np.ndarray,
+    fast: int = EMA_PERIODS[0],
+    slow: int = EMA_PERIODS[1],
+    signal: int = MACD_SIGNAL_PERIOD,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """``(macd, signal, histogram)``."""
+    line = ema(closes, fast) - ema(closes, slow)
+    signal_line = ema(line, signal)
+    return line, signal_line, line - signal_line
+
+
+def rsi(closes: np.ndarray, period: int = RSI_PERIOD) -> np.ndarray:
+    # The first bar has no change, so the averages start one bar later.
+    change = np.diff(closes)
+    gain = np.concatenate(([np.nan], wilder(np.maximum(change, 0.0), period)))
+    loss = np.concatenate(([np.nan], wilder(np.maximum(-change, 0.0), period)))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        value = 100.0 - 100.0 / (1.0 + gain / loss)
+    flat = loss == 0
+    value[flat] = np.where(gain[flat] == 0, 50.0, 100.0)
+    return value
+
+
+def atr(
+    highs: np.ndarray, lows: np.ndarray, closes: np.ndarray, period: int = ATR_PERIOD
+) -> np.ndarray:
+    true_range = highs - lows
+    if len(closes) > 1:
+        previous = closes[:-1]
+        true_range[1:] = np.maximum.reduce(
+            [true_range[1:], np.abs(highs[1:] - previous), np.abs(lows[1:] - previous)]
+        )
+    return wilder(true_range, period)
+
+
+def _column(klines: Sequence[dict[str, Any]], key: str) -> np.ndarray:
+    def number(value: Any) -> float:
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return math.nan
+
+    return np.fromiter((number(k.get(key)) for k in klines), dtype=float, count=len(klines))
+
+
+def _as_list(values: np.ndarray) -> list[float | None]:
+    return [None if v != v else v for v in np.round(values, 4).tolist()]
+
+
+class IndicatorEngine:
+    """Chart indicators of one K-line series."""
+
+    def __init__(self, closes: np.ndarray, highs: np.ndarray, lows: np.ndarray) -> None:
+        self.closes = closes
+        self.highs = highs
+        self.lows = lows
+        self._recursive: dict[str, np.ndarray] | None = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_klines(cls, klines: Sequence[dict[str, Any]]) -> "IndicatorEngine":
+        """Build from bar dicts; missing closes count as 0, missing highs/lows as the close."""
+        closes = np.nan_to_num(_column(klines, "close"), nan=0.0)
+        highs = _column(klines, "high")
+        lows = _column(klines, "low")
+        highs = np.where(np.isfinite(highs), highs, closes)
+        lows = np.where(np.isfinite(lows), lows, closes)
+        return cls(closes, highs, lows)
+
+    def __len__(self) -> int:
+        return len(self.closes)
+
+    def _recursive_series(self) -> dict[str, np.ndarray]:
+        with self._lock:
+            if self._recursive is None:
+                line, signal, hist = macd(self.closes)
+                self._recursive = {
+                    **{f"ema{p}": ema(self.closes, p) for p in EMA_PERIODS},
+                    "macd": line,
+                    "macd_signal": signal,
+                    "macd_hist": hist,
+                    f"rsi{RSI_PERIOD}": rsi(self.closes),
+                    f"atr{ATR_PERIOD}": atr(self.highs, self.lows, self.closes),
+                }
+            return self._recursive
+
+    def window(self, lo: int = 0, hi: int | None = None) -> dict[str, list[float | None]]:
+        """Indicator values for bars ``[lo, hi)``, NaN warm-up as ``None``."""
+        n = len(self.closes)
+        hi = n if hi is None else min(max(hi, 0), n)
+        lo = min(max(lo, 0), hi)
+        result: dict[str, list[float | None]] = {}
+        for period in MA_PERIODS:
+            # Short series keep the historical empty MA60.
+            if period == MA_PERIODS[-1] and n < period:
+                result[f"ma{period}"] = []
+            else:
+                result[f"ma{period}"] = _as_list(sma(self.closes, period, lo, hi))
+        upper, mid, lower = bollinger(self.closes, lo=lo, hi=hi)
+        result["boll_upper"] = _as_list(upper)
+        result["boll_mid"] = _as_list(mid)
+        result["boll_lower"] = _as_list(lower)
+        for name, values in self._recursive_series().items():
+            result[name] = _as_list(values[lo:hi])
+        return result
+
+
+class IndicatorCache:
+    """Bounded LRU of ``IndicatorEngine`` per charted result."""
+
+    def __init__(self, max_entries: int = INDICATOR_CACHE_SIZE) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Hashable, tuple[Hashable, IndicatorEngine]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        key: Hashable,
+        fingerprint: Hashable,
+        build: Callable[[], IndicatorEngine],
+    ) -> IndicatorEngine:
+        """Engine cached under *key*, rebuilt when *fingerprint* changed."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == fingerprint:
+                self._entries.move_to_end(key)
+                return entry[1]
+        engine = build()
+        with self._lock:
+            self._entries[key] = (fingerprint, engine)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return engine
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# Global singleton
+_indicator_cache: IndicatorCache | None = None
+
+
+def get_indicator_cache() -> IndicatorCache:
+    global _indicator_cache
+    if _indicator_cache is None:
+        _indicator_cache = IndicatorCache()
+    return _indicator_cache
@@ -12,6 +12,10 @@ Supported log files:
 - run_info.json: run metadata
 - current_position.json: final positions
 - current_position.yaml: final positions
+
+Completed runs also carry ``run_artifact.npz`` (see ``run_artifact``); the
+value/trade/order/data parsers read from it when it is up to date with the text
+logs and fall back to line-by-line parsing otherwise.
 """
 
 import json
@@ -22,7 +26,7 @@ from typing import Any
 
 import numpy as np
 
-from app.services import strategy_runtime_support
+from app.services import run_artifact, strategy_runtime_support
 
 logger = logging.getLogger(__name__)
 
@@ -60,28 +64,38 @@ def _parse_tsv(filepath: Path) -> list[dict[str, str]]:
 
     rows = []
     with open(filepath, encoding="utf-8") as f:
-        header_line = f.readline().strip()
-        if not header_line:
-            return []
-        if header_line.startswith("{") or header_line.startswith("["):
+        headers = _tsv_headers(f.readline())
+        if headers is None:
             return []
-        if "\t" not in header_line:
-            return []
-        headers = header_line.split("\t")
 
         for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            values = line.split("\t")
-            row = {}
-            for i, h in enumerate(headers):
-                row[h] = values[i] if i < len(values) else ""
-            rows.append(row)
+            row = _tsv_row(headers, line)
+            if row is not None:
+                rows.append(row)
 
     return rows
 
 
+def _tsv_headers(header_line: str) -> list[str] | None:
+    """Return TSV column names, or None if the first line is not a TSV header."""
+    header_line = header_line.strip()
+    if not header_line:
+        return None
+    if header_line.startswith("{") or header_line.startswith("["):
+        return None
+    if "\t" not in header_line:
+        return None
+    return header_line.split("\t")
+
+
+def _tsv_row(headers: list[str], line: str) -> dict[str, str] | None:
+    line = line.strip()
+    if not line:
+        return None
+    values = line.split("\t")
+    return {h: values[i] if i < len(values) else "" for i, h in enumerate(headers)}
+
+
 def _parse_json_lines(filepath: Path) -> list[dict[str, Any]]:
     if not filepath.is_file():
         return []
@@ -108,22 +122,28 @@ def _parse_pipe_lines(filepath: Path) -> list[dict[str, str]]:
     rows: list[dict[str, str]] = []
     with open(filepath, encoding="utf-8") as f:
         for line in f:
-            text = line.strip()
-            if not text or "|" not in text:
-                continue
-            parts = [part.strip() for part in text.split("|")]
-            if len(parts) < 2:
-                continue
-            row: dict[str, str] = {"datetime": parts[0], "event": parts[1]}
-            for part in parts[2:]:
-                if not part or "=" not in part:
-                    continue
-                key, value = part.split("=", 1)
-                row[key.strip().lower()] = value.strip()
-            rows.append(row)
+            row = _pipe_row(line)
+            if row is not None:
+                rows.append(row)
     return rows
 
 
+def _pipe_row(line: str) -> dict[str, str] | None:
+    text = line.strip()
+    if not text or "|" not in text:
+        return None
+    parts = [part.strip() for part in text.split("|")]
+    if len(parts) < 2:
+        return None
+    row: dict[str, str] = {"datetime": parts[0], "event": parts[1]}
+    for part in parts[2:]:
+        if not part or "=" not in part:
+            continue
+        key, value = part.split("=", 1)
+        row[key.strip().lower()] = value.strip()
+    return row
+
+
 def _parse_pipe_key_value_lines(filepath: Path) -> list[dict[str, str]]:
     if not filepath.is_file():
         return []
@@ -131,28 +151,34 @@ def _parse_pipe_key_value_lines(filepath: Path) -> list[dict[str, str]]:
     rows: list[dict[str, str]] = []
     with open(filepath, encoding="utf-8") as f:
         for line in f:
-            text = line.strip()
-            if not text or "|" not in text:
-                continue
-            parts = [part.strip() for part in text.split("|")]
-            if len(parts) < 2:
-                continue
-            row: dict[str, str] = {"log_time": parts[0]}
-            unlabeled: list[str] = []
-            for part in parts[1:]:
-                if not part:
-                    continue
-                if "=" in part:
-                    key, value = part.split("=", 1)
-                    row[key.strip()] = value.strip()
-                    continue
-                unlabeled.append(part)
-            if unlabeled:
-                row["event"] = unlabeled[0]
-            rows.append(row)
+            row = _pipe_key_value_row(line)
+            if row is not None:
+                rows.append(row)
     return rows
 
 
+def _pipe_key_value_row(line: str) -> dict[str, str] | None:
+    text = line.strip()
+    if not text or "|" not in text:
+        return None
+    parts = [part.strip() for part in text.split("|")]
+    if len(parts) < 2:
+        return None
+    row: dict[str, str] = {"log_time": parts[0]}
+    unlabeled: list[str] = []
+    for part in parts[1:]:
+        if not part:
+            continue
+        if "=" in part:
+            key, value = part.split("=", 1)
+            row[key.strip()] = value.strip()
+            continue
+        unlabeled.append(part)
+    if unlabeled:
+        row["event"] = unlabeled[0]
+    return row
+
+
 def _normalize_dt_text(value: Any) -> str:
     text = str(value or "").strip()
     return text
@@ -346,6 +372,9 @@ def parse_value_log(log_dir: Path) -> dict[str, Any]:
         - cash_curve: List of cash values.
         - drawdown_curve: List of drawdown percentages.
     """
+    cached = run_artifact.read_artifact_section(log_dir, "value")
+    if cached is not None:
+        return cached
     rows = _parse_tsv(log_dir / "value.log")
     if not rows:
         rows = _parse_json_lines(log_dir / "value.log")
@@ -356,15 +385,28 @@ def parse_value_log(log_dir: Path) -> dict[str, Any]:
     cash = []
 
     for row in rows:
-        dt = _normalize_dt_text(
-            row.get("dt") or row.get("datetime") or row.get("event_time") or row.get("log_time")
-        )
-        dt = _normalize_date_text(dt)
+        dt, value, cash_value = _value_point(row)
         dates.append(dt)
-        equity.append(_safe_float(row.get("value", row.get("broker_value", "0"))))
-        cash.append(_safe_float(row.get("cash", row.get("broker_cash", "0"))))
+        equity.append(value)
+        cash.append(cash_value)
+
+    return _build_value_data(dates, equity, cash)
+
+
+def _value_point(row: dict[str, Any]) -> tuple[str, float, float]:
+    """Return (date, equity, cash) for one value.log row."""
+    dt = _normalize_dt_text(
+        row.get("dt") or row.get("datetime") or row.get("event_time") or row.get("log_time")
+    )
+    return (
+        _normalize_date_text(dt),
+        _safe_float(row.get("value", row.get("broker_value", "0"))),
+        _safe_float(row.get("cash", row.get("broker_cash", "0"))),
+    )
+
 
-    # Calculate drawdown curve
+def _build_value_data(dates: list[str], equity: list[float], cash: list[float]) -> dict[str, Any]:
+    """Assemble the parse_value_log payload, deriving the drawdown curve."""
     drawdown = []
     peak = 0.0
     for v in equity:
@@ -404,89 +446,99 @@ def parse_trade_log(log_dir: Path) -> list[dict[str, Any]]:
     Returns:
         A list of trade record dictionaries.
     """
+    cached = run_artifact.read_artifact_section(log_dir, "trades")
+    if cached is not None:
+        return cached
     rows = _parse_tsv(log_dir / "trade.log")
     if not rows:
         json_rows = _parse_json_lines(log_dir / "trade.log")
         pipe_rows = _parse_pipe_lines(log_dir / "trade.log") if not json_rows else []
         if not json_rows and not pipe_rows:
             return []
+        return _trades_from_event_rows(json_rows or pipe_rows)
+    return _trades_from_tsv_rows(rows)
+
+
+def _trades_from_event_rows(source_rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Pair OPEN/CLOSED events (JSON or pipe trade.log) into closed trade records."""
+    grouped: dict[int, dict[str, Any]] = {}
+    ungrouped_index = 1000000
+    for row in source_rows:
+        ref = int(_safe_float(row.get("ref", ungrouped_index), float(ungrouped_index)))
+        if ref == ungrouped_index:
+            ungrouped_index += 1
+        item = grouped.setdefault(ref, {"ref": ref})
+        dt_value = _normalize_dt_text(
+            row.get("datetime") or row.get("event_time") or row.get("log_time")
+        )
+        event = str(row.get("event", "")).strip().upper()
+        is_open = _is_truthy(row.get("isopen")) or event == "OPEN"
+        is_closed = _is_truthy(row.get("isclosed")) or event == "CLOSED"
+        data_name = row.get("data_name") or row.get("data") or item.get("data_name", "")
+        if is_open:
+            item["dtopen"] = dt_value
+            item["open_size"] = _safe_float(row.get("size", 0.0))
+            item["open_price"] = _safe_float(row.get("price", 0.0))
+            item["open_value"] = _safe_float(row.get("value", 0.0))
+            item["data_name"] = data_name
+        if is_closed:
+            item["dtclose"] = dt_value
+            item["close_price"] = _safe_float(row.get("price", 0.0))
+            item["pnl"] = _safe_float(row.get("pnl", 0.0))
+            item["pnlcomm"] = _safe_float(row.get("pnlcomm", item.get("pnl", 0.0)))
+            item["commission_close"] = _safe_float(row.get("commission", 0.0))
+            if not item["commission_close"]:
+                item["commission_close"] = abs(
+                    _safe_float(row.get("pnl", 0.0))
+                    - _safe_float(row.get("pnlcomm", row.get("pnl", 0.0)))
+                )
+            item["barlen"] = int(_safe_float(row.get("barlen", 0)))
+            item["data_name"] = data_name
+        item["commission_open"] = item.get("commission_open", 0.0) + (
+            _safe_float(row.get("commission", 0.0)) if is_open else 0.0
+        )
+        size_for_direction = _safe_float(row.get("size", item.get("open_size", 0.0)), 0.0)
+        if is_open or "direction" not in item:
+            item["direction"] = "buy" if size_for_direction >= 0 else "sell"
+
+    trades: list[dict[str, Any]] = []
+    for item in sorted(
+        grouped.values(),
+        key=lambda payload: payload.get("dtclose") or payload.get("dtopen") or "",
+    ):
+        if not item.get("dtclose"):
+            continue
+        open_size = abs(_safe_float(item.get("open_size", 0.0), 0.0))
+        commission = _safe_float(item.get("commission_open", 0.0), 0.0) + _safe_float(
+            item.get("commission_close", 0.0),
+            0.0,
+        )
+        open_price = _safe_float(item.get("open_price", item.get("close_price", 0.0)), 0.0)
+        open_value = _safe_float(item.get("open_value", 0.0), 0.0)
+        if open_value <= 0 and open_size > 0 and open_price > 0:
+            open_value = open_size * open_price
+        trades.append(
+            {
+                "ref": int(item.get("ref", 0)),
+                "datetime": _normalize_date_text(item.get("dtclose")),
+                "dtopen": _normalize_dt_text(item.get("dtopen")),
+                "dtclose": _normalize_dt_text(item.get("dtclose")),
+                "data_name": str(item.get("data_name", "")),
+                "direction": item.get("direction", "buy"),
+                "size": open_size,
+                "price": round(open_price, 4),
+                "value": round(abs(open_value), 2),
+                "commission": round(commission, 4),
+                "pnl": round(_safe_float(item.get("pnl", 0.0)), 2),
+                "pnlcomm": round(_safe_float(item.get("pnlcomm", item.get("pnl", 0.0))), 2),
+                "barlen": int(_safe_float(item.get("barlen", 0))),
+            }
+        )
+    return trades
 
-        grouped: dict[int, dict[str, Any]] = {}
-        ungrouped_index = 1000000
-        source_rows = json_rows or pipe_rows
-        for row in source_rows:
-            ref = int(_safe_float(row.get("ref", ungrouped_index), float(ungrouped_index)))
-            if ref == ungrouped_index:
-                ungrouped_index += 1
-            item = grouped.setdefault(ref, {"ref": ref})
-            dt_value = _normalize_dt_text(
-                row.get("datetime") or row.get("event_time") or row.get("log_time")
-            )
-            event = str(row.get("event", "")).strip().upper()
-            is_open = _is_truthy(row.get("isopen")) or event == "OPEN"
-            is_closed = _is_truthy(row.get("isclosed")) or event == "CLOSED"
-            data_name = row.get("data_name") or row.get("data") or item.get("data_name", "")
-            if is_open:
-                item["dtopen"] = dt_value
-                item["open_size"] = _safe_float(row.get("size", 0.0))
-                item["open_price"] = _safe_float(row.get("price", 0.0))
-                item["open_value"] = _safe_float(row.get("value", 0.0))
-                item["data_name"] = data_name
-            if is_closed:
-                item["dtclose"] = dt_value
-                item["close_price"] = _safe_float(row.get("price", 0.0))
-                item["pnl"] = _safe_float(row.get("pnl", 0.0))
-                item["pnlcomm"] = _safe_float(row.get("pnlcomm", item.get("pnl", 0.0)))
-                item["commission_close"] = _safe_float(row.get("commission", 0.0))
-                if not item["commission_close"]:
-                    item["commission_close"] = abs(
-                        _safe_float(row.get("pnl", 0.0))
-                        - _safe_float(row.get("pnlcomm", row.get("pnl", 0.0)))
-                    )
-                item["barlen"] = int(_safe_float(row.get("barlen", 0)))
-                item["data_name"] = data_name
-            item["commission_open"] = item.get("commission_open", 0.0) + (
-                _safe_float(row.get("commission", 0.0)) if is_open else 0.0
-            )
-            size_for_direction = _safe_float(row.get("size", item.get("open_size", 0.0)), 0.0)
-            if is_open or "direction" not in item:
-                item["direction"] = "buy" if size_for_direction >= 0 else "sell"
-
-        trades: list[dict[str, Any]] = []
-        for item in sorted(
-            grouped.values(),
-            key=lambda payload: payload.get("dtclose") or payload.get("dtopen") or "",
-        ):
-            if not item.get("dtclose"):
-                continue
-            open_size = abs(_safe_float(item.get("open_size", 0.0), 0.0))
-            commission = _safe_float(item.get("commission_open", 0.0), 0.0) + _safe_float(
-                item.get("commission_close", 0.0),
-                0.0,
-            )
-            open_price = _safe_float(item.get("open_price", item.get("close_price", 0.0)), 0.0)
-            open_value = _safe_float(item.get("open_value", 0.0), 0.0)
-            if open_value <= 0 and open_size > 0 and open_price > 0:
-                open_value = open_size * open_price
-            trades.append(
-                {
-                    "ref": int(item.get("ref", 0)),
-                    "datetime": _normalize_date_text(item.get("dtclose")),
-                    "dtopen": _normalize_dt_text(item.get("dtopen")),
-                    "dtclose": _normalize_dt_text(item.get("dtclose")),
-                    "data_name": str(item.get("data_name", "")),
-                    "direction": item.get("direction", "buy"),
-                    "size": open_size,
-                    "price": round(open_price, 4),
-                    "value": round(abs(open_value), 2),
-                    "commission": round(commission, 4),
-                    "pnl": round(_safe_float(item.get("pnl", 0.0)), 2),
-                    "pnlcomm": round(_safe_float(item.get("pnlcomm", item.get("pnl", 0.0))), 2),
-                    "barlen": int(_safe_float(item.get("barlen", 0))),
-                }
-            )
-        return trades
 
+def _trades_from_tsv_rows(rows: list[dict[str, str]]) -> list[dict[str, Any]]:
+    """Convert closed rows of a TSV trade.log into trade records."""
     trades = []
 
     for row in rows:
@@ -523,6 +575,9 @@ def parse_order_log(log_dir: Path) -> list[dict[str, Any]]:
     Returns:
         A list of completed order dictionaries.
     """
+    cached = run_artifact.read_artifact_section(log_dir, "orders")
+    if cached is not None:
+        return cached
     rows = _parse_tsv(log_dir / "order.log")
     if not rows:
         json_rows = _parse_json_lines(log_dir / "order.log")
@@ -594,6 +649,9 @@ def parse_data_log(log_dir: Path) -> dict[str, Any]:
         - volumes: List of volume values.
         - indicators: Dictionary of indicator values by column name.
     """
+    cached = run_artifact.read_artifact_section(log_dir, "kline")
+    if cached is not None:
+        return cached
     rows = _parse_tsv(log_dir / "data.log")
     if not rows:
         bar_rows = _parse_json_lines(log_dir / "bar.log")
@@ -858,28 +916,13 @@ def parse_run_info(log_dir: Path) -> dict[str, Any]:
         return {}
 
 
-def parse_log_dir(log_dir: Path, strategy_dir: Path | None = None) -> dict[str, Any] | None:
-    strategy_root = strategy_dir
-    if strategy_root is None:
-        if log_dir.name == "logs":
-            strategy_root = log_dir.parent
-        elif log_dir.parent.name == "logs":
-            strategy_root = log_dir.parent.parent
-        else:
-            strategy_root = log_dir.parent
-
-    value_data = parse_value_log(log_dir)
-    trades = parse_trade_log(log_dir)
-    orders = parse_order_log(log_dir)
-    kline_data = parse_data_log(log_dir)
-    run_info = parse_run_info(log_dir)
-    positions = parse_position_log(log_dir)
-    if not positions:
-        positions = parse_current_position(log_dir)
-    if not value_data.get("equity_curve"):
-        value_data = _synthesize_value_curve(strategy_root, kline_data, positions, trades, run_info)
+def summarize_equity_curve(equity: list[float]) -> dict[str, float]:
+    """Headline return metrics for a per-bar equity curve.
 
-    equity = value_data.get("equity_curve", [])
+    Shared by the log parser and in-process optimization trials, so both
+    report the same ``total_return``/``annual_return`` (percent) and
+    annualized ``sharpe_ratio`` for the same curve.
+    """
     initial_cash = equity[0] if equity else 100000.0
     final_value = equity[-1] if equity else initial_cash
 
@@ -893,16 +936,12 @@ def parse_log_dir(log_dir: Path, strategy_dir: Path | None = None) -> dict[str,
         else 0.0
     )
 
-    max_drawdown = (
-        max(value_data.get("drawdown_curve", [0.0])) if value_data.get("drawdown_curve") else 0.0
-    )
-
     if len(equity) > 1:
-        returns = []
-        for i in range(1, len(equity)):
-            if equity[i - 1] > 0:
-                returns.append((equity[i] - equity[i - 1]) / equity[i - 1])
-        if returns:
+        equity_arr = np.asarray(equity, dtype=np.float64)
+        prev = equity_arr[:-1]
+        valid = prev > 0
+        returns = (equity_arr[1:][valid] - prev[valid]) / prev[valid]
+        if returns.size:
             avg_ret = np.mean(returns)
             std_ret = np.std(returns)
             sharpe_ratio = (avg_ret / std_ret * (252**0.5)) if std_ret > 0 else 0.0
@@ -911,6 +950,82 @@ def parse_log_dir(log_dir: Path, strategy_dir: Path | None = None) -> dict[str,
     else:
         sharpe_ratio = 0.0
 
+    return {
+        "initial_cash": initial_cash,
+        "final_value": round(final_value, 2),
+        "total_return": round(total_return, 4),
+        "annual_return": round(annual_return, 4),
+        "sharpe_ratio": round(float(sharpe_ratio), 4),
+    }
+
+
+def parse_log_dir(
+    log_dir: Path,
+    strategy_dir: Path | None = None,
+    write_artifact: bool = False,
+    preparsed: dict[str, Any] | None = None,
+) -> dict[str, Any] | None:
+    """Parse a run's log directory into curves, trades, orders, kline and metrics.
+
+    Args:
+        log_dir: The log directory path.
+        strategy_dir: Strategy root used to resolve the initial cash when the
+            equity curve has to be synthesized. Derived from ``log_dir`` if omitted.
+        write_artifact: Store the parsed sections as ``run_artifact.npz`` when
+            they had to be parsed from text, so later reads skip the text logs.
+            Only set this for runs that have finished writing logs.
+        preparsed: Sections already parsed while the run was being tailed
+            (``"value"`` and/or ``"trades"``); those logs are not re-read.
+
+    Returns:
+        The parsed result dictionary.
+    """
+    strategy_root = strategy_dir
+    if strategy_root is None:
+        if log_dir.name == "logs":
+            strategy_root = log_dir.parent
+        elif log_dir.parent.name == "logs":
+            strategy_root = log_dir.parent.parent
+        else:
+            strategy_root = log_dir.parent
+
+    sections = run_artifact.load_run_artifact(log_dir)
+    if sections is not None:
+        value_data = sections["value"]
+        trades = sections["trades"]
+        orders = sections["orders"]
+        kline_data = sections["kline"]
+        run_info = sections["run_info"]
+    else:
+        preparsed = preparsed or {}
+        value_data = preparsed.get("value") or parse_value_log(log_dir)
+        trades = preparsed.get("trades")
+        if trades is None:
+            trades = parse_trade_log(log_dir)
+        orders = parse_order_log(log_dir)
+        kline_data = parse_data_log(log_dir)
+        run_info = parse_run_info(log_dir)
+        if write_artifact:
+            run_artifact.write_run_artifact(
+                log_dir,
+                value=value_data,
+                trades=trades,
+                orders=orders,
+                kline=kline_data,
+                run_info=run_info,
+            )
+    if not value_data.get("equity_curve"):
+        positions = parse_position_log(log_dir)
+        if not positions:
+            positions = parse_current_position(log_dir)
+        value_data = _synthesize_value_curve(strategy_root, kline_data, positions, trades, run_info)
+
+    equity = value_data.get("equity_curve", [])
+    summary = summarize_equity_curve(equity)
+    max_drawdown = (
+        max(value_data.get("drawdown_curve", [0.0])) if value_data.get("drawdown_curve") else 0.0
+    )
+
     total_trades = len(trades)
     profitable_trades = len([t for t in trades if t.get("pnlcomm", 0) > 0])
     losing_trades = len([t for t in trades if t.get("pnlcomm", 0) <= 0])
@@ -919,16 +1034,16 @@ def parse_log_dir(log_dir: Path, strategy_dir: Path | None = None) -> dict[str,
     return {
         "run_info": run_info,
         "log_dir": str(log_dir),
-        "total_return": round(total_return, 4),
-        "annual_return": round(annual_return, 4),
-        "sharpe_ratio": round(sharpe_ratio, 4),
+        "total_return": summary["total_return"],
+        "annual_return": summary["annual_return"],
+        "sharpe_ratio": summary["sharpe_ratio"],
         "max_drawdown": round(max_drawdown, 4),
         "win_rate": round(win_rate, 2),
         "total_trades": total_trades,
         "profitable_trades": profitable_trades,
         "losing_trades": losing_trades,
-        "initial_cash": initial_cash,
-        "final_value": round(final_value, 2),
+        "initial_cash": summary["initial_cash"],
+        "final_value": summary["final_value"],
         "equity_curve": equity,
         "equity_dates": value_data.get("dates", []),
         "cash_curve": value_data.get("cash_curve", []),
@@ -0,0 +1,291 @@
+"""
+Vectorized performance metrics engine.
+
+All equity-based metrics are computed from one ``(n_runs, n_bars)`` float
+matrix in a single pass; shorter runs are right-padded with ``NaN`` and every
+reduction is NaN-aware, so a single backtest is simply a batch of one.
+Trade statistics are computed the same way from the concatenated per-run
+trade arrays (``np.bincount`` over run ids instead of per-run loops).
+
+The formulas reproduce the ones ``FincoreAdapter`` and
+``fincore_metrics_helper`` have always used:
+
+- Sharpe: mean/std (population) of per-bar simple returns minus the
+  risk-free rate, bars whose previous value is not positive are skipped.
+- Max drawdown: ``min((equity - running_peak) / running_peak)``.
+- Annual return: ``(1 + total_return) ** (periods_per_year / n_bars) - 1``.
+- Weekly/monthly returns: equity change over consecutive 5/21-bar windows.
+"""
+
+from __future__ import annotations
+
+import warnings
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+WEEK_BARS = 5
+MONTH_BARS = 21
+
+
+def as_equity_matrix(curves: Sequence[Sequence[float]]) -> tuple[np.ndarray, np.ndarray]:
+    """Stack equity curves into a NaN-padded matrix.
+
+    Returns:
+        ``(matrix, lengths)`` with ``matrix.shape == (len(curves), max_len)``.
+    """
+    lengths = np.fromiter((len(curve) for curve in curves), dtype=np.int64, count=len(curves))
+    width = int(lengths.max()) if len(lengths) else 0
+    matrix = np.full((len(curves), width), np.nan, dtype=np.float64)
+    for row, curve in enumerate(curves):
+        if len(curve):
+            matrix[row, : len(curve)] = np.asarray(curve, dtype=np.float64)
+    return matrix, lengths
+
+
+def _row_last(matrix: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    if matrix.shape[1] == 0:
+        return np.full(len(lengths), np.nan)
+    index = np.clip(lengths - 1, 0, None)
+    return matrix[np.arange(len(lengths)), index]
+
+
+@contextmanager
+def _ignore_nan_warnings() -> Iterator[None]:
+    """Silence 'Mean of empty slice' style warnings for all-NaN rows."""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        yield
+
+
+def _nan_stats(values: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Row-wise (mean, min, max) ignoring NaN; rows without values give 0."""
+    if values.shape[1] == 0:
+        zeros = np.zeros(len(values))
+        return zeros, zeros.copy(), zeros.copy()
+    has_any = ~np.all(np.isnan(values), axis=1)
+    with _ignore_nan_warnings():
+        stats = (np.nanmean(values, axis=1), np.nanmin(values, axis=1), np.nanmax(values, axis=1))
+    return tuple(np.where(has_any, stat, 0.0) for stat in stats)  # type: ignore[return-value]
+
+
+def simple_returns(matrix: np.ndarray, *, keep_nonpositive_prev: bool = False) -> np.ndarray:
+    """Per-bar simple returns, shape ``(n_runs, n_bars - 1)``.
+
+    Bars whose previous value is not positive are ``NaN`` (skipped) or ``0.0``
+    when ``keep_nonpositive_prev`` is set; padding stays ``NaN``.
+    """
+    if matrix.shape[1] < 2:
+        return np.empty((matrix.shape[0], 0))
+    prev = matrix[:, :-1]
+    cur = matrix[:, 1:]
+    valid = ~np.isnan(prev) & ~np.isnan(cur)
+    positive = valid & (prev > 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = np.where(positive, (cur - prev) / np.where(positive, prev, 1.0), np.nan)
+    if keep_nonpositive_prev:
+        returns = np.where(valid & ~positive, 0.0, returns)
+    return returns
+
+
+def sharpe_from_returns(returns: np.ndarray, risk_free_rate: float = 0.0) -> np.ndarray:
+    """Row-wise non-annualized Sharpe ratio of a NaN-padded returns matrix."""
+    excess = returns - risk_free_rate
+    counts = np.sum(~np.isnan(excess), axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"), _ignore_nan_warnings():
+        mean = np.nanmean(excess, axis=1) if excess.shape[1] else np.zeros(len(excess))
+        std = np.nanstd(excess, axis=1) if excess.shape[1] else np.zeros(len(excess))
+        sharpe = mean / std
+    return np.where((counts > 0) & (std != 0) & np.isfinite(sharpe), sharpe, 0.0)
+
+
+def drawdowns(matrix: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Return ``(running_peak, drawdown_fraction)``; drawdown is <= 0."""
+    peak = np.fmax.accumulate(matrix, axis=1) if matrix.shape[1] else matrix
+    with np.errstate(divide="ignore", invalid="ignore"):
+        drawdown = (matrix - peak) / peak
+    return peak, drawdown
+
+
+def drawdown_duration(matrix: np.ndarray, drawdown: np.ndarray, peak: np.ndarray) -> np.ndarray:
+    """Bars since the last strictly higher peak at the deepest drawdown point."""
+    n_runs, width = matrix.shape
+    if width == 0:
+        return np.zeros(n_runs, dtype=np.int64)
+    positions = np.arange(width)
+    prev_peak = np.concatenate([matrix[:, :1], peak[:, :-1]], axis=1)
+    new_high = np.zeros_like(matrix, dtype=bool)
+    new_high[:, 1:] = matrix[:, 1:] > prev_peak[:, 1:]
+    # Index of the most recent new high (or -1 before the first one).
+    last_reset = np.maximum.accumulate(np.where(new_high, positions, -1), axis=1)
+    duration = np.where(new_high, 0, positions - last_reset)
+    dd = np.where(new_high | np.isnan(matrix), 0.0, np.where(peak > 0, drawdown, 0.0))
+    deepest = np.argmin(dd, axis=1)
+    rows = np.arange(n_runs)
+    return np.where(dd[rows, deepest] < 0, duration[rows, deepest], 0).astype(np.int64)
+
+
+def window_returns(matrix: np.ndarray, lengths: np.ndarray, window: int) -> np.ndarray:
+    """Equity change over consecutive ``window``-bar spans, ``NaN`` where undefined.
+
+    Windows start every ``window`` bars and end ``window`` bars later (or at
+    the last bar); runs shorter than ``window + 1`` bars have no windows.
+    """
+    n_runs, width = matrix.shape
+    if width < 2:
+        return np.empty((n_runs, 0))
+    starts = np.arange(0, width - 1, window)
+    last = (lengths - 1)[:, None]
+    ends = np.minimum(starts[None, :] + window, last)
+    valid = (starts[None, :] < last) & (lengths[:, None] >= window + 1)
+    v0 = matrix[:, starts]
+    v1 = np.take_along_axis(matrix, np.clip(ends, 0, None), axis=1)
+    valid &= v0 > 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(valid, (v1 - v0) / np.where(valid, v0, 1.0), np.nan)
+
+
+def compounded_returns(returns: Sequence[float], window: int) -> np.ndarray:
+    """Compound consecutive ``window``-sized chunks of returns, as percentages."""
+    values = np.asarray(returns, dtype=np.float64)
+    if values.size == 0:
+        return values
+    starts = np.arange(0, values.size, window)
+    return (np.multiply.reduceat(1.0 + values, starts) - 1.0) * 100
+
+
+def max_consecutive(flags: np.ndarray) -> int:
+    """Length of the longest run of True values."""
+    if flags.size == 0 or not flags.any():
+        return 0
+    padded = np.concatenate(([0], flags.astype(np.int8), [0]))
+    edges = np.flatnonzero(np.diff(padded))
+    return int((edges[1::2] - edges[::2]).max())
+
+
+@dataclass
+class EquityMetrics:
+    """Equity-curve metrics, one array element per run (decimals, not percent)."""
+
+    lengths: np.ndarray
+    initial: np.ndarray
+    final: np.ndarray
+    total_return: np.ndarray
+    annual_return: np.ndarray
+    sharpe_ratio: np.ndarray
+    max_drawdown: np.ndarray
+    max_drawdown_value: np.ndarray
+    max_drawdown_duration: np.ndarray
+    max_value: np.ndarray
+    daily: tuple[np.ndarray, np.ndarray, np.ndarray]
+    weekly: tuple[np.ndarray, np.ndarray, np.ndarray]
+    monthly: tuple[np.ndarray, np.ndarray, np.ndarray]
+
+
+def compute_equity_metrics(
+    matrix: np.ndarray,
+    lengths: np.ndarray,
+    *,
+    periods_per_year: int = 252,
+    risk_free_rate: float = 0.02,
+) -> EquityMetrics:
+    """Compute every equity-based metric for a batch of runs in one pass."""
+    n_runs = matrix.shape[0]
+    enough = lengths >= 2
+    initial = matrix[:, 0] if matrix.shape[1] else np.full(n_runs, np.nan)
+    final = _row_last(matrix, lengths)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        total = np.where(enough & (initial != 0), (final - initial) / initial, 0.0)
+        annual = np.where(
+            enough & (initial != 0),
+            (1 + total) ** (periods_per_year / np.maximum(lengths, 1)) - 1,
+            0.0,
+        )
+    annual = np.where(np.isfinite(annual), annual, 0.0)
+
+    returns = simple_returns(matrix)
+    sharpe = np.where(enough, sharpe_from_returns(returns, risk_free_rate), 0.0)
+
+    peak, drawdown = drawdowns(matrix)
+    with _ignore_nan_warnings():
+        mdd = np.nanmin(drawdown, axis=1) if matrix.shape[1] else np.zeros(n_runs)
+        mdd_value = np.nanmax(peak - matrix, axis=1) if matrix.shape[1] else np.zeros(n_runs)
+        max_value = np.nanmax(matrix, axis=1) if matrix.shape[1] else np.zeros(n_runs)
+    mdd = np.where(enough, mdd, 0.0)
+    mdd_value = np.where(enough, mdd_value, 0.0)
+    duration = np.where(enough, drawdown_duration(matrix, drawdown, peak), 0)
+
+    daily_returns = simple_returns(matrix, keep_nonpositive_prev=True)
+    return EquityMetrics(
+        lengths=lengths,
+        initial=initial,
+        final=final,
+        total_return=total,
+        annual_return=annual,
+        sharpe_ratio=sharpe,
+        max_drawdown=mdd,
+        max_drawdown_value=mdd_value,
+        max_drawdown_duration=duration,
+        max_value=np.where(np.isnan(max_value), 0.0, max_value),
+        daily=_nan_stats(daily_returns),
+        weekly=_nan_stats(window_returns(matrix, lengths, WEEK_BARS)),
+        monthly=_nan_stats(window_returns(matrix, lengths, MONTH_BARS)),
+    )
+
+
+@dataclass
+class TradeMetrics:
+    """Trade statistics, one array element per run."""
+
+    count: np.ndarray
+    wins: np.ndarray
+    losses: np.ndarray
+    total_win: np.ndarray
+    total_loss: np.ndarray
+    total_pnl: np.ndarray
+    commission: np.ndarray
+
+
+def _trade_value(trade: Any, key: str) -> float:
+    value = trade.get(key, 0) if isinstance(trade, dict) else getattr(trade, key, 0)
+    try:
+        return float(value or 0.0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def trade_arrays(trades: Sequence[Any], key: str = "pnlcomm") -> np.ndarray:
+    """Extract one numeric field of a trade list as a float array."""
+    return np.fromiter((_trade_value(t, key) for t in trades), dtype=np.float64, count=len(trades))
+
+
+def compute_trade_metrics(trade_lists: Sequence[Sequence[Any]]) -> TradeMetrics:
+    """Aggregate win/loss/commission statistics for a batch of runs.
+
+    Losses count strictly negative ``pnlcomm`` values; ``total_loss`` is positive.
+    """
+    n_runs = len(trade_lists)
+    counts = np.fromiter((len(t) for t in trade_lists), dtype=np.int64, count=n_runs)
+    run_ids = np.repeat(np.arange(n_runs), counts)
+    flat = [trade for trades in trade_lists for trade in trades]
+    pnl = trade_arrays(flat, "pnlcomm")
+    commission = np.abs(trade_arrays(flat, "commission"))
+    win = pnl > 0
+    loss = pnl < 0
+
+    def _sum(values: np.ndarray) -> np.ndarray:
+        return np.bincount(run_ids, weights=values, minlength=n_runs)
+
+    return TradeMetrics(
+        count=counts,
+        wins=np.bincount(run_ids[win], minlength=n_runs),
+        losses=np.bincount(run_ids[loss], minlength=n_runs),
+        total_win=_sum(np.where(win, pnl, 0.0)),
+        total_loss=np.abs(_sum(np.where(loss, pnl, 0.0))),
+        total_pnl=_sum(pnl),
+        commission=_sum(commission),
+    )
@@ -8,7 +8,6 @@ Supports:
 - System monitoring
 """
 
-import asyncio
 import json
 import logging
 import urllib.error
@@ -16,7 +15,6 @@ import urllib.request
 from datetime import datetime, timezone
 from typing import Any
 
-from app.config import get_settings
 from app.db.sql_repository import SQLRepository
 from app.models.alerts import (
     Alert,
@@ -26,6 +24,7 @@ from app.models.alerts import (
     AlertStatus,
     AlertType,
 )
+from app.services.alert_engine import get_alert_engine
 from app.services.alert_evaluation import (
     compare_values,
     get_current_metric_value,
@@ -58,11 +57,8 @@ class MonitoringService:
         self.backtest_service = BacktestService()
         self.paper_trading_service = PaperTradingService()
 
-        # In-memory monitoring task registry (per-process).
-        #
-        # Note: this is intentionally kept in-memory; for production usage you would
-        # likely want a proper scheduler and persistent state.
-        self._monitoring_tasks: dict[str, asyncio.Task] = {}
+        # Rules are evaluated by the process-wide AlertEngine; this instance
+        # only notifies it of rule changes.
         self._running = False
         self._trigger_state: dict[str, Any] = {}
 
@@ -125,8 +121,8 @@ class MonitoringService:
     ) -> AlertRule | None:
         """Updates an existing alert rule and manages monitoring state.
 
-        Stops monitoring if the rule becomes inactive and starts monitoring
-        if an inactive rule becomes active.
+        Stops monitoring if the rule becomes inactive; active rules are
+        re-registered with the alert engine so it sees the new configuration.
 
         Args:
             rule_id: The unique identifier of the alert rule to update.
@@ -140,8 +136,6 @@ class MonitoringService:
         if not rule or rule.user_id != user_id:
             return None
 
-        was_active = bool(getattr(rule, "is_active", False))
-
         # Stop monitoring if the rule becomes inactive.
         if not update_data.get("is_active", True) and rule.is_active:
             await self._stop_monitoring(rule_id)
@@ -149,8 +143,9 @@ class MonitoringService:
         # Update the rule with new data.
         rule = await self.alert_rule_repo.update(rule_id, update_data)
 
-        # If the rule was inactive and becomes active, start monitoring.
-        if bool(getattr(rule, "is_active", False)) and not was_active:
+        # If the rule is (still or newly) active, (re)register it so the
+        # engine evaluates the updated configuration.
+        if rule and bool(getattr(rule, "is_active", False)):
             await self._start_monitoring(rule.id)
 
         return rule
@@ -308,87 +303,34 @@ class MonitoringService:
         return alert
 
     async def _start_monitoring(self, rule_id: str):
-        """Starts a background monitoring loop for an alert rule.
+        """Registers an active alert rule with the shared alert engine.
+
+        Also used after updates, so the engine picks up the new configuration.
+        In a worker that does not run the engine, the change reaches it
+        through the engine's rule sync instead.
 
         Args:
             rule_id: The unique identifier of the alert rule to monitor.
         """
-        if rule_id in self._monitoring_tasks:
-            logger.warning(f"Monitoring task already exists: {rule_id}")
-            return
-
         rule = await self.alert_rule_repo.get_by_id(rule_id)
+        engine = get_alert_engine()
         if not rule or not rule.is_active:
+            engine.remove(rule_id)
             return
 
-        # Create the monitoring task.
-        task = asyncio.create_task(self._monitor_task(rule_id))
+        engine.upsert(rule)
 
-        self._monitoring_tasks[rule_id] = task
-
-        logger.info(f"Started monitoring task: {rule_id}")
+        logger.info(f"Started monitoring rule: {rule_id}")
 
     async def _stop_monitoring(self, rule_id: str):
-        """Stops a background monitoring loop for an alert rule.
+        """Removes an alert rule from the shared alert engine.
 
         Args:
             rule_id: The unique identifier of the alert rule to stop monitoring.
         """
-        if rule_id in self._monitoring_tasks:
-            task = self._monitoring_tasks[rule_id]
-            task.cancel()
-            del self._monitoring_tasks[rule_id]
-
-            logger.info(f"Stopped monitoring task: {rule_id}")
-
-    async def _monitor_task(self, rule_id: str):
-        """Background monitoring loop for a single alert rule.
-
-        Periodically checks if the rule's trigger conditions are met and
-        triggers alerts when necessary. Sleep intervals vary by alert type.
-
-        Args:
-            rule_id: The unique identifier of the alert rule to monitor.
-        """
-        rule = await self.alert_rule_repo.get_by_id(rule_id)
-        if not rule or not rule.is_active:
-            logger.info(f"Rule not active, stopping monitoring: {rule_id}")
-            return
+        get_alert_engine().remove(rule_id)
 
-        logger.info(f"Monitoring task started for rule: {rule_id}")
-
-        while True:
-            try:
-                # Fetch the latest rule configuration.
-                rule = await self.alert_rule_repo.get_by_id(rule_id)
-                if not rule or not rule.is_active:
-                    logger.info(f"Rule not active, stopping monitoring: {rule_id}")
-                    break
-
-                # Check if trigger conditions are met.
-                should_trigger = await self._check_trigger(rule)
-
-                if should_trigger:
-                    # Trigger the alert.
-                    await self._trigger_alert(rule)
-
-                # Determine check interval based on alert type.
-                settings = get_settings()
-                if rule.alert_type == AlertType.SYSTEM:
-                    await asyncio.sleep(settings.MONITORING_SYSTEM_INTERVAL)
-                elif rule.alert_type in [AlertType.ACCOUNT, AlertType.POSITION]:
-                    await asyncio.sleep(settings.MONITORING_ACCOUNT_INTERVAL)
-                elif rule.alert_type == AlertType.STRATEGY:
-                    await asyncio.sleep(settings.MONITORING_STRATEGY_INTERVAL)
-                else:
-                    await asyncio.sleep(settings.MONITORING_DEFAULT_INTERVAL)
-
-            except asyncio.CancelledError:
-                logger.info(f"Monitoring task cancelled: {rule_id}")
-                break
-            except Exception as e:
-                logger.error(f"Monitoring task error ({rule_id}): {e}")
-                await asyncio.sleep(get_settings().MONITORING_DEFAULT_INTERVAL)
+        logger.info(f"Stopped monitoring rule: {rule_id}")
 
     async def _check_trigger(self, rule: AlertRule) -> bool:
         """Evaluates whether a rule should trigger based on its trigger type."""
@@ -421,7 +363,7 @@ class MonitoringService:
 
         return await _check_cross_trigger(rule, config, self._trigger_state)
 
-    async def _trigger_alert(self, rule: AlertRule):
+    async def _trigger_alert(self, rule: AlertRule, trigger_value: float | None = None):
         """Creates an alert record and pushes notifications.
 
         Updates the rule's trigger count, creates a new Alert entity, and
@@ -429,6 +371,8 @@ class MonitoringService:
 
         Args:
             rule: The alert rule that was triggered.
+            trigger_value: Metric value that fired the rule; resolved again
+                when not given.
         """
         # Update the trigger count and last triggered timestamp.
         await self.alert_rule_repo.update(
@@ -442,7 +386,8 @@ class MonitoringService:
         trigger_config = (
             rule.trigger_config if isinstance(getattr(rule, "trigger_config", None), dict) else {}
         )
-        trigger_value = await self._get_current_metric_value(rule, trigger_config)
+        if trigger_value is None:
+            trigger_value = await self._get_current_metric_value(rule, trigger_config)
         threshold_value = None
         threshold_value = trigger_config.get("threshold")
         trigger_type = getattr(rule, "trigger_type", "threshold")
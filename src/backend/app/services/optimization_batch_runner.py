@@ -0,0 +1,327 @@
+"""
+In-process batch evaluation of optimization trials.
+
+``run_single_trial`` pays for a fresh interpreter per parameter set: it
+spawns ``python -O run.py``, which re-imports backtrader, re-reads the data
+files and writes full text logs that are parsed back afterwards. For cheap
+strategies that overhead dominates the backtest itself.
+
+``run_trial_batch`` evaluates a chunk of parameter sets inside one pool
+worker instead:
+
+- the strategy directory is staged once per chunk and the strategy modules
+  stay imported between its trials;
+- ``pandas.read_csv`` is memoized for the chunk, so data files are parsed once;
+- ``Cerebro.run`` is wrapped to attach an in-memory analyzer and to drop
+  file-writing observers, so metrics come straight from the run instead of
+  a log directory.
+
+The hooks are installed only while a batch runs and act only in the context
+that entered them (other threads see the original functions). A batch stops
+before its next trial once ``request_batch_cancel`` marks its ``tmp_base``.
+
+Full log artifacts are only produced for the best trials, by re-running them
+through ``run_single_trial`` (see ``optimization_thread_runner``).
+"""
+
+from __future__ import annotations
+
+import contextlib
+import copy
+import io
+import logging
+import os
+import runpy
+import shutil
+import sys
+import threading
+import traceback
+from collections.abc import Iterator, Sequence
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any
+
+import backtrader as bt
+import pandas as pd
+import yaml
+
+from app.runtime_lib import RUNTIME_LIB_DIR
+from app.services.backtest_worker import interpreter_library_roots, purge_job_modules
+from app.services.log_parser_service import summarize_equity_curve
+from app.services.optimization_trial_runner import compute_trial_metrics
+from app.services.workspace_staging import stage_strategy_dir
+
+log = logging.getLogger(__name__)
+
+# Observers that only write log files; trials in a batch do not need them.
+_FILE_OBSERVERS = frozenset({"TradeLogger"})
+_ANALYZER_NAME = "_optimization_trial"
+# Created in a batch's ``tmp_base`` to stop the batches still running.
+CANCEL_MARKER = ".cancel"
+
+
+class TrialMetricsAnalyzer(bt.Analyzer):
+    """Record the broker value per bar and the PnL of every closed trade."""
+
+    def __init__(self):
+        self.equity: list[float] = []
+        self.trades: list[dict[str, float]] = []
+
+    def next(self):
+        self.equity.append(float(self.strategy.broker.getvalue()))
+
+    def notify_trade(self, trade):
+        if trade.isclosed:
+            self.trades.append(
+                {"pnlcomm": float(trade.pnlcomm), "commission": float(trade.commission)}
+            )
+
+    def get_analysis(self):
+        return {"equity_curve": self.equity, "trades": self.trades}
+
+
+# Hook state of the batch running in the current context; None elsewhere.
+_captured_runs: ContextVar[list[Any] | None] = ContextVar("captured_runs", default=None)
+_csv_frames: ContextVar[dict[tuple[Any, ...], pd.DataFrame] | None] = ContextVar(
+    "csv_frames", default=None
+)
+_hooks_lock = threading.Lock()
+_hooks_depth = 0
+_originals: dict[str, Any] = {}
+
+
+def _addobserver(self, obscls, *args, **kwargs):
+    if _captured_runs.get() is not None and getattr(obscls, "__name__", "") in _FILE_OBSERVERS:
+        return None
+    return _originals["addobserver"](self, obscls, *args, **kwargs)
+
+
+def _run(self, *args, **kwargs):
+    captured = _captured_runs.get()
+    if captured is None:
+        return _originals["run"](self, *args, **kwargs)
+    self.addanalyzer(TrialMetricsAnalyzer, _name=_ANALYZER_NAME)
+    strategies = _originals["run"](self, *args, **kwargs)
+    captured.append(strategies)
+    return strategies
+
+
+def _read_csv(filepath_or_buffer, *args, **kwargs):
+    original = _originals["read_csv"]
+    frames = _csv_frames.get()
+    if (
+        frames is None
+        or not isinstance(filepath_or_buffer, str | os.PathLike)
+        or kwargs.get("chunksize")
+        or kwargs.get("iterator")
+    ):
+        return original(filepath_or_buffer, *args, **kwargs)
+    try:
+        path = os.path.abspath(os.fspath(filepath_or_buffer))
+        key = (path, os.stat(path).st_mtime_ns, repr(args), repr(sorted(kwargs.items())))
+    except (OSError, TypeError):
+        return original(filepath_or_buffer, *args, **kwargs)
+    frame = frames.get(key)
+    if frame is None:
+        frame = original(filepath_or_buffer, *args, **kwargs)
+        frames[key] = frame
+    return frame.copy()
+
+
+@contextlib.contextmanager
+def _hooks_installed() -> Iterator[None]:
+    """Install the batch hooks while at least one batch scope is open."""
+    global _hooks_depth
+    with _hooks_lock:
+        if _hooks_depth == 0:
+            _originals.update(
+                run=bt.Cerebro.run,
+                addobserver=bt.Cerebro.addobserver,
+                read_csv=pd.read_csv,
+            )
+            bt.Cerebro.run = _run
+            bt.Cerebro.addobserver = _addobserver
+            pd.read_csv = _read_csv
+        _hooks_depth += 1
+    try:
+        yield
+    finally:
+        with _hooks_lock:
+            _hooks_depth -= 1
+            if _hooks_depth == 0:
+                bt.Cerebro.run = _originals["run"]
+                bt.Cerebro.addobserver = _originals["addobserver"]
+                pd.read_csv = _originals["read_csv"]
+                _originals.clear()
+
+
+@contextlib.contextmanager
+def _in_memory_cerebro(captured: list[Any]) -> Iterator[None]:
+    """Record every ``Cerebro`` run of this context into ``TrialMetricsAnalyzer``."""
+    token = _captured_runs.set(captured)
+    try:
+        with _hooks_installed():
+            yield
+    finally:
+        _captured_runs.reset(token)
+
+
+@contextlib.contextmanager
+def _memoized_read_csv() -> Iterator[None]:
+    """Serve this context's repeated ``pd.read_csv`` calls on unchanged files from memory."""
+    token = _csv_frames.set({})
+    try:
+        with _hooks_installed():
+            yield
+    finally:
+        _csv_frames.reset(token)
+
+
+def request_batch_cancel(tmp_base: str) -> None:
+    """Make the batches running under ``tmp_base`` stop before their next trial."""
+    try:
+        Path(tmp_base, CANCEL_MARKER).touch()
+    except OSError as e:
+        log.debug("Could not mark batches in %s cancelled: %s", tmp_base, e)
+
+
+def _first_strategy(runs: Any) -> Any:
+    strategy = runs[0] if runs else None
+    # Optimizing cerebros return one list per parameter combination.
+    if isinstance(strategy, list):
+        strategy = strategy[0] if strategy else None
+    return strategy
+
+
+def _error_line(exc: BaseException) -> str:
+    return traceback.format_exception_only(type(exc), exc)[-1].strip()
+
+
+def _run_trial_in_process(
+    run_py: Path,
+    config_path: Path,
+    base_config: dict[str, Any],
+    params: dict[str, Any],
+    trial_index: int,
+) -> dict[str, Any]:
+    result: dict[str, Any] = {"params": params, "trial_index": trial_index, "success": False}
+
+    config = copy.deepcopy(base_config)
+    config.setdefault("params", {})
+    config["params"].update(params)
+    with open(config_path, "w", encoding="utf-8") as f:
+        yaml.dump(config, f, allow_unicode=True, default_flow_style=False)
+
+    captured: list[Any] = []
+    stderr_buffer = io.StringIO()
+    sys.argv = [str(run_py)]
+    try:
+        with (
+            _in_memory_cerebro(captured),
+            contextlib.redirect_stdout(io.StringIO()),
+            contextlib.redirect_stderr(stderr_buffer),
+        ):
+            runpy.run_path(str(run_py), run_name="__main__")
+    except SystemExit as exc:
+        if exc.code not in (None, 0):
+            result["exit_code"] = exc.code if isinstance(exc.code, int) else 1
+            stderr_text = stderr_buffer.getvalue().strip()
+            result["error"] = stderr_text.split("\n")[-1] if stderr_text else str(exc.code)
+            return result
+    except Exception as exc:
+        result["exit_code"] = 1
+        result["error"] = _error_line(exc)
+        return result
+
+    strategy = _first_strategy(captured[-1]) if captured else None
+    analyzer = getattr(getattr(strategy, "analyzers", None), _ANALYZER_NAME, None)
+    if analyzer is None:
+        result["error"] = "no backtest run captured"
+        return result
+
+    analysis = analyzer.get_analysis()
+    equity = analysis["equity_curve"]
+    if not equity:
+        result["error"] = "no bars processed"
+        return result
+
+    parsed = {**summarize_equity_curve(equity), **analysis}
+    result["metrics"] = compute_trial_metrics(parsed)
+    result["success"] = True
+    return result
+
+
+def run_trial_batch(
+    strategy_dir: str,
+    batch: Sequence[tuple[int, dict[str, Any]]],
+    tmp_base: str,
+) -> list[dict[str, Any]]:
+    """Evaluate ``(trial_index, params)`` pairs in this process, in order.
+
+    Returns one result per entry, shaped like ``run_single_trial`` results
+    but without ``artifact_path``. Never raises: a failure that breaks the
+    whole batch is reported on every remaining trial, and trials skipped
+    after ``request_batch_cancel`` fail with ``"cancelled"``.
+    """
+    if not batch:
+        return []
+
+    strategy_path = Path(strategy_dir)
+    batch_dir = Path(tmp_base) / f"batch_{batch[0][0]}"
+    cancel_marker = Path(tmp_base) / CANCEL_MARKER
+    results: list[dict[str, Any]] = []
+
+    saved_cwd = os.getcwd()
+    saved_env = dict(os.environ)
+    saved_path = list(sys.path)
+    saved_argv = list(sys.argv)
+    module_baseline = set(sys.modules)
+    try:
+        stage_strategy_dir(strategy_path, batch_dir)
+        logs_dir = batch_dir / "logs"
+        if logs_dir.is_dir():
+            shutil.rmtree(logs_dir)
+
+        config_path = batch_dir / "config.yaml"
+        base_config: dict[str, Any] = {}
+        if config_path.is_file():
+            with open(config_path, encoding="utf-8") as f:
+                base_config = yaml.safe_load(f) or {}
+
+        os.chdir(batch_dir)
+        os.environ["BACKTRADER_DATA_DIR"] = str(strategy_path.parent.parent / "datas")
+        sys.path[:0] = [str(strategy_path), str(batch_dir), str(RUNTIME_LIB_DIR)]
+
+        with _memoized_read_csv():
+            for trial_index, params in batch:
+                if cancel_marker.exists():
+                    break
+                results.append(
+                    _run_trial_in_process(
+                        batch_dir / "run.py", config_path, base_config, params, trial_index
+                    )
+                )
+    except Exception as exc:
+        error = _error_line(exc)
+        for trial_index, params in batch[len(results) :]:
+            results.append(
+                {"params": params, "trial_index": trial_index, "success": False, "error": error}
+            )
+    finally:
+        os.chdir(saved_cwd)
+        os.environ.clear()
+        os.environ.update(saved_env)
+        sys.path[:] = saved_path
+        sys.argv = saved_argv
+        purge_job_modules(module_baseline, interpreter_library_roots())
+        try:
+            if batch_dir.is_dir():
+                shutil.rmtree(batch_dir)
+        except Exception as e:
+            log.debug("Batch dir cleanup failed: %s", e)
+
+    for trial_index, params in batch[len(results) :]:
+        results.append(
+            {"params": params, "trial_index": trial_index, "success": False, "error": "cancelled"}
+        )
+    return results
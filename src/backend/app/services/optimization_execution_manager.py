@@ -2,20 +2,60 @@
 Persistent state manager for parameter optimization tasks.
 
 Stores task metadata and results in the database for multi-instance support
-and restart resilience.
+and restart resilience. Trial results are rows of ``optimization_trials``:
+progress flushes append the trials that are new since the last flush, and
+reads order and page them in SQL.
 """
 
 import logging
+import math
 from functools import lru_cache
 from typing import Any
 
-from sqlalchemy import select, update
+from sqlalchemy import func, insert, select, update
 
 from app.db.database import async_session_maker
-from app.models.optimization import OptimizationTask
+from app.models.optimization import INDEXED_TRIAL_METRICS, OptimizationTask, OptimizationTrial
 from app.schemas.backtest import TaskStatus
+from app.services.optimization_task_state import select_top_results
 
 logger = logging.getLogger(__name__)
+_TERMINAL_STATUSES = {
+    TaskStatus.COMPLETED.value,
+    TaskStatus.FAILED.value,
+    TaskStatus.CANCELLED.value,
+}
+
+
+def _finite_or_none(value: Any) -> float | None:
+    if isinstance(value, int | float) and math.isfinite(value):
+        return float(value)
+    return None
+
+
+def _trial_row(task_id: str, result_index: int, result: dict[str, Any]) -> dict[str, Any]:
+    metrics = result.get("metrics") if isinstance(result.get("metrics"), dict) else {}
+    trial_index = result.get("trial_index")
+    row = {
+        "task_id": task_id,
+        "result_index": result_index,
+        "trial_index": trial_index if isinstance(trial_index, int) else None,
+        "params": dict(result.get("params") or {}),
+        "metrics": dict(metrics),
+        "artifact_path": result.get("artifact_path"),
+    }
+    for name in INDEXED_TRIAL_METRICS:
+        row[name] = _finite_or_none(metrics.get(name))
+    return row
+
+
+def _trial_result(trial: OptimizationTrial) -> dict[str, Any]:
+    result: dict[str, Any] = {"params": trial.params or {}, "metrics": trial.metrics or {}}
+    if trial.trial_index is not None:
+        result["trial_index"] = trial.trial_index
+    if trial.artifact_path is not None:
+        result["artifact_path"] = trial.artifact_path
+    return result
 
 
 class OptimizationExecutionManager:
@@ -67,11 +107,14 @@ class OptimizationExecutionManager:
         status: str | None = None,
         error_message: str | None = None,
     ) -> bool:
-        """Update task progress and optionally status."""
+        """Update task progress and optionally status.
+
+        ``results`` is the task's whole successful-result list, which only
+        grows while the task runs; entries past the stored rows are inserted.
+        """
         values: dict[str, Any] = {
             "completed": completed,
             "failed": failed,
-            "results": results,
         }
         if status:
             values["status"] = status
@@ -82,9 +125,142 @@ class OptimizationExecutionManager:
             result = await session.execute(
                 update(OptimizationTask).where(OptimizationTask.id == task_id).values(**values)
             )
+            if result.rowcount > 0 and results:
+                await self._append_trials(
+                    session, task_id, results, sync_artifacts=status in _TERMINAL_STATUSES
+                )
             await session.commit()
             return result.rowcount > 0
 
+    async def _append_trials(
+        self,
+        session: Any,
+        task_id: str,
+        results: list[dict[str, Any]],
+        *,
+        sync_artifacts: bool,
+    ) -> None:
+        stored = await session.scalar(
+            select(func.max(OptimizationTrial.result_index)).where(
+                OptimizationTrial.task_id == task_id
+            )
+        )
+        start = 0 if stored is None else stored + 1
+        if start < len(results):
+            await session.execute(
+                insert(OptimizationTrial),
+                [
+                    _trial_row(task_id, index, results[index])
+                    for index in range(start, len(results))
+                ],
+            )
+        if not sync_artifacts or start == 0:
+            return
+        # Batched runs re-run their best trials for log artifacts after those
+        # trials were stored; take the paths over once the task is finished.
+        missing = await session.scalars(
+            select(OptimizationTrial.result_index).where(
+                OptimizationTrial.task_id == task_id,
+                OptimizationTrial.result_index < min(start, len(results)),
+                OptimizationTrial.artifact_path.is_(None),
+            )
+        )
+        for index in missing.all():
+            artifact_path = results[index].get("artifact_path")
+            if artifact_path:
+                await session.execute(
+                    update(OptimizationTrial)
+                    .where(
+                        OptimizationTrial.task_id == task_id,
+                        OptimizationTrial.result_index == index,
+                    )
+                    .values(artifact_path=artifact_path)
+                )
+
+    async def list_trials(
+        self,
+        task_id: str,
+        *,
+        sort_by: str = "annual_return",
+        descending: bool = True,
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> list[tuple[int, dict[str, Any]]] | None:
+        """Return one page of ``(result_index, result)`` pairs, best first.
+
+        Metrics in ``INDEXED_TRIAL_METRICS`` are ordered and paged in SQL,
+        with missing values last; other keys are ordered in memory. Returns
+        None when the task does not exist.
+        """
+        offset = max(offset, 0)
+        async with async_session_maker() as session:
+            task = await session.get(OptimizationTask, task_id)
+            if task is None:
+                return None
+            if task.results:
+                return select_top_results(
+                    task.results, sort_by=sort_by, descending=descending, limit=limit, offset=offset
+                )
+            if sort_by not in INDEXED_TRIAL_METRICS:
+                trials = await session.scalars(
+                    select(OptimizationTrial)
+                    .where(OptimizationTrial.task_id == task_id)
+                    .order_by(OptimizationTrial.result_index)
+                )
+                results = [_trial_result(trial) for trial in trials.all()]
+                return select_top_results(
+                    results, sort_by=sort_by, descending=descending, limit=limit, offset=offset
+                )
+
+            column = getattr(OptimizationTrial, sort_by)
+            by_task = select(OptimizationTrial).where(OptimizationTrial.task_id == task_id)
+            present = (
+                by_task.where(column.is_not(None))
+                .order_by(column.desc() if descending else column.asc())
+                .order_by(OptimizationTrial.result_index)
+                .offset(offset)
+            )
+            if limit is not None:
+                present = present.limit(limit)
+            trials = list((await session.scalars(present)).all())
+            if limit is None or len(trials) < limit:
+                # Rows without a value follow, in result order.
+                missing_offset = 0
+                if not trials and offset:
+                    counted = await session.scalar(
+                        select(func.count())
+                        .select_from(OptimizationTrial)
+                        .where(OptimizationTrial.task_id == task_id, column.is_not(None))
+                    )
+                    missing_offset = max(offset - (counted or 0), 0)
+                missing = (
+                    by_task.where(column.is_(None))
+                    .order_by(OptimizationTrial.result_index)
+                    .offset(missing_offset)
+                )
+                if limit is not None:
+                    missing = missing.limit(limit - len(trials))
+                trials.extend((await session.scalars(missing)).all())
+            return [(trial.result_index, _trial_result(trial)) for trial in trials]
+
+    async def get_trial(self, task_id: str, result_index: int) -> dict[str, Any] | None:
+        """Return the result stored at *result_index*, or None."""
+        async with async_session_maker() as session:
+            task = await session.get(OptimizationTask, task_id)
+            if task is None:
+                return None
+            if task.results:
+                if 0 <= result_index < len(task.results):
+                    return task.results[result_index]
+                return None
+            trial = await session.scalar(
+                select(OptimizationTrial).where(
+                    OptimizationTrial.task_id == task_id,
+                    OptimizationTrial.result_index == result_index,
+                )
+            )
+            return _trial_result(trial) if trial is not None else None
+
     async def set_cancelled(self, task_id: str, user_id: str | None = None) -> bool:
         """Mark task as cancelled. Returns False if not found or ownership mismatch."""
         task = await self.get_task(task_id, user_id)
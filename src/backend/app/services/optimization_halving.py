@@ -0,0 +1,222 @@
+"""
+Successive-halving (multi-fidelity) helpers for parameter optimization.
+
+Candidates are first scored on a short window of bars. Only the best
+``1 / eta`` of each rung is promoted to a window ``eta`` times longer; the
+last rung always uses the full configured data range. Poor parameter sets
+therefore cost a fraction of a full backtest.
+
+Fidelity is a number of bars; ``None`` means "all bars". It reaches the
+strategy process as ``FIDELITY_BARS_ENV`` and the runtime keeps the *first*
+that many bars of the configured range, so every rung scores candidates on
+the same early window and later rungs extend it. Only the workspace unit
+runtime reads the variable; the bundled templates load their own data and
+would simulate the full range in every rung, so callers check
+``honours_fidelity`` and run those as plain grids. Should a run still cover
+more bars than asked, ``evaluate`` raises ``FidelityIgnored`` and the run
+finishes as a plain grid search instead of paying for extra full evaluations.
+"""
+
+import heapq
+import math
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+# Environment variable carrying the rung's bar window to the strategy process.
+FIDELITY_BARS_ENV = "BACKTRADER_FIDELITY_BARS"
+
+
+class FidelityIgnored(Exception):
+    """Raised by ``evaluate`` when a run simulated more bars than requested.
+
+    Args:
+        metrics: Metrics of that run, which covered the full range.
+    """
+
+    def __init__(self, metrics: dict[str, float]) -> None:
+        super().__init__("strategy ignores the fidelity bar window")
+        self.metrics = metrics
+
+
+@dataclass
+class HalvingOutcome:
+    """Full-fidelity evaluations and bookkeeping of one successive-halving run."""
+
+    results: list[dict[str, Any]] = field(default_factory=list)
+    evaluations: int = 0
+    failures: int = 0
+    rung_sizes: list[int] = field(default_factory=list)
+    # Set when the strategy ignored the bar window and the run fell back to a grid.
+    fidelity_ignored: bool = False
+
+
+def honours_fidelity(strategy_dir: Path) -> bool:
+    """Whether the strategy's ``run.py`` reads ``FIDELITY_BARS_ENV``."""
+    try:
+        return FIDELITY_BARS_ENV in (strategy_dir / "run.py").read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError):
+        return False
+
+
+def bounded_map(
+    executor: Executor, fn: Callable[[Any], Any], items: Iterable[Any], window: int
+) -> Iterator[Any]:
+    """``executor.map`` in order, with at most ``window`` calls in flight.
+
+    ``items`` is consumed lazily, so a huge rung is never queued at once.
+    """
+    pending: deque[Any] = deque()
+    for item in items:
+        pending.append(executor.submit(fn, item))
+        if len(pending) >= max(window, 1):
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def fidelity_schedule(
+    min_bars: int, eta: int, rungs: int, full_bars: int | None = None
+) -> list[int | None]:
+    """Bar counts per rung: ``min_bars * eta**i``, ending with ``full_bars``.
+
+    Rungs that would not be shorter than ``full_bars`` are dropped, so a
+    short data range degenerates to a single full-fidelity rung.
+    """
+    schedule: list[int | None] = []
+    for i in range(max(rungs, 1) - 1):
+        bars = int(min_bars * eta**i)
+        if full_bars is not None and bars >= full_bars:
+            break
+        schedule.append(bars)
+    schedule.append(full_bars)
+    return schedule
+
+
+def rung_sizes(n_candidates: int, eta: int, n_rungs: int) -> list[int]:
+    """Number of candidates evaluated in each rung."""
+    sizes = []
+    size = n_candidates
+    for _ in range(n_rungs):
+        sizes.append(size)
+        size = max(math.ceil(size / eta), 1) if size else 0
+    return sizes
+
+
+def estimate_evaluations(n_candidates: int, eta: int, n_rungs: int) -> int:
+    """Total backtests a successive-halving run over ``n_candidates`` performs."""
+    return sum(rung_sizes(n_candidates, eta, n_rungs))
+
+
+def run_successive_halving(
+    candidates: Iterable[dict[str, Any]],
+    n_candidates: int,
+    schedule: Sequence[int | None],
+    eta: int,
+    evaluate: Callable[[dict[str, Any], int | None], dict[str, float] | None],
+    score: Callable[[dict[str, float]], float],
+    *,
+    should_stop: Callable[[], bool] = lambda: False,
+    on_evaluation: Callable[[HalvingOutcome], Any] | None = None,
+    map_fn: Callable[[Callable[[Any], Any], Iterable[Any]], Iterable[Any]] = map,
+) -> HalvingOutcome:
+    """Evaluate ``candidates`` rung by rung, promoting the top ``1 / eta``.
+
+    Args:
+        candidates: Parameter sets; iterated once, never materialized.
+        n_candidates: ``len(candidates)``, used to size the first promotion.
+        schedule: Bar counts per rung (see ``fidelity_schedule``).
+        eta: Reduction factor between rungs.
+        evaluate: Runs one backtest, returning metrics or ``None`` on failure;
+            raises ``FidelityIgnored`` if the run covered more bars than asked.
+        score: Maps metrics to a value where higher is better.
+        should_stop: Polled before every evaluation (cancellation).
+        on_evaluation: Called after every evaluation with the running outcome.
+        map_fn: Maps evaluations over a rung's candidates in order; pass a
+            ``bounded_map`` over an executor to evaluate them in parallel.
+
+    Returns:
+        The outcome; ``results`` holds ``{"params", "metrics"}`` rows of the
+        final, full-fidelity rung.
+    """
+    outcome = HalvingOutcome()
+    sizes = rung_sizes(n_candidates, eta, len(schedule))
+    survivors: Iterable[dict[str, Any]] = candidates
+    stopped = False
+    window: list[int | None] = [None]
+
+    def _until_stopped(items: Iterable[dict[str, Any]]) -> Iterator[dict[str, Any]]:
+        nonlocal stopped
+        for params in items:
+            if should_stop():
+                stopped = True
+                return
+            yield params
+
+    def _attempt(params: dict[str, Any]) -> tuple[dict[str, Any], Any, FidelityIgnored | None]:
+        try:
+            return params, evaluate(params, window[0]), None
+        except FidelityIgnored as ignored:
+            return params, ignored.metrics, ignored
+
+    for rung, bars in enumerate(schedule):
+        is_last = rung == len(schedule) - 1
+        keep = sizes[rung + 1] if not is_last else 0
+        # Min-heap of (score, order, params) holding the best ``keep`` so far.
+        best: list[tuple[float, int, dict[str, Any]]] = []
+        evaluated = 0
+        window[0] = bars
+
+        for order, (params, metrics, ignored) in enumerate(
+            map_fn(_attempt, _until_stopped(survivors))
+        ):
+            if ignored is not None and not outcome.fidelity_ignored:
+                # Every run covers the full range anyway: finish as a plain grid.
+                outcome.fidelity_ignored = True
+                is_last, bars = True, schedule[-1]
+                window[0] = bars
+                for _score, _order, kept in sorted(best, reverse=True):
+                    kept_metrics = evaluate(kept, bars)
+                    outcome.evaluations += 1
+                    if kept_metrics is None:
+                        outcome.failures += 1
+                    else:
+                        outcome.results.append({"params": kept, "metrics": kept_metrics})
+                best = []
+            outcome.evaluations += 1
+            evaluated += 1
+            if metrics is None:
+                outcome.failures += 1
+            elif is_last:
+                outcome.results.append({"params": params, "metrics": metrics})
+            else:
+                # Ties favour the earlier candidate, like a stable sort.
+                entry = (score(metrics), -order, params)
+                if len(best) < keep:
+                    heapq.heappush(best, entry)
+                elif keep and entry > best[0]:
+                    heapq.heapreplace(best, entry)
+            if on_evaluation is not None:
+                on_evaluation(outcome)
+
+        if stopped:
+            return outcome
+        outcome.rung_sizes.append(evaluated)
+        if is_last:
+            break
+        survivors = [params for _score, _order, params in sorted(best, reverse=True)]
+        if not survivors:
+            break
+
+    return outcome
+
+
+def build_halving_pruner(optuna_module: Any, min_bars: int, eta: int) -> Any | None:
+    """Return Optuna's ``SuccessiveHalvingPruner`` for bar-count steps, if available."""
+    pruner_cls = getattr(getattr(optuna_module, "pruners", None), "SuccessiveHalvingPruner", None)
+    if pruner_cls is None:
+        return None
+    return pruner_cls(min_resource=min_bars, reduction_factor=eta)
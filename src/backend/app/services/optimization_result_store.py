@@ -0,0 +1,48 @@
+"""
+Append-only trial result store for optimization tasks.
+
+The thread runner records every finished trial here instead of rebuilding
+the full result list after each one. Results are kept in two append-only
+lists (all trials / successful trials); snapshots of them are published to
+the task state, the artifact manifest and the database at most once per
+flush interval.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+
+def is_successful_trial(result: dict[str, Any]) -> bool:
+    """A trial counts as successful if it says so or produced metrics."""
+    return bool(result.get("success")) or bool(result.get("metrics"))
+
+
+class TrialResultStore:
+    """Collect trial results of one optimization task."""
+
+    def __init__(self) -> None:
+        self._all: list[dict[str, Any]] = []
+        self._successful: list[dict[str, Any]] = []
+
+    @property
+    def all_results(self) -> list[dict[str, Any]]:
+        """Every recorded trial, in completion order. Do not mutate."""
+        return self._all
+
+    @property
+    def successful(self) -> list[dict[str, Any]]:
+        """Successful trials, in completion order. Do not mutate."""
+        return self._successful
+
+    @property
+    def failed_count(self) -> int:
+        return len(self._all) - len(self._successful)
+
+    def append(self, result: dict[str, Any]) -> bool:
+        """Record one trial result; returns whether it was successful."""
+        self._all.append(result)
+        succeeded = is_successful_trial(result)
+        if succeeded:
+            self._successful.append(result)
+        return succeeded
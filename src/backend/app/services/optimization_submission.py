@@ -1,30 +1,75 @@
 import itertools
-from collections.abc import Callable
+import math
+from collections.abc import Callable, Iterator, Sequence
 from pathlib import Path
-from typing import Any
+from typing import Any, overload
+
+
+class ParamGrid(Sequence[dict[str, Any]]):
+    """Lazy Cartesian product of per-parameter value lists.
+
+    Only the axes are stored; combinations are produced on iteration or
+    decoded by index, so ``len()`` and ``grid[i]`` stay cheap for grids far
+    too large to materialize.
+    """
+
+    def __init__(self, keys: list[str], value_lists: list[list[Any]]) -> None:
+        self.keys = list(keys)
+        self.value_lists = [list(values) for values in value_lists]
+        self._size = math.prod(len(values) for values in self.value_lists)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        keys = self.keys
+        for combo in itertools.product(*self.value_lists):
+            yield dict(zip(keys, combo, strict=False))
+
+    @overload
+    def __getitem__(self, index: int) -> dict[str, Any]: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[dict[str, Any]]: ...
+
+    def __getitem__(self, index: int | slice) -> dict[str, Any] | list[dict[str, Any]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._size))]
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("parameter grid index out of range")
+        combo: list[Any] = []
+        for values in reversed(self.value_lists):
+            index, offset = divmod(index, len(values))
+            combo.append(values[offset])
+        return dict(zip(self.keys, reversed(combo), strict=False))
+
+    def __repr__(self) -> str:
+        return f"ParamGrid(keys={self.keys!r}, size={self._size})"
+
+
+def _range_values(spec: dict[str, float]) -> list[Any]:
+    start = spec["start"]
+    end = spec["end"]
+    step = spec["step"]
+    ptype = spec.get("type", "float")
+
+    vals = []
+    v = start
+    while v <= end + 1e-9:
+        vals.append(int(v) if ptype == "int" else round(v, 6))
+        v += step
+    return vals
 
 
 def generate_param_grid(
     param_ranges: dict[str, dict[str, float]],
-) -> list[dict[str, Any]]:
-    keys = []
-    value_lists = []
-    for name, spec in param_ranges.items():
-        start = spec["start"]
-        end = spec["end"]
-        step = spec["step"]
-        ptype = spec.get("type", "float")
-
-        vals = []
-        v = start
-        while v <= end + 1e-9:
-            vals.append(int(v) if ptype == "int" else round(v, 6))
-            v += step
-        keys.append(name)
-        value_lists.append(vals)
-
-    combos = list(itertools.product(*value_lists))
-    return [dict(zip(keys, combo, strict=False)) for combo in combos]
+) -> ParamGrid:
+    return ParamGrid(
+        list(param_ranges.keys()),
+        [_range_values(spec) for spec in param_ranges.values()],
+    )
 
 
 def submit_optimization(
@@ -37,7 +82,7 @@ def submit_optimization(
     *,
     get_strategy_dir: Callable[[str], Path],
     generate_param_grid_fn: Callable[
-        [dict[str, dict[str, float]]], list[dict[str, Any]]
+        [dict[str, dict[str, float]]], Sequence[dict[str, Any]]
     ] = generate_param_grid,
     set_task_fn: Callable[[str, dict[str, Any]], Any],
     build_initial_runtime_task_fn: Callable[..., dict[str, Any]],
@@ -45,7 +90,7 @@ def submit_optimization(
     running_status: str,
     thread_cls: Callable[..., Any],
     run_optimization_thread_fn: Callable[
-        [str, str, list[dict[str, Any]], int, bool, str | None], Any
+        [str, str, Sequence[dict[str, Any]], int, bool, str | None], Any
     ],
     task_id_factory: Callable[[], str],
     strategy_dir_override: str | Path | None = None,
@@ -51,6 +51,40 @@ def load_optimization_task_state(
     return runtime_task
 
 
+def select_persisted_results(
+    task_id: str,
+    task: dict[str, Any],
+    *,
+    sort_by: str,
+    descending: bool,
+    limit: int | None,
+    offset: int,
+    get_manager: Callable[[], Any] = get_optimization_execution_manager,
+    run_async: Callable[[Any], Any] = _run_async,
+    get_task: Callable[[str], dict[str, Any] | None] = get_runtime_task,
+) -> list[tuple[int, dict[str, Any]]] | None:
+    """Page the task's stored trials in SQL.
+
+    None means the page comes from memory: the task is still running in
+    this process (stored rows lag by a flush interval), is not persisted,
+    or the database lookup failed.
+    """
+    if str(task.get("status") or "") not in _TERMINAL_OPTIMIZATION_STATUSES:
+        if get_task(task_id) is not None:
+            return None
+    try:
+        mgr = get_manager()
+        page = run_async(
+            mgr.list_trials(
+                task_id, sort_by=sort_by, descending=descending, limit=limit, offset=offset
+            )
+        )
+        return None if page is None else list(page)
+    except Exception as e:
+        logger.debug("DB results lookup failed: %s", e)
+        return None
+
+
 def is_optimization_cancelled(
     task_id: str,
     persist_to_db: bool,
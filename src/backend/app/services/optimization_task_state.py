@@ -1,3 +1,5 @@
+import heapq
+import math
 import threading
 from datetime import datetime, timezone
 from typing import Any
@@ -368,10 +370,81 @@ def build_progress_response(task_id: str, task: dict[str, Any]) -> dict[str, Any
     }
 
 
-def build_results_response(task_id: str, task: dict[str, Any]) -> dict[str, Any]:
-    results = list(task.get("results", []) or [])
+def _result_sort_value(result: dict[str, Any], sort_by: str) -> Any:
+    metrics = result.get("metrics")
+    if isinstance(metrics, dict) and sort_by in metrics:
+        return metrics[sort_by]
+    return (result.get("params") or {}).get(sort_by)
+
+
+def _result_sort_key(result: dict[str, Any], sort_by: str, descending: bool) -> tuple[int, Any]:
+    """Rank numbers, then strings, then missing values, in either direction.
+
+    Values of different kinds are never compared with each other, so a
+    column mixing ``None``, labels and numbers sorts instead of raising.
+    """
+    value = _result_sort_value(result, sort_by)
+    if isinstance(value, int | float) and math.isfinite(value):
+        rank, value = 0, float(value)
+    elif isinstance(value, str):
+        rank = 1
+    else:
+        rank, value = 2, 0
+    return (-rank, value) if descending else (rank, value)
+
+
+def select_top_results(
+    results: list[dict[str, Any]],
+    *,
+    sort_by: str = "annual_return",
+    descending: bool = True,
+    limit: int | None = None,
+    offset: int = 0,
+) -> list[tuple[int, dict[str, Any]]]:
+    """Return ``(index, result)`` pairs ordered by ``sort_by``.
+
+    With ``limit`` only the top ``offset + limit`` entries are selected
+    (heap-based, no full sort) and the first ``offset`` are skipped. Ties
+    keep their original order, like a stable sort.
+    """
+
+    def key(item: tuple[int, dict[str, Any]]) -> Any:
+        return _result_sort_key(item[1], sort_by, descending)
+
+    offset = max(offset, 0)
+    indexed = enumerate(results)
+    if limit is not None and offset + limit < len(results):
+        select = heapq.nlargest if descending else heapq.nsmallest
+        return select(offset + max(limit, 0), indexed, key=key)[offset:]
+    return sorted(indexed, key=key, reverse=descending)[offset:]
+
+
+def build_results_response(
+    task_id: str,
+    task: dict[str, Any],
+    *,
+    sort_by: str = "annual_return",
+    descending: bool = True,
+    limit: int | None = None,
+    offset: int = 0,
+    selected: list[tuple[int, dict[str, Any]]] | None = None,
+) -> dict[str, Any]:
+    """Build the results payload for *task*.
+
+    ``selected`` is an already ordered page of ``(index, result)`` pairs
+    (from ``optimization_trials``); without it the page is picked from the
+    task's in-memory results.
+    """
+    if selected is None:
+        selected = select_top_results(
+            task.get("results", []) or [],
+            sort_by=sort_by,
+            descending=descending,
+            limit=limit,
+            offset=offset,
+        )
     rows: list[dict[str, Any]] = []
-    for index, result in enumerate(results):
+    for index, result in selected:
         params = dict(result.get("params", {}) or {})
         row = dict(params)
         metrics = result.get("metrics")
@@ -385,7 +458,6 @@ def build_results_response(task_id: str, task: dict[str, Any]) -> dict[str, Any]
             row["trial_index"] = result.get("trial_index")
         rows.append(row)
 
-    rows.sort(key=lambda row: row.get("annual_return", -999999), reverse=True)
     best = rows[0] if rows else None
     param_names = task.get("param_names") or list((task.get("param_ranges") or {}).keys())
 
@@ -1,12 +1,16 @@
+import itertools
 import json
 import logging
-from collections.abc import Callable
+import time
+from collections.abc import Callable, Iterator, Sequence
 from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
 from app.schemas.backtest import TaskStatus
+from app.services.optimization_result_store import TrialResultStore, is_successful_trial
+from app.services.optimization_task_state import select_top_results
 
 module_logger = logging.getLogger(__name__)
 
@@ -29,7 +33,7 @@ def _write_json(path: Path, payload: dict[str, Any]) -> None:
 
 
 def _trial_summary_entry(result: dict[str, Any]) -> dict[str, Any]:
-    is_success = bool(result.get("success")) or bool(result.get("metrics"))
+    is_success = is_successful_trial(result)
     return {
         "trial_index": result.get("trial_index"),
         "success": is_success,
@@ -46,7 +50,7 @@ def _update_artifact_manifest(
     artifact_root: str | None,
     *,
     task_id: str,
-    grid: list[dict[str, Any]],
+    grid: Sequence[dict[str, Any]],
     runtime_task: dict[str, Any] | None,
     all_trial_results: list[dict[str, Any]],
     successful_results: list[dict[str, Any]],
@@ -60,11 +64,7 @@ def _update_artifact_manifest(
     summary_path = artifact_root_path / "summary.json"
     existing_manifest = _read_json(manifest_path)
     completed_count = len(successful_results)
-    failed_count = sum(
-        1
-        for item in all_trial_results
-        if not (bool(item.get("success")) or bool(item.get("metrics")))
-    )
+    failed_count = len(all_trial_results) - completed_count
     status = final_status or str(
         (runtime_task or {}).get("status") or existing_manifest.get("status") or "running"
     )
@@ -104,10 +104,54 @@ def _update_artifact_manifest(
     _write_json(summary_path, summary_payload)
 
 
+def _chunked(
+    items: Iterator[tuple[int, dict[str, Any]]], size: int
+) -> Iterator[list[tuple[int, dict[str, Any]]]]:
+    while chunk := list(itertools.islice(items, size)):
+        yield chunk
+
+
+def _rerun_top_trials_with_artifacts(
+    executor: Any,
+    successful_results: list[dict[str, Any]],
+    *,
+    top_k: int,
+    strategy_dir: str,
+    tmp_base: str,
+    artifact_root: str,
+    run_single_trial_fn: Callable[..., dict[str, Any]],
+    log: logging.Logger,
+) -> None:
+    """Re-run the best batch trials as regular trials to keep their log artifacts.
+
+    Metrics stay as computed in-process; only ``artifact_path`` is taken over.
+    """
+    top = select_top_results(successful_results, limit=top_k)
+    futures = {
+        executor.submit(
+            run_single_trial_fn,
+            strategy_dir,
+            result.get("params") or {},
+            int(result.get("trial_index") or 0),
+            tmp_base,
+            artifact_root,
+        ): result
+        for _index, result in top
+    }
+    for fut, result in futures.items():
+        try:
+            artifact_path = (fut.result() or {}).get("artifact_path")
+        except Exception as e:
+            log.warning("Artifact re-run failed for trial %s: %s", result.get("trial_index"), e)
+            continue
+        if artifact_path:
+            result["artifact_path"] = artifact_path
+
+
 def run_optimization_thread(
     task_id: str,
     strategy_dir: str,
-    grid: list[dict[str, Any]],
+    grid: Sequence[dict[str, Any]],
     n_workers: int,
     persist_to_db: bool = True,
     artifact_root: str | None = None,
@@ -122,52 +166,100 @@ def run_optimization_thread(
     mkdtemp_fn: Callable[..., str],
     rmtree_fn: Callable[..., Any],
     logger: logging.Logger | None = None,
+    flush_interval: float = 0.0,
+    max_in_flight: int | None = None,
+    run_trial_batch_fn: Callable[[str, list[tuple[int, dict[str, Any]]], str], list[dict[str, Any]]]
+    | None = None,
+    batch_size: int = 1,
+    artifact_top_k: int = 0,
+    cancel_batches_fn: Callable[[str], None] | None = None,
 ) -> None:
+    """Evaluate ``grid`` in a process pool and publish progress as trials finish.
+
+    ``grid`` is consumed lazily: at most ``max_in_flight`` trials (default
+    ``2 * n_workers``) are submitted at a time, so huge grids are never fully
+    queued and cancellation is noticed before the next batch is submitted.
+
+    Trials are recorded in an append-only ``TrialResultStore``. Counters are
+    updated per trial; the result snapshot, artifact manifest and DB row are
+    rewritten at most once per ``flush_interval`` seconds (every trial when 0)
+    and at the end.
+
+    With ``run_trial_batch_fn`` and ``batch_size > 1`` each pool job evaluates
+    ``batch_size`` parameter sets in-process and returns metrics without log
+    directories; the ``artifact_top_k`` best trials are then re-run through
+    ``run_single_trial_fn`` so they still get full artifacts. On cancel,
+    ``cancel_batches_fn(tmp_base)`` stops the batches already running.
+    """
     log = logger or module_logger
     tmp_base = mkdtemp_fn(prefix=f"opt_{task_id[:8]}_")
-    successful_results: list[dict[str, Any]] = []
-    all_trial_results: list[dict[str, Any]] = []
+    store = TrialResultStore()
+    successful_results = store.successful
+    all_trial_results = store.all_results
+    last_flush_at: float | None = None
 
     try:
         with process_pool_executor_cls(max_workers=n_workers) as executor:
-            futures = {}
-            for i, params in enumerate(grid):
-                if is_cancelled_fn(task_id, persist_to_db):
-                    break
-                fut = executor.submit(
-                    run_single_trial_fn,
-                    strategy_dir,
-                    params,
-                    i,
-                    tmp_base,
-                    artifact_root,
-                )
-                futures[fut] = i
+            window = max_in_flight or max(2 * n_workers, 1)
+            batched = run_trial_batch_fn is not None and batch_size > 1
+            work_items = _chunked(enumerate(grid), batch_size if batched else 1)
+            in_flight: dict[Any, list[tuple[int, dict[str, Any]]]] = {}
+            exhausted = False
+
+            while True:
+                cancelled = is_cancelled_fn(task_id, persist_to_db)
+                while not cancelled and not exhausted and len(in_flight) < window:
+                    chunk = next(work_items, None)
+                    if chunk is None:
+                        exhausted = True
+                        break
+                    if batched:
+                        fut = executor.submit(run_trial_batch_fn, strategy_dir, chunk, tmp_base)
+                    else:
+                        i, params = chunk[0]
+                        fut = executor.submit(
+                            run_single_trial_fn,
+                            strategy_dir,
+                            params,
+                            i,
+                            tmp_base,
+                            artifact_root,
+                        )
+                    in_flight[fut] = chunk
 
-            for fut in as_completed_fn(futures):
-                if is_cancelled_fn(task_id, persist_to_db):
-                    for pending_fut in futures:
+                if cancelled:
+                    for pending_fut in in_flight:
                         pending_fut.cancel()
+                    if batched and cancel_batches_fn is not None:
+                        cancel_batches_fn(tmp_base)
                     break
+                if not in_flight:
+                    break
+
+                fut = next(iter(as_completed_fn(in_flight)))
+                chunk = in_flight.pop(fut)
 
                 try:
-                    trial_result = fut.result(timeout=5)
+                    payload = fut.result(timeout=5)
+                    trial_results = list(payload) if batched else [payload]
                 except Exception:
-                    trial_result = {"success": False, "error": "worker exception"}
-
-                all_trial_results.append(trial_result)
-                trial_succeeded = bool(trial_result.get("success")) or bool(
-                    trial_result.get("metrics")
-                )
+                    trial_results = [
+                        {"success": False, "error": "worker exception", "trial_index": i}
+                        for i, _params in chunk
+                    ]
 
-                if trial_succeeded:
-                    successful_results.append(trial_result)
-                    update_task_fn(task_id, completed=len(successful_results))
-                else:
-                    task = get_task_fn(task_id)
-                    if task:
-                        update_task_fn(task_id, failed=task["failed"] + 1)
+                for trial_result in trial_results:
+                    if store.append(trial_result):
+                        update_task_fn(task_id, completed=len(successful_results))
+                    else:
+                        task = get_task_fn(task_id)
+                        if task:
+                            update_task_fn(task_id, failed=task["failed"] + 1)
 
+                now = time.monotonic()
+                if last_flush_at is not None and now - last_flush_at < flush_interval:
+                    continue
+                last_flush_at = now
                 task = update_task_fn(task_id, results=list(successful_results))
                 _update_artifact_manifest(
                     artifact_root,
@@ -181,6 +273,18 @@ def run_optimization_thread(
                 if persist_to_db:
                     persist_runtime_task_fn(task_id)
 
+            if batched and artifact_root and artifact_top_k > 0 and not cancelled:
+                _rerun_top_trials_with_artifacts(
+                    executor,
+                    successful_results,
+                    top_k=artifact_top_k,
+                    strategy_dir=strategy_dir,
+                    tmp_base=tmp_base,
+                    artifact_root=artifact_root,
+                    run_single_trial_fn=run_single_trial_fn,
+                    log=log,
+                )
+
         task = get_task_fn(task_id)
         final_status = (
             TaskStatus.CANCELLED.value
@@ -188,8 +292,12 @@ def run_optimization_thread(
             else TaskStatus.COMPLETED.value
         )
         if task and task.get("status") != TaskStatus.CANCELLED.value:
-            update_task_fn(task_id, status=TaskStatus.COMPLETED.value, results=successful_results)
+            update_task_fn(
+                task_id, status=TaskStatus.COMPLETED.value, results=list(successful_results)
+            )
             final_status = TaskStatus.COMPLETED.value
+        elif task:
+            update_task_fn(task_id, results=list(successful_results))
 
         _update_artifact_manifest(
             artifact_root,
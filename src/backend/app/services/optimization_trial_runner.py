@@ -5,14 +5,19 @@ import os
 import shutil
 import subprocess
 import sys
-from collections.abc import Callable
+from collections.abc import Callable, Sequence
 from pathlib import Path
 from typing import Any
 
+import numpy as np
 import yaml
 
+from app.runtime_lib import RUNTIME_LIB_DIR
+from app.services import metrics_engine
 from app.services.log_parser_service import parse_log_dir
+from app.services.optimization_halving import FIDELITY_BARS_ENV
 from app.services.strategy_runtime_support import has_log_artifacts, latest_meaningful_log_subdir
+from app.services.workspace_staging import stage_strategy_dir
 
 log = logging.getLogger(__name__)
 
@@ -29,22 +34,15 @@ def safe_float(val: Any, default: float = 0.0) -> float:
 
 def _aggregate_period_returns(daily_returns: list[float], period_size: int) -> list[float]:
     """Group daily returns into period returns (weekly=5, monthly=21)."""
-    result = []
-    for i in range(0, len(daily_returns), period_size):
-        chunk = daily_returns[i : i + period_size]
-        period_ret = 1.0
-        for r in chunk:
-            period_ret *= 1 + r
-        result.append((period_ret - 1) * 100)
-    return result
+    return metrics_engine.compounded_returns(daily_returns, period_size).tolist()
 
 
-def _period_stats(returns_pct: list[float]) -> tuple[float, float, float]:
+def _period_stats(returns_pct: Sequence[float] | np.ndarray) -> tuple[float, float, float]:
     """Return (avg, min, max) for a list of returns in percent."""
-    if not returns_pct:
+    values = np.asarray(returns_pct, dtype=np.float64)
+    if not values.size:
         return 0.0, 0.0, 0.0
-    avg = sum(returns_pct) / len(returns_pct)
-    return avg, min(returns_pct), max(returns_pct)
+    return float(values.mean()), float(values.min()), float(values.max())
 
 
 def _write_json(path: Path, payload: dict[str, Any]) -> None:
@@ -131,7 +129,21 @@ def parse_trial_logs(
     parsed = parse_log_dir(log_dir, strategy_dir=trial_dir)
     if not parsed:
         return None
+    return compute_trial_metrics(parsed, safe_float_fn=safe_float_fn)
+
 
+def compute_trial_metrics(
+    parsed: dict[str, Any],
+    *,
+    safe_float_fn: Callable[..., float] = safe_float,
+) -> dict[str, float]:
+    """Build the optimization metric row from a parsed run.
+
+    ``parsed`` needs ``equity_curve`` and ``trades`` (dicts with ``pnlcomm``
+    and ``commission``); the headline figures (``initial_cash``,
+    ``total_return``, ``annual_return``, ``sharpe_ratio``, ``max_drawdown``)
+    are used when present.
+    """
     equity = [safe_float_fn(value, 0.0) for value in (parsed.get("equity_curve") or [])]
     trades = list(parsed.get("trades") or [])
 
@@ -156,37 +168,31 @@ def parse_trial_logs(
         0.0,
     )
 
-    # Max drawdown
-    peak = 0.0
+    # Max drawdown (the parsed value is a floor; the first deepest point wins)
+    equity_array = np.asarray(equity, dtype=np.float64)
     max_dd = safe_float_fn(parsed.get("max_drawdown", 0.0), 0.0)
     max_dd_value = 0.0
     max_market_value = 0.0
-    for v in equity:
-        if v > peak:
-            peak = v
-        if v > max_market_value:
-            max_market_value = v
-        dd_abs = peak - v
-        dd_pct = (dd_abs / peak * 100) if peak > 0 else 0
-        if dd_pct > max_dd:
-            max_dd = dd_pct
-            max_dd_value = dd_abs
+    if equity_array.size:
+        peak = np.maximum.accumulate(np.maximum(equity_array, 0.0))
+        dd_abs = peak - equity_array
+        with np.errstate(divide="ignore", invalid="ignore"):
+            dd_pct = np.where(peak > 0, dd_abs / np.where(peak > 0, peak, 1.0) * 100, 0.0)
+        deepest = int(np.argmax(dd_pct))
+        if dd_pct[deepest] > max_dd:
+            max_dd = float(dd_pct[deepest])
+            max_dd_value = float(dd_abs[deepest])
+        max_market_value = max(float(equity_array.max()), 0.0)
 
     # Daily returns
-    daily_returns: list[float] = []
-    if len(equity) > 1:
-        daily_returns = [
-            (equity[i] - equity[i - 1]) / equity[i - 1]
-            for i in range(1, len(equity))
-            if equity[i - 1] > 0
-        ]
+    daily_returns = metrics_engine.simple_returns(equity_array[None, :])[0]
+    daily_returns = daily_returns[~np.isnan(daily_returns)]
 
     # Sharpe ratio
     sharpe = safe_float_fn(parsed.get("sharpe_ratio", 0.0), 0.0)
 
     # Daily return stats (in percent)
-    daily_pct = [r * 100 for r in daily_returns]
-    daily_avg, daily_min, daily_max = _period_stats(daily_pct)
+    daily_avg, daily_min, daily_max = _period_stats(daily_returns * 100)
 
     # Weekly return stats (5 trading days)
     weekly_pct = _aggregate_period_returns(daily_returns, 5)
@@ -201,17 +207,20 @@ def parse_trial_logs(
 
     # ---- Parse trade log ----
     total_trades = len(trades)
-    trade_pnls = [safe_float_fn(trade.get("pnlcomm", 0.0), 0.0) for trade in trades]
-    win_trades = len([pnl for pnl in trade_pnls if pnl > 0])
-    total_win_amount = sum(pnl for pnl in trade_pnls if pnl > 0)
-    total_loss_amount = sum(abs(pnl) for pnl in trade_pnls if pnl <= 0)
+    trade_pnls = np.array(
+        [safe_float_fn(trade.get("pnlcomm", 0.0), 0.0) for trade in trades], dtype=np.float64
+    )
+    wins = trade_pnls > 0
+    win_trades = int(np.count_nonzero(wins))
+    total_win_amount = float(trade_pnls[wins].sum())
+    total_loss_amount = float(np.abs(trade_pnls[~wins]).sum())
     trading_cost = sum(safe_float_fn(trade.get("commission", 0.0), 0.0) for trade in trades)
 
     win_rate = (win_trades / total_trades * 100) if total_trades > 0 else 0
     loss_trades = total_trades - win_trades
     avg_win = total_win_amount / win_trades if win_trades > 0 else 0
     avg_loss = total_loss_amount / loss_trades if loss_trades > 0 else 0
-    avg_profit = sum(trade_pnls) / total_trades if total_trades > 0 else 0
+    avg_profit = float(trade_pnls.sum()) / total_trades if total_trades > 0 else 0
     avg_profit_rate = (avg_profit / initial * 100) if initial > 0 else 0
 
     profit_loss_ratio = avg_win / avg_loss if avg_loss > 0 else 0
@@ -269,6 +278,7 @@ def run_single_trial(
     *,
     parse_trial_logs_fn: Callable[[Path], dict[str, float] | None] = parse_trial_logs,
     subprocess_module: Any = subprocess,
+    fidelity_bars: int | None = None,
 ) -> dict[str, Any]:
     strategy_path = Path(strategy_dir)
     trial_dir = Path(tmp_base) / f"trial_{trial_index}"
@@ -277,7 +287,12 @@ def run_single_trial(
     stderr_text = ""
 
     try:
-        shutil.copytree(strategy_path, trial_dir, dirs_exist_ok=True)
+        staging = stage_strategy_dir(strategy_path, trial_dir)
+        result["staging"] = {
+            "bytes_copied": staging.bytes_copied,
+            "files_linked": staging.files_linked,
+            "files_copied": staging.files_copied,
+        }
 
         logs_dir = trial_dir / "logs"
         if logs_dir.is_dir():
@@ -301,8 +316,12 @@ def run_single_trial(
         project_root = Path(strategy_dir).parent.parent
         env = dict(os.environ)
         env["BACKTRADER_DATA_DIR"] = str(project_root / "datas")
-        extra_paths = [str(strategy_dir), str(trial_dir)]
+        extra_paths = [str(strategy_dir), str(trial_dir), str(RUNTIME_LIB_DIR)]
         env["PYTHONPATH"] = os.pathsep.join(extra_paths + [env.get("PYTHONPATH", "")])
+        if fidelity_bars:
+            env[FIDELITY_BARS_ENV] = str(fidelity_bars)
+        else:
+            env.pop(FIDELITY_BARS_ENV, None)
 
         proc = subprocess_module.run(
             [sys.executable, "-O", str(run_py)],
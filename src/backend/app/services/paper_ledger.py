@@ -0,0 +1,454 @@
+"""
+Write-behind persistence for paper-trading fills.
+
+Settling a fill used to cost several repository reads and three commits
+(order, position, account, plus the trade row). While ``PaperLedger`` runs,
+``PaperTradingService`` settles fills against in-memory accounts and
+positions and hands the changed rows to the ledger instead:
+
+- each batch of rows is appended to a write-ahead log (JSON lines under
+  the backend data directory) before it is queued for the flusher;
+- a background flusher bulk-writes the pending rows every
+  ``PAPER_LEDGER_FLUSH_INTERVAL`` seconds, or as soon as
+  ``PAPER_LEDGER_FLUSH_BATCH`` records are pending, in one transaction;
+  later changes to the same row are coalesced;
+- a WAL segment is deleted once its rows are committed. On start, segments
+  left by a crash are replayed and flushed before fills are accepted.
+
+The cached accounts are only authoritative while one process settles
+fills, so a single writer runs the ledger: the process holding the
+``writer.lock`` lease of the WAL directory. Other uvicorn workers stay in
+standby and leave new orders to it (``PaperTradingService``). The writer
+logs into its own subdirectory, leased for its lifetime, and deletes only
+its own segments; a subdirectory whose lease is free belongs to a process
+that died, and is replayed by the next writer. When the writer exits, the
+replacement worker started by the process manager takes the lease over.
+
+Inserts are idempotent (existing ids are updated), so replaying a segment
+whose rows were already committed is harmless. Flush lag, backlog and
+duration are exported as Prometheus metrics and by ``stats``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import shutil
+import time
+import uuid
+from collections.abc import Awaitable, Callable, Iterable
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import insert, select, update
+
+from app.config import get_settings
+from app.db.session_provider import unit_of_work
+from app.middleware.metrics import record_paper_ledger_flush, set_paper_ledger_backlog
+from app.models.paper_trading import Account, Order, PaperTrade, Position
+from app.utils.backend_data_paths import get_backend_data_path
+from app.utils.process_lease import ProcessLease
+
+logger = logging.getLogger(__name__)
+
+# Row kinds in flush order; updates apply to existing rows, upserts insert
+# missing ones.
+_UPDATES = {"account": Account, "order": Order}
+_UPSERTS = {"position": Position, "trade": PaperTrade}
+KINDS = (*_UPDATES, *_UPSERTS)
+
+_DATETIME_FIELDS = frozenset({"created_at", "updated_at", "entry_time", "filled_at"})
+# Ids per ``IN`` clause when checking which upserted rows exist.
+_ID_CHUNK = 500
+_WAL_SUFFIX = ".wal"
+_LEASE_FILE = "lock"
+
+
+def _encode(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _decode_row(row: dict[str, Any]) -> dict[str, Any]:
+    for name in _DATETIME_FIELDS & row.keys():
+        if isinstance(row[name], str):
+            row[name] = datetime.fromisoformat(row[name])
+    return row
+
+
+class PaperLedger:
+    """In-memory paper-trading state with a WAL and a batched flusher.
+
+    Args:
+        wal_dir: Directory shared by the WAL segments of all processes.
+        flush_interval: Seconds between flushes of pending rows.
+        flush_batch: Pending records that trigger an early flush.
+    """
+
+    def __init__(
+        self,
+        wal_dir: Path | None = None,
+        flush_interval: float | None = None,
+        flush_batch: int | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        settings = get_settings()
+        self.wal_dir = wal_dir or get_backend_data_path("paper_ledger")
+        self.flush_interval = (
+            settings.PAPER_LEDGER_FLUSH_INTERVAL if flush_interval is None else flush_interval
+        )
+        self.flush_batch = settings.PAPER_LEDGER_FLUSH_BATCH if flush_batch is None else flush_batch
+        self._clock = clock
+        # Authoritative state of the accounts and positions settled here.
+        self._accounts: dict[str, Account] = {}
+        self._positions: dict[str, dict[str, Position]] = {}
+        # Rows waiting for the flusher, and the batch being written.
+        self._pending: dict[str, dict[str, dict[str, Any]]] = {kind: {} for kind in KINDS}
+        self._flushing: dict[str, dict[str, dict[str, Any]]] = {kind: {} for kind in KINDS}
+        self._pending_records = 0
+        self._pending_since: float | None = None
+        self._segment = 0
+        self._wal = None
+        self._wal_path: Path | None = None
+        # Single-writer lease, and this process's segment directory.
+        self._writer = ProcessLease(self.wal_dir / "writer.lock")
+        self.segment_dir = self.wal_dir / f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._segment_lease = ProcessLease(self.segment_dir / _LEASE_FILE)
+        # Started while another process is the writer.
+        self.standby = False
+        self._flush_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self.flushed_records = 0
+        self.failed_flushes = 0
+        self.last_flush_seconds = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    # ------------------------------------------------------------------
+    # In-memory state
+    # ------------------------------------------------------------------
+
+    def adopt_account(self, account: Account) -> Account:
+        """The ledger's instance of *account* (adopting it if unknown).
+
+        A newly adopted account gets its unflushed values applied, so an
+        account read from the database after ``forget_account`` is current.
+        """
+        account_id = str(account.id)
+        cached = self._accounts.get(account_id)
+        if cached is not None:
+            return cached
+        self.apply_pending("account", account)
+        self._accounts[account_id] = account
+        return account
+
+    def cached_account(self, account_id: str) -> Account | None:
+        return self._accounts.get(str(account_id))
+
+    def forget_account(self, account_id: str) -> None:
+        """Drop the cached account and positions after an out-of-band change.
+
+        Call it whenever an account is updated outside the ledger (e.g. soft
+        deleted); the next fill reloads both from the database.
+        """
+        account_id = str(account_id)
+        self._accounts.pop(account_id, None)
+        self._positions.pop(account_id, None)
+
+    async def positions(
+        self, account_id: str, load: Callable[[], Awaitable[Iterable[Position]]]
+    ) -> dict[str, Position]:
+        """Positions of an account by symbol, loaded once with *load*.
+
+        Unflushed changes are applied to the loaded rows, and positions opened
+        since the last flush are added.
+        """
+        account_id = str(account_id)
+        positions = self._positions.get(account_id)
+        if positions is None:
+            loaded = {
+                position.symbol: self.apply_pending("position", position)
+                for position in await load()
+            }
+            known = {str(position.id) for position in loaded.values()}
+            for kind_rows in (self._flushing["position"], self._pending["position"]):
+                for row_id in list(kind_rows):
+                    row = self.pending_row("position", row_id)
+                    if row_id in known or str(row.get("account_id")) != account_id:
+                        continue
+                    known.add(row_id)
+                    loaded[row["symbol"]] = Position(**row)
+            positions = self._positions.setdefault(account_id, loaded)
+        return positions
+
+    def apply_pending(self, kind: str, obj: Any) -> Any:
+        """Set the unflushed values of *obj*'s row on it; returns *obj*."""
+        for name, value in (self.pending_row(kind, obj.id) or {}).items():
+            setattr(obj, name, value)
+        return obj
+
+    def pending_row(self, kind: str, row_id: str) -> dict[str, Any] | None:
+        """Latest unflushed values of a row (None once committed)."""
+        row_id = str(row_id)
+        flushing = self._flushing[kind].get(row_id)
+        pending = self._pending[kind].get(row_id)
+        if flushing is None or pending is None:
+            return pending or flushing
+        return {**flushing, **pending}
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+
+    def record(self, rows: Iterable[tuple[str, dict[str, Any]]]) -> None:
+        """Log ``(kind, row)`` changes to the WAL and queue them for the flusher.
+
+        Rows must carry their ``id``; partial rows update earlier ones.
+        """
+        rows = list(rows)
+        if self._wal is not None:
+            lines = [
+                json.dumps({"kind": kind, "row": {k: _encode(v) for k, v in row.items()}})
+                for kind, row in rows
+            ]
+            self._wal.write("\n".join(lines) + "\n")
+            self._wal.flush()
+        for kind, row in rows:
+            self._queue(kind, row)
+        if self._pending_records >= self.flush_batch:
+            self._wakeup.set()
+
+    def _queue(self, kind: str, row: dict[str, Any]) -> None:
+        pending = self._pending[kind]
+        row_id = str(row["id"])
+        if row_id in pending:
+            pending[row_id].update(row)
+        else:
+            pending[row_id] = dict(row)
+        self._pending_records += 1
+        if self._pending_since is None:
+            self._pending_since = self._clock()
+
+    # ------------------------------------------------------------------
+    # WAL
+    # ------------------------------------------------------------------
+
+    def _segments(self, directory: Path) -> list[tuple[int, Path]]:
+        segments = []
+        for path in directory.glob(f"*{_WAL_SUFFIX}"):
+            try:
+                segments.append((int(path.stem), path))
+            except ValueError:
+                continue
+        return sorted(segments)
+
+    def _open_segment(self) -> None:
+        if self._wal is not None:
+            self._wal.close()
+        self._segment += 1
+        self._wal_path = self.segment_dir / f"{self._segment:012d}{_WAL_SUFFIX}"
+        self._wal = open(self._wal_path, "a", encoding="utf-8")  # noqa: SIM115
+
+    def _orphans(self) -> list[tuple[Path, ProcessLease]]:
+        """Segment directories of dead processes, leased to this one."""
+        orphans = []
+        for directory in sorted(self.wal_dir.iterdir()):
+            if not directory.is_dir() or directory == self.segment_dir:
+                continue
+            lease = ProcessLease(directory / _LEASE_FILE)
+            if lease.acquire():
+                orphans.append((directory, lease))
+        return orphans
+
+    def _replay(self, segments: list[tuple[int, Path]]) -> int:
+        replayed = 0
+        for _number, path in segments:
+            with path.open(encoding="utf-8") as wal:
+                for line in wal:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Torn final write of a crashed process.
+                        break
+                    if entry.get("kind") in self._pending:
+                        self._queue(entry["kind"], _decode_row(entry["row"]))
+                        replayed += 1
+        return replayed
+
+    # ------------------------------------------------------------------
+    # Flushing
+    # ------------------------------------------------------------------
+
+    def lag(self) -> float:
+        """Age in seconds of the oldest unflushed record."""
+        return 0.0 if self._pending_since is None else self._clock() - self._pending_since
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "pending_records": self._pending_records,
+            "lag_seconds": self.lag(),
+            "flushed_records": self.flushed_records,
+            "failed_flushes": self.failed_flushes,
+            "last_flush_seconds": self.last_flush_seconds,
+        }
+
+    async def flush(self) -> int:
+        """Write all pending rows in one transaction.
+
+        Returns:
+            Number of records flushed.
+        """
+        async with self._flush_lock:
+            if not self._pending_records:
+                return 0
+            batch, self._pending = self._pending, {kind: {} for kind in KINDS}
+            records, since = self._pending_records, self._pending_since
+            self._pending_records, self._pending_since = 0, None
+            self._flushing = batch
+            # Later records go to a new segment; older ones are covered by this batch.
+            if self._wal is not None:
+                self._open_segment()
+            started = time.perf_counter()
+            try:
+                await self._write(batch)
+            except Exception:
+                self._requeue(batch, records, since)
+                self.failed_flushes += 1
+                raise
+            finally:
+                self._flushing = {kind: {} for kind in KINDS}
+            self.last_flush_seconds = time.perf_counter() - started
+            self.flushed_records += records
+            for number, path in self._segments(self.segment_dir):
+                if number < self._segment:
+                    path.unlink(missing_ok=True)
+            record_paper_ledger_flush(self.last_flush_seconds, records)
+            return records
+
+    def _requeue(
+        self, batch: dict[str, dict[str, dict[str, Any]]], records: int, since: float | None
+    ) -> None:
+        for kind, rows in batch.items():
+            pending = self._pending[kind]
+            for row_id, row in rows.items():
+                pending[row_id] = {**row, **pending.get(row_id, {})}
+        self._pending_records += records
+        if since is not None:
+            self._pending_since = min(since, self._pending_since or since)
+
+    async def _write(self, batch: dict[str, dict[str, dict[str, Any]]]) -> None:
+        async with unit_of_work() as session:
+            for kind, model in _UPDATES.items():
+                rows = list(batch[kind].values())
+                if rows:
+                    await session.execute(update(model), rows)
+            for kind, model in _UPSERTS.items():
+                rows = batch[kind]
+                if not rows:
+                    continue
+                ids = list(rows)
+                existing: set[str] = set()
+                for start in range(0, len(ids), _ID_CHUNK):
+                    chunk = ids[start : start + _ID_CHUNK]
+                    result = await session.execute(select(model.id).where(model.id.in_(chunk)))
+                    existing.update(result.scalars())
+                inserts = [row for row_id, row in rows.items() if row_id not in existing]
+                updates = [row for row_id, row in rows.items() if row_id in existing]
+                if inserts:
+                    await session.execute(insert(model), inserts)
+                if updates:
+                    await session.execute(update(model), updates)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception(
+                    "Paper ledger flush failed; %d records pending", self._pending_records
+                )
+            set_paper_ledger_backlog(self._pending_records, self.lag())
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def start(self) -> None:
+        """Become the writer, replay dead processes' segments, then start the flusher.
+
+        Stays in standby (not ``running``) while another process is the writer.
+        """
+        if self.running:
+            return
+        self.wal_dir.mkdir(parents=True, exist_ok=True)
+        if not self._writer.acquire():
+            self.standby = True
+            logger.info("Paper ledger standby: another process writes %s", self.wal_dir)
+            return
+        self.standby = False
+        orphans = self._orphans()
+        try:
+            replayed = sum(self._replay(self._segments(directory)) for directory, _lease in orphans)
+            if replayed:
+                logger.warning("Replaying %d paper ledger records from the WAL", replayed)
+                await self.flush()
+            for directory, _lease in orphans:
+                shutil.rmtree(directory, ignore_errors=True)
+        except Exception:
+            self._writer.release()
+            raise
+        finally:
+            for _directory, lease in orphans:
+                lease.release()
+        self._segment_lease.acquire()
+        self._open_segment()
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+        logger.info("Paper ledger started (WAL: %s)", self.segment_dir)
+
+    async def shutdown(self) -> None:
+        """Stop the flusher and write what is pending."""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        try:
+            await self.flush()
+        finally:
+            if self._wal is not None:
+                self._wal.close()
+                self._wal = None
+                if not self._pending_records:
+                    # Everything is committed; nothing to replay.
+                    shutil.rmtree(self.segment_dir, ignore_errors=True)
+            self._segment_lease.release()
+            self._writer.release()
+            self.standby = False
+            self._accounts.clear()
+            self._positions.clear()
+
+
+# Global singleton
+_paper_ledger: PaperLedger | None = None
+
+
+def get_paper_ledger() -> PaperLedger:
+    global _paper_ledger
+    if _paper_ledger is None:
+        _paper_ledger = PaperLedger()
+    return _paper_ledger
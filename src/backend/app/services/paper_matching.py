@@ -0,0 +1,408 @@
+"""
+In-memory order matching for paper trading.
+
+Market orders fill as soon as they are processed, but limit, stop and
+stop-limit orders rest until the market reaches them. ``MatchingEngine``
+keeps the resting orders of each symbol in an ``OrderBook`` of binary
+heaps in price-time priority:
+
+- buy limits by highest limit, sell limits by lowest limit;
+- buy stops by lowest stop, sell stops by highest stop.
+
+Inserting an order is O(log n); cancelling marks it dead in O(1), and dead
+entries are dropped when they reach the top of a heap (or by compaction
+once they outnumber live ones). Each quote only looks at the heap tops, so
+a tick that fills nothing costs O(1) per book side.
+
+Quotes come from the gateway tick stream (``QuoteService`` tick listener,
+receiver threads) or ``on_price``. Fills are handed to the event loop and
+settled by ``PaperTradingService.settle_resting_fills``; pending orders are
+reloaded from the database on ``start`` and, in the process that settles
+fills for standby workers (see ``paper_ledger``), every
+``PAPER_ORDER_INTAKE_INTERVAL`` seconds.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+import threading
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from app.config import get_settings
+from app.models.paper_trading import OrderSide, OrderType
+
+logger = logging.getLogger(__name__)
+
+# Order types that rest in a book until triggered.
+RESTING_ORDER_TYPES = frozenset(
+    {OrderType.LIMIT.value, OrderType.STOP.value, OrderType.STOP_LIMIT.value}
+)
+# Dead heap entries tolerated per live order before a book side is rebuilt.
+_COMPACT_RATIO = 2
+
+
+@dataclass(slots=True)
+class RestingOrder:
+    """A pending limit/stop order held by the matching engine."""
+
+    order_id: str
+    account_id: str
+    symbol: str
+    side: str
+    order_type: str
+    size: float
+    limit_price: float | None = None
+    stop_price: float | None = None
+    seq: int = 0
+    # Set when a stop-limit's stop was hit and it now rests as a limit.
+    triggered: bool = False
+    active: bool = True
+
+    @property
+    def is_buy(self) -> bool:
+        return self.side == OrderSide.BUY
+
+
+@dataclass(slots=True)
+class Fill:
+    """A resting order reached by the market."""
+
+    order: RestingOrder
+    price: float
+    # True when a stop turned the order into a market order (slippage applies).
+    marketable: bool
+
+
+@dataclass
+class _BookSide:
+    heap: list[tuple[float, int, RestingOrder]] = field(default_factory=list)
+    live: int = 0
+
+    def push(self, key: float, order: RestingOrder) -> None:
+        heapq.heappush(self.heap, (key, order.seq, order))
+        self.live += 1
+
+    def top(self) -> tuple[float, RestingOrder] | None:
+        heap = self.heap
+        while heap and not heap[0][2].active:
+            heapq.heappop(heap)
+        return (heap[0][0], heap[0][2]) if heap else None
+
+    def pop(self) -> RestingOrder:
+        self.live -= 1
+        return heapq.heappop(self.heap)[2]
+
+    def discard(self) -> None:
+        self.live -= 1
+        if len(self.heap) > _COMPACT_RATIO * self.live + 16:
+            self.heap = [entry for entry in self.heap if entry[2].active]
+            heapq.heapify(self.heap)
+
+
+class OrderBook:
+    """Resting orders of one symbol."""
+
+    def __init__(self, symbol: str) -> None:
+        self.symbol = symbol
+        # Heap keys are negated where the highest price has priority.
+        self.buy_limits = _BookSide()  # -limit
+        self.sell_limits = _BookSide()  # limit
+        self.buy_stops = _BookSide()  # stop (triggers when price >= stop)
+        self.sell_stops = _BookSide()  # -stop (triggers when price <= stop)
+
+    def __len__(self) -> int:
+        return sum(
+            side.live
+            for side in (self.buy_limits, self.sell_limits, self.buy_stops, self.sell_stops)
+        )
+
+    def _side(self, order: RestingOrder) -> tuple[_BookSide, float]:
+        if order.order_type == OrderType.LIMIT or order.triggered:
+            if order.is_buy:
+                return self.buy_limits, -float(order.limit_price)
+            return self.sell_limits, float(order.limit_price)
+        if order.is_buy:
+            return self.buy_stops, float(order.stop_price)
+        return self.sell_stops, -float(order.stop_price)
+
+    def add(self, order: RestingOrder) -> None:
+        side, key = self._side(order)
+        side.push(key, order)
+
+    def cancel(self, order: RestingOrder) -> None:
+        order.active = False
+        self._side(order)[0].discard()
+
+    def match(self, bid: float, ask: float) -> list[Fill]:
+        """Orders reached by a quote; buys execute at *ask*, sells at *bid*."""
+        fills: list[Fill] = []
+        # Stops first: a triggered stop-limit may be marketable right away.
+        while (top := self.buy_stops.top()) is not None and ask >= top[0]:
+            self._trigger(self.buy_stops.pop(), ask, fills)
+        while (top := self.sell_stops.top()) is not None and bid <= -top[0]:
+            self._trigger(self.sell_stops.pop(), bid, fills)
+        while (top := self.buy_limits.top()) is not None and ask <= -top[0]:
+            order = self.buy_limits.pop()
+            order.active = False
+            fills.append(Fill(order, ask, marketable=False))
+        while (top := self.sell_limits.top()) is not None and bid >= top[0]:
+            order = self.sell_limits.pop()
+            order.active = False
+            fills.append(Fill(order, bid, marketable=False))
+        return fills
+
+    def _trigger(self, order: RestingOrder, price: float, fills: list[Fill]) -> None:
+        if order.order_type == OrderType.STOP_LIMIT:
+            order.triggered = True
+            self.add(order)
+        else:
+            order.active = False
+            fills.append(Fill(order, price, marketable=True))
+
+
+FillHandler = Callable[[list[Fill]], Awaitable[None]]
+
+
+class MatchingEngine:
+    """Per-symbol order books driven by quotes.
+
+    Args:
+        on_fills: Coroutine settling a batch of fills on the event loop.
+        load_pending: Coroutine returning the pending resting orders to
+            reload on ``start`` and on each intake.
+        intake_interval: Seconds between reloads when started with ``intake``.
+    """
+
+    def __init__(
+        self,
+        on_fills: FillHandler,
+        load_pending: Callable[[], Awaitable[list[RestingOrder]]] | None = None,
+        intake_interval: float = 1.0,
+    ) -> None:
+        self._on_fills = on_fills
+        self._load_pending = load_pending
+        self.intake_interval = intake_interval
+        self._intake_task: asyncio.Task | None = None
+        self._books: dict[str, OrderBook] = {}
+        self._orders: dict[str, RestingOrder] = {}
+        # Last (bid, ask) per upper-cased symbol.
+        self._quotes: dict[str, tuple[float, float]] = {}
+        # Orders handed to ``on_fills`` and not settled yet.
+        self._settling: set[str] = set()
+        self._seq = itertools.count(1)
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    @property
+    def running(self) -> bool:
+        return self._loop is not None
+
+    @property
+    def order_count(self) -> int:
+        return len(self._orders)
+
+    def book(self, symbol: str) -> OrderBook | None:
+        return self._books.get(symbol.upper())
+
+    def last_price(self, symbol: str) -> float | None:
+        """Mid of the last quote seen for *symbol*."""
+        quote = self._quotes.get(symbol.upper())
+        return None if quote is None else (quote[0] + quote[1]) / 2
+
+    # ------------------------------------------------------------------
+    # Orders
+    # ------------------------------------------------------------------
+
+    def add(self, order: RestingOrder) -> None:
+        """Rest *order*; it is matched at once against the last quote."""
+        key = order.symbol.upper()
+        with self._lock:
+            if order.order_id in self._orders:
+                return
+            order.seq = next(self._seq)
+            book = self._books.get(key)
+            if book is None:
+                book = self._books[key] = OrderBook(key)
+            book.add(order)
+            self._orders[order.order_id] = order
+            quote = self._quotes.get(key)
+            fills = book.match(*quote) if quote is not None else []
+            self._take(fills)
+        self._dispatch(fills)
+
+    def cancel(self, order_id: str) -> bool:
+        """Remove a resting order; False if it is unknown or being filled."""
+        with self._lock:
+            order = self._orders.pop(str(order_id), None)
+            if order is None:
+                return False
+            self._books[order.symbol.upper()].cancel(order)
+            return True
+
+    def is_settling(self, order_id: str) -> bool:
+        return str(order_id) in self._settling
+
+    def settled(self, order_id: str) -> None:
+        self._settling.discard(str(order_id))
+
+    def _take(self, fills: list[Fill]) -> None:
+        for fill in fills:
+            self._orders.pop(fill.order.order_id, None)
+            self._settling.add(fill.order.order_id)
+
+    # ------------------------------------------------------------------
+    # Quotes
+    # ------------------------------------------------------------------
+
+    def on_price(
+        self, symbol: str, price: float, bid: float | None = None, ask: float | None = None
+    ) -> list[Fill]:
+        """Match *symbol*'s book against a new quote; safe from any thread."""
+        key = symbol.upper()
+        bid = price if bid is None or bid <= 0 else bid
+        ask = price if ask is None or ask <= 0 else ask
+        with self._lock:
+            self._quotes[key] = (bid, ask)
+            book = self._books.get(key)
+            if book is None or not len(book):
+                return []
+            fills = book.match(bid, ask)
+            self._take(fills)
+        self._dispatch(fills)
+        return fills
+
+    def _on_tick(self, source: str, payload: dict[str, Any]) -> None:
+        """Quote tick listener (receiver thread)."""
+        price = _positive(payload.get("price") or payload.get("last"))
+        # Gateway ticks (GatewayTick) carry bid_price/ask_price.
+        bid = _positive(payload.get("bid_price") or payload.get("bid"))
+        ask = _positive(payload.get("ask_price") or payload.get("ask"))
+        if price is None:
+            if bid is None or ask is None:
+                return
+            price = (bid + ask) / 2
+        symbols = {str(payload.get(name) or "") for name in ("symbol", "instrument_id")}
+        for symbol in symbols - {""}:
+            self.on_price(symbol, price, bid, ask)
+
+    def _dispatch(self, fills: list[Fill]) -> None:
+        loop = self._loop
+        if not fills or loop is None:
+            return
+        try:
+            loop.call_soon_threadsafe(self._spawn, fills)
+        except RuntimeError:
+            # Event loop closed (shutdown); pending orders reload on start.
+            pass
+
+    def _spawn(self, fills: list[Fill]) -> None:
+        task = asyncio.create_task(self._settle(fills))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _settle(self, fills: list[Fill]) -> None:
+        try:
+            await self._on_fills(fills)
+        except Exception:
+            logger.exception("Failed to settle %d paper fills", len(fills))
+        finally:
+            for fill in fills:
+                self.settled(fill.order.order_id)
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def reload(self) -> None:
+        """Sync the books with the pending orders in the database.
+
+        Adds orders submitted by other processes and drops the ones filled or
+        cancelled elsewhere (orders added during the reload are kept).
+        """
+        if self._load_pending is None:
+            return
+        mark = next(self._seq)
+        orders = await self._load_pending()
+        pending = {order.order_id for order in orders}
+        with self._lock:
+            gone = [
+                order_id
+                for order_id, order in self._orders.items()
+                if order.seq < mark and order_id not in pending
+            ]
+        for order_id in gone:
+            self.cancel(order_id)
+        for order in orders:
+            if order.order_id not in self._settling:
+                self.add(order)
+
+    async def _intake(self) -> None:
+        while True:
+            await asyncio.sleep(self.intake_interval)
+            try:
+                await self.reload()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Failed to reload pending paper orders")
+
+    async def start(self, intake: bool = False) -> None:
+        """Reload pending resting orders and subscribe to quote ticks.
+
+        Args:
+            intake: Keep reloading pending orders every ``intake_interval``
+                seconds, for orders submitted in other processes.
+        """
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        await self.reload()
+        from app.services.quote_service import get_quote_service
+
+        get_quote_service().add_tick_listener(self._on_tick)
+        if intake and self.intake_interval > 0:
+            self._intake_task = asyncio.create_task(self._intake())
+        logger.info("Paper matching engine started with %d resting orders", self.order_count)
+
+    async def shutdown(self) -> None:
+        self._loop = None
+        task, self._intake_task = self._intake_task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+
+def _positive(value: Any) -> float | None:
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if number > 0 else None
+
+
+# Global singleton
+_matching_engine: MatchingEngine | None = None
+
+
+def get_matching_engine() -> MatchingEngine:
+    global _matching_engine
+    if _matching_engine is None:
+        from app.services.paper_trading_service import PaperTradingService
+
+        _matching_engine = MatchingEngine(
+            lambda fills: PaperTradingService().settle_resting_fills(fills),
+            lambda: PaperTradingService().load_pending_orders(),
+            get_settings().PAPER_ORDER_INTAKE_INTERVAL,
+        )
+    return _matching_engine
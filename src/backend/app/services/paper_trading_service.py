@@ -6,6 +6,7 @@ Provides a Backtrader-based paper trading environment.
 
 import asyncio
 import logging
+import uuid
 from datetime import datetime, timezone
 
 from app.db.sql_repository import SQLRepository
@@ -18,11 +19,26 @@ from app.models.paper_trading import (
     PaperTrade,
     Position,
 )
+from app.services.alert_engine import publish_metric_update
+from app.services.paper_ledger import PaperLedger, get_paper_ledger
+from app.services.paper_matching import (
+    RESTING_ORDER_TYPES,
+    Fill,
+    RestingOrder,
+    get_matching_engine,
+)
+from app.services.risk_control_service import RiskControlService, get_risk_control_service
 from app.websocket_manager import MessageType
 from app.websocket_manager import manager as ws_manager
 
 logger = logging.getLogger(__name__)
 
+# Rows read per query when reloading pending orders or an account's positions.
+LOAD_PAGE_SIZE = 500
+
+# Market orders being processed by this process.
+_processing_orders: set[str] = set()
+
 
 class PaperTradingService:
     """Paper trading service.
@@ -30,9 +46,14 @@ class PaperTradingService:
     This service provides:
     1. Create and manage paper trading accounts
     2. Submit and manage paper orders
-    3. Simulate order execution
-    4. Calculate positions and PnL
+    3. Simulate order execution (limit/stop orders rest in the matching engine)
+    4. Calculate positions and PnL (persisted write-behind by ``PaperLedger``)
     5. Real-time WebSocket notifications
+    6. Pre-trade risk checks (``RiskControlService``, one instance per account)
+
+    With the paper ledger, only its writer process settles fills; workers in
+    standby store new orders as pending and the writer's matching engine
+    picks them up (``load_pending_orders``).
     """
 
     def __init__(self) -> None:
@@ -108,12 +129,47 @@ class PaperTradingService:
 
         Returns:
             The created order.
+
+        Raises:
+            ValueError: If the account does not exist, a limit/stop order
+                lacks its price, or the risk checks reject the order.
         """
         # Get account
         account = await self.account_repo.get_by_id(account_id)
         if not account:
             raise ValueError(f"Account not found: {account_id}")
 
+        resting = None
+        if order_type in RESTING_ORDER_TYPES:
+            resting = RestingOrder(
+                order_id="",
+                account_id=account_id,
+                symbol=symbol,
+                side=side,
+                order_type=order_type,
+                size=size,
+                limit_price=(limit_price or price) if order_type == OrderType.STOP_LIMIT else price,
+                stop_price=stop_price,
+            )
+            if order_type != OrderType.STOP and resting.limit_price is None:
+                raise ValueError(f"Limit price required for {order_type} orders")
+            if order_type != OrderType.LIMIT and resting.stop_price is None:
+                raise ValueError(f"Stop price required for {order_type} orders")
+
+        # Pre-trade risk check, before the order exists
+        risk = get_risk_control_service()
+        if risk.get_exposure(account_id) is None:
+            await self._seed_risk_state(risk, account)
+        reference_price = price or limit_price or stop_price
+        if reference_price is None:
+            reference_price = await self._get_simulated_price(symbol)
+        order_value = size * reference_price
+        passed, alert = risk.check_order(
+            account_id, symbol, order_value if side == OrderSide.BUY else -order_value
+        )
+        if not passed and alert is not None:
+            raise ValueError(f"Order rejected by risk control: {alert.message}")
+
         # Calculate margin and commission
         commission = size * price * account.commission_rate if price else 0
 
@@ -138,8 +194,17 @@ class PaperTradingService:
         # Send order creation notification
         await self._notify_order_update(account_id, order)
 
-        # Process order fill asynchronously
-        asyncio.create_task(self._process_order(order.id, account_id, account))
+        if get_paper_ledger().standby:
+            # Settled by the ledger's writer process
+            pass
+        elif resting is not None:
+            # Rest until the market reaches the order
+            resting.order_id = str(order.id)
+            get_matching_engine().add(resting)
+        else:
+            # Process order fill asynchronously
+            _processing_orders.add(str(order.id))
+            asyncio.create_task(self._process_order(order.id, account_id, account))
 
         return order
 
@@ -151,26 +216,129 @@ class PaperTradingService:
             account_id: Account ID.
             account: Account object.
         """
-        # Get order
-        order = await self.order_repo.get_by_id(order_id)
-        if not order:
-            logger.error(f"Order not found: {order_id}")
-            return
+        try:
+            # Get order
+            order = await self.order_repo.get_by_id(order_id)
+            if not order:
+                logger.error(f"Order not found: {order_id}")
+                return
 
-        # Get current price (simulated)
-        current_price = await self._get_simulated_price(order.symbol)
+            # Get current price (simulated)
+            current_price = await self._get_simulated_price(order.symbol)
 
-        # Calculate slippage
-        slippage = self._calculate_slippage(
-            order.price,
-            current_price,
-            account.slippage_rate,
-            order.side,
-            order.order_type,
-        )
+            # Calculate slippage
+            slippage = self._calculate_slippage(
+                order.price,
+                current_price,
+                account.slippage_rate,
+                order.side,
+                order.order_type,
+            )
+
+            await self._settle_fill(order, account, current_price + slippage)
+        finally:
+            _processing_orders.discard(str(order_id))
+
+    async def settle_resting_fills(self, fills: list[Fill]) -> None:
+        """Execute resting orders reached by the market (matching engine).
+
+        Args:
+            fills: Fills in match order.
+        """
+        accounts: dict[str, Account] = {}
+        for fill in fills:
+            # Status is checked again when the fill is claimed (other processes
+            # match the same orders).
+            order = await self.order_repo.get_by_id(fill.order.order_id)
+            if not order or order.status != OrderStatus.PENDING:
+                continue
+            account = accounts.get(order.account_id)
+            if account is None:
+                account = await self.account_repo.get_by_id(order.account_id)
+                if not account:
+                    continue
+                accounts[order.account_id] = account
+            price = fill.price
+            if fill.marketable:
+                # A triggered stop executes as a market order
+                price += self._calculate_slippage(
+                    None, price, account.slippage_rate, order.side, OrderType.MARKET
+                )
+            await self._settle_fill(order, account, price)
+
+    async def load_pending_orders(self) -> list[RestingOrder]:
+        """Pending orders, for reloading the matching engine.
+
+        Pending market orders (submitted in a standby worker, or interrupted by
+        a restart) are processed here as well.
+
+        Returns:
+            Resting orders in submission order.
+        """
+        resting = []
+        accounts: dict[str, Account | None] = {}
+        skip = 0
+        while True:
+            orders = await self.order_repo.list(
+                filters={"status": OrderStatus.PENDING},
+                skip=skip,
+                limit=LOAD_PAGE_SIZE,
+                sort_by="created_at",
+                sort_order="asc",
+            )
+            for order in orders:
+                if order.order_type not in RESTING_ORDER_TYPES:
+                    if str(order.id) in _processing_orders:
+                        continue
+                    if order.account_id not in accounts:
+                        accounts[order.account_id] = await self.account_repo.get_by_id(
+                            order.account_id
+                        )
+                    account = accounts[order.account_id]
+                    if account is not None:
+                        _processing_orders.add(str(order.id))
+                        asyncio.create_task(self._process_order(order.id, account.id, account))
+                    continue
+                resting.append(
+                    RestingOrder(
+                        order_id=str(order.id),
+                        account_id=order.account_id,
+                        symbol=order.symbol,
+                        side=order.side,
+                        order_type=order.order_type,
+                        size=order.size,
+                        limit_price=(order.limit_price or order.price)
+                        if order.order_type == OrderType.STOP_LIMIT
+                        else order.price,
+                        stop_price=order.stop_price,
+                    )
+                )
+            if len(orders) < LOAD_PAGE_SIZE:
+                return resting
+            skip += LOAD_PAGE_SIZE
 
-        fill_price = current_price + slippage
+    async def _settle_fill(self, order: Order, account: Account, fill_price: float) -> None:
+        """Fill an order at *fill_price* if the account can afford it.
+
+        The order is first claimed with a conditional status update, so an
+        order that another process filled or a user cancelled meanwhile is
+        left alone.
+
+        Args:
+            order: Order object.
+            account: Account object.
+            fill_price: Execution price including slippage.
+        """
+        if not await self._claim_order(order.id, OrderStatus.FILLED):
+            logger.info(f"Order {order.id} is no longer pending; fill skipped")
+            return
+        ledger = get_paper_ledger()
+        if ledger.running:
+            account = ledger.adopt_account(account)
+        account_id = account.id
+        order_id = order.id
         commission = order.size * fill_price * account.commission_rate
+        equity_before = account.total_equity
 
         # Check sufficient funds
         if order.side == OrderSide.BUY:
@@ -186,17 +354,66 @@ class PaperTradingService:
                 await self._reject_order(order, "Insufficient position")
                 return
 
-        # Execute fill
-        await self._fill_order(order, fill_price, commission)
+        if ledger.running:
+            await self._record_fill(ledger, account, order, fill_price, commission)
+        else:
+            # Execute fill
+            await self._fill_order(order, fill_price, commission)
 
-        # Update position
-        await self._update_position(account, order, fill_price, commission)
+            # Update position
+            await self._update_position(account, order, fill_price, commission)
 
-        # Update account
-        await self._update_account(account, order, fill_price, commission)
+            # Update account
+            await self._update_account(account, order, fill_price, commission)
 
+        fill_value = order.size * fill_price
+        get_risk_control_service().on_fill(
+            str(account_id),
+            order.symbol,
+            fill_value if order.side == OrderSide.BUY else -fill_value,
+            pnl=account.total_equity - equity_before,
+        )
         logger.info(f"Order filled: {order_id} at {fill_price}")
 
+    async def _seed_risk_state(self, risk: RiskControlService, account: Account) -> None:
+        """Load an account's balance and positions into the risk service.
+
+        Runs once per account and process; fills keep the state current
+        afterwards (``on_fill``).
+
+        Args:
+            risk: Risk control service.
+            account: Account object.
+        """
+        account_id = str(account.id)
+        ledger = get_paper_ledger()
+        if ledger.running:
+            account = ledger.adopt_account(account)
+            positions = list(
+                (
+                    await ledger.positions(account_id, lambda: self._load_positions(account_id))
+                ).values()
+            )
+        else:
+            positions = await self._load_positions(account_id)
+        risk.update_balance(account_id, account.total_equity)
+        for position in positions:
+            risk.update_position(account_id, position.symbol, position.size * position.avg_price)
+
+    async def _claim_order(self, order_id: str, status: OrderStatus) -> bool:
+        """Move a pending order to *status* in the database.
+
+        Args:
+            order_id: Order ID.
+            status: New status.
+
+        Returns:
+            False if the order was no longer pending.
+        """
+        return await self.order_repo.update_if(
+            order_id, {"status": OrderStatus.PENDING}, {"status": status}
+        )
+
     async def _fill_order(self, order: Order, price: float, commission: float) -> None:
         """Fill an order.
 
@@ -271,6 +488,11 @@ class PaperTradingService:
         Returns:
             Position or None.
         """
+        ledger = get_paper_ledger()
+        if ledger.running:
+            positions = await ledger.positions(account_id, lambda: self._load_positions(account_id))
+            return positions.get(symbol)
+
         positions = await self.position_repo.list(
             filters={"account_id": account_id, "symbol": symbol}, limit=1
         )
@@ -293,79 +515,21 @@ class PaperTradingService:
             commission: Commission amount.
         """
         position = await self._get_position(account.id, order.symbol)
+        values, realized = self._position_change(position, order, price)
 
         if not position:
             # Create new position
-            position = Position(
-                account_id=account.id,
-                symbol=order.symbol,
-                size=order.size if order.side == OrderSide.BUY else -order.size,
-                avg_price=price,
-                market_value=order.size * price,
-                unrealized_pnl=0.0,
-                unrealized_pnl_pct=0.0,
-                entry_price=price,
-                entry_time=datetime.now(timezone.utc),
-            )
+            position = Position(account_id=account.id, symbol=order.symbol, **values)
 
             await self.position_repo.create(position)
 
         else:
             # Update existing position
-            old_size = position.size
-            old_market_value = position.market_value
-
-            # Update size
-            if order.side == OrderSide.BUY:
-                new_size = old_size + order.size
-            else:
-                new_size = old_size - order.size
-
-            # Calculate new average price
-            total_value = abs(old_size) * position.avg_price + order.size * price
-            new_avg_price = total_value / abs(new_size) if new_size != 0 else 0
-
-            # Calculate new market value
-            new_market_value = new_size * price
-
-            # Calculate unrealized PnL
-            if new_size != 0:
-                if new_size > 0:
-                    unrealized_pnl = (price - new_avg_price) * new_size
-                else:
-                    unrealized_pnl = (new_avg_price - price) * abs(new_size)
-            else:
-                unrealized_pnl = old_market_value - abs(old_size) * new_avg_price
-
-            unrealized_pnl_pct = (
-                (unrealized_pnl / abs(new_size * new_avg_price) * 100) if new_avg_price != 0 else 0
-            )
-
-            await self.position_repo.update(
-                position.id,
-                {
-                    "size": new_size,
-                    "avg_price": new_avg_price,
-                    "market_value": new_market_value,
-                    "unrealized_pnl": unrealized_pnl,
-                    "unrealized_pnl_pct": unrealized_pnl_pct,
-                    "updated_at": datetime.now(timezone.utc),
-                },
-            )
+            await self.position_repo.update(position.id, values)
 
             # Update trade record PnL (if closing position)
-            if (old_size > 0 and new_size <= 0) or (old_size < 0 and new_size >= 0):
-                # Calculate realized PnL
-                if old_size > 0:
-                    pnl = (price - position.avg_price) * abs(old_size)
-                else:
-                    pnl = (position.avg_price - price) * abs(old_size)
-
-                pnl_pct = (
-                    (pnl / (abs(old_size) * position.avg_price) * 100)
-                    if position.avg_price != 0
-                    else 0
-                )
+            if realized is not None:
+                pnl, pnl_pct = realized
 
                 # Update trade record
                 trade = await self._get_last_trade(order.id)
@@ -378,6 +542,85 @@ class PaperTradingService:
                         },
                     )
 
+    @staticmethod
+    def _position_change(
+        position: Position | None, order: Order, price: float
+    ) -> tuple[dict, tuple[float, float] | None]:
+        """Position values after a fill.
+
+        Args:
+            position: Current position, or None for a new one.
+            order: Filled order.
+            price: Fill price.
+
+        Returns:
+            Tuple of (new position values, realized ``(pnl, pnl_pct)`` if the
+            fill closed or reversed the position).
+        """
+        if not position:
+            return {
+                "size": order.size if order.side == OrderSide.BUY else -order.size,
+                "avg_price": price,
+                "market_value": order.size * price,
+                "unrealized_pnl": 0.0,
+                "unrealized_pnl_pct": 0.0,
+                "entry_price": price,
+                "entry_time": datetime.now(timezone.utc),
+            }, None
+
+        old_size = position.size
+        old_market_value = position.market_value
+
+        # Update size
+        if order.side == OrderSide.BUY:
+            new_size = old_size + order.size
+        else:
+            new_size = old_size - order.size
+
+        # Calculate new average price
+        total_value = abs(old_size) * position.avg_price + order.size * price
+        new_avg_price = total_value / abs(new_size) if new_size != 0 else 0
+
+        # Calculate new market value
+        new_market_value = new_size * price
+
+        # Calculate unrealized PnL
+        if new_size != 0:
+            if new_size > 0:
+                unrealized_pnl = (price - new_avg_price) * new_size
+            else:
+                unrealized_pnl = (new_avg_price - price) * abs(new_size)
+        else:
+            unrealized_pnl = old_market_value - abs(old_size) * new_avg_price
+
+        unrealized_pnl_pct = (
+            (unrealized_pnl / abs(new_size * new_avg_price) * 100) if new_avg_price != 0 else 0
+        )
+
+        values = {
+            "size": new_size,
+            "avg_price": new_avg_price,
+            "market_value": new_market_value,
+            "unrealized_pnl": unrealized_pnl,
+            "unrealized_pnl_pct": unrealized_pnl_pct,
+            "updated_at": datetime.now(timezone.utc),
+        }
+
+        realized = None
+        if (old_size > 0 and new_size <= 0) or (old_size < 0 and new_size >= 0):
+            # Calculate realized PnL
+            if old_size > 0:
+                pnl = (price - position.avg_price) * abs(old_size)
+            else:
+                pnl = (position.avg_price - price) * abs(old_size)
+
+            pnl_pct = (
+                (pnl / (abs(old_size) * position.avg_price) * 100) if position.avg_price != 0 else 0
+            )
+            realized = (pnl, pnl_pct)
+
+        return values, realized
+
     async def _update_account(
         self,
         account: Account,
@@ -397,6 +640,36 @@ class PaperTradingService:
         positions = await self.position_repo.list(filters={"account_id": account.id})
         total_market_value = sum(p.market_value for p in positions)
 
+        values = self._account_change(account, order, price, commission, total_market_value)
+        await self.account_repo.update(account.id, values)
+
+        # Send account update
+        await self._notify_account_update(account)
+
+        # Send position updates
+        for position in positions:
+            await self._notify_position_update(position)
+
+    @staticmethod
+    def _account_change(
+        account: Account,
+        order: Order,
+        price: float,
+        commission: float,
+        total_market_value: float,
+    ) -> dict:
+        """Apply a fill to the account's cash, equity and PnL.
+
+        Args:
+            account: Account object (updated in place).
+            order: Filled order.
+            price: Fill price.
+            commission: Commission amount.
+            total_market_value: Market value of all positions after the fill.
+
+        Returns:
+            Changed account values.
+        """
         # Update cash
         if order.side == OrderSide.BUY:
             account.current_cash -= order.size * price + commission
@@ -411,23 +684,113 @@ class PaperTradingService:
         account.profit_loss = profit_loss
         account.profit_loss_pct = (profit_loss / account.initial_cash) * 100
 
-        await self.account_repo.update(
-            account.id,
-            {
-                "current_cash": account.current_cash,
-                "total_equity": account.total_equity,
-                "profit_loss": account.profit_loss,
-                "profit_loss_pct": account.profit_loss_pct,
-                "updated_at": datetime.now(timezone.utc),
-            },
+        return {
+            "current_cash": account.current_cash,
+            "total_equity": account.total_equity,
+            "profit_loss": account.profit_loss,
+            "profit_loss_pct": account.profit_loss_pct,
+            "updated_at": datetime.now(timezone.utc),
+        }
+
+    async def _record_fill(
+        self,
+        ledger: PaperLedger,
+        account: Account,
+        order: Order,
+        price: float,
+        commission: float,
+    ) -> None:
+        """Settle a fill in memory and hand the changed rows to the ledger.
+
+        Args:
+            ledger: Running paper ledger.
+            account: The ledger's account object.
+            order: Order object.
+            price: Fill price.
+            commission: Commission amount.
+        """
+        positions = await ledger.positions(account.id, lambda: self._load_positions(account.id))
+        now = datetime.now(timezone.utc)
+
+        order.status = OrderStatus.FILLED
+        order.filled_size = order.size
+        order.avg_fill_price = price
+        order.commission = commission
+        order.filled_at = now
+
+        position = positions.get(order.symbol)
+        values, realized = self._position_change(position, order, price)
+        if not position:
+            position = Position(
+                id=str(uuid.uuid4()), account_id=account.id, symbol=order.symbol, **values
+            )
+            positions[order.symbol] = position
+            position_row = {
+                "id": position.id,
+                "account_id": account.id,
+                "symbol": order.symbol,
+                "updated_at": now,
+                **values,
+            }
+        else:
+            for name, value in values.items():
+                setattr(position, name, value)
+            position_row = {"id": position.id, **values}
+        pnl, pnl_pct = realized or (0.0, 0.0)
+
+        total_market_value = sum(p.market_value for p in positions.values())
+        account_values = self._account_change(account, order, price, commission, total_market_value)
+
+        ledger.record(
+            [
+                (
+                    "order",
+                    {
+                        "id": order.id,
+                        "status": order.status,
+                        "filled_size": order.filled_size,
+                        "avg_fill_price": order.avg_fill_price,
+                        "commission": order.commission,
+                        "filled_at": order.filled_at,
+                    },
+                ),
+                ("position", position_row),
+                (
+                    "trade",
+                    {
+                        "id": str(uuid.uuid4()),
+                        "account_id": order.account_id,
+                        "order_id": order.id,
+                        "symbol": order.symbol,
+                        "side": order.side,
+                        "size": order.size,
+                        "price": price,
+                        "commission": commission,
+                        "slippage": 0.0,  # Slippage already included in price
+                        "pnl": pnl,
+                        "pnl_pct": pnl_pct,
+                        "created_at": now,
+                    },
+                ),
+                ("account", {"id": account.id, **account_values}),
+            ]
         )
 
-        # Send account update
+        # Market values of every position feed the account equity: send them all,
+        # as the unbuffered path does.
         await self._notify_account_update(account)
-
-        # Send position updates
-        for position in positions:
-            await self._notify_position_update(position)
+        for held in positions.values():
+            await self._notify_position_update(held)
+
+    async def _load_positions(self, account_id: str) -> list[Position]:
+        positions = []
+        while True:
+            page = await self.position_repo.list(
+                filters={"account_id": account_id}, skip=len(positions), limit=LOAD_PAGE_SIZE
+            )
+            positions.extend(page)
+            if len(page) < LOAD_PAGE_SIZE:
+                return positions
 
     async def _get_last_trade(self, order_id: str) -> PaperTrade | None:
         """Get the last trade for an order.
@@ -456,7 +819,9 @@ class PaperTradingService:
         Returns:
             Account or None.
         """
-        return await self.account_repo.get_by_id(account_id)
+        account = await self.account_repo.get_by_id(account_id)
+        # Fills not yet flushed are only in the ledger
+        return get_paper_ledger().apply_pending("account", account) if account else None
 
     async def list_accounts(
         self,
@@ -494,7 +859,8 @@ class PaperTradingService:
         Returns:
             Order or None.
         """
-        return await self.order_repo.get_by_id(order_id)
+        order = await self.order_repo.get_by_id(order_id)
+        return get_paper_ledger().apply_pending("order", order) if order else None
 
     async def list_orders(
         self,
@@ -506,6 +872,9 @@ class PaperTradingService:
     ) -> tuple[list[Order], int]:
         """List orders with filtering.
 
+        Unflushed fills are applied to the returned orders; *filters* and
+        sorting see the committed rows, at most one ledger flush behind.
+
         Args:
             filters: Filter conditions.
             limit: Items per page.
@@ -525,7 +894,8 @@ class PaperTradingService:
         )
         total = await self.order_repo.count(filters=filters)
 
-        return orders, total
+        ledger = get_paper_ledger()
+        return [ledger.apply_pending("order", order) for order in orders], total
 
     async def list_positions(
         self,
@@ -537,6 +907,9 @@ class PaperTradingService:
     ) -> tuple[list[Position], int]:
         """List positions with filtering.
 
+        Unflushed fills are applied to the returned positions; positions opened
+        since the last ledger flush appear after the next one.
+
         Args:
             filters: Filter conditions.
             limit: Items per page.
@@ -556,7 +929,8 @@ class PaperTradingService:
         )
         total = await self.position_repo.count(filters=filters)
 
-        return positions, total
+        ledger = get_paper_ledger()
+        return [ledger.apply_pending("position", position) for position in positions], total
 
     async def list_trades(
         self,
@@ -605,6 +979,8 @@ class PaperTradingService:
 
         # Soft delete: mark as inactive
         await self.account_repo.update(account_id, {"is_active": False})
+        # The ledger's copy would otherwise outlive the change
+        get_paper_ledger().forget_account(account_id)
         return True
 
     async def cancel_order(self, order_id: str, user_id: str) -> bool:
@@ -630,8 +1006,11 @@ class PaperTradingService:
         if order.status != OrderStatus.PENDING:
             return False
 
-        # Mark as cancelled
-        await self.order_repo.update(order_id, {"status": OrderStatus.CANCELLED})
+        # Mark as cancelled unless a fill claimed the order first (in any process)
+        if not await self._claim_order(order_id, OrderStatus.CANCELLED):
+            return False
+        get_matching_engine().cancel(order_id)
+        order.status = OrderStatus.CANCELLED
 
         # Send update
         await self._notify_order_update(order.account_id, order)
@@ -647,7 +1026,8 @@ class PaperTradingService:
         Returns:
             Position or None.
         """
-        return await self.position_repo.get_by_id(position_id)
+        position = await self.position_repo.get_by_id(position_id)
+        return get_paper_ledger().apply_pending("position", position) if position else None
 
     def _calculate_slippage(
         self,
@@ -691,8 +1071,8 @@ class PaperTradingService:
     async def _get_simulated_price(self, symbol: str) -> float:
         """Get simulated price for trading.
 
-        In production, this should fetch from real-time data source.
-        Currently returns simulated price for testing.
+        Uses the last gateway quote seen by the matching engine; symbols
+        without quotes get a fixed price for testing.
 
         Args:
             symbol: Trading symbol.
@@ -700,8 +1080,10 @@ class PaperTradingService:
         Returns:
             Simulated price.
         """
-        # This should integrate with real-time market data
-        # Currently returns fixed price for testing
+        last_price = get_matching_engine().last_price(symbol)
+        if last_price is not None:
+            return last_price
+
         if "000001" in symbol:
             return 10.5
         elif "600000" in symbol:
@@ -715,6 +1097,7 @@ class PaperTradingService:
         Args:
             account: Account object.
         """
+        publish_metric_update(("paper_account", str(account.id)), account)
         await ws_manager.send_to_task(
             f"account:{account.id}",
             {
@@ -735,6 +1118,9 @@ class PaperTradingService:
         Args:
             position: Position object.
         """
+        publish_metric_update(
+            ("paper_position", str(position.account_id), str(position.symbol)), position
+        )
         await ws_manager.send_to_task(
             f"position:{position.id}",
             {
@@ -17,7 +17,8 @@ import subprocess
 import tempfile
 import threading
 import uuid
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
@@ -29,9 +30,22 @@ from app.services.optimization_async_runner import (
     _ensure_async_runner_loop,
     _run_async,
 )
+from app.services.optimization_batch_runner import request_batch_cancel, run_trial_batch
 from app.services.optimization_execution_manager import (
     get_optimization_execution_manager,
 )
+from app.services.optimization_halving import (
+    FIDELITY_BARS_ENV,
+    FidelityIgnored,
+    HalvingOutcome,
+    bounded_map,
+    build_halving_pruner,
+    estimate_evaluations,
+    fidelity_schedule,
+    honours_fidelity,
+    run_successive_halving,
+)
+from app.services.optimization_submission import ParamGrid
 from app.services.optimization_submission import (
     generate_param_grid as _submission_generate_param_grid,
 )
@@ -50,6 +64,9 @@ from app.services.optimization_task_gateway import (
 from app.services.optimization_task_gateway import (
     persist_optimization_task as _gateway_persist_optimization_task,
 )
+from app.services.optimization_task_gateway import (
+    select_persisted_results as _gateway_select_persisted_results,
+)
 from app.services.optimization_task_state import (
     build_initial_runtime_task,
     build_progress_response,
@@ -176,6 +193,7 @@ def _run_single_trial(
     trial_index: int,
     tmp_base: str,
     artifact_root: str | None = None,
+    fidelity_bars: int | None = None,
 ) -> dict[str, Any]:
     """Run a single backtest trial in an isolated process.
 
@@ -188,6 +206,7 @@ def _run_single_trial(
         params: Dictionary of parameters to use for this trial.
         trial_index: Index of this trial in the optimization grid.
         tmp_base: Base temporary directory for trial execution.
+        fidelity_bars: Ask the runtime to simulate only the first N bars.
 
     Returns:
         Dictionary containing trial results with keys:
@@ -205,6 +224,7 @@ def _run_single_trial(
         artifact_root,
         parse_trial_logs_fn=_parse_trial_logs,
         subprocess_module=subprocess,
+        fidelity_bars=fidelity_bars,
     )
 
 
@@ -246,7 +266,7 @@ def _parse_trial_logs(trial_dir: Path) -> dict[str, float] | None:
 
 def generate_param_grid(
     param_ranges: dict[str, dict[str, float]],
-) -> list[dict[str, Any]]:
+) -> ParamGrid:
     """Generate a Cartesian product parameter grid from range specifications.
 
     Args:
@@ -255,7 +275,8 @@ def generate_param_grid(
             Optional: type ("int" or "float", defaults to "float").
 
     Returns:
-        List of parameter dictionaries, one for each combination in the grid.
+        Lazy sequence of parameter dictionaries, one for each combination in
+        the grid. ``len()`` and indexing do not materialize the product.
     """
     return _submission_generate_param_grid(param_ranges)
 
@@ -308,10 +329,148 @@ def submit_optimization(
     )
 
 
+def submit_halving_optimization(
+    strategy_id: str,
+    param_ranges: dict[str, dict[str, float]],
+    strategy_dir: str,
+    n_workers: int = 4,
+    task_id: str | None = None,
+    persist_to_db: bool = True,
+    artifact_root: str | None = None,
+    *,
+    metric: str = "sharpe_ratio",
+    min_bars: int = 250,
+    eta: int = 3,
+    rungs: int = 3,
+) -> str:
+    """Submit a grid optimization that scores candidates by successive halving.
+
+    For strategies whose ``run.py`` honours the fidelity bar window (see
+    ``honours_fidelity``), such as workspace unit runtimes. Each rung runs
+    its candidates on ``n_workers`` trial subprocesses at a time.
+
+    Args:
+        strategy_id: The strategy identifier to optimize.
+        param_ranges: Dictionary mapping parameter names to range specifications.
+        strategy_dir: Directory holding the strategy's run.py.
+        n_workers: Number of trials run in parallel.
+        task_id: Optional task ID (e.g. from DB). If not provided, generates one.
+        persist_to_db: If True, persist progress and results to DB.
+        artifact_root: Where full-range trials keep their log artifacts.
+        metric: Metric candidates are promoted by.
+        min_bars: Bars used by the first rung.
+        eta: Reduction factor between rungs.
+        rungs: Number of rungs, the last one on the full range.
+
+    Returns:
+        The task ID for tracking optimization progress.
+
+    Raises:
+        ValueError: If the parameter grid is empty.
+    """
+    grid = generate_param_grid(param_ranges)
+    if not grid:
+        raise ValueError("Parameter grid is empty, please check parameter range settings")
+    schedule = fidelity_schedule(min_bars, eta, rungs)
+    resolved_task_id = task_id or uuid.uuid4().hex[:8]
+    _set_task(
+        resolved_task_id,
+        build_initial_runtime_task(
+            strategy_id=strategy_id,
+            param_ranges=param_ranges,
+            total=estimate_evaluations(len(grid), eta, len(schedule)),
+            n_workers=n_workers,
+            created_at=datetime.now(timezone.utc).isoformat(),
+            status=TaskStatus.RUNNING.value,
+        ),
+    )
+    thread = threading.Thread(
+        target=_run_halving_optimization_thread,
+        args=(resolved_task_id, strategy_dir, grid, n_workers, persist_to_db, artifact_root),
+        kwargs={"schedule": schedule, "eta": eta, "metric": metric},
+        daemon=True,
+    )
+    thread.start()
+    return resolved_task_id
+
+
+def _run_halving_optimization_thread(
+    task_id: str,
+    strategy_dir: str,
+    grid: Sequence[dict[str, Any]],
+    n_workers: int,
+    persist_to_db: bool,
+    artifact_root: str | None,
+    *,
+    schedule: list[int | None],
+    eta: int,
+    metric: str,
+) -> None:
+    """Run ``submit_halving_optimization`` rung by rung in a background thread."""
+    tmp_base = tempfile.mkdtemp(prefix=f"opt_{task_id[:8]}_")
+    trial_indexes = itertools.count()
+
+    def _evaluate(params: dict[str, Any], bars: int | None) -> dict[str, float] | None:
+        result = _run_single_trial(
+            strategy_dir,
+            params,
+            next(trial_indexes),
+            tmp_base,
+            artifact_root if bars is None else None,
+            fidelity_bars=bars,
+        )
+        return result.get("metrics") if result.get("success") else None
+
+    def _on_evaluation(outcome: HalvingOutcome) -> None:
+        _update_task(
+            task_id,
+            completed=outcome.evaluations - outcome.failures,
+            failed=outcome.failures,
+            results=list(outcome.results),
+        )
+        if persist_to_db:
+            _persist_runtime_task(task_id)
+
+    try:
+        with ThreadPoolExecutor(max_workers=n_workers) as executor:
+            outcome = run_successive_halving(
+                grid,
+                len(grid),
+                schedule,
+                eta,
+                _evaluate,
+                lambda metrics: _score_optimization_metrics(metrics, metric),
+                should_stop=lambda: _is_optimization_cancelled(task_id, persist_to_db),
+                on_evaluation=_on_evaluation,
+                map_fn=lambda fn, items: bounded_map(executor, fn, items, 2 * n_workers),
+            )
+        logger.info(
+            "Successive halving %s: rung sizes %s, %s evaluations",
+            task_id,
+            outcome.rung_sizes,
+            outcome.evaluations,
+        )
+        _finalize_backtest_optimization_task(task_id, persist_to_db)
+    except Exception as e:
+        logger.error("Optimization task failed %s: %s", task_id, e)
+        _update_task(task_id, status=TaskStatus.FAILED.value, error=str(e))
+        if persist_to_db:
+            _persist_runtime_task(
+                task_id,
+                completed=0,
+                failed=0,
+                results=[],
+                status=TaskStatus.FAILED.value,
+                error_message=str(e),
+            )
+    finally:
+        shutil.rmtree(tmp_base, ignore_errors=True)
+
+
 def _run_optimization_thread(
     task_id: str,
     strategy_dir: str,
-    grid: list[dict[str, Any]],
+    grid: Sequence[dict[str, Any]],
     n_workers: int,
     persist_to_db: bool = True,
     artifact_root: str | None = None,
@@ -321,10 +480,13 @@ def _run_optimization_thread(
     Args:
         task_id: The optimization task identifier.
         strategy_dir: Path to the strategy directory.
-        grid: List of parameter combinations to evaluate.
+        grid: Parameter combinations to evaluate (typically a lazy ``ParamGrid``).
         n_workers: Number of parallel worker processes.
         persist_to_db: If True, persist final state to DB on completion.
     """
+    from app.config import get_settings
+
+    settings = get_settings()
     _thread_runner_run_optimization_thread(
         task_id,
         strategy_dir,
@@ -342,6 +504,11 @@ def _run_optimization_thread(
         mkdtemp_fn=tempfile.mkdtemp,
         rmtree_fn=shutil.rmtree,
         logger=logger,
+        flush_interval=settings.OPTIMIZATION_PROGRESS_FLUSH_INTERVAL,
+        run_trial_batch_fn=run_trial_batch,
+        batch_size=settings.OPTIMIZATION_BATCH_SIZE,
+        artifact_top_k=settings.OPTIMIZATION_BATCH_ARTIFACT_TOP_K,
+        cancel_batches_fn=request_batch_cancel,
     )
 
 
@@ -375,22 +542,56 @@ def get_optimization_progress(
 
 
 def get_optimization_results(
-    task_id: str, user_id: str | None = None, use_db: bool = True
+    task_id: str,
+    user_id: str | None = None,
+    use_db: bool = True,
+    *,
+    sort_by: str = "annual_return",
+    descending: bool = True,
+    limit: int | None = None,
+    offset: int = 0,
 ) -> dict[str, Any] | None:
     """Get the results of a completed optimization task. Checks DB first, then in-memory.
 
+    Persisted tasks are ordered and paged in SQL; tasks running in this
+    process are paged from memory.
+
     Args:
         task_id: The optimization task identifier.
+        sort_by: Metric (or parameter) rows are ordered by.
+        descending: Sort direction.
+        limit: Return only ``limit`` rows.
+        offset: Skip the first ``offset`` rows.
 
     Returns:
         Dictionary containing optimization results, or None if task not found.
     """
-    return _query_task_response(
-        task_id,
-        build_results_response,
-        user_id=user_id,
-        use_db=use_db,
-    )
+
+    def _build(tid: str, task: dict[str, Any]) -> dict[str, Any]:
+        selected = None
+        if use_db:
+            selected = _gateway_select_persisted_results(
+                tid,
+                task,
+                sort_by=sort_by,
+                descending=descending,
+                limit=limit,
+                offset=offset,
+                get_manager=get_optimization_execution_manager,
+                run_async=_run_async,
+                get_task=_get_task,
+            )
+        return build_results_response(
+            tid,
+            task,
+            sort_by=sort_by,
+            descending=descending,
+            limit=limit,
+            offset=offset,
+            selected=selected,
+        )
+
+    return _query_task_response(task_id, _build, user_id=user_id, use_db=use_db)
 
 
 def cancel_optimization(task_id: str, user_id: str | None = None, use_db: bool = True) -> bool:
@@ -437,16 +638,40 @@ def _build_backtest_optimization_runtime_task(
     }
 
 
-def _generate_backtest_param_combinations(param_grid: dict[str, list[Any]]) -> list[dict[str, Any]]:
-    keys = list(param_grid.keys())
-    values = list(param_grid.values())
-    combinations = list(itertools.product(*values))
-    return [dict(zip(keys, combo, strict=False)) for combo in combinations]
+def _generate_backtest_param_combinations(param_grid: dict[str, list[Any]]) -> ParamGrid:
+    return ParamGrid(list(param_grid.keys()), list(param_grid.values()))
+
+
+def _halving_enabled(request: OptimizationRequest) -> bool:
+    """Whether ``early_stopping`` can apply: the strategy honours the bar window."""
+    if not request.early_stopping:
+        return False
+    from app.services.strategy_service import get_strategy_dir
+
+    try:
+        strategy_dir = get_strategy_dir(request.backtest_config.strategy_id)
+    except ValueError:
+        return False
+    return honours_fidelity(strategy_dir)
+
+
+def _halving_schedule(request: OptimizationRequest) -> list[int | None]:
+    return fidelity_schedule(
+        request.halving_min_bars,
+        request.halving_eta,
+        request.halving_rungs,
+        full_bars=request.backtest_config.bar_count,
+    )
 
 
 def estimate_backtest_optimization_total(request: OptimizationRequest) -> int:
     if request.method == "grid":
-        return len(_generate_backtest_param_combinations(request.param_grid or {}))
+        n_candidates = len(_generate_backtest_param_combinations(request.param_grid or {}))
+        if _halving_enabled(request):
+            return estimate_evaluations(
+                n_candidates, request.halving_eta, len(_halving_schedule(request))
+            )
+        return n_candidates
     return request.n_trials
 
 
@@ -463,8 +688,8 @@ def _extract_backtest_metrics(result: Any) -> dict[str, float]:
 def _score_optimization_metrics(metrics: dict[str, float], metric: str) -> float:
     if metric == "max_drawdown":
         return -float(metrics.get("max_drawdown", float("inf")))
-    if metric == "total_return":
-        return float(metrics.get("total_return", float("-inf")))
+    if metric in ("total_return", "annual_return"):
+        return float(metrics.get(metric, float("-inf")))
     return float(metrics.get("sharpe_ratio", float("-inf")))
 
 
@@ -580,6 +805,78 @@ def _run_backtest_grid_optimization(
             _persist_runtime_task(task_id)
 
 
+def _evaluate_backtest_params(
+    user_id: str,
+    request: OptimizationRequest,
+    params: dict[str, Any],
+    bars: int | None,
+    backtest_service: BacktestService,
+) -> dict[str, float] | None:
+    """Run one backtest on the first ``bars`` bars; metrics or None on failure.
+
+    Raises:
+        FidelityIgnored: The strategy simulated more than ``bars`` bars.
+    """
+    backtest_request = request.backtest_config.model_copy()
+    backtest_request.params = params
+    backtest_request.fidelity_bars = bars
+    try:
+        result = _run_async(
+            _run_backtest_request(user_id, backtest_request, backtest_service=backtest_service)
+        )
+    except Exception as e:
+        logger.error("Backtest optimization trial failed: %s", e)
+        return None
+    if getattr(result, "status", None) != TaskStatus.COMPLETED:
+        return None
+    metrics = _extract_backtest_metrics(result)
+    if bars is not None and len(getattr(result, "equity_curve", None) or []) > bars:
+        raise FidelityIgnored(metrics)
+    return metrics
+
+
+def _run_backtest_halving_optimization(
+    task_id: str,
+    user_id: str,
+    request: OptimizationRequest,
+    persist_to_db: bool,
+) -> None:
+    """Grid search with successive halving over growing bar windows."""
+    backtest_service = BacktestService()
+    grid = _generate_backtest_param_combinations(request.param_grid or {})
+
+    def _on_evaluation(outcome: HalvingOutcome) -> None:
+        if outcome.fidelity_ignored:
+            _update_task(task_id, total=len(grid))
+        _update_task(
+            task_id,
+            completed=outcome.evaluations - outcome.failures,
+            failed=outcome.failures,
+            results=list(outcome.results),
+        )
+        if persist_to_db:
+            _persist_runtime_task(task_id)
+
+    outcome = run_successive_halving(
+        grid,
+        len(grid),
+        _halving_schedule(request),
+        request.halving_eta,
+        lambda params, bars: _evaluate_backtest_params(
+            user_id, request, params, bars, backtest_service
+        ),
+        lambda metrics: _score_optimization_metrics(metrics, request.metric),
+        should_stop=lambda: _is_optimization_cancelled(task_id, persist_to_db),
+        on_evaluation=_on_evaluation,
+    )
+    logger.info(
+        "Successive halving %s: rung sizes %s, %s evaluations",
+        task_id,
+        outcome.rung_sizes,
+        outcome.evaluations,
+    )
+
+
 def _run_backtest_bayesian_optimization(
     task_id: str,
     user_id: str,
@@ -593,9 +890,17 @@ def _run_backtest_bayesian_optimization(
 
     backtest_service = BacktestService()
     results: list[dict[str, Any]] = []
-    study = optuna.create_study(direction="minimize")
+    schedule = _halving_schedule(request) if _halving_enabled(request) else [None]
+    pruner = (
+        build_halving_pruner(optuna, request.halving_min_bars, request.halving_eta)
+        if len(schedule) > 1
+        else None
+    )
+    study = optuna.create_study(direction="minimize", pruner=pruner)
+    pruned = 0
 
     def objective(trial: Any) -> float:
+        nonlocal pruned
         params: dict[str, Any] = {}
         for key, bounds in (request.param_bounds or {}).items():
             bound_type = bounds.get("type")
@@ -606,31 +911,33 @@ def _run_backtest_bayesian_optimization(
             elif bound_type == "categorical":
                 params[key] = trial.suggest_categorical(key, bounds["choices"])
 
-        backtest_request = request.backtest_config.model_copy()
-        backtest_request.params = params
-
-        try:
-            result = _run_async(
-                _run_backtest_request(
-                    user_id,
-                    backtest_request,
-                    backtest_service=backtest_service,
+        metrics: dict[str, float] | None = None
+        for bars in schedule:
+            try:
+                metrics = _evaluate_backtest_params(
+                    user_id, request, params, bars, backtest_service
                 )
-            )
-            if getattr(result, "status", None) == TaskStatus.COMPLETED:
-                metrics = _extract_backtest_metrics(result)
-                results.append({"params": params, "metrics": metrics})
-                _update_task(task_id, completed=len(results), results=list(results))
-                return _objective_value_from_metrics(metrics, request.metric)
-
-            task = _get_task(task_id)
-            _update_task(task_id, failed=(task.get("failed", 0) if task else 0) + 1)
-            return _failure_objective_value(request.metric)
-        except Exception as e:
-            logger.error("Backtest bayesian optimization trial failed: %s", e)
-            task = _get_task(task_id)
-            _update_task(task_id, failed=(task.get("failed", 0) if task else 0) + 1)
-            return _failure_objective_value(request.metric)
+            except FidelityIgnored as ignored:
+                # The run already covered the full range; rungs cannot help.
+                metrics = ignored.metrics
+                break
+            if metrics is None:
+                break
+            if bars is not None and pruner is not None:
+                trial.report(_objective_value_from_metrics(metrics, request.metric), bars)
+                if trial.should_prune():
+                    pruned += 1
+                    _update_task(task_id, completed=len(results) + pruned, pruned=pruned)
+                    raise optuna.TrialPruned()
+
+        if metrics is not None:
+            results.append({"params": params, "metrics": metrics})
+            _update_task(task_id, completed=len(results) + pruned, results=list(results))
+            return _objective_value_from_metrics(metrics, request.metric)
+
+        task = _get_task(task_id)
+        _update_task(task_id, failed=(task.get("failed", 0) if task else 0) + 1)
+        return _failure_objective_value(request.metric)
 
     for _ in range(request.n_trials):
         if _is_optimization_cancelled(task_id, persist_to_db):
@@ -647,7 +954,17 @@ def _run_backtest_optimization_thread(
     persist_to_db: bool,
 ) -> None:
     try:
-        if request.method == "grid":
+        halving = _halving_enabled(request)
+        if request.early_stopping and not halving:
+            logger.warning(
+                "Strategy %s does not read %s; optimizing %s without successive halving",
+                request.backtest_config.strategy_id,
+                FIDELITY_BARS_ENV,
+                task_id,
+            )
+        if request.method == "grid" and halving:
+            _run_backtest_halving_optimization(task_id, user_id, request, persist_to_db)
+        elif request.method == "grid":
             _run_backtest_grid_optimization(task_id, user_id, request, persist_to_db)
         else:
             _run_backtest_bayesian_optimization(task_id, user_id, request, persist_to_db)
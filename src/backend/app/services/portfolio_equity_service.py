@@ -0,0 +1,267 @@
+"""
+Incremental portfolio equity aggregation across live/simulated instances.
+
+Every instance appends one line per bar to ``value.log`` in its latest log
+directory. ``PortfolioEquityService`` follows each file by byte offset with
+``ValueLogFollower`` (the follower ``BacktestLogTailer`` uses), parses only
+appended lines, and folds them into an aligned ``instances x dates`` NumPy
+matrix together with the running portfolio total and peak. Requests whose logs have not grown are
+served from memory; appended bars only recompute the new columns.
+
+A value.log the follower cannot read incrementally (rewritten, mixed format)
+or that does not exist (finished runs with a run artifact only) falls back
+to ``parse_value_log``; the former is re-parsed only when its size or
+mtime changes.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from app.services.backtest_log_tailer import ValueLogFollower
+from app.services.equity_alignment import align_equity_curves
+from app.services.log_parser_service import find_latest_log_dir, parse_value_log
+from app.services.strategy_service import get_strategy_dir
+
+_MIN_CAPACITY = 256
+
+
+@dataclass
+class _InstanceSeries:
+    """Parsed value.log of one instance plus the follower's position in it."""
+
+    log_dir: Path
+    follower: ValueLogFollower
+    dates: list[str] = field(default_factory=list)
+    equity: list[float] = field(default_factory=list)
+    cash: list[float] = field(default_factory=list)
+    # Index of the first row not yet folded into the matrix (None = up to date).
+    pending_from: int | None = None
+    # (size, mtime_ns) of value.log at the last full parse, when degraded.
+    full_parse_key: tuple[int, int] | None = None
+
+    @property
+    def initial(self) -> float:
+        return self.equity[0] if self.equity else 0.0
+
+    @property
+    def last(self) -> float:
+        return self.equity[-1] if self.equity else 0.0
+
+
+@dataclass
+class PortfolioEquity:
+    """Aligned portfolio view.
+
+    ``curves`` are read-only views into the service's matrix and are only
+    valid until the next ``equity`` call.
+    """
+
+    dates: list[str] = field(default_factory=list)
+    curves: dict[str, np.ndarray] = field(default_factory=dict)
+    total: np.ndarray = field(default_factory=lambda: np.zeros(0))
+    drawdown: np.ndarray = field(default_factory=lambda: np.zeros(0))
+
+
+class PortfolioEquityService:
+    """Keep per-instance equity series and their aligned sum in memory."""
+
+    def __init__(self) -> None:
+        self._series: dict[str, _InstanceSeries] = {}
+        self._lock = threading.Lock()
+        self._rows: list[str] = []
+        self._dates: list[str] = []
+        self._matrix = np.zeros((0, 0))
+        self._total = np.zeros(0)
+        self._peak = np.zeros(0)
+        self._width = 0
+        self._stale = True
+
+    # ---------- per-instance series ----------
+
+    def refresh(self, instances: Iterable[dict[str, Any]]) -> dict[str, _InstanceSeries]:
+        """Bring the series of ``instances`` up to date with their value.log.
+
+        Returns:
+            Series of the instances that have a log directory, keyed by
+            instance id, in ``instances`` order.
+        """
+        with self._lock:
+            series: dict[str, _InstanceSeries] = {}
+            for inst in instances:
+                try:
+                    strategy_dir = get_strategy_dir(inst["strategy_id"])
+                except ValueError:
+                    continue
+                log_dir = find_latest_log_dir(strategy_dir)
+                if not log_dir:
+                    continue
+                series[inst["id"]] = self._refresh_instance(inst["id"], Path(log_dir))
+            for instance_id in set(self._series) - set(series):
+                del self._series[instance_id]
+            return series
+
+    def _refresh_instance(self, instance_id: str, log_dir: Path) -> _InstanceSeries:
+        current = self._series.get(instance_id)
+        if current is None or current.log_dir != log_dir:
+            current = _InstanceSeries(
+                log_dir=log_dir,
+                follower=ValueLogFollower(log_dir / "value.log"),
+            )
+            self._series[instance_id] = current
+            self._stale = True
+
+        value_log = log_dir / "value.log"
+        if not value_log.is_file():
+            self._replace(current, parse_value_log(log_dir))
+            return current
+
+        if not current.follower.degraded:
+            start = len(current.equity)
+            for dt, value, cash in current.follower.read_points():
+                current.dates.append(dt)
+                current.equity.append(value)
+                current.cash.append(cash)
+            if not current.follower.degraded:
+                if len(current.equity) > start and current.pending_from is None:
+                    current.pending_from = start
+                return current
+
+        stat = value_log.stat()
+        key = (stat.st_size, stat.st_mtime_ns)
+        if key != current.full_parse_key:
+            current.full_parse_key = key
+            self._replace(current, parse_value_log(log_dir))
+        return current
+
+    def _replace(self, current: _InstanceSeries, value_data: dict[str, Any]) -> None:
+        dates = list(value_data.get("dates") or [])
+        equity = list(value_data.get("equity_curve") or [])
+        cash = list(value_data.get("cash_curve") or [])
+        if (dates, equity) != (current.dates, current.equity):
+            current.dates, current.equity, current.cash = dates, equity, cash
+            current.pending_from = None
+            self._stale = True
+
+    # ---------- aligned matrix ----------
+
+    def equity(self, series: dict[str, _InstanceSeries]) -> PortfolioEquity:
+        """Aligned equity of ``series`` (as returned by ``refresh``)."""
+        with self._lock:
+            rows = [instance_id for instance_id, s in series.items() if s.dates]
+            if self._stale or rows != self._rows:
+                self._rebuild(rows)
+            else:
+                self._append(rows)
+            width = self._width
+            drawdown = np.zeros(width)
+            peak = self._peak[:width]
+            np.divide(peak - self._total[:width], peak, out=drawdown, where=peak > 0)
+            view = self._matrix[:, :width]
+            view.flags.writeable = False
+            return PortfolioEquity(
+                dates=list(self._dates),
+                curves={instance_id: view[i] for i, instance_id in enumerate(rows)},
+                total=self._total[:width].copy(),
+                drawdown=-drawdown,
+            )
+
+    def _rebuild(self, rows: list[str]) -> None:
+        aligned = align_equity_curves(
+            {i: (self._series[i].dates, self._series[i].equity) for i in rows},
+            {i: self._series[i].initial for i in rows},
+        )
+        width = len(aligned.dates)
+        self._allocate(len(rows), width)
+        for index, instance_id in enumerate(rows):
+            self._matrix[index, :width] = aligned.curves[instance_id]
+            self._series[instance_id].pending_from = None
+        self._rows = rows
+        self._dates = aligned.dates
+        self._width = width
+        self._update_totals(0, width)
+        self._stale = False
+
+    def _append(self, rows: list[str]) -> None:
+        """Fold rows appended since the last call into the trailing columns."""
+        tails: dict[int, tuple[np.ndarray, np.ndarray]] = {}
+        for index, instance_id in enumerate(rows):
+            s = self._series[instance_id]
+            if s.pending_from is None:
+                continue
+            dates = np.asarray(s.dates[s.pending_from :], dtype=str)
+            tails[index] = (dates, np.asarray(s.equity[s.pending_from :], dtype=float))
+        if not tails:
+            return
+
+        last = self._dates[-1] if self._dates else None
+        first_new = min(dates[0] for dates, _values in tails.values())
+        if (
+            last is None
+            or first_new < last
+            or any(np.any(d[1:] < d[:-1]) for d, _values in tails.values())
+        ):
+            # Out-of-order bars cannot be appended; realign everything.
+            self._rebuild(rows)
+            return
+
+        start = self._width - 1 if first_new == last else self._width
+        suffix = np.unique(np.concatenate([dates for dates, _values in tails.values()]))
+        width = start + len(suffix)
+        self._allocate(len(rows), width)
+
+        # Rows without new bars carry their last value forward.
+        baseline = self._matrix[:, min(start, self._width - 1)]
+        block = np.repeat(baseline[:, None], len(suffix), axis=1)
+        for index, (dates, values) in tails.items():
+            positions = np.searchsorted(dates, suffix, side="right") - 1
+            known = positions >= 0
+            block[index, known] = values[positions[known]]
+        self._matrix[:, start:width] = block
+        self._dates[start:] = suffix.tolist()
+        self._width = width
+        self._update_totals(start, width)
+        for instance_id in rows:
+            self._series[instance_id].pending_from = None
+
+    def _allocate(self, n_rows: int, width: int) -> None:
+        if self._matrix.shape[0] == n_rows and self._matrix.shape[1] >= width:
+            return
+        capacity = max(_MIN_CAPACITY, width * 2)
+        matrix = np.zeros((n_rows, capacity))
+        total = np.zeros(capacity)
+        peak = np.zeros(capacity)
+        if self._matrix.shape[0] == n_rows:
+            matrix[:, : self._width] = self._matrix[:, : self._width]
+            total[: self._width] = self._total[: self._width]
+            peak[: self._width] = self._peak[: self._width]
+        self._matrix, self._total, self._peak = matrix, total, peak
+
+    def _update_totals(self, start: int, end: int) -> None:
+        self._total[start:end] = self._matrix[:, start:end].sum(axis=0)
+        previous_peak = self._peak[start - 1] if start > 0 else 0.0
+        self._peak[start:end] = np.maximum.accumulate(
+            np.maximum(self._total[start:end], previous_peak)
+        )
+
+
+# Global singleton
+_service: PortfolioEquityService | None = None
+
+
+def get_portfolio_equity_service() -> PortfolioEquityService:
+    """Get the global portfolio equity service singleton.
+
+    Returns:
+        The PortfolioEquityService instance.
+    """
+    global _service
+    if _service is None:
+        _service = PortfolioEquityService()
+    return _service
@@ -13,7 +13,9 @@ backtrader_web  QuoteService
    ├─ connects ZMQ SUB to each gateway's market_endpoint
    ├─ sends "subscribe" commands via ZMQ DEALER to command_endpoint
    ├─ caches latest GatewayTick per (source, symbol) in memory
-   └─ serves cached ticks to the frontend via REST API
+   ├─ serves cached ticks to the frontend via REST API
+   ├─ builds chart bars from ticks (BarAggregator), seeded once via get_bars
+   └─ forwards every tick to QuoteStreamHub (WebSocket fan-out)
 """
 
 from __future__ import annotations
@@ -24,11 +26,21 @@ import math
 import threading
 import time
 import uuid
+from collections.abc import Callable
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+import numpy as np
+
 from app.config import get_settings
+from app.services.bar_aggregator import (
+    TIMEFRAME_SECONDS,
+    BarAggregator,
+    BarListener,
+    parse_source_timezones,
+)
+from app.services.tick_history import TickRing, loads_tick, tick_values
 from app.utils.backend_data_paths import get_backend_data_path
 
 logger = logging.getLogger(__name__)
@@ -262,16 +274,41 @@ _QUOTE_FIELDS_BY_SOURCE = _load_quote_fields_by_source()
 # ZMQ tick receiver — one per gateway
 # ===================================================================
 
+# (source, raw GatewayTick payload), called on the receiver thread
+TickListener = Callable[[str, dict[str, Any]], None]
+
 
 class _ZmqTickReceiver:
     """Background thread that SUBscribes to a GatewayRuntime's market_endpoint
-    and caches the latest GatewayTick per symbol."""
+    and caches the latest GatewayTick per symbol.
 
-    def __init__(self, source: str, market_endpoint: str) -> None:
+    Frames are drained in non-blocking batches of up to ``BATCH_SIZE``.
+    Every tick is appended to its symbol's ``TickRing`` (bounded history for
+    charts and bar building); the latest payload per symbol is stored in the
+    cache and passed to listeners once per batch, as ``(source, payload)``
+    on the receiver thread.
+
+    Readers never lock: cache entries are replaced by single dict stores and
+    rings are read through ``TickRing.snapshot``.
+    """
+
+    BATCH_SIZE = 1024
+    POLL_TIMEOUT_MS = 500  # so the loop can check _running
+
+    def __init__(
+        self,
+        source: str,
+        market_endpoint: str,
+        history_size: int | None = None,
+    ) -> None:
         self.source = source
         self.market_endpoint = market_endpoint
         self._tick_cache: dict[str, dict[str, Any]] = {}  # symbol -> raw tick dict
-        self._lock = threading.Lock()
+        self._history: dict[str, TickRing] = {}  # symbol -> recent ticks
+        self._history_size = (
+            history_size if history_size is not None else get_settings().QUOTE_TICK_HISTORY_SIZE
+        )
+        self._listeners: list[TickListener] = []
         self._running = False
         self._thread: threading.Thread | None = None
 
@@ -303,12 +340,33 @@ class _ZmqTickReceiver:
     # -- data access --
 
     def get_tick(self, symbol: str) -> dict[str, Any] | None:
-        with self._lock:
-            return self._tick_cache.get(symbol)
+        return self._tick_cache.get(symbol)
 
     def get_all_ticks(self) -> dict[str, dict[str, Any]]:
-        with self._lock:
-            return dict(self._tick_cache)
+        return dict(self._tick_cache)
+
+    def get_history(
+        self,
+        symbol: str,
+        limit: int | None = None,
+        since: int | None = None,
+    ) -> tuple[dict[str, np.ndarray], int] | None:
+        """Recent ticks of *symbol* (see ``TickRing.snapshot``), or None."""
+        ring = self._history.get(symbol)
+        if ring is None:
+            return None
+        return ring.snapshot(limit=limit, since=since)
+
+    def add_listener(self, listener: TickListener) -> None:
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def _notify(self, payload: dict[str, Any]) -> None:
+        for listener in self._listeners:
+            try:
+                listener(self.source, payload)
+            except Exception:
+                logger.exception("Tick listener failed for %s", self.source)
 
     def seed_tick(self, symbol: str, payload: dict[str, Any]) -> None:
         normalized = dict(payload)
@@ -317,14 +375,46 @@ class _ZmqTickReceiver:
         key = str(normalized.get("symbol") or symbol or "").strip()
         if not key:
             return
-        with self._lock:
-            self._tick_cache[key] = normalized
-            instrument_id = str(normalized.get("instrument_id") or "").strip()
-            if instrument_id and instrument_id != key:
-                self._tick_cache[instrument_id] = normalized
+        self._tick_cache[key] = normalized
+        instrument_id = str(normalized.get("instrument_id") or "").strip()
+        if instrument_id and instrument_id != key:
+            self._tick_cache[instrument_id] = normalized
+        self._notify(normalized)
 
     # -- internal --
 
+    def _drain_batch(self, recv_nowait: Callable[[], bytes | None]) -> int:
+        """Decode queued frames into the rings and publish the latest ticks.
+
+        Returns:
+            Number of frames consumed.
+        """
+        latest: dict[str, dict[str, Any]] = {}
+        consumed = 0
+        while consumed < self.BATCH_SIZE:
+            raw = recv_nowait()
+            if raw is None:
+                break
+            consumed += 1
+            try:
+                payload = loads_tick(raw)
+            except ValueError:
+                continue
+            if not isinstance(payload, dict):
+                continue
+            symbol = payload.get("symbol") or payload.get("instrument_id") or ""
+            if not symbol:
+                continue
+            ring = self._history.get(symbol)
+            if ring is None:
+                ring = self._history[symbol] = TickRing(self._history_size)
+            ring.append(tick_values(payload))
+            latest[symbol] = payload
+        for symbol, payload in latest.items():
+            self._tick_cache[symbol] = payload
+            self._notify(payload)
+        return consumed
+
     def _recv_loop(self) -> None:
         """Connect ZMQ SUB and drain ticks into cache."""
         try:
@@ -337,7 +427,6 @@ class _ZmqTickReceiver:
         ctx = zmq.Context.instance()
         sock = ctx.socket(zmq.SUB)
         sock.setsockopt(zmq.SUBSCRIBE, b"")
-        sock.setsockopt(zmq.RCVTIMEO, 500)  # 500 ms timeout so we can check _running
         try:
             sock.connect(self.market_endpoint)
         except zmq.ZMQError as exc:
@@ -346,22 +435,17 @@ class _ZmqTickReceiver:
             sock.close()
             return
 
+        def recv_nowait() -> bytes | None:
+            try:
+                return sock.recv(zmq.NOBLOCK)
+            except zmq.Again:
+                return None
+
         logger.info("ZMQ SUB connected to %s for %s", self.market_endpoint, self.source)
         try:
             while self._running:
-                try:
-                    raw = sock.recv()
-                except zmq.Again:
-                    continue
-                try:
-                    payload = json.loads(raw.decode("utf-8"))
-                except (json.JSONDecodeError, UnicodeDecodeError):
-                    continue
-                symbol = payload.get("symbol") or payload.get("instrument_id") or ""
-                if not symbol:
-                    continue
-                with self._lock:
-                    self._tick_cache[symbol] = payload
+                if sock.poll(self.POLL_TIMEOUT_MS):
+                    self._drain_batch(recv_nowait)
         finally:
             sock.close()
             self._running = False
@@ -401,6 +485,14 @@ class QuoteService:
         self._subscribed_symbols: dict[str, set[str]] = {}
         # Sources explicitly disconnected by the user; auto-connect should stay paused
         self._auto_connect_suppressed_sources: set[str] = set()
+        # Rolling chart bars built from receiver ticks
+        settings = get_settings()
+        self._bars = BarAggregator(
+            settings.QUOTE_BAR_HISTORY_SIZE,
+            parse_source_timezones(settings.QUOTE_SOURCE_TIMEZONES),
+        )
+        # Callbacks attached to every receiver (e.g. the WebSocket fan-out hub)
+        self._tick_listeners: list[TickListener] = [self._feed_bars]
 
     def suppress_auto_connect(self, source: str) -> None:
         normalized = str(source or "").strip().upper()
@@ -414,6 +506,13 @@ class QuoteService:
             return
         self._auto_connect_suppressed_sources.discard(normalized)
 
+    def get_cached_tick(self, source: str, symbol: str) -> dict[str, Any] | None:
+        """Latest received tick of *symbol* without contacting the gateway."""
+        receiver = self._receivers.get(str(source or "").strip().upper())
+        if receiver is None:
+            return None
+        return self._match_cached_tick(receiver.get_all_ticks(), symbol)
+
     def get_cached_tick_metrics(self, source: str) -> dict[str, Any]:
         normalized = str(source or "").strip().upper()
         if not normalized:
@@ -611,6 +710,56 @@ class QuoteService:
             "refresh_mode": "push" if has_receiver else "polling",
         }
 
+    def open_quote_stream(
+        self,
+        source: str,
+        user_id: str,
+        symbols: list[str] | None,
+        listener: TickListener,
+    ) -> dict[str, Any]:
+        """Attach *listener* to the receiver of *source* and return a snapshot.
+
+        The listener is attached before the snapshot is read, so every tick
+        newer than the snapshot reaches it. Blocking (gateway commands); run
+        it off the event loop.
+        """
+        self.add_tick_listener(listener)
+        manager = self._get_live_trading_manager()
+        if source == "MT5":
+            self._ensure_mt5_gateway_connected(manager)
+        self._ensure_receiver(source, manager)
+        return self.get_quotes(source, user_id, symbols)
+
+    def ensure_symbol_feed(self, source: str, symbols: list[str]) -> bool:
+        """Start the receiver of *source* and subscribe *symbols* on its gateway.
+
+        For tick consumers other than the quote page (alert rules). Blocking
+        (gateway commands); run it off the event loop.
+
+        Returns:
+            Whether the receiver runs and every symbol is subscribed.
+        """
+        source = str(source or "").strip().upper()
+        manager = self._get_live_trading_manager()
+        if source == "MT5":
+            self._ensure_mt5_gateway_connected(manager)
+        self._ensure_receiver(source, manager)
+        self._subscribe_symbols_on_gateway(source, symbols)
+        receiver = self._receivers.get(source)
+        subscribed = self._subscribed_symbols.get(source, set())
+        return (
+            receiver is not None
+            and receiver.is_alive
+            and all(symbol in subscribed for symbol in symbols)
+        )
+
+    def add_tick_listener(self, listener: TickListener) -> None:
+        """Call *listener* for every tick of current and future receivers."""
+        if listener not in self._tick_listeners:
+            self._tick_listeners.append(listener)
+        for receiver in list(self._receivers.values()):
+            receiver.add_listener(listener)
+
     # ------------------------------------------------------------------
     # Chart data (P1)
     # ------------------------------------------------------------------
@@ -622,46 +771,83 @@ class QuoteService:
         timeframe: str = "M1",
         count: int = 200,
     ) -> dict[str, Any]:
-        """Fetch OHLCV bars from gateway via ZMQ command channel.
-
-        Sends a ``get_bars`` command to the gateway runtime's command socket
-        and returns the bar data for chart rendering.
+        """Return OHLCV bars for chart rendering.
+
+        The first request per (source, symbol, timeframe) sends a
+        ``get_bars`` command to the gateway runtime's command socket and
+        seeds the in-process ``BarAggregator``; the receiver's ticks keep
+        those bars current, so later requests are served from memory.
+        Timeframes the aggregator does not know, and gateway bars whose
+        dates cannot be parsed, are passed through uncached.
         """
+        cacheable = timeframe in TIMEFRAME_SECONDS
+        if cacheable and self._bars.has_series(source, symbol, timeframe, count):
+            self._bind_bar_feed(source, symbol, timeframe)
+            return self._bars.chart(source, symbol, timeframe, count)
+
         manager = self._get_live_trading_manager()
+        bars = self._fetch_gateway_bars(manager, source, symbol, timeframe, count)
+        if bars is None and self._bars.tick_key(source, symbol, timeframe) is not None:
+            return self._bars.chart(source, symbol, timeframe, count)
+        if bars and cacheable and self._bars.seed(source, symbol, timeframe, bars, count):
+            self._ensure_receiver(source, manager)
+            self._subscribe_symbols_on_gateway(source, [symbol])
+            self._bind_bar_feed(source, symbol, timeframe)
+            return self._bars.chart(source, symbol, timeframe, count)
+
+        return {
+            "source": source,
+            "symbol": symbol,
+            "timeframe": timeframe,
+            "bars": bars or [],
+            "total": len(bars or []),
+        }
+
+    def open_bar_stream(
+        self,
+        source: str,
+        symbol: str,
+        timeframe: str,
+        count: int,
+        listener: BarListener,
+    ) -> dict[str, Any]:
+        """Register *listener* for forming-bar updates and return the chart.
+
+        Blocking on the first request of a series; run it off the event loop.
+        """
+        self._bars.add_listener(listener)
+        return self.get_chart_data(source, symbol, timeframe, count)
+
+    def _fetch_gateway_bars(
+        self,
+        manager: Any,
+        source: str,
+        symbol: str,
+        timeframe: str,
+        count: int,
+    ) -> list[dict[str, Any]] | None:
+        """Normalized ``get_bars`` result, or None if the gateway is unavailable."""
         config = self._find_gateway_config(manager, source)
         if config is None:
-            return {
-                "source": source,
-                "symbol": symbol,
-                "timeframe": timeframe,
-                "bars": [],
-                "total": 0,
-            }
+            return None
 
         command_endpoint = getattr(config, "command_endpoint", None)
         if not command_endpoint:
-            return {
-                "source": source,
+            return None
+
+        bars = self._send_gateway_command(
+            command_endpoint,
+            "get_bars",
+            {
                 "symbol": symbol,
                 "timeframe": timeframe,
-                "bars": [],
-                "total": 0,
-            }
-
-        bars = (
-            self._send_gateway_command(
-                command_endpoint,
-                "get_bars",
-                {
-                    "symbol": symbol,
-                    "timeframe": timeframe,
-                    "count": count,
-                },
-                send_timeout_ms=5000,
-                recv_timeout_ms=10000,
-            )
-            or []
+                "count": count,
+            },
+            send_timeout_ms=5000,
+            recv_timeout_ms=10000,
         )
+        if bars is None:
+            return None
 
         normalized: list[dict[str, Any]] = []
         for bar in bars:
@@ -675,14 +861,29 @@ class QuoteService:
                     "volume": float(bar.get("volume") or bar.get("tick_volume") or 0),
                 }
             )
+        return normalized
 
-        return {
-            "source": source,
-            "symbol": symbol,
-            "timeframe": timeframe,
-            "bars": normalized,
-            "total": len(normalized),
-        }
+    def _bind_bar_feed(self, source: str, symbol: str, timeframe: str) -> None:
+        """Point a chart series at the receiver ring holding *symbol*'s ticks."""
+        receiver = self._receivers.get(source)
+        if receiver is None:
+            return
+        current = self._bars.tick_key(source, symbol, timeframe)
+        if current and receiver.get_history(current, limit=0) is not None:
+            return
+        payload = self._match_cached_tick(receiver.get_all_ticks(), symbol) or {}
+        tick_key = str(payload.get("symbol") or payload.get("instrument_id") or symbol)
+        history = receiver.get_history(tick_key, limit=0)
+        self._bars.bind(source, symbol, timeframe, tick_key, history[1] if history else 0)
+
+    def _feed_bars(self, source: str, payload: dict[str, Any]) -> None:
+        """Tick listener: fold new ring ticks into the charted bar series."""
+        tick_key = payload.get("symbol") or payload.get("instrument_id") or ""
+        if not tick_key or not self._bars.watches(source, tick_key):
+            return
+        receiver = self._receivers.get(source)
+        if receiver is not None:
+            self._bars.ingest(source, tick_key, receiver)
 
     # ------------------------------------------------------------------
     # ZMQ receiver management
@@ -704,6 +905,8 @@ class QuoteService:
             return
 
         receiver = _ZmqTickReceiver(source, market_endpoint)
+        for listener in self._tick_listeners:
+            receiver.add_listener(listener)
         receiver.start()
         self._receivers[source] = receiver
         logger.info("Started ZMQ receiver for %s at %s", source, market_endpoint)
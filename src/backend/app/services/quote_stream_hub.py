@@ -0,0 +1,367 @@
+"""
+WebSocket fan-out of gateway ticks to quote page clients.
+
+``_ZmqTickReceiver`` threads hand the latest tick of each symbol in every
+drained batch to ``QuoteStreamHub.publish``, which only records the latest
+payload per (source, symbol) and schedules one drain on the event loop per
+batch. The drain builds each subscribed QuoteTick once and offers it to
+every client watching that symbol. Updates of a forming chart bar
+(``BarAggregator``) are routed the same way to clients subscribed to that
+(source, symbol, timeframe).
+
+Each ``QuoteStreamClient`` keeps a conflated outbox (latest tick per
+symbol), so a slow consumer never queues more than one pending tick per
+subscribed symbol. Its writer sends per-symbol deltas against what the
+client last received, at most ``max_rate`` messages per second, and gives
+up on a client whose socket does not accept a message within
+``send_timeout`` seconds. Gateway command sockets are only used when a
+client subscribes, never per tick.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from collections.abc import Awaitable, Callable, Iterable
+from datetime import datetime, timezone
+from typing import Any
+
+from app.services.quote_service import _SOURCE_TO_LABEL, QuoteService
+
+logger = logging.getLogger(__name__)
+
+_META_FIELDS = ("name", "exchange", "category")
+
+
+def _tick_delta(previous: dict[str, Any] | None, tick: dict[str, Any]) -> dict[str, Any] | None:
+    """Fields of *tick* that differ from *previous* (always with ``symbol``)."""
+    if previous is None:
+        return dict(tick)
+    changed = {key: value for key, value in tick.items() if previous.get(key) != value}
+    if not changed:
+        return None
+    changed["symbol"] = tick["symbol"]
+    return changed
+
+
+class QuoteStreamClient:
+    """One WebSocket connection: its subscriptions and conflated outbox.
+
+    All messages for the connection go through ``run`` so there is a single
+    writer per socket.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[dict[str, Any]], Awaitable[Any]],
+        max_rate: float = 4.0,
+        send_timeout: float = 5.0,
+    ) -> None:
+        self._send = send
+        self._interval = 1.0 / max_rate if max_rate > 0 else 0.0
+        self._send_timeout = send_timeout
+        # source -> requested symbols
+        self.subscriptions: dict[str, set[str]] = {}
+        self._outbox: dict[tuple[str, str], dict[str, Any]] = {}
+        self._sent: dict[tuple[str, str], dict[str, Any]] = {}
+        # (source, symbol, timeframe) of streamed chart bars
+        self.bar_subscriptions: set[tuple[str, str, str]] = set()
+        self._bar_outbox: dict[tuple[str, str, str], dict[str, Any]] = {}
+        self._control: list[dict[str, Any]] = []
+        self._wakeup = asyncio.Event()
+
+    def offer(self, source: str, symbol: str, tick: dict[str, Any]) -> None:
+        """Queue *tick*, replacing any not yet sent tick of the same symbol."""
+        self._outbox[(source, symbol)] = tick
+        self._wakeup.set()
+
+    def offer_bar(self, key: tuple[str, str, str], bar: dict[str, Any]) -> None:
+        """Queue the latest state of a forming bar."""
+        self._bar_outbox[key] = bar
+        self._wakeup.set()
+
+    def send_message(self, message: dict[str, Any]) -> None:
+        """Queue a control message (snapshot, pong, error) ahead of deltas."""
+        self._control.append(message)
+        self._wakeup.set()
+
+    def send_snapshot(self, snapshot: dict[str, Any]) -> None:
+        """Queue a full quote snapshot; later deltas are relative to it."""
+        source = snapshot["source"]
+        self.forget(source)
+        self.subscriptions[source] = {tick["symbol"] for tick in snapshot["ticks"]}
+        for tick in snapshot["ticks"]:
+            self._sent[(source, tick["symbol"])] = tick
+        self.send_message({"type": "snapshot", **snapshot})
+
+    def forget(self, source: str) -> None:
+        self.subscriptions.pop(source, None)
+        for store in (self._outbox, self._sent):
+            for key in [key for key in store if key[0] == source]:
+                del store[key]
+
+    def forget_bars(self, key: tuple[str, str, str]) -> None:
+        self.bar_subscriptions.discard(key)
+        self._bar_outbox.pop(key, None)
+
+    @property
+    def pending(self) -> int:
+        return len(self._outbox) + len(self._bar_outbox)
+
+    def _take_deltas(self) -> list[dict[str, Any]]:
+        outbox, self._outbox = self._outbox, {}
+        by_source: dict[str, list[dict[str, Any]]] = {}
+        for (source, symbol), tick in outbox.items():
+            delta = _tick_delta(self._sent.get((source, symbol)), tick)
+            self._sent[(source, symbol)] = tick
+            if delta is not None:
+                by_source.setdefault(source, []).append(delta)
+        now = datetime.now(timezone.utc).isoformat()
+        return [
+            {"type": "quotes", "source": source, "ticks": ticks, "update_time": now}
+            for source, ticks in by_source.items()
+        ]
+
+    def _take_bars(self) -> list[dict[str, Any]]:
+        outbox, self._bar_outbox = self._bar_outbox, {}
+        return [
+            {"type": "bar", "source": source, "symbol": symbol, "timeframe": timeframe, "bar": bar}
+            for (source, symbol, timeframe), bar in outbox.items()
+        ]
+
+    async def run(self) -> None:
+        """Send queued messages until the consumer falls behind.
+
+        Returns when a send does not complete within ``send_timeout``;
+        send errors propagate to the caller.
+        """
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            messages, self._control = self._control, []
+            deltas = self._take_deltas() + self._take_bars()
+            for message in messages + deltas:
+                try:
+                    await asyncio.wait_for(self._send(message), timeout=self._send_timeout)
+                except asyncio.TimeoutError:
+                    logger.warning("Dropping slow quote stream consumer")
+                    return
+            if deltas and self._interval:
+                # Ticks arriving meanwhile are conflated in the outbox.
+                await asyncio.sleep(self._interval)
+
+
+class QuoteStreamHub:
+    """Route receiver ticks to the clients subscribed to them."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._drain_scheduled = False
+        # source -> tick key -> latest payload
+        self._latest: dict[str, dict[str, dict[str, Any]]] = {}
+        self._pending: dict[str, dict[str, dict[str, Any]]] = {}
+        # source -> requested symbol -> clients
+        self._subscribers: dict[str, dict[str, set[QuoteStreamClient]]] = {}
+        self._meta: dict[str, dict[str, dict[str, str]]] = {}
+        # source -> tick key -> requested symbols it resolves to
+        self._routes: dict[str, dict[str, tuple[str, ...]]] = {}
+        # (source, symbol, timeframe) -> clients / latest forming bar
+        self._bar_subscribers: dict[tuple[str, str, str], set[QuoteStreamClient]] = {}
+        self._pending_bars: dict[tuple[str, str, str], dict[str, Any]] = {}
+
+    # -- receiver side (any thread) --
+
+    def publish(self, source: str, payload: dict[str, Any]) -> None:
+        """Record a tick; the event loop fans it out on its next drain."""
+        key = str(payload.get("symbol") or payload.get("instrument_id") or "")
+        if not key:
+            return
+        with self._lock:
+            self._latest.setdefault(source, {})[key] = payload
+            if source not in self._subscribers:
+                return
+            self._pending.setdefault(source, {})[key] = payload
+            loop = self._claim_drain()
+        if loop is not None:
+            self._schedule_drain(loop)
+
+    def publish_bar(self, source: str, symbol: str, timeframe: str, bar: dict[str, Any]) -> None:
+        """Record a forming-bar update (``BarListener``)."""
+        key = (source, symbol, timeframe)
+        with self._lock:
+            if key not in self._bar_subscribers:
+                return
+            self._pending_bars[key] = bar
+            loop = self._claim_drain()
+        if loop is not None:
+            self._schedule_drain(loop)
+
+    def _claim_drain(self) -> asyncio.AbstractEventLoop | None:
+        """Loop to schedule a drain on, unless one is pending (lock held)."""
+        if self._drain_scheduled or self._loop is None:
+            return None
+        self._drain_scheduled = True
+        return self._loop
+
+    def _schedule_drain(self, loop: asyncio.AbstractEventLoop) -> None:
+        try:
+            loop.call_soon_threadsafe(self._drain)
+        except RuntimeError:
+            # Event loop closed (shutdown); nothing left to deliver to.
+            with self._lock:
+                self._drain_scheduled = False
+
+    # -- event loop side --
+
+    def subscribe(self, client: QuoteStreamClient, snapshot: dict[str, Any]) -> None:
+        """Register *client* for the symbols of a ``get_quotes`` *snapshot*."""
+        source = snapshot["source"]
+        self.unsubscribe(client, source)
+        client.send_snapshot(snapshot)
+        with self._lock:
+            self._loop = asyncio.get_running_loop()
+            subscribers = self._subscribers.setdefault(source, {})
+            meta = self._meta.setdefault(source, {})
+            for tick in snapshot["ticks"]:
+                symbol = tick["symbol"]
+                subscribers.setdefault(symbol, set()).add(client)
+                meta[symbol] = {field: tick.get(field) or "" for field in _META_FIELDS}
+            self._routes.pop(source, None)
+            latest = dict(self._latest.get(source, {}))
+        # Ticks that arrived while the snapshot was taken; unchanged ones
+        # produce no delta.
+        self._dispatch(source, latest, only={client})
+
+    def unsubscribe(self, client: QuoteStreamClient, source: str | None = None) -> None:
+        """Drop *client* from *source* (or from every source)."""
+        sources = [source] if source is not None else list(client.subscriptions)
+        with self._lock:
+            for name in sources:
+                subscribers = self._subscribers.get(name)
+                if subscribers is None:
+                    continue
+                for symbol in client.subscriptions.get(name, ()):
+                    clients = subscribers.get(symbol)
+                    if clients is None:
+                        continue
+                    clients.discard(client)
+                    if not clients:
+                        del subscribers[symbol]
+                        self._meta.get(name, {}).pop(symbol, None)
+                if not subscribers:
+                    del self._subscribers[name]
+                    self._pending.pop(name, None)
+                self._routes.pop(name, None)
+        for name in sources:
+            client.forget(name)
+
+    def subscribe_bars(self, client: QuoteStreamClient, chart: dict[str, Any]) -> None:
+        """Send *chart* (``get_chart_data``) and stream its forming bar."""
+        key = (chart["source"], chart["symbol"], chart["timeframe"])
+        client.bar_subscriptions.add(key)
+        client.send_message({"type": "bars", **chart})
+        with self._lock:
+            self._loop = asyncio.get_running_loop()
+            self._bar_subscribers.setdefault(key, set()).add(client)
+
+    def unsubscribe_bars(
+        self, client: QuoteStreamClient, key: tuple[str, str, str] | None = None
+    ) -> None:
+        """Stop streaming one bar series (or all of them) to *client*."""
+        keys = [key] if key is not None else list(client.bar_subscriptions)
+        with self._lock:
+            for name in keys:
+                clients = self._bar_subscribers.get(name)
+                if clients is None:
+                    continue
+                clients.discard(client)
+                if not clients:
+                    del self._bar_subscribers[name]
+                    self._pending_bars.pop(name, None)
+        for name in keys:
+            client.forget_bars(name)
+
+    def disconnect(self, client: QuoteStreamClient) -> None:
+        """Drop every quote and bar subscription of *client*."""
+        self.unsubscribe(client)
+        self.unsubscribe_bars(client)
+
+    def subscriber_count(self, source: str) -> int:
+        with self._lock:
+            clients: set[QuoteStreamClient] = set()
+            for subscribed in self._subscribers.get(source, {}).values():
+                clients |= subscribed
+            return len(clients)
+
+    def _drain(self) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            bars, self._pending_bars = self._pending_bars, {}
+            self._drain_scheduled = False
+        for source, payloads in pending.items():
+            self._dispatch(source, payloads)
+        for key, bar in bars.items():
+            for client in self._bar_subscribers.get(key, ()):
+                client.offer_bar(key, bar)
+
+    def _dispatch(
+        self,
+        source: str,
+        payloads: dict[str, dict[str, Any]],
+        only: set[QuoteStreamClient] | None = None,
+    ) -> None:
+        subscribers = self._subscribers.get(source)
+        if not subscribers or not payloads:
+            return
+        label = _SOURCE_TO_LABEL.get(source, source)
+        meta = self._meta.get(source, {})
+        now = datetime.now(timezone.utc).isoformat()
+        for key, payload in payloads.items():
+            for symbol in self._route(source, key, payload, subscribers):
+                clients = subscribers.get(symbol, ())
+                if only is not None:
+                    clients = only.intersection(clients)
+                if not clients:
+                    continue
+                tick = QuoteService._build_tick(
+                    source, label, symbol, meta.get(symbol, {}), payload, now
+                )
+                for client in clients:
+                    client.offer(source, symbol, tick)
+
+    def _route(
+        self,
+        source: str,
+        key: str,
+        payload: dict[str, Any],
+        symbols: Iterable[str],
+    ) -> tuple[str, ...]:
+        """Requested symbols a tick key resolves to (memoized per source)."""
+        routes = self._routes.setdefault(source, {})
+        resolved = routes.get(key)
+        if resolved is None:
+            resolved = tuple(
+                symbol
+                for symbol in symbols
+                if QuoteService._match_cached_tick({key: payload}, symbol) is not None
+            )
+            routes[key] = resolved
+        return resolved
+
+
+# Global singleton
+_hub: QuoteStreamHub | None = None
+
+
+def get_quote_stream_hub() -> QuoteStreamHub:
+    """Get the global quote stream hub singleton.
+
+    Returns:
+        The QuoteStreamHub instance.
+    """
+    global _hub
+    if _hub is None:
+        _hub = QuoteStreamHub()
+    return _hub
@@ -2,8 +2,16 @@
 Risk Control Service - 风控服务
 
 提供实盘交易的风险控制功能，包括仓位限制、止损止盈、亏损预警等。
+
+下单前风控(check_order)是同步的编译管线：配置更新时把启用的检查编译成
+闭包列表，按实例增量维护持仓敞口、日盈亏和成交计数(on_fill/update_balance)，
+单次检查为 O(1)且无副作用，每项检查的耗时记入延迟直方图。亏损预警在状态
+更新时发出。模拟盘以账户ID作为实例ID接入(下单前检查、成交后更新)。
 """
 
+import time
+from bisect import bisect_left
+from collections.abc import Callable
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import Enum
@@ -71,20 +79,274 @@ class RiskAlert:
     details: dict[str, Any] = field(default_factory=dict)
 
 
+@dataclass
+class ExposureState:
+    """实例风险状态(随成交增量更新)"""
+
+    positions: dict[str, float] = field(default_factory=dict)  # symbol -> 持仓金额
+    total_exposure: float = 0.0  # 各品种持仓金额绝对值之和
+    account_balance: float = 0.0
+    initial_balance: float = 0.0  # 当日开盘余额
+    daily_pnl: float = 0.0  # 当日盈亏(日亏损检查的唯一数据源)
+    trade_count: int = 0  # 当日成交次数(交易次数检查的唯一数据源)
+    loss_warned: bool = False  # 当日已发出亏损预警
+
+
+class LatencyHistogram:
+    """检查耗时直方图(纳秒计时，按微秒分桶)"""
+
+    BUCKETS_US = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 5000)
+
+    def __init__(self) -> None:
+        self._bounds_ns = [b * 1000 for b in self.BUCKETS_US]
+        self.counts = [0] * (len(self.BUCKETS_US) + 1)
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def observe(self, elapsed_ns: int) -> None:
+        self.counts[bisect_left(self._bounds_ns, elapsed_ns)] += 1
+        self.count += 1
+        self.total_ns += elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+
+    def quantile(self, q: float) -> float | None:
+        """分位数上界(微秒)，落在最后一个桶时返回最大值"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank and n:
+                if i < len(self.BUCKETS_US):
+                    return float(self.BUCKETS_US[i])
+                break
+        return self.max_ns / 1000
+
+    def snapshot(self) -> dict[str, Any]:
+        labels = [f"le_{b}us" for b in self.BUCKETS_US] + ["inf"]
+        return {
+            "count": self.count,
+            "mean_us": self.total_ns / self.count / 1000 if self.count else None,
+            "max_us": self.max_ns / 1000,
+            "p50_us": self.quantile(0.5),
+            "p99_us": self.quantile(0.99),
+            "buckets": dict(zip(labels, self.counts, strict=True)),
+        }
+
+
+# 编译后的单项检查: (state, instance_id, symbol, 带方向的订单金额) -> 拒单告警
+PreTradeCheck = Callable[[ExposureState, str, str, float], "RiskAlert | None"]
+
+
 class RiskControlService:
     """风控服务"""
 
     def __init__(self, config: RiskControlConfig | None = None):
         self.config = config or RiskControlConfig()
         self._alerts: list[RiskAlert] = []
-        self._daily_trades: dict[str, int] = {}  # instance_id -> count
-        self._daily_pnl: dict[str, float] = {}  # instance_id -> pnl
+        self._states: dict[str, ExposureState] = {}  # instance_id -> 风险状态
+        self._latency: dict[str, LatencyHistogram] = {}
+        self._checks: tuple[tuple[str, PreTradeCheck, LatencyHistogram], ...] = ()
+        self._compile()
 
     def update_config(self, config: RiskControlConfig) -> None:
         """更新风控配置"""
         self.config = config
+        self._compile()
         logger.info(f"Risk control config updated: {config}")
 
+    # ==================== 下单前风控管线 ====================
+
+    def _compile(self) -> None:
+        """按当前配置编译启用的下单前检查"""
+        config = self.config
+        max_order_size = config.max_order_size
+        max_position = config.max_position_pct / 100
+        max_total = config.max_total_position_pct / 100
+        max_loss = config.max_daily_loss_pct / 100
+        max_trades = config.max_daily_trades
+
+        def order_size(state: ExposureState, instance_id: str, symbol: str, value: float):
+            if abs(value) > max_order_size:
+                return self._order_size_alert(instance_id, abs(value))
+            return None
+
+        def position_limit(state: ExposureState, instance_id: str, symbol: str, value: float):
+            balance = state.account_balance
+            if balance <= 0:
+                return None
+            current = abs(state.positions.get(symbol, 0.0))
+            new = abs(state.positions.get(symbol, 0.0) + value)
+            # 减仓/平仓不增加敞口，始终放行
+            if new <= current:
+                return None
+            if new > max_position * balance:
+                return self._single_position_alert(instance_id, symbol, new, balance)
+            total = state.total_exposure + new - current
+            if total > max_total * balance:
+                return self._total_position_alert(instance_id, total, balance)
+            return None
+
+        def daily_loss(state: ExposureState, instance_id: str, symbol: str, value: float):
+            initial = state.initial_balance
+            if initial <= 0 or state.daily_pnl > -0.8 * max_loss * initial:
+                return None
+            if state.daily_pnl <= -max_loss * initial:
+                pnl_pct = state.daily_pnl / initial * 100
+                return self._daily_loss_alert(instance_id, state.daily_pnl, pnl_pct)
+            return None
+
+        def trade_count(state: ExposureState, instance_id: str, symbol: str, value: float):
+            if state.trade_count + 1 > max_trades:
+                return self._trade_count_alert(instance_id, state.trade_count + 1)
+            return None
+
+        checks: list[tuple[str, PreTradeCheck]] = [("order_size", order_size)]
+        if config.enable_position_limit:
+            checks.append(("position_limit", position_limit))
+        checks += [("daily_loss", daily_loss), ("trade_count", trade_count)]
+        self._checks = tuple((name, check, self._histogram(name)) for name, check in checks)
+
+    def _histogram(self, name: str) -> LatencyHistogram:
+        histogram = self._latency.get(name)
+        if histogram is None:
+            histogram = self._latency[name] = LatencyHistogram()
+        return histogram
+
+    def _state(self, instance_id: str) -> ExposureState:
+        state = self._states.get(instance_id)
+        if state is None:
+            state = self._states[instance_id] = ExposureState()
+        return state
+
+    def check_order(
+        self,
+        instance_id: str,
+        symbol: str,
+        order_value: float,
+    ) -> tuple[bool, RiskAlert | None]:
+        """
+        下单前风控检查(同步，O(1))
+
+        依次执行启用的检查，首个未通过的检查拒单。
+
+        Args:
+            instance_id: 实例ID
+            symbol: 交易标的
+            order_value: 订单金额(买入为正，卖出为负，与 on_fill 的 value_delta 一致)
+
+        Returns:
+            (是否通过检查, 告警信息)
+        """
+        state = self._state(instance_id)
+        clock = time.perf_counter_ns
+        started = clock()
+        last = started
+        alert = None
+        for _name, check, histogram in self._checks:
+            alert = check(state, instance_id, symbol, order_value)
+            now = clock()
+            histogram.observe(now - last)
+            last = now
+            if alert is not None:
+                break
+        self._histogram("total").observe(last - started)
+        if alert is not None:
+            self._add_alert(alert)
+            return False, alert
+        return True, None
+
+    def on_fill(
+        self,
+        instance_id: str,
+        symbol: str,
+        value_delta: float,
+        pnl: float = 0.0,
+    ) -> None:
+        """
+        成交后增量更新风险状态
+
+        Args:
+            instance_id: 实例ID
+            symbol: 交易标的
+            value_delta: 持仓金额变化(买入为正，卖出为负)
+            pnl: 本次成交的已实现盈亏(含手续费)
+        """
+        state = self._state(instance_id)
+        old = state.positions.get(symbol, 0.0)
+        new = old + value_delta
+        if new:
+            state.positions[symbol] = new
+        else:
+            state.positions.pop(symbol, None)
+        state.total_exposure += abs(new) - abs(old)
+        state.trade_count += 1
+        state.daily_pnl += pnl
+        state.account_balance += pnl
+        self._track_daily_loss(instance_id, state)
+
+    def update_balance(
+        self,
+        instance_id: str,
+        account_balance: float,
+        initial_balance: float | None = None,
+    ) -> None:
+        """
+        同步账户余额(如券商回报)
+
+        Args:
+            instance_id: 实例ID
+            account_balance: 当前余额
+            initial_balance: 当日开盘余额(可选，不指定则沿用，首次为当前余额)
+        """
+        state = self._state(instance_id)
+        state.account_balance = account_balance
+        if initial_balance is not None:
+            state.initial_balance = initial_balance
+        elif state.initial_balance <= 0:
+            state.initial_balance = account_balance
+        state.daily_pnl = state.account_balance - state.initial_balance
+        self._track_daily_loss(instance_id, state)
+
+    def _track_daily_loss(self, instance_id: str, state: ExposureState) -> None:
+        """日盈亏变化后发出亏损预警(达上限 80% 时每日一次，超限由 check_order 拒单)"""
+        initial = state.initial_balance
+        if state.loss_warned or initial <= 0:
+            return
+        max_loss = self.config.max_daily_loss_pct / 100 * initial
+        if -max_loss < state.daily_pnl <= -0.8 * max_loss:
+            state.loss_warned = True
+            pnl_pct = state.daily_pnl / initial * 100
+            self._add_alert(self._daily_loss_warning(instance_id, state.daily_pnl, pnl_pct))
+
+    def update_position(self, instance_id: str, symbol: str, value: float) -> None:
+        """
+        校正单品种持仓金额(如按最新价重估)
+
+        Args:
+            instance_id: 实例ID
+            symbol: 交易标的
+            value: 持仓金额
+        """
+        state = self._state(instance_id)
+        old = state.positions.get(symbol, 0.0)
+        if value:
+            state.positions[symbol] = value
+        else:
+            state.positions.pop(symbol, None)
+        state.total_exposure += abs(value) - abs(old)
+
+    def get_exposure(self, instance_id: str) -> ExposureState | None:
+        """获取实例风险状态"""
+        return self._states.get(instance_id)
+
+    def get_latency_stats(self) -> dict[str, dict[str, Any]]:
+        """获取下单前检查耗时统计(微秒)"""
+        return {name: histogram.snapshot() for name, histogram in self._latency.items()}
+
     async def check_position_limit(
         self,
         instance_id: str,
@@ -112,17 +374,7 @@ class RiskControlService:
         # 检查单品种仓位
         single_position_pct = (position_size / account_balance) * 100
         if single_position_pct > self.config.max_position_pct:
-            alert = RiskAlert(
-                alert_type=RiskAlertType.POSITION_LIMIT,
-                level=RiskAlertLevel.WARNING,
-                message=f"单品种仓位超限: {symbol} 仓位 {single_position_pct:.1f}% 超过上限 {self.config.max_position_pct}%",
-                instance_id=instance_id,
-                details={
-                    "symbol": symbol,
-                    "position_pct": single_position_pct,
-                    "limit": self.config.max_position_pct,
-                },
-            )
+            alert = self._single_position_alert(instance_id, symbol, position_size, account_balance)
             self._add_alert(alert)
             return False, alert
 
@@ -130,21 +382,43 @@ class RiskControlService:
         total_position = sum(current_positions.values()) + position_size
         total_position_pct = (total_position / account_balance) * 100
         if total_position_pct > self.config.max_total_position_pct:
-            alert = RiskAlert(
-                alert_type=RiskAlertType.POSITION_LIMIT,
-                level=RiskAlertLevel.WARNING,
-                message=f"总仓位超限: 当前 {total_position_pct:.1f}% 超过上限 {self.config.max_total_position_pct}%",
-                instance_id=instance_id,
-                details={
-                    "total_position_pct": total_position_pct,
-                    "limit": self.config.max_total_position_pct,
-                },
-            )
+            alert = self._total_position_alert(instance_id, total_position, account_balance)
             self._add_alert(alert)
             return False, alert
 
         return True, None
 
+    def _single_position_alert(
+        self, instance_id: str, symbol: str, position_size: float, account_balance: float
+    ) -> RiskAlert:
+        single_position_pct = (position_size / account_balance) * 100
+        return RiskAlert(
+            alert_type=RiskAlertType.POSITION_LIMIT,
+            level=RiskAlertLevel.WARNING,
+            message=f"单品种仓位超限: {symbol} 仓位 {single_position_pct:.1f}% 超过上限 {self.config.max_position_pct}%",
+            instance_id=instance_id,
+            details={
+                "symbol": symbol,
+                "position_pct": single_position_pct,
+                "limit": self.config.max_position_pct,
+            },
+        )
+
+    def _total_position_alert(
+        self, instance_id: str, total_position: float, account_balance: float
+    ) -> RiskAlert:
+        total_position_pct = (total_position / account_balance) * 100
+        return RiskAlert(
+            alert_type=RiskAlertType.POSITION_LIMIT,
+            level=RiskAlertLevel.WARNING,
+            message=f"总仓位超限: 当前 {total_position_pct:.1f}% 超过上限 {self.config.max_total_position_pct}%",
+            instance_id=instance_id,
+            details={
+                "total_position_pct": total_position_pct,
+                "limit": self.config.max_total_position_pct,
+            },
+        )
+
     async def check_daily_loss(
         self,
         instance_id: str,
@@ -162,43 +436,48 @@ class RiskControlService:
         Returns:
             (是否继续交易, 告警信息)
         """
-        daily_pnl = account_balance - initial_balance
+        self.update_balance(instance_id, account_balance, initial_balance)
+        daily_pnl = self._state(instance_id).daily_pnl
         daily_pnl_pct = (daily_pnl / initial_balance) * 100 if initial_balance > 0 else 0
 
-        self._daily_pnl[instance_id] = daily_pnl
-
         if daily_pnl_pct <= -self.config.max_daily_loss_pct:
-            alert = RiskAlert(
-                alert_type=RiskAlertType.DAILY_LOSS,
-                level=RiskAlertLevel.CRITICAL,
-                message=f"日亏损超限: 当前亏损 {abs(daily_pnl_pct):.1f}% 超过上限 {self.config.max_daily_loss_pct}%",
-                instance_id=instance_id,
-                details={
-                    "daily_pnl": daily_pnl,
-                    "daily_pnl_pct": daily_pnl_pct,
-                    "limit": self.config.max_daily_loss_pct,
-                },
-            )
+            alert = self._daily_loss_alert(instance_id, daily_pnl, daily_pnl_pct)
             self._add_alert(alert)
             return False, alert
 
-        # 预警(达到80%阈值)
-        if daily_pnl_pct <= -self.config.max_daily_loss_pct * 0.8:
-            alert = RiskAlert(
-                alert_type=RiskAlertType.DAILY_LOSS,
-                level=RiskAlertLevel.WARNING,
-                message=f"日亏损预警: 当前亏损 {abs(daily_pnl_pct):.1f}% 接近上限 {self.config.max_daily_loss_pct}%",
-                instance_id=instance_id,
-                details={
-                    "daily_pnl": daily_pnl,
-                    "daily_pnl_pct": daily_pnl_pct,
-                    "threshold": self.config.max_daily_loss_pct * 0.8,
-                },
-            )
-            self._add_alert(alert)
-
+        # 达到 80% 阈值的预警由 update_balance 发出(每日一次)
         return True, None
 
+    def _daily_loss_alert(
+        self, instance_id: str, daily_pnl: float, daily_pnl_pct: float
+    ) -> RiskAlert:
+        return RiskAlert(
+            alert_type=RiskAlertType.DAILY_LOSS,
+            level=RiskAlertLevel.CRITICAL,
+            message=f"日亏损超限: 当前亏损 {abs(daily_pnl_pct):.1f}% 超过上限 {self.config.max_daily_loss_pct}%",
+            instance_id=instance_id,
+            details={
+                "daily_pnl": daily_pnl,
+                "daily_pnl_pct": daily_pnl_pct,
+                "limit": self.config.max_daily_loss_pct,
+            },
+        )
+
+    def _daily_loss_warning(
+        self, instance_id: str, daily_pnl: float, daily_pnl_pct: float
+    ) -> RiskAlert:
+        return RiskAlert(
+            alert_type=RiskAlertType.DAILY_LOSS,
+            level=RiskAlertLevel.WARNING,
+            message=f"日亏损预警: 当前亏损 {abs(daily_pnl_pct):.1f}% 接近上限 {self.config.max_daily_loss_pct}%",
+            instance_id=instance_id,
+            details={
+                "daily_pnl": daily_pnl,
+                "daily_pnl_pct": daily_pnl_pct,
+                "threshold": self.config.max_daily_loss_pct * 0.8,
+            },
+        )
+
     async def check_stop_loss(
         self,
         instance_id: str,
@@ -317,50 +596,59 @@ class RiskControlService:
             (是否通过检查, 告警信息)
         """
         if order_size > self.config.max_order_size:
-            alert = RiskAlert(
-                alert_type=RiskAlertType.ABNORMAL_TRADING,
-                level=RiskAlertLevel.WARNING,
-                message=f"单笔金额超限: {order_size:.2f} 超过上限 {self.config.max_order_size}",
-                instance_id=instance_id,
-                details={
-                    "order_size": order_size,
-                    "limit": self.config.max_order_size,
-                },
-            )
+            alert = self._order_size_alert(instance_id, order_size)
             self._add_alert(alert)
             return False, alert
 
         return True, None
 
+    def _order_size_alert(self, instance_id: str, order_size: float) -> RiskAlert:
+        return RiskAlert(
+            alert_type=RiskAlertType.ABNORMAL_TRADING,
+            level=RiskAlertLevel.WARNING,
+            message=f"单笔金额超限: {order_size:.2f} 超过上限 {self.config.max_order_size}",
+            instance_id=instance_id,
+            details={
+                "order_size": order_size,
+                "limit": self.config.max_order_size,
+            },
+        )
+
     async def increment_trade_count(self, instance_id: str) -> tuple[bool, RiskAlert | None]:
         """
         增加交易计数并检查是否超限
 
+        与 on_fill 共用 ExposureState.trade_count，同一笔成交只应调用其一。
+
         Args:
             instance_id: 实例ID
 
         Returns:
             (是否允许交易, 告警信息)
         """
-        count = self._daily_trades.get(instance_id, 0) + 1
-        self._daily_trades[instance_id] = count
+        state = self._state(instance_id)
+        state.trade_count += 1
+        count = state.trade_count
 
         if count > self.config.max_daily_trades:
-            alert = RiskAlert(
-                alert_type=RiskAlertType.ABNORMAL_TRADING,
-                level=RiskAlertLevel.WARNING,
-                message=f"每日交易次数超限: {count} 超过上限 {self.config.max_daily_trades}",
-                instance_id=instance_id,
-                details={
-                    "trade_count": count,
-                    "limit": self.config.max_daily_trades,
-                },
-            )
+            alert = self._trade_count_alert(instance_id, count)
             self._add_alert(alert)
             return False, alert
 
         return True, None
 
+    def _trade_count_alert(self, instance_id: str, count: int) -> RiskAlert:
+        return RiskAlert(
+            alert_type=RiskAlertType.ABNORMAL_TRADING,
+            level=RiskAlertLevel.WARNING,
+            message=f"每日交易次数超限: {count} 超过上限 {self.config.max_daily_trades}",
+            instance_id=instance_id,
+            details={
+                "trade_count": count,
+                "limit": self.config.max_daily_trades,
+            },
+        )
+
     def get_alerts(
         self,
         instance_id: str | None = None,
@@ -415,11 +703,16 @@ class RiskControlService:
             instance_id: 实例ID(可选，不指定则重置全部)
         """
         if instance_id:
-            self._daily_trades.pop(instance_id, None)
-            self._daily_pnl.pop(instance_id, None)
+            states = [self._states[instance_id]] if instance_id in self._states else []
         else:
-            self._daily_trades.clear()
-            self._daily_pnl.clear()
+            states = list(self._states.values())
+
+        # 风险状态: 以当前余额作为新一日的开盘余额
+        for state in states:
+            state.initial_balance = state.account_balance
+            state.daily_pnl = 0.0
+            state.trade_count = 0
+            state.loss_warned = False
 
         logger.info(f"Daily counters reset for instance: {instance_id or 'all'}")
 
@@ -0,0 +1,279 @@
+"""
+Columnar run artifact for parsed backtest logs.
+
+``log_parser_service`` turns the text logs of a run (``value.log``,
+``trade.log``, ``data.log`` ...) into curves, trade/order records and kline
+data by splitting every line. Completed runs never change, so the runner
+stores the parsed sections once in ``run_artifact.npz`` next to the logs:
+
+- ``value``: dates plus equity/cash/drawdown curves as float64 arrays.
+- ``kline``: dates, an ``(n, 4)`` OHLC matrix, volumes and one float64 array
+  per indicator (``NaN`` marks a missing value).
+- ``trades`` / ``orders``: one array per record field.
+- ``run_info``: the JSON document as a string.
+
+The artifact records a fingerprint (name, size, mtime) of the text logs it
+was built from; if any of them changed, or the artifact is unreadable, readers
+get ``None`` and fall back to the text parsers. Sections whose values do not
+fit a typed column are stored as JSON instead, so a round trip always returns
+exactly what the text parser produced.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import os
+import tempfile
+import zipfile
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_NAME = "run_artifact.npz"
+SECTIONS = ("value", "trades", "orders", "kline", "run_info")
+# Text logs the parsed sections are derived from.
+SOURCE_FILES = (
+    "value.log",
+    "trade.log",
+    "order.log",
+    "data.log",
+    "bar.log",
+    "indicator.log",
+    "run_info.json",
+)
+_FORMAT_VERSION = 1
+_META_KEY = "__meta__"
+_VALUE_CURVES = ("equity_curve", "cash_curve", "drawdown_curve")
+
+
+def source_fingerprint(log_dir: Path) -> str:
+    """Return a cheap fingerprint of the text logs present in ``log_dir``."""
+    parts: list[str] = []
+    for name in SOURCE_FILES:
+        try:
+            stat = (log_dir / name).stat()
+        except OSError:
+            continue
+        parts.append(f"{name}:{stat.st_size}:{stat.st_mtime_ns}")
+    return "|".join(parts)
+
+
+# ----------------------------------------------------------------------
+# Encoding
+# ----------------------------------------------------------------------
+
+
+def _json_array(payload: Any) -> np.ndarray:
+    return np.array(json.dumps(payload, ensure_ascii=False))
+
+
+def _str_array(values: list[Any]) -> np.ndarray | None:
+    if not all(isinstance(value, str) for value in values):
+        return None
+    return np.array(values, dtype=str) if values else np.array([], dtype="U1")
+
+
+def _float_array(values: list[Any], allow_none: bool = False) -> np.ndarray | None:
+    out = np.empty(len(values), dtype=np.float64)
+    for index, value in enumerate(values):
+        if value is None and allow_none:
+            out[index] = math.nan
+        elif type(value) is float and not (allow_none and math.isnan(value)):
+            out[index] = value
+        else:
+            return None
+    return out
+
+
+def _encode_records(
+    prefix: str, records: list[dict[str, Any]], arrays: dict[str, np.ndarray]
+) -> dict[str, Any]:
+    """Encode a list of same-shaped dicts as one typed array per field."""
+    if not records or not all(isinstance(record, dict) for record in records):
+        return {"json": True} if records else {"fields": [], "rows": 0}
+    fields = list(records[0].keys())
+    if any(list(record.keys()) != fields for record in records):
+        return {"json": True}
+    encoded: dict[str, np.ndarray] = {}
+    for position, field in enumerate(fields):
+        column = [record[field] for record in records]
+        kinds = {type(value) for value in column}
+        if kinds == {str}:
+            array = np.array(column, dtype=str)
+        elif kinds == {int}:
+            array = np.array(column, dtype=np.int64)
+        elif kinds == {float}:
+            array = np.array(column, dtype=np.float64)
+        else:
+            return {"json": True}
+        encoded[f"{prefix}/{position}"] = array
+    arrays.update(encoded)
+    return {"fields": fields, "rows": len(records)}
+
+
+def _encode_value(value: dict[str, Any], arrays: dict[str, np.ndarray]) -> dict[str, Any]:
+    dates = _str_array(list(value.get("dates") or []))
+    curves = {name: _float_array(list(value.get(name) or [])) for name in _VALUE_CURVES}
+    if set(value.keys()) != {"dates", *_VALUE_CURVES} or dates is None:
+        return {"json": True}
+    if any(array is None for array in curves.values()):
+        return {"json": True}
+    arrays["value/dates"] = dates
+    for name, array in curves.items():
+        arrays[f"value/{name}"] = array
+    return {}
+
+
+def _encode_kline(kline: dict[str, Any], arrays: dict[str, np.ndarray]) -> dict[str, Any]:
+    if set(kline.keys()) != {"dates", "ohlc", "volumes", "indicators"}:
+        return {"json": True}
+    dates = _str_array(list(kline.get("dates") or []))
+    ohlc_rows = list(kline.get("ohlc") or [])
+    if dates is None or any(not isinstance(row, list) or len(row) != 4 for row in ohlc_rows):
+        return {"json": True}
+    ohlc = _float_array([price for row in ohlc_rows for price in row])
+    volumes = _float_array(list(kline.get("volumes") or []))
+    indicators = kline.get("indicators") or {}
+    if ohlc is None or volumes is None or not isinstance(indicators, dict):
+        return {"json": True}
+    indicator_arrays: list[np.ndarray] = []
+    for values in indicators.values():
+        array = _float_array(list(values or []), allow_none=True)
+        if array is None:
+            return {"json": True}
+        indicator_arrays.append(array)
+    arrays["kline/dates"] = dates
+    arrays["kline/ohlc"] = ohlc.reshape(-1, 4)
+    arrays["kline/volumes"] = volumes
+    for position, array in enumerate(indicator_arrays):
+        arrays[f"kline/indicator/{position}"] = array
+    return {"indicators": [str(name) for name in indicators.keys()]}
+
+
+def write_run_artifact(
+    log_dir: Path,
+    *,
+    value: dict[str, Any],
+    trades: list[dict[str, Any]],
+    orders: list[dict[str, Any]],
+    kline: dict[str, Any],
+    run_info: dict[str, Any],
+) -> Path | None:
+    """Persist parsed log sections as ``run_artifact.npz`` in ``log_dir``.
+
+    Returns:
+        The artifact path, or None if it could not be written.
+    """
+    arrays: dict[str, np.ndarray] = {}
+    layout: dict[str, dict[str, Any]] = {
+        "value": _encode_value(value, arrays),
+        "trades": _encode_records("trades", trades, arrays),
+        "orders": _encode_records("orders", orders, arrays),
+        "kline": _encode_kline(kline, arrays),
+        "run_info": {"json": True},
+    }
+    payloads = {
+        "value": value,
+        "trades": trades,
+        "orders": orders,
+        "kline": kline,
+        "run_info": run_info,
+    }
+    for section, spec in layout.items():
+        if spec.get("json"):
+            arrays[f"{section}/json"] = _json_array(payloads[section])
+    meta = {
+        "version": _FORMAT_VERSION,
+        "fingerprint": source_fingerprint(log_dir),
+        "layout": layout,
+    }
+    arrays[_META_KEY] = _json_array(meta)
+
+    target = log_dir / ARTIFACT_NAME
+    try:
+        fd, tmp_name = tempfile.mkstemp(prefix=".run_artifact-", suffix=".npz", dir=log_dir)
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                np.savez(handle, **arrays)
+            os.replace(tmp_name, target)
+        finally:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+    except (OSError, ValueError, TypeError) as e:
+        logger.warning("Failed to write run artifact in %s: %s", log_dir, e)
+        return None
+    return target
+
+
+# ----------------------------------------------------------------------
+# Decoding
+# ----------------------------------------------------------------------
+
+
+def _decode_records(npz: Any, prefix: str, spec: dict[str, Any]) -> list[dict[str, Any]]:
+    fields = spec.get("fields") or []
+    columns = [npz[f"{prefix}/{position}"].tolist() for position in range(len(fields))]
+    return [dict(zip(fields, row, strict=True)) for row in zip(*columns, strict=True)]
+
+
+def _decode_value(npz: Any) -> dict[str, Any]:
+    result: dict[str, Any] = {"dates": npz["value/dates"].tolist()}
+    for name in _VALUE_CURVES:
+        result[name] = npz[f"value/{name}"].tolist()
+    return result
+
+
+def _decode_kline(npz: Any, spec: dict[str, Any]) -> dict[str, Any]:
+    indicators: dict[str, list[float | None]] = {}
+    for position, name in enumerate(spec.get("indicators") or []):
+        array = npz[f"kline/indicator/{position}"]
+        values: list[float | None] = array.tolist()
+        if np.isnan(array).any():
+            values = [None if value != value else value for value in values]
+        indicators[name] = values
+    return {
+        "dates": npz["kline/dates"].tolist(),
+        "ohlc": npz["kline/ohlc"].tolist(),
+        "volumes": npz["kline/volumes"].tolist(),
+        "indicators": indicators,
+    }
+
+
+def _decode_section(npz: Any, section: str, spec: dict[str, Any]) -> Any:
+    if spec.get("json"):
+        return json.loads(str(npz[f"{section}/json"]))
+    if section == "value":
+        return _decode_value(npz)
+    if section == "kline":
+        return _decode_kline(npz, spec)
+    return _decode_records(npz, section, spec)
+
+
+def load_run_artifact(log_dir: Path, sections: tuple[str, ...] = SECTIONS) -> dict[str, Any] | None:
+    """Load parsed sections from a fresh artifact, or None to fall back to text logs."""
+    path = log_dir / ARTIFACT_NAME
+    if not path.is_file():
+        return None
+    try:
+        with np.load(path, allow_pickle=False) as npz:
+            meta = json.loads(str(npz[_META_KEY]))
+            if meta.get("version") != _FORMAT_VERSION:
+                return None
+            if meta.get("fingerprint") != source_fingerprint(log_dir):
+                return None
+            layout = meta.get("layout") or {}
+            return {section: _decode_section(npz, section, layout[section]) for section in sections}
+    except (OSError, ValueError, KeyError, TypeError, zipfile.BadZipFile) as e:
+        logger.debug("Ignoring unreadable run artifact %s: %s", path, e)
+        return None
+
+
+def read_artifact_section(log_dir: Path, section: str) -> Any | None:
+    """Return one parsed section from a fresh artifact, or None."""
+    loaded = load_run_artifact(log_dir, (section,))
+    return loaded[section] if loaded is not None else None
@@ -0,0 +1,136 @@
+"""
+Bounded per-symbol tick history for gateway tick receivers.
+
+``TickRing`` stores the numeric fields of the last ``capacity`` ticks of one
+symbol as a struct-of-arrays NumPy block (one row per field). A single
+writer (the receiver thread) appends; readers copy a window without taking
+a lock and discard any slot the writer overwrote while they were copying,
+using the monotonically increasing write sequence.
+
+``loads_tick`` decodes a raw ZMQ frame with orjson when it is installed
+(straight from ``bytes``, no intermediate ``str``) and falls back to the
+standard library otherwise.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import time
+from typing import Any
+
+import numpy as np
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+# GatewayTick fields kept in the history, in row order.
+TICK_FIELDS = (
+    "timestamp",
+    "price",
+    "bid_price",
+    "ask_price",
+    "bid_volume",
+    "ask_volume",
+    "volume",
+    "turnover",
+    "openinterest",
+)
+_FIELD_COUNT = len(TICK_FIELDS)
+
+
+def loads_tick(raw: bytes) -> Any:
+    """Decode a JSON tick frame.
+
+    Raises:
+        ValueError: If *raw* is not valid UTF-8 JSON.
+    """
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _number(value: Any) -> float:
+    if value is None or value == "":
+        return math.nan
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return math.nan
+    return number if math.isfinite(number) else math.nan
+
+
+def tick_values(payload: dict[str, Any]) -> list[float]:
+    """Numeric ``TICK_FIELDS`` of *payload*; NaN where missing.
+
+    Millisecond timestamps are converted to seconds; ticks without a
+    timestamp are stamped with the receive time.
+    """
+    values = [_number(payload.get(field)) for field in TICK_FIELDS]
+    if values[0] > 1e12:
+        values[0] /= 1000.0
+    elif math.isnan(values[0]):
+        values[0] = time.time()
+    return values
+
+
+class TickRing:
+    """Fixed-capacity ring of one symbol's ticks (single writer)."""
+
+    __slots__ = ("capacity", "_data", "_claimed", "_written")
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = max(1, int(capacity))
+        self._data = np.full((_FIELD_COUNT, self.capacity), np.nan)
+        # Total ticks ever appended; slot of tick ``n`` is ``n % capacity``.
+        # ``_claimed`` runs one ahead while a slot is being written.
+        self._claimed = 0
+        self._written = 0
+
+    @property
+    def sequence(self) -> int:
+        """Sequence number the next appended tick will get."""
+        return self._written
+
+    def append(self, values: list[float]) -> None:
+        self._claimed = self._written + 1
+        self._data[:, self._written % self.capacity] = values
+        # Publish only after the slot is fully written.
+        self._written = self._claimed
+
+    def snapshot(
+        self,
+        limit: int | None = None,
+        since: int | None = None,
+    ) -> tuple[dict[str, np.ndarray], int]:
+        """Copy the newest ticks without blocking the writer.
+
+        Args:
+            limit: Return at most this many of the newest ticks.
+            since: Return only ticks with a sequence number ``>= since``
+                (e.g. the sequence returned by a previous call).
+
+        Returns:
+            ``({field: array}, next_sequence)``. Arrays are oldest first and
+            never contain a slot overwritten during the copy.
+        """
+        end = self._written
+        start = max(0, end - self.capacity)
+        if since is not None:
+            start = max(start, since)
+        if limit is not None:
+            start = max(start, end - max(0, limit))
+        start = min(start, end)
+        slots = np.arange(start, end) % self.capacity
+        block = self._data[:, slots]
+        # The writer may have lapped the oldest copied slots while we copied
+        # (including one it is still writing); drop those.
+        safe_start = max(start, self._claimed - self.capacity)
+        if safe_start > start:
+            block = block[:, safe_start - start :]
+        return {field: block[i] for i, field in enumerate(TICK_FIELDS)}, end
@@ -11,6 +11,7 @@ import logging
 from typing import Any
 
 from sqlalchemy import desc, select
+from sqlalchemy.orm import noload
 
 from app.db import database as db
 from app.models.backtest import BacktestResultModel, BacktestTask
@@ -106,6 +107,7 @@ async def generate_performance_diff(
             stmt = (
                 select(BacktestTask, BacktestResultModel)
                 .join(BacktestResultModel, BacktestResultModel.task_id == BacktestTask.id)
+                .options(noload(BacktestResultModel.blob))
                 .where(BacktestTask.strategy_version_id == version_id)
                 .where(BacktestTask.status == "completed")
                 .order_by(desc(BacktestTask.created_at))
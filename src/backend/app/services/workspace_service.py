@@ -38,8 +38,16 @@ from app.schemas.workspace import (
     WorkspaceUpdate,
 )
 from app.services import workspace_unit_runtime
-from app.services.fincore_metrics_helper import calculate_extended_metrics
+from app.services.fincore_metrics_helper import (
+    calculate_extended_metrics,
+    calculate_extended_metrics_batch,
+)
 from app.services.optimization_execution_manager import get_optimization_execution_manager
+from app.services.optimization_halving import (
+    estimate_evaluations,
+    fidelity_schedule,
+    honours_fidelity,
+)
 from app.services.optimization_task_state import (
     build_results_response,
     estimate_remaining_seconds,
@@ -47,6 +55,7 @@ from app.services.optimization_task_state import (
 from app.services.param_optimization_service import (
     get_optimization_progress,
     get_optimization_results,
+    submit_halving_optimization,
     submit_optimization,
 )
 from app.services.trading_workspace_service import TradingWorkspaceService
@@ -54,6 +63,12 @@ from app.services.trading_workspace_service import TradingWorkspaceService
 logger = logging.getLogger(__name__)
 
 _DEFAULT_UNIT_START_DATE = datetime(2020, 1, 1, tzinfo=timezone.utc)
+# Unit ``optimization_config.objective`` -> metric results are ranked by.
+_OBJECTIVE_METRICS = {
+    "sharpe_max": "sharpe_ratio",
+    "max_return": "annual_return",
+    "min_drawdown": "max_drawdown",
+}
 _ACTIVE_OPTIMIZATION_STATUSES = {"pending", "queued", "running"}
 _TERMINAL_OPTIMIZATION_STATUSES = {
     TaskStatus.COMPLETED.value,
@@ -171,6 +186,13 @@ def _workspace_settings_dict(ws: Workspace) -> dict[str, Any]:
     return _normalize_workspace_settings(None)
 
 
+def _unit_objective(unit: StrategyUnit) -> str:
+    """Metric the unit's optimization results are ranked by (default Sharpe)."""
+    oc = unit.optimization_config or {}
+    objective_key = oc.get("objective", "sharpe_max") or "sharpe_max"
+    return _OBJECTIVE_METRICS.get(str(objective_key), str(objective_key))
+
+
 def _default_unit_start_date_iso() -> str:
     return _DEFAULT_UNIT_START_DATE.isoformat()
 
@@ -1536,6 +1558,8 @@ class WorkspaceService:
                 task_by_id = {str(task.id): task for task in task_result.scalars().all()}
 
             changed = False
+            # Units whose metrics need (re)computing; scored in one batch below.
+            pending_metrics: list[tuple[Any, Any, dict[str, Any]]] = []
             for unit in units:
                 unit_obj = cast(Any, unit)
                 metrics_snapshot = cast(dict[str, Any], unit_obj.metrics_snapshot or {})
@@ -1581,24 +1605,7 @@ class WorkspaceService:
                                 for t in (bt_result.trades or [])
                             ],
                         }
-                        try:
-                            metrics = calculate_extended_metrics(log_data)
-                            unit_obj.metrics_snapshot = metrics
-                        except Exception:
-                            unit_obj.metrics_snapshot = {
-                                "total_return": bt_result.total_return,
-                                "annual_return": bt_result.annual_return,
-                                "sharpe_ratio": bt_result.sharpe_ratio,
-                                "max_drawdown": bt_result.max_drawdown,
-                                "win_rate": bt_result.win_rate,
-                                "total_trades": bt_result.total_trades,
-                                "profitable_trades": bt_result.profitable_trades,
-                                "losing_trades": bt_result.losing_trades,
-                                "initial_cash": 100000.0,
-                                "final_value": (bt_result.equity_curve or [100000.0])[-1]
-                                if (bt_result.equity_curve or [])
-                                else 100000.0,
-                            }
+                        pending_metrics.append((unit_obj, bt_result, log_data))
                         unit_obj.bar_count = await self._resolve_unit_bar_count(
                             backtest_service,
                             last_task_id,
@@ -1607,6 +1614,32 @@ class WorkspaceService:
                         )
                         changed = True
 
+            if pending_metrics:
+                try:
+                    batch = calculate_extended_metrics_batch(
+                        [log_data for _unit, _result, log_data in pending_metrics]
+                    )
+                except Exception as e:
+                    logger.warning("Extended metrics failed for workspace %s: %s", workspace_id, e)
+                    batch = [{} for _ in pending_metrics]
+                for (unit_obj, bt_result, _log_data), metrics in zip(
+                    pending_metrics, batch, strict=True
+                ):
+                    unit_obj.metrics_snapshot = metrics or {
+                        "total_return": bt_result.total_return,
+                        "annual_return": bt_result.annual_return,
+                        "sharpe_ratio": bt_result.sharpe_ratio,
+                        "max_drawdown": bt_result.max_drawdown,
+                        "win_rate": bt_result.win_rate,
+                        "total_trades": bt_result.total_trades,
+                        "profitable_trades": bt_result.profitable_trades,
+                        "losing_trades": bt_result.losing_trades,
+                        "initial_cash": 100000.0,
+                        "final_value": (bt_result.equity_curve or [100000.0])[-1]
+                        if (bt_result.equity_curve or [])
+                        else 100000.0,
+                    }
+
             if changed:
                 await session.commit()
 
@@ -1802,13 +1835,21 @@ class WorkspaceService:
             # Sync unit runtime dir so optimization uses unit's symbol/data config
             workspace_settings = cast(dict[str, Any], _workspace_settings_dict(ws))
             unit_runtime_dir = workspace_unit_runtime.sync_unit_runtime(unit, workspace_settings)
+            # The unit runtime honours the fidelity bar window that halving needs.
+            halving = req.early_stopping and honours_fidelity(unit_runtime_dir)
+            total = len(grid)
+            if halving:
+                schedule = fidelity_schedule(
+                    req.halving_min_bars, req.halving_eta, req.halving_rungs
+                )
+                total = estimate_evaluations(len(grid), req.halving_eta, len(schedule))
 
             # Create persisted task in DB
             mgr = get_optimization_execution_manager()
             db_task = await mgr.create_task(
                 user_id=user_id,
                 strategy_id=strategy_id,
-                total=len(grid),
+                total=total,
                 param_ranges=param_ranges,
                 n_workers=req.n_workers,
             )
@@ -1829,15 +1870,30 @@ class WorkspaceService:
                 },
             )
 
-            submit_optimization(
-                strategy_id=strategy_id,
-                param_ranges=param_ranges,
-                n_workers=req.n_workers,
-                task_id=task_id,
-                persist_to_db=True,
-                strategy_dir=str(unit_runtime_dir),
-                artifact_root=str(artifact_root),
-            )
+            if halving:
+                submit_halving_optimization(
+                    strategy_id=strategy_id,
+                    param_ranges=param_ranges,
+                    strategy_dir=str(unit_runtime_dir),
+                    n_workers=req.n_workers,
+                    task_id=task_id,
+                    persist_to_db=True,
+                    artifact_root=str(artifact_root),
+                    metric=_unit_objective(unit),
+                    min_bars=req.halving_min_bars,
+                    eta=req.halving_eta,
+                    rungs=req.halving_rungs,
+                )
+            else:
+                submit_optimization(
+                    strategy_id=strategy_id,
+                    param_ranges=param_ranges,
+                    n_workers=req.n_workers,
+                    task_id=task_id,
+                    persist_to_db=True,
+                    strategy_dir=str(unit_runtime_dir),
+                    artifact_root=str(artifact_root),
+                )
 
             # Update unit with optimization task id — merge into existing config
             unit.last_optimization_task_id = task_id
@@ -1846,6 +1902,7 @@ class WorkspaceService:
                 {
                     "param_ranges": param_ranges,
                     "n_workers": req.n_workers,
+                    "early_stopping": halving,
                     "artifact_root": str(artifact_root),
                     "submitted_at": datetime.now(timezone.utc).isoformat(),
                 }
@@ -1857,6 +1914,7 @@ class WorkspaceService:
                 "task_id": task_id,
                 "unit_id": req.unit_id,
                 "total_combinations": len(grid),
+                "total_evaluations": total,
                 "n_workers": req.n_workers,
             }
 
@@ -1895,21 +1953,13 @@ class WorkspaceService:
                 return None
 
             task_id = unit.last_optimization_task_id
-            # Read user-configured objective from optimization_config
-            oc = unit.optimization_config or {}
-            objective_key = oc.get("objective", "sharpe_max") or "sharpe_max"
-            objective_map = {
-                "sharpe_max": "sharpe_ratio",
-                "max_return": "annual_return",
-                "min_drawdown": "max_drawdown",
-            }
-            objective = objective_map.get(str(objective_key), str(objective_key))
+            objective = _unit_objective(unit)
             reverse_sort = objective != "max_drawdown"
 
             # Try DB first
             mgr = get_optimization_execution_manager()
             db_task = await mgr.get_task(task_id, user_id=user_id)
-            if db_task and db_task.results is not None:
+            if db_task:
                 task_dict = {
                     "status": db_task.status,
                     "strategy_id": db_task.strategy_id,
@@ -1917,28 +1967,28 @@ class WorkspaceService:
                     "total": db_task.total,
                     "completed": db_task.completed,
                     "failed": db_task.failed,
-                    "results": db_task.results,
                 }
-                results_response = build_results_response(task_id, task_dict)
-                rows = list(results_response.get("rows") or [])
-                rows.sort(
-                    key=lambda row: row.get(objective, 999999 if not reverse_sort else -999999),
-                    reverse=reverse_sort,
+                selected = await mgr.list_trials(
+                    task_id, sort_by=objective, descending=reverse_sort
+                )
+                results_response = build_results_response(
+                    task_id,
+                    task_dict,
+                    sort_by=objective,
+                    descending=reverse_sort,
+                    selected=selected or [],
                 )
-                results_response["rows"] = rows
-                results_response["best"] = rows[0] if rows else None
                 results_response["objective"] = objective
                 return results_response
 
-            results_response = get_optimization_results(task_id, user_id=user_id, use_db=False)
+            results_response = get_optimization_results(
+                task_id,
+                user_id=user_id,
+                use_db=False,
+                sort_by=objective,
+                descending=reverse_sort,
+            )
             if results_response:
-                rows = list(results_response.get("rows") or [])
-                rows.sort(
-                    key=lambda row: row.get(objective, 999999 if not reverse_sort else -999999),
-                    reverse=reverse_sort,
-                )
-                results_response["rows"] = rows
-                results_response["best"] = rows[0] if rows else None
                 results_response["objective"] = objective
             return results_response
 
@@ -1977,14 +2027,13 @@ class WorkspaceService:
 
             mgr = get_optimization_execution_manager()
             db_task = await mgr.get_task(req.optimization_task_id, user_id=user_id)
-            if not db_task or not db_task.results:
+            if not db_task or not db_task.completed:
                 return {"error": "Optimization results not found"}
 
-            results = db_task.results
-            if req.result_index >= len(results):
+            best = await mgr.get_trial(req.optimization_task_id, req.result_index)
+            if best is None:
                 return {"error": f"Result index {req.result_index} out of range"}
 
-            best = results[req.result_index]
             best_params = best.get("params", {})
 
             # Merge into unit params
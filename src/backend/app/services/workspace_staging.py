@@ -0,0 +1,286 @@
+"""
+Copy-free staging of strategy directories into per-task workspaces.
+
+Backtests and optimization trials used to ``shutil.copytree`` the whole
+strategy directory for every task, including data files, caches and old logs.
+Staging instead:
+
+1. Fingerprints the template directory (relative path, size, mtime of every
+   file) and keeps one immutable snapshot per fingerprint, so an unchanged
+   template is never copied again.
+2. Hardlinks (or, failing that, symlinks) every snapshot file into the task
+   directory. Snapshot files are read-only, and a snapshot whose files were
+   modified in place anyway (e.g. by a task running as root) is repaired
+   before it is reused.
+3. Writes private copies only for files the runner rewrites per task
+   (``config.yaml`` and ``run.py``); ``logs/`` is always created fresh.
+
+Each staged task leases its snapshot (a file naming the task directory and
+the staging process); snapshots of older template versions are only pruned
+once no live task directory holds a lease on them.
+
+Only the private copies, plus anything that had to fall back to a real copy,
+count towards ``bytes_copied``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+
+from app.services.process_supervisor import is_pid_alive
+
+logger = logging.getLogger(__name__)
+
+# Files that are rewritten per task and therefore must never be shared.
+PRIVATE_FILES = frozenset({"config.yaml", "run.py"})
+# Directories that are task output or interpreter caches, never template input.
+EXCLUDED_DIRS = frozenset({"logs", "__pycache__", ".pytest_cache", ".ipynb_checkpoints"})
+
+_SNAPSHOT_ROOT = Path(tempfile.gettempdir()) / "bt_strategy_snapshots"
+_LEASE_ROOT = Path(tempfile.gettempdir()) / "bt_strategy_snapshot_leases"
+# Write permission bits cleared on snapshot files.
+_WRITE_BITS = 0o222
+_snapshot_lock = threading.Lock()
+
+
+@dataclass
+class StagingReport:
+    """Per-task staging statistics."""
+
+    fingerprint: str
+    files_linked: int = 0
+    files_copied: int = 0
+    bytes_linked: int = 0
+    bytes_copied: int = 0
+    snapshot_reused: bool = True
+
+    def as_dict(self) -> dict[str, int | str | bool]:
+        return {
+            "fingerprint": self.fingerprint,
+            "files_linked": self.files_linked,
+            "files_copied": self.files_copied,
+            "bytes_linked": self.bytes_linked,
+            "bytes_copied": self.bytes_copied,
+            "snapshot_reused": self.snapshot_reused,
+        }
+
+
+def _iter_template_files(template_dir: Path):
+    """Yield (relative_path, stat) for every template file, skipping task output."""
+    for root, dirs, files in os.walk(template_dir):
+        dirs[:] = sorted(d for d in dirs if d not in EXCLUDED_DIRS)
+        root_path = Path(root)
+        for name in sorted(files):
+            if name.endswith((".pyc", ".pyo")):
+                continue
+            path = root_path / name
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            yield path.relative_to(template_dir), stat
+
+
+def fingerprint_template(template_dir: Path) -> str:
+    """Return a content-version fingerprint of a strategy template directory."""
+    digest = hashlib.sha1()
+    for relative, stat in _iter_template_files(template_dir):
+        digest.update(f"{relative.as_posix()}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode())
+    return digest.hexdigest()
+
+
+def _snapshot_prefix(template_dir: Path) -> str:
+    path_key = hashlib.sha1(str(template_dir.resolve()).encode("utf-8")).hexdigest()[:8]
+    return f"{template_dir.name}-{path_key}-"
+
+
+def _snapshot_dir(template_dir: Path, fingerprint: str) -> Path:
+    return _SNAPSHOT_ROOT / f"{_snapshot_prefix(template_dir)}{fingerprint[:20]}"
+
+
+def _make_read_only(path: Path) -> None:
+    os.chmod(path, path.stat().st_mode & ~_WRITE_BITS)
+
+
+def _ensure_snapshot(template_dir: Path, fingerprint: str, target_dir: Path) -> tuple[Path, bool]:
+    """Return the immutable snapshot for ``fingerprint``, creating it once.
+
+    The snapshot is leased to ``target_dir`` before it is returned.
+    """
+    snapshot = _snapshot_dir(template_dir, fingerprint)
+    # Lease first: pruning re-checks leases after retiring a snapshot.
+    _take_lease(snapshot, target_dir)
+    if snapshot.is_dir() and fingerprint_template(snapshot) == fingerprint:
+        return snapshot, True
+    with _snapshot_lock:
+        if snapshot.is_dir():
+            if fingerprint_template(snapshot) == fingerprint:
+                return snapshot, True
+            _repair_snapshot(template_dir, snapshot)
+            return snapshot, False
+        snapshot.parent.mkdir(parents=True, exist_ok=True)
+        building = Path(tempfile.mkdtemp(prefix=f".{snapshot.name}-", dir=snapshot.parent))
+        try:
+            for relative, _stat in _iter_template_files(template_dir):
+                target = building / relative
+                target.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copy2(template_dir / relative, target)
+                _make_read_only(target)
+            try:
+                # Atomic publish: concurrent processes either see a complete
+                # snapshot or none at all.
+                os.replace(building, snapshot)
+            except OSError:
+                if not snapshot.is_dir():
+                    raise
+        finally:
+            if building.exists():
+                shutil.rmtree(building, ignore_errors=True)
+        # A concurrent prune may have dropped the lease taken above.
+        _take_lease(snapshot, target_dir)
+        _prune_stale_snapshots(template_dir, keep=snapshot)
+    logger.info("Staged new strategy snapshot %s", snapshot)
+    return snapshot, False
+
+
+def _repair_snapshot(template_dir: Path, snapshot: Path) -> None:
+    """Restore snapshot files that no longer match the template."""
+    expected = {}
+    for relative, stat in _iter_template_files(template_dir):
+        expected[relative] = stat
+        target = snapshot / relative
+        try:
+            current = target.stat()
+        except OSError:
+            current = None
+        if (
+            current is not None
+            and current.st_size == stat.st_size
+            and current.st_mtime_ns == stat.st_mtime_ns
+        ):
+            continue
+        # Swap in a new inode; tasks linked to the modified file keep theirs.
+        target.parent.mkdir(parents=True, exist_ok=True)
+        fresh = target.with_name(f".{target.name}.{uuid.uuid4().hex}")
+        shutil.copy2(template_dir / relative, fresh)
+        _make_read_only(fresh)
+        os.replace(fresh, target)
+    for relative, _stat in list(_iter_template_files(snapshot)):
+        if relative not in expected:
+            (snapshot / relative).unlink(missing_ok=True)
+    logger.warning("Repaired strategy snapshot %s modified in place", snapshot)
+
+
+def _lease_dir(snapshot: Path) -> Path:
+    return _LEASE_ROOT / snapshot.name
+
+
+def _take_lease(snapshot: Path, target_dir: Path) -> None:
+    """Record that the task in ``target_dir`` stages from ``snapshot``."""
+    lease_dir = _lease_dir(snapshot)
+    lease_dir.mkdir(parents=True, exist_ok=True)
+    target = str(target_dir.resolve())
+    key = hashlib.sha1(target.encode("utf-8")).hexdigest()[:16]
+    (lease_dir / f"{os.getpid()}-{key}").write_text(target, encoding="utf-8")
+
+
+def _snapshot_in_use(snapshot: Path) -> bool:
+    """Whether a live task directory still leases ``snapshot``; drops stale leases."""
+    lease_dir = _lease_dir(snapshot)
+    if not lease_dir.is_dir():
+        return False
+    in_use = False
+    for lease in lease_dir.iterdir():
+        try:
+            pid = int(lease.name.split("-", 1)[0])
+            target = Path(lease.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            continue
+        if is_pid_alive(pid) and target.exists():
+            in_use = True
+        else:
+            lease.unlink(missing_ok=True)
+    return in_use
+
+
+def _prune_stale_snapshots(template_dir: Path, keep: Path) -> None:
+    """Drop snapshots of older versions of the same template no task still uses."""
+    for candidate in _SNAPSHOT_ROOT.glob(f"{_snapshot_prefix(template_dir)}*"):
+        if candidate == keep or not candidate.is_dir() or _snapshot_in_use(candidate):
+            continue
+        retired = candidate.with_name(f".retired-{candidate.name}-{uuid.uuid4().hex}")
+        try:
+            os.replace(candidate, retired)
+        except OSError:
+            continue
+        if _snapshot_in_use(candidate):
+            # Leased between the check and the move: put it back.
+            try:
+                os.replace(retired, candidate)
+                continue
+            except OSError:
+                pass
+        shutil.rmtree(retired, ignore_errors=True)
+        shutil.rmtree(_lease_dir(candidate), ignore_errors=True)
+
+
+def _link_or_copy(source: Path, target: Path, size: int, report: StagingReport) -> None:
+    try:
+        os.link(source, target)
+    except OSError:
+        try:
+            os.symlink(source, target)
+        except OSError:
+            shutil.copy2(source, target)
+            report.files_copied += 1
+            report.bytes_copied += size
+            return
+    report.files_linked += 1
+    report.bytes_linked += size
+
+
+def stage_strategy_dir(
+    template_dir: Path,
+    target_dir: Path,
+    private_files: frozenset[str] = PRIVATE_FILES,
+) -> StagingReport:
+    """Populate ``target_dir`` from ``template_dir`` without copying immutable files.
+
+    Args:
+        template_dir: Strategy directory to stage (never modified).
+        target_dir: Per-task working directory; created if missing. It keeps
+            the snapshot leased until the directory is removed.
+        private_files: Top-level file names that get a private writable copy.
+
+    Returns:
+        StagingReport with link/copy counters for metrics.
+    """
+    template_dir = Path(template_dir)
+    target_dir = Path(target_dir)
+    fingerprint = fingerprint_template(template_dir)
+    target_dir.mkdir(parents=True, exist_ok=True)
+    snapshot, reused = _ensure_snapshot(template_dir, fingerprint, target_dir)
+    report = StagingReport(fingerprint=fingerprint, snapshot_reused=reused)
+
+    for relative, stat in _iter_template_files(snapshot):
+        source = snapshot / relative
+        target = target_dir / relative
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if target.exists() or target.is_symlink():
+            target.unlink()
+        if len(relative.parts) == 1 and relative.name in private_files:
+            shutil.copy2(source, target)
+            os.chmod(target, stat.st_mode | 0o200)
+            report.files_copied += 1
+            report.bytes_copied += stat.st_size
+        else:
+            _link_or_copy(source, target, stat.st_size, report)
+    return report
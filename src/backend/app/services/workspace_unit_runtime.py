@@ -44,7 +44,13 @@ _UNIT_RUN_PY = textwrap.dedent(
     import yaml
     from backtrader.comminfo import ComminfoFuturesPercent
 
+    try:
+        import bt_bar_cache
+    except ImportError:
+        bt_bar_cache = None
+
     BASE_DIR = Path(__file__).resolve().parent
+    _BAR_CACHE_VARIANT = 'unit-ohlcv-v1'
 
 
     class UnitPandasFeed(bt.feeds.PandasData):
@@ -144,9 +150,7 @@ _UNIT_RUN_PY = textwrap.dedent(
         raise FileNotFoundError(f'No CSV file found for symbol={symbol} under {directory_path}')
 
 
-    def load_dataframe(config: dict) -> tuple[pd.DataFrame, Path]:
-        data = config.get('data') or {}
-        csv_path = resolve_data_file(config)
+    def _read_normalized_csv(csv_path: Path) -> pd.DataFrame:
         df = pd.read_csv(csv_path)
         rename_map = {}
         if 'time' in df.columns and 'datetime' not in df.columns:
@@ -169,30 +173,61 @@ _UNIT_RUN_PY = textwrap.dedent(
             df['openinterest'] = 0.0
         df['datetime'] = pd.to_datetime(df['datetime'], errors='coerce', utc=True)
         df = df.dropna(subset=['datetime'])
+        df = df.sort_values('datetime').drop_duplicates('datetime')
+        df = df[['datetime', 'open', 'high', 'low', 'close', 'volume', 'openinterest']].copy()
+        for column in ('open', 'high', 'low', 'close', 'volume', 'openinterest'):
+            df[column] = pd.to_numeric(df[column], errors='coerce').fillna(0.0)
+        df = df[(df['open'] > 0) & (df['close'] > 0)]
+        return df.set_index('datetime')
+
+
+    def load_dataframe(config: dict) -> tuple[pd.DataFrame, Path]:
+        data = config.get('data') or {}
+        csv_path = resolve_data_file(config)
+        start_ts = None
         start_date = data.get('start_date')
         if start_date:
             start_ts = pd.to_datetime(start_date, errors='coerce', utc=True)
-            if not pd.isna(start_ts):
-                df = df[df['datetime'] >= start_ts]
+            if pd.isna(start_ts):
+                start_ts = None
+        end_ts = None
         if data.get('use_end_date', True):
             end_date = data.get('end_date')
             if end_date:
                 end_ts = pd.to_datetime(end_date, errors='coerce', utc=True)
-                if not pd.isna(end_ts):
-                    df = df[df['datetime'] <= end_ts]
-        df = df.sort_values('datetime').drop_duplicates('datetime')
-        df = df[['datetime', 'open', 'high', 'low', 'close', 'volume', 'openinterest']].copy()
-        for column in ('open', 'high', 'low', 'close', 'volume', 'openinterest'):
-            df[column] = pd.to_numeric(df[column], errors='coerce').fillna(0.0)
-        df = df[(df['open'] > 0) & (df['close'] > 0)]
+                if pd.isna(end_ts):
+                    end_ts = None
         sample_count = _safe_int(data.get('sample_count'), 0)
         bar_count = _safe_int(data.get('bar_count'), 0)
         limit = bar_count if bar_count > 0 else sample_count
-        if limit > 0 and len(df) > limit:
-            df = df.iloc[-limit:]
+        df = None
+        if bt_bar_cache is not None:
+            # Parsed once per CSV version and memory-mapped by every later run.
+            try:
+                df = bt_bar_cache.load_bars(
+                    csv_path,
+                    _read_normalized_csv,
+                    variant=_BAR_CACHE_VARIANT,
+                    start=start_ts,
+                    end=end_ts,
+                    bar_count=limit,
+                )
+            except OSError:
+                df = None
+        if df is None:
+            df = _read_normalized_csv(csv_path)
+            if start_ts is not None:
+                df = df[df.index >= start_ts]
+            if end_ts is not None:
+                df = df[df.index <= end_ts]
+            if limit > 0 and len(df) > limit:
+                df = df.iloc[-limit:]
+        # Optimization rungs score candidates on the first N bars of the range.
+        fidelity = _safe_int(os.environ.get('BACKTRADER_FIDELITY_BARS'), 0)
+        if fidelity > 0 and len(df) > fidelity:
+            df = df.iloc[:fidelity]
         if df.empty:
             raise ValueError(f'No data rows available after filtering for {csv_path}')
-        df = df.set_index('datetime')
         return df, csv_path
 
 
@@ -1,7 +1,9 @@
 """
 Cache decorator for API responses.
 
-Automatically caches API responses to Redis/Memory cache.
+Automatically caches API responses to Redis/Memory cache. Concurrent misses
+are coalesced into one call and expired responses are served stale while
+they are refreshed (see ``app.db.cache.get_or_compute``).
 """
 
 import hashlib
@@ -10,11 +12,15 @@ from collections.abc import Callable
 from functools import wraps
 from typing import Any
 
-from app.db.cache import get_cache
+from app.db.cache import get_cache, get_or_compute
 
 
 def cache_response(
-    ttl: int = 300, key_prefix: str = "api", vary_by_params: list[str] | None = None
+    ttl: int = 300,
+    key_prefix: str = "api",
+    vary_by_params: list[str] | None = None,
+    stale_ttl: int | None = None,
+    negative_ttl: int | None = None,
 ):
     """
     Decorator to cache API responses.
@@ -23,6 +29,10 @@ def cache_response(
         ttl: Time-to-live in seconds (default: 300 = 5 minutes)
         key_prefix: Prefix for cache key (default: "api")
         vary_by_params: List of parameter names to include in cache key
+        stale_ttl: Seconds an expired response may still be served while it
+            is refreshed (default: CACHE_STALE_TTL)
+        negative_ttl: Seconds a ``None`` response is cached (default:
+            CACHE_NEGATIVE_TTL)
     """
 
     def decorator(func: Callable) -> Callable:
@@ -39,20 +49,14 @@ def cache_response(
 
             cache_key = ":".join(key_parts)
 
-            # Try to get from cache
-            cache = get_cache()
-            cached_response = await cache.get(cache_key)
-
-            if cached_response is not None:
-                return cached_response
-
-            # Execute function
-            result = await func(*args, **kwargs)
-
-            # Cache the result
-            await cache.set(cache_key, result, ttl)
-
-            return result
+            return await get_or_compute(
+                get_cache(),
+                cache_key,
+                lambda: func(*args, **kwargs),
+                ttl=ttl,
+                stale_ttl=stale_ttl,
+                negative_ttl=negative_ttl,
+            )
 
         return wrapper
 
@@ -0,0 +1,54 @@
+"""Process-lifetime leases on lock files.
+
+Uvicorn workers share the backend data directory. A lease is an exclusive
+lock on a file that a process keeps until it releases it or exits; the
+operating system drops it when the process dies, so a lease that can be
+taken has no live holder. Locks belong to the open file, so two leases on
+one path conflict even within a process.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+from pathlib import Path
+
+if sys.platform == "win32":
+    import msvcrt
+else:
+    import fcntl
+
+
+class ProcessLease:
+    """Exclusive, non-blocking lease on *path*."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._fd: int | None = None
+
+    @property
+    def held(self) -> bool:
+        return self._fd is not None
+
+    def acquire(self) -> bool:
+        """Take the lease; False while another holder has it."""
+        if self._fd is not None:
+            return True
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_CREAT | os.O_RDWR)
+        try:
+            if sys.platform == "win32":
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+            else:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        self._fd = fd
+        return True
+
+    def release(self) -> None:
+        """Give the lease up (closing the file drops the lock)."""
+        fd, self._fd = self._fd, None
+        if fd is not None:
+            os.close(fd)
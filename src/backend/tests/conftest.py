@@ -20,6 +20,8 @@ from sqlalchemy.pool import StaticPool
 # Ensure test environment configuration (before any app imports)
 os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite://")
 os.environ.setdefault("SQL_ECHO", "false")
+# Backtests in tests run as cold subprocesses unless a test builds its own pool.
+os.environ.setdefault("BACKTEST_WORKER_POOL_SIZE", "0")
 os.environ.setdefault("ADMIN_PASSWORD", "TestAdmin@12345")
 
 importlib.import_module("app.models")
@@ -45,6 +47,7 @@ for module_name in [
     "app.db.session_provider",
     "app.db.sql_repository",
     "app.services.backtest_manager",
+    "app.services.optimization_execution_manager",
 ]:
     importlib.import_module(module_name).async_session_maker = _test_session_maker
 
@@ -0,0 +1,310 @@
+"""
+Shared alert engine tests (timing wheel, batched metric fetch, vectorized checks).
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.models.alerts import AlertType
+from app.services.alert_engine import AlertEngine
+
+
+def _rule(
+    rule_id: str, alert_type=AlertType.ACCOUNT, trigger_type="threshold", updated_at=None, **config
+):
+    return SimpleNamespace(
+        id=rule_id,
+        user_id="u1",
+        is_active=True,
+        alert_type=alert_type,
+        trigger_type=trigger_type,
+        trigger_config=config,
+        triggered_count=0,
+        updated_at=updated_at or datetime(2026, 1, 1, tzinfo=timezone.utc),
+    )
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _RuleRepo:
+    """Alert rule table of the database."""
+
+    def __init__(self) -> None:
+        self.rules: dict[str, SimpleNamespace] = {}
+        self.calls: list[dict] = []
+
+    def store(self, *rules: SimpleNamespace) -> None:
+        for rule in rules:
+            self.rules[rule.id] = rule
+
+    async def list(self, filters=None, skip=0, limit=100, sort_by=None, sort_order="desc"):
+        self.calls.append({"filters": filters, "skip": skip, "limit": limit})
+        filters = filters or {}
+        rules = [
+            rule
+            for rule in self.rules.values()
+            if ("id" not in filters or rule.id in filters["id"])
+            and ("is_active" not in filters or rule.is_active == filters["is_active"])
+        ]
+        if sort_by:
+            rules.sort(key=lambda rule: getattr(rule, sort_by), reverse=sort_order == "desc")
+        return rules[skip : skip + limit]
+
+
+def _engine(clock=None) -> tuple[AlertEngine, SimpleNamespace]:
+    repo = _RuleRepo()
+    monitor = SimpleNamespace(
+        paper_trading_service=SimpleNamespace(
+            get_account=AsyncMock(
+                return_value=SimpleNamespace(current_cash=500.0, total_equity=1500.0)
+            ),
+        ),
+        live_trading_service=SimpleNamespace(get_task_status=AsyncMock(return_value=None)),
+        backtest_service=SimpleNamespace(get_result=AsyncMock(return_value=None)),
+        alert_rule_repo=repo,
+        _trigger_alert=AsyncMock(),
+    )
+    return AlertEngine(monitor, clock=clock or _Clock()), monitor
+
+
+def test_timing_wheel_groups_rules_by_interval():
+    clock = _Clock()
+    engine, _monitor = _engine(clock)
+    account = _rule("a", threshold=1)
+    strategy = _rule("s", alert_type=AlertType.STRATEGY, threshold=1)
+    engine.upsert(account)
+    engine.upsert(strategy)
+
+    # New rules are checked on the next wake-up, then on their slot.
+    assert {r.id for r in engine.take_due(clock.now)} == {"a", "s"}
+    assert engine.take_due(clock.now) == []
+
+    clock.now += 30
+    assert [r.id for r in engine.take_due(clock.now)] == ["a"]
+    clock.now += 30
+    assert {r.id for r in engine.take_due(clock.now)} == {"a", "s"}
+
+    # A late wake-up runs each slot once and realigns it.
+    clock.now += 95
+    assert len(engine.take_due(clock.now)) == 2
+    clock.now += 4
+    assert engine.take_due(clock.now) == []
+
+    engine.remove("a")
+    strategy.is_active = False
+    engine.upsert(strategy)
+    assert engine.rule_count == 0
+    assert engine._next_due() is None
+
+
+@pytest.mark.asyncio
+async def test_rules_on_one_source_share_a_fetch():
+    engine, monitor = _engine()
+    rules = [
+        _rule("cash", account_id="acc", metric="cash", threshold=600, condition="lt"),
+        _rule("equity", account_id="acc", metric="equity", threshold=2000, condition="gt"),
+        _rule("manual", current_value=3, threshold=3, condition="eq"),
+        _rule("no-threshold", account_id="acc"),
+    ]
+    monitor.alert_rule_repo.store(*rules)
+
+    triggered = await engine.evaluate(rules)
+
+    assert triggered == ["cash", "manual"]
+    monitor.paper_trading_service.get_account.assert_awaited_once_with("acc")
+    values = [call.kwargs["trigger_value"] for call in monitor._trigger_alert.await_args_list]
+    assert values == [500.0, 3.0]
+    assert rules[0].triggered_count == 1
+
+
+@pytest.mark.asyncio
+async def test_rate_and_cross_rules_keep_state_between_rounds():
+    engine, monitor = _engine()
+    pct = _rule("pct", trigger_type="rate", account_id="acc", metric="equity", threshold=0.1)
+    absolute = _rule(
+        "abs",
+        trigger_type="rate",
+        account_id="acc",
+        metric="cash",
+        threshold=-50,
+        mode="abs",
+        condition="lt",
+    )
+    cross = _rule("cross", trigger_type="cross", value1=1, value2=0)
+    monitor.alert_rule_repo.store(pct, absolute, cross)
+
+    assert await engine.evaluate([pct, absolute, cross]) == []
+
+    monitor.paper_trading_service.get_account.return_value = SimpleNamespace(
+        current_cash=400.0, total_equity=1800.0
+    )
+    assert await engine.evaluate([pct, absolute]) == ["pct", "abs"]
+
+    cross.trigger_config = {"value1": 0, "value2": 1, "direction": "down"}
+    monitor.alert_rule_repo.store(SimpleNamespace(**vars(cross)))
+    assert await engine.evaluate([cross]) == ["cross"]
+
+
+@pytest.mark.asyncio
+async def test_start_loads_active_rules_and_shutdown_stops_scheduler(tmp_path):
+    engine, monitor = _engine()
+    engine._lease_path = tmp_path / "alert_engine.lock"
+    monitor.alert_rule_repo.store(_rule("a", threshold=1))
+
+    await engine.start()
+    assert engine.running
+    assert engine.rule_count == 1
+    assert monitor.alert_rule_repo.calls == [
+        {"filters": {"is_active": True}, "skip": 0, "limit": 500}
+    ]
+
+    await engine.shutdown()
+    assert not engine.running
+
+
+@pytest.mark.asyncio
+async def test_one_worker_runs_the_engine_and_syncs_rule_changes(tmp_path):
+    engine, monitor = _engine()
+    other, _ = _engine()
+    engine._lease_path = other._lease_path = tmp_path / "alert_engine.lock"
+    repo = monitor.alert_rule_repo
+    old = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    repo.store(_rule("a", account_id="acc", metric="cash", threshold=600, updated_at=old))
+
+    await engine.start()
+    await other.start()
+    try:
+        assert (engine.running, other.running, other.standby) == (True, False, True)
+        other.upsert(_rule("ignored", threshold=1))
+        assert other.rule_count == 0
+
+        # Changes made in other workers: a new rule, one deactivated.
+        now = datetime.now(timezone.utc) + timedelta(seconds=1)
+        repo.store(_rule("b", account_id="acc", metric="cash", threshold=600, updated_at=now))
+        assert await engine.sync_rules() == 1
+        assert await engine.sync_rules() == 0
+        assert engine.rule_count == 2
+
+        repo.rules["a"] = SimpleNamespace(**{**vars(repo.rules["a"]), "is_active": False})
+        # Not synced yet: the stale copy is read again before it fires.
+        rules = list(engine._rules.values())
+        assert await engine.evaluate(rules) == ["b"]
+        assert engine.rule_count == 1
+    finally:
+        await engine.shutdown()
+        await other.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_published_changes_trigger_dependent_rules_without_polling():
+    clock = _Clock()
+    engine, monitor = _engine(clock)
+    equity = _rule("equity", account_id="acc", metric="equity", threshold=2000, condition="gt")
+    monitor.alert_rule_repo.store(equity)
+    engine.upsert(equity)
+    # Event-driven rules stay off the timing wheel.
+    assert engine._next_due() is None
+
+    engine._loop = asyncio.get_running_loop()
+    engine.publish(("paper_account", "other"), object())  # no dependents
+    engine.publish(("paper_account", "acc"), SimpleNamespace(current_cash=1, total_equity=1900))
+    engine.publish(("paper_account", "acc"), SimpleNamespace(current_cash=1, total_equity=2100))
+    await asyncio.sleep(0)
+    assert engine._wakeup.is_set()
+
+    pushed = engine._take_pushed()
+    assert list(pushed) == [("paper_account", "acc")]
+    assert await engine.evaluate(engine._dependent_rules(pushed), pushed) == ["equity"]
+    monitor.paper_trading_service.get_account.assert_not_awaited()
+
+    polled = AlertEngine(monitor, clock=clock, event_driven=False)
+    polled.upsert(equity)
+    assert polled._next_due() == clock.now + 30
+
+
+class _QuoteService:
+    def __init__(self, ready: bool = True) -> None:
+        self.ready = ready
+        self.feeds: list[tuple[str, list[str]]] = []
+
+    def ensure_symbol_feed(self, source: str, symbols: list[str]) -> bool:
+        self.feeds.append((source, symbols))
+        return self.ready
+
+
+@pytest.mark.asyncio
+async def test_quote_ticks_route_to_price_rules(monkeypatch):
+    monkeypatch.setattr("app.services.quote_service.get_quote_service", lambda: _QuoteService())
+    engine, monitor = _engine()
+    engine._loop = asyncio.get_running_loop()
+    above = _rule("above", quote_source="mt5", symbol="EURUSD", threshold=1.2, condition="gt")
+    cross = _rule(
+        "cross", trigger_type="cross", quote_source="MT5", symbol="EURUSD", metric="bid", value2=1.1
+    )
+    monitor.alert_rule_repo.store(above, cross)
+    engine.upsert(above)
+    engine.upsert(cross)
+
+    engine._on_tick("MT5", {"symbol": "EURUSD.a", "price": 1.0, "bid": 1.05})
+    engine._on_tick("MT5", {"symbol": "GBPUSD", "price": 9.0, "bid": 9.0})
+    pushed = engine._take_pushed()
+    assert list(pushed) == [("quote", "MT5", "EURUSD")]
+    assert await engine.evaluate(engine._dependent_rules(pushed), pushed) == []
+
+    engine._on_tick("MT5", {"symbol": "EURUSD.a", "price": 1.25, "bid": 1.15})
+    pushed = engine._take_pushed()
+    triggered = await engine.evaluate(engine._dependent_rules(pushed), pushed)
+    assert sorted(triggered) == ["above", "cross"]
+
+    engine.remove("above")
+    engine.remove("cross")
+    assert engine._quote_routes == {}
+
+
+@pytest.mark.asyncio
+async def test_quote_rules_open_their_feed(monkeypatch):
+    quotes = _QuoteService(ready=False)
+    monkeypatch.setattr("app.services.quote_service.get_quote_service", lambda: quotes)
+    engine, _monitor = _engine()
+    engine._loop = asyncio.get_running_loop()
+
+    engine.upsert(_rule("a", quote_source="mt5", symbol="EURUSD", threshold=1.2))
+    await asyncio.gather(*engine._feed_tasks)
+    assert quotes.feeds == [("MT5", ["EURUSD"])]
+
+    # Gateway not up yet: retried until the feed is ready.
+    quotes.ready = True
+    await engine.ensure_quote_feeds()
+    await engine.ensure_quote_feeds()
+    engine.upsert(_rule("b", quote_source="MT5", symbol="EURUSD", threshold=1.3))
+    await asyncio.gather(*engine._feed_tasks)
+    assert quotes.feeds == [("MT5", ["EURUSD"])] * 2
+
+
+@pytest.mark.asyncio
+async def test_event_driven_rules_fire_once_per_crossing_of_the_threshold():
+    engine, monitor = _engine()
+    engine._loop = asyncio.get_running_loop()
+    equity = _rule("equity", account_id="acc", metric="equity", threshold=2000, condition="gt")
+    monitor.alert_rule_repo.store(equity)
+    engine.upsert(equity)
+    key = ("paper_account", "acc")
+
+    fired = []
+    for value in (2100, 2200, 2300, 1900, 1950, 2050, 2060):
+        fired.append(
+            await engine.evaluate([equity], {key: SimpleNamespace(total_equity=value)})
+            == ["equity"]
+        )
+    assert fired == [True, False, False, False, False, True, False]
+    assert monitor._trigger_alert.await_count == 2
@@ -241,3 +241,28 @@ class TestCalculateIndicators:
         klines = [{"close": float(i)} for i in range(1, 11)]
         indicators = svc.calculate_indicators(klines)
         assert indicators["ma60"] == []
+
+    def test_window_keeps_warm_up_history(self):
+        """Test a window is computed with the bars before it."""
+        klines = [{"date": f"d{i:03d}", "close": float(i)} for i in range(1, 101)]
+        full = svc.calculate_indicators(klines)
+        window = svc.calculate_indicators(klines, 70, 80, cache_key=("backtest", "t-window"))
+        assert set(window) == set(full)
+        for name, values in window.items():
+            assert values == full[name][70:80], name
+        assert window["ma60"][0] == 41.5
+        assert svc.calculate_indicators(klines, 80, 80) == {}
+
+    def test_richer_indicator_set(self):
+        """Test EMA/MACD/Bollinger/RSI/ATR are returned."""
+        klines = [
+            {"close": 10.0 + (i % 7), "high": 11.0 + (i % 7), "low": 9.0 + (i % 7)}
+            for i in range(40)
+        ]
+        indicators = svc.calculate_indicators(klines)
+        for name in ("ema12", "macd", "macd_signal", "boll_upper", "rsi14", "atr14"):
+            assert len(indicators[name]) == 40
+        assert indicators["rsi14"][13] is None
+        assert 0 <= indicators["rsi14"][14] <= 100
+        assert indicators["macd_signal"][32] is None
+        assert indicators["macd_signal"][33] is not None
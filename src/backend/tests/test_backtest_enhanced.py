@@ -1176,7 +1176,9 @@ class TestEnhancedBacktestListSortOrder:
         clear_lru_cache,
     ):
         mock_service = AsyncMock()
-        mock_service.list_results = AsyncMock(return_value=MagicMock(items=[], total=0))
+        mock_service.list_results = AsyncMock(
+            return_value=MagicMock(items=[], total=0, next_cursor=None)
+        )
 
         with patch("app.api.backtest_enhanced.BacktestService", return_value=mock_service):
             resp = await client.get("/api/v1/backtests/?sort_order=asc", headers=auth_headers)
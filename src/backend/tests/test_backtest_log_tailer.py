@@ -0,0 +1,142 @@
+"""
+Live backtest log ingestion tests.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import threading
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.services.backtest_log_tailer import BacktestLogTailer
+from app.services.log_parser_service import parse_log_dir, parse_trade_log, parse_value_log
+
+VALUE_HEADER = "log_time\tdt\tvalue\tcash\n"
+TRADE_HEADER = (
+    "ref\tdtopen\tdtclose\tdata_name\tlong\tsize\tprice\tvalue\tcommission"
+    "\tpnl\tpnlcomm\tbarlen\tisclosed\n"
+)
+
+
+def _append(path: Path, text: str) -> None:
+    with open(path, "a", encoding="utf-8") as handle:
+        handle.write(text)
+
+
+def test_poll_reports_only_complete_new_lines(tmp_path: Path):
+    value_log = tmp_path / "value.log"
+    tailer = BacktestLogTailer(tmp_path, total_bars=4)
+
+    assert tailer.poll().bars == 0
+
+    _append(value_log, VALUE_HEADER + "t\t2024-01-01 00:00:00\t100000.0\t100000.0\nt\t2024-01-0")
+    first = tailer.poll()
+    assert first.bars == 1
+    assert first.equity_points == [["2024-01-01", 100000.0]]
+
+    _append(value_log, "2 00:00:00\t101000.0\t90000.0\n")
+    second = tailer.poll()
+    assert second.equity_points == [["2024-01-02", 101000.0]]
+    assert tailer.progress_fraction() == 0.5
+
+
+def test_finish_matches_full_parse(tmp_path: Path):
+    tailer = BacktestLogTailer(tmp_path)
+    _append(tmp_path / "value.log", VALUE_HEADER + "t\t2024-01-01 00:00:00\t100000.0\t100000.0\n")
+    _append(tmp_path / "trade.log", TRADE_HEADER)
+    tailer.poll()
+
+    _append(tmp_path / "value.log", "t\t2024-01-02 00:00:00\t99000.0\t50000.0")
+    _append(
+        tmp_path / "trade.log",
+        "1\t2024-01-01 00:00:00\t2024-01-02 00:00:00\tAAA\t1\t10\t100\t1000\t1\t5\t4\t1\t1\n",
+    )
+    update = tailer.poll()
+    assert [trade["ref"] for trade in update.trades] == [1]
+
+    sections = tailer.finish()
+
+    assert sections["value"] == parse_value_log(tmp_path)
+    assert sections["trades"] == parse_trade_log(tmp_path)
+    assert parse_log_dir(tmp_path, preparsed=sections) == parse_log_dir(tmp_path)
+
+
+def test_finish_waits_for_an_in_flight_poll(tmp_path: Path):
+    tailer = BacktestLogTailer(tmp_path)
+    _append(tmp_path / "value.log", VALUE_HEADER + "t\t2024-01-01 00:00:00\t100000.0\t100000.0\n")
+    finished: list[dict] = []
+
+    with tailer._lock:  # a poll thread the cancelled tail task left running
+        worker = threading.Thread(target=lambda: finished.append(tailer.finish()))
+        worker.start()
+        worker.join(0.05)
+        assert worker.is_alive()
+    worker.join()
+
+    _append(tmp_path / "value.log", "t\t2024-01-02 00:00:00\t99000.0\t50000.0\n")
+    assert tailer.poll().equity_points == []
+    assert "value" in finished[0]
+    assert tailer.bars == 1
+
+
+def test_json_event_trades_are_paired_on_finish(tmp_path: Path):
+    trade_log = tmp_path / "trade.log"
+    tailer = BacktestLogTailer(tmp_path)
+    events = [
+        {"ref": 7, "datetime": "2024-01-01 00:00:00", "event": "OPEN", "size": 2, "price": 10},
+        {"ref": 7, "datetime": "2024-01-03 00:00:00", "event": "CLOSED", "pnl": 3, "pnlcomm": 2},
+    ]
+    _append(trade_log, json.dumps(events[0]) + "\n")
+    assert tailer.poll().trades == []
+    _append(trade_log, json.dumps(events[1]) + "\n")
+    assert tailer.poll().trades[0]["pnlcomm"] == 2.0
+
+    assert tailer.finish()["trades"] == parse_trade_log(tmp_path)
+
+
+def test_truncated_log_falls_back_to_full_parse(tmp_path: Path):
+    value_log = tmp_path / "value.log"
+    tailer = BacktestLogTailer(tmp_path)
+    _append(value_log, VALUE_HEADER + "t\t2024-01-01 00:00:00\t100000.0\t100000.0\n")
+    tailer.poll()
+
+    value_log.write_text(VALUE_HEADER, encoding="utf-8")
+
+    assert "value" not in tailer.finish()
+
+
+@pytest.mark.asyncio
+async def test_follow_logs_pushes_progress_and_trade_events(tmp_path: Path):
+    from app.services.backtest_service import BacktestService
+
+    svc = BacktestService()
+    tailer = BacktestLogTailer(tmp_path, total_bars=2)
+    _append(tmp_path / "value.log", VALUE_HEADER + "t\t2024-01-01 00:00:00\t100000.0\t1.0\n")
+    _append(
+        tmp_path / "trade.log",
+        TRADE_HEADER
+        + "1\t2024-01-01 00:00:00\t2024-01-01 00:00:00\tAAA\t1\t1\t1\t1\t0\t1\t1\t1\t1\n",
+    )
+
+    with patch("app.services.backtest_service.ws_manager") as mock_ws:
+        mock_ws.send_to_task = AsyncMock()
+        task = asyncio.create_task(svc._follow_logs("t1", tailer, 0.01))
+        for _ in range(200):
+            if mock_ws.send_to_task.await_count >= 2:
+                break
+            await asyncio.sleep(0.01)
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+
+    messages = [call.args[1] for call in mock_ws.send_to_task.await_args_list]
+    progress = next(message for message in messages if message["type"] == "progress")
+    assert progress["progress"] == 54
+    assert progress["data"]["bars"] == 1
+    assert progress["data"]["equity"] == 100000.0
+    assert any(message["type"] == "trade" for message in messages)
@@ -12,7 +12,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 
 from app.models.backtest import BacktestResultModel, BacktestTask
-from app.schemas.backtest import BacktestRequest, BacktestResponse, BacktestResult, TaskStatus
+from app.schemas.backtest import BacktestRequest, BacktestResponse, TaskStatus
 from app.services.backtest_manager import BacktestExecutionManager
 from app.services.backtest_runner import BacktestExecutionRunner
 from app.services.backtest_service import BacktestService
@@ -405,66 +405,90 @@ class TestCancelTask:
 class TestListAndDeleteResults:
     """Result list and deletion tests."""
 
-    async def test_list_results_uses_pagination_and_get_result(self):
-        svc = BacktestService()
-        tasks = [
-            BacktestTask(
+    async def test_list_results_uses_summary_projection(self):
+        task_manager = MagicMock(spec=BacktestExecutionManager)
+        svc = BacktestService(task_manager=task_manager)
+        rows = [
+            MagicMock(
                 id="task1",
-                user_id="user1",
                 strategy_id="s1",
                 symbol="000001.SZ",
                 status=TaskStatus.COMPLETED,
                 request_data={},
-                created_at=datetime(2024, 1, 1),
+                error_message=None,
+                created_at=datetime(2024, 1, 2),
+                result_id="r1",
+                total_return=10.0,
+                annual_return=8.0,
+                sharpe_ratio=1.0,
+                max_drawdown=-5.0,
+                win_rate=50.0,
+                metrics_source="manual",
+                total_trades=50,
+                profitable_trades=25,
+                losing_trades=25,
             ),
-            BacktestTask(
+            MagicMock(
                 id="task2",
-                user_id="user1",
                 strategy_id="s2",
                 symbol="000002.SZ",
-                status=TaskStatus.COMPLETED,
+                status=TaskStatus.PENDING,
                 request_data={},
-                created_at=datetime(2024, 1, 2),
+                error_message=None,
+                created_at=datetime(2024, 1, 1),
+                result_id=None,
             ),
         ]
-        _mock_result = BacktestResult(  # noqa: F841 - created for test fixture reference
-            task_id="task1",
-            strategy_id="s1",
-            symbol="000001.SZ",
-            start_date=datetime(2024, 1, 1),
-            end_date=datetime(2024, 6, 30),
-            status=TaskStatus.COMPLETED,
-            total_return=10.0,
-            annual_return=8.0,
-            sharpe_ratio=1.0,
-            max_drawdown=-5.0,
-            win_rate=50.0,
-            total_trades=50,
-            profitable_trades=25,
-            losing_trades=25,
-            equity_curve=[],
-            equity_dates=[],
-            drawdown_curve=[],
-            trades=[],
-            created_at=datetime(2024, 1, 1),
-            error_message=None,
-            metrics_source="manual",
-        )
+        task_manager.list_result_summaries = AsyncMock(return_value=rows)
+        task_manager.count_user_tasks = AsyncMock(return_value=3)
 
-        with patch.object(svc.task_repo, "list", return_value=tasks) as mock_list:
-            with patch.object(svc.task_repo, "count", return_value=2):
-                with patch.object(svc.result_repo, "list", return_value=[]):
-                    response = await svc.list_results("user1", limit=2, offset=0)
+        response = await svc.list_results("user1", limit=2, offset=0)
 
-        mock_list.assert_awaited_once_with(
-            filters={"user_id": "user1"},
-            skip=0,
+        task_manager.list_result_summaries.assert_awaited_once_with(
+            "user1",
             limit=2,
+            offset=0,
             order_by="created_at",
             order_desc=True,
+            after=None,
+        )
+        assert response.total == 3
+        assert [item.task_id for item in response.items] == ["task1", "task2"]
+        assert response.items[0].total_return == 10.0
+        assert response.items[0].equity_curve == []
+        assert response.items[1].total_trades == 0
+        assert svc._decode_list_cursor(response.next_cursor) == (datetime(2024, 1, 1), "task2")
+
+    async def test_list_results_cursor_skips_count(self):
+        task_manager = MagicMock(spec=BacktestExecutionManager)
+        task_manager.list_result_summaries = AsyncMock(return_value=[])
+        svc = BacktestService(task_manager=task_manager)
+        cursor = svc._encode_list_cursor(datetime(2024, 1, 1), "task2")
+
+        response = await svc.list_results("user1", limit=2, cursor=cursor)
+
+        assert task_manager.list_result_summaries.await_args.kwargs["after"] == (
+            datetime(2024, 1, 1),
+            "task2",
         )
-        assert response.total == 2
-        assert len(response.items) == 2
+        task_manager.count_user_tasks.assert_not_called()
+        assert response.total is None
+        assert response.next_cursor is None
+
+    async def test_list_results_rejects_malformed_cursor(self):
+        svc = BacktestService(task_manager=MagicMock(spec=BacktestExecutionManager))
+
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            await svc.list_results("user1", cursor="not-a-cursor")
+
+    async def test_list_results_rejects_cursor_with_other_sort(self):
+        task_manager = MagicMock(spec=BacktestExecutionManager)
+        svc = BacktestService(task_manager=task_manager)
+        cursor = svc._encode_list_cursor(datetime(2024, 1, 1), "task2")
+
+        with pytest.raises(ValueError, match="sort_by=created_at"):
+            await svc.list_results("user1", sort_by="sharpe_ratio", cursor=cursor)
+        task_manager.list_result_summaries.assert_not_called()
 
     async def test_delete_result_deletes_logs_and_clears_cache(self):
         task_manager = MagicMock(spec=BacktestExecutionManager)
@@ -500,12 +524,11 @@ class TestListAndDeleteResults:
         """Listing results for a user with no tasks returns empty list."""
         svc = BacktestService()
 
-        with patch.object(svc.task_repo, "list", return_value=[]):
-            with patch.object(svc.task_repo, "count", return_value=0):
-                response = await svc.list_results("user1")
+        response = await svc.list_results("user1")
 
         assert response.total == 0
         assert len(response.items) == 0
+        assert response.next_cursor is None
 
 
 @pytest.mark.asyncio
@@ -623,3 +646,95 @@ class TestGetTaskStatusErrorPaths:
         with patch.object(svc.task_repo, "get_by_id", return_value=task):
             result = await svc.get_task_status("task123")
         assert result == TaskStatus.RUNNING
+
+
+@pytest.mark.asyncio
+class TestResultSummaryStorage:
+    """Summary projection, keyset pagination and blob storage against the test DB."""
+
+    async def _seed(self, manager: BacktestExecutionManager) -> list[str]:
+        from app.db.database import async_session_maker
+
+        async with async_session_maker() as session:
+            for i in range(5):
+                session.add(
+                    BacktestTask(
+                        id=f"task{i}",
+                        user_id="user1",
+                        strategy_id="s1",
+                        symbol="000001.SZ",
+                        status=TaskStatus.COMPLETED,
+                        request_data={},
+                        # Two tasks share a timestamp to exercise the id tie-breaker.
+                        created_at=datetime(2024, 1, min(i, 3) + 1),
+                    )
+                )
+            await session.commit()
+        for i in range(4):
+            await manager.create_result(
+                f"task{i}",
+                {"total_return": float(i), "total_trades": i},
+                equity_curve=[100.0, 100.0 + i],
+                equity_dates=["2024-01-01", "2024-01-02"],
+                drawdown_curve=[0.0, 0.0],
+                trades=[],
+            )
+        return ["task4", "task3", "task2", "task1", "task0"]
+
+    async def test_keyset_pages_cover_every_task_once(self):
+        manager = BacktestExecutionManager()
+        expected = await self._seed(manager)
+        svc = BacktestService(task_manager=manager)
+
+        first = await svc.list_results("user1", limit=2)
+        seen = [item.task_id for item in first.items]
+        cursor = first.next_cursor
+        while cursor:
+            page = await svc.list_results("user1", limit=2, cursor=cursor)
+            assert page.total is None
+            seen.extend(item.task_id for item in page.items)
+            cursor = page.next_cursor
+
+        assert first.total == 5
+        assert seen == expected
+        assert all(item.equity_curve == [] for item in first.items)
+
+    async def test_summary_sorts_by_result_metric(self):
+        manager = BacktestExecutionManager()
+        await self._seed(manager)
+
+        rows = await manager.list_result_summaries(
+            "user1", limit=3, order_by="total_return", order_desc=True
+        )
+
+        assert [row.id for row in rows] == ["task3", "task2", "task1"]
+        assert rows[0].total_trades == 3
+
+    async def test_summary_rejects_keyset_for_metric_sort(self):
+        manager = BacktestExecutionManager()
+
+        with pytest.raises(ValueError, match="sort_by=created_at"):
+            await manager.list_result_summaries(
+                "user1", order_by="total_return", after=(datetime(2024, 1, 1), "task2")
+            )
+
+    async def test_blobs_round_trip_and_delete_with_task(self):
+        from sqlalchemy import func, inspect, select
+
+        from app.db.database import async_session_maker
+        from app.models.backtest import BacktestResultBlob
+
+        manager = BacktestExecutionManager()
+        await self._seed(manager)
+
+        stored = await manager.get_result("task2")
+        assert stored.equity_curve == [100.0, 102.0]
+        assert stored.equity_dates == ["2024-01-01", "2024-01-02"]
+        # The pyramid is deferred: result loads do not pull it in.
+        assert "chart_pyramid" in inspect(stored.blob).unloaded
+        assert await manager.get_chart_pyramid("task2") == {"n": 2, "equity_curve": []}
+
+        assert await manager.delete_task_and_result("task2", "user1") is True
+        async with async_session_maker() as session:
+            remaining = await session.execute(select(func.count()).select_from(BacktestResultBlob))
+        assert remaining.scalar() == 3
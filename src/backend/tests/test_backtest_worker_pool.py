@@ -0,0 +1,152 @@
+"""
+Warm backtest worker pool tests.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.services.backtest_runner import BacktestExecutionRunner
+from app.services.backtest_service import BacktestService
+from app.services.backtest_worker_pool import BacktestWorkerPool
+
+
+def _write_strategy(work_dir: Path, body: str, helper: str | None = None) -> Path:
+    work_dir.mkdir(parents=True, exist_ok=True)
+    run_py = work_dir / "run.py"
+    run_py.write_text(body, encoding="utf-8")
+    if helper is not None:
+        (work_dir / "strategy_helper.py").write_text(helper, encoding="utf-8")
+    return run_py
+
+
+@pytest.fixture
+def pool():
+    worker_pool = BacktestWorkerPool(size=1, max_jobs_per_worker=0, max_rss_mb=0)
+    yield worker_pool
+    worker_pool.shutdown()
+
+
+def test_pool_runs_job_and_reuses_worker(tmp_path: Path, pool: BacktestWorkerPool):
+    run_py = _write_strategy(
+        tmp_path / "a",
+        "import os\nprint('log_dir=' + os.environ['BACKTRADER_LOG_DIR'])\n",
+    )
+
+    first = pool.run(run_py, run_py.parent, env={"BACKTRADER_LOG_DIR": "x"}, timeout=60)
+    second = pool.run(run_py, run_py.parent, env={"BACKTRADER_LOG_DIR": "y"}, timeout=60)
+
+    assert first.returncode == 0
+    assert "log_dir=x" in first.stdout
+    assert "log_dir=y" in second.stdout
+    assert first.worker_pid == second.worker_pid
+    stats = pool.get_stats()
+    assert stats["jobs_completed"] == 2
+    assert stats["workers_started"] == 1
+
+
+def test_prewarm_starts_min_workers_for_the_first_job(tmp_path: Path):
+    worker_pool = BacktestWorkerPool(size=3, max_jobs_per_worker=0, max_rss_mb=0, min_workers=2)
+    run_py = _write_strategy(tmp_path / "a", "print('ok')\n")
+    try:
+        assert worker_pool.prewarm() == 2
+        assert worker_pool.prewarm() == 0
+        stats = worker_pool.get_stats()
+        assert (stats["live_workers"], stats["idle_workers"]) == (2, 2)
+
+        result = worker_pool.run(run_py, run_py.parent, timeout=60)
+    finally:
+        worker_pool.shutdown()
+
+    assert result.returncode == 0
+    assert worker_pool.get_stats()["workers_started"] == 2
+
+
+def test_pool_reimports_strategy_modules_per_job(tmp_path: Path, pool: BacktestWorkerPool):
+    body = "from strategy_helper import NAME\nprint(NAME)\n"
+    run_a = _write_strategy(tmp_path / "a", body, helper="NAME = 'alpha'\n")
+    run_b = _write_strategy(tmp_path / "b", body, helper="NAME = 'beta'\n")
+
+    first = pool.run(run_a, run_a.parent, sys_path=[str(run_a.parent)], timeout=60)
+    second = pool.run(run_b, run_b.parent, sys_path=[str(run_b.parent)], timeout=60)
+
+    assert first.stdout.strip() == "alpha"
+    assert second.stdout.strip() == "beta"
+
+
+def test_pool_reports_failures_and_exit_codes(tmp_path: Path, pool: BacktestWorkerPool):
+    failing = _write_strategy(tmp_path / "fail", "raise ValueError('bad config')\n")
+    exiting = _write_strategy(tmp_path / "exit", "import sys\nsys.exit(3)\n")
+
+    failed = pool.run(failing, failing.parent, timeout=60)
+    exited = pool.run(exiting, exiting.parent, timeout=60)
+
+    assert failed.returncode == 1
+    assert "ValueError: bad config" in failed.stderr
+    assert exited.returncode == 3
+
+
+def test_pool_recycles_worker_after_max_jobs(tmp_path: Path):
+    worker_pool = BacktestWorkerPool(size=1, max_jobs_per_worker=1, max_rss_mb=0)
+    run_py = _write_strategy(tmp_path / "a", "print('ok')\n")
+    try:
+        first = worker_pool.run(run_py, run_py.parent, timeout=60)
+        second = worker_pool.run(run_py, run_py.parent, timeout=60)
+    finally:
+        worker_pool.shutdown()
+
+    assert first.worker_pid != second.worker_pid
+    assert worker_pool.get_stats()["recycle_reasons"]["max_jobs"] >= 1
+
+
+def test_killing_worker_aborts_job_and_replaces_worker(tmp_path: Path, pool: BacktestWorkerPool):
+    slow = _write_strategy(tmp_path / "slow", "import time\ntime.sleep(30)\n")
+    fast = _write_strategy(tmp_path / "fast", "print('ok')\n")
+    handles = []
+
+    def _kill_soon(proc):
+        handles.append(proc)
+        threading.Timer(0.5, proc.kill).start()
+
+    started = time.monotonic()
+    aborted = pool.run(slow, slow.parent, timeout=60, on_start=_kill_soon)
+    assert time.monotonic() - started < 20
+    assert aborted.returncode != 0
+
+    recovered = pool.run(fast, fast.parent, timeout=60)
+    assert recovered.returncode == 0
+    assert recovered.worker_pid != handles[0].pid
+
+
+@pytest.mark.asyncio
+async def test_service_routes_through_worker_pool_and_registers_handle(tmp_path: Path):
+    pool_mock = MagicMock(spec=BacktestWorkerPool)
+
+    def _fake_run(run_py, cwd, **kwargs):
+        kwargs["on_start"]("proc-handle")
+        kwargs["on_finish"]()
+        result = MagicMock(returncode=0, stdout="done", stderr="")
+        result.queue_wait_seconds = 0.0
+        result.run_seconds = 0.1
+        return result
+
+    pool_mock.run.side_effect = _fake_run
+    task_runner = MagicMock(spec=BacktestExecutionRunner)
+    svc = BacktestService(task_runner=task_runner, worker_pool=pool_mock)
+    (tmp_path / "run.py").write_text("print('x')\n", encoding="utf-8")
+
+    with patch("app.config.get_settings") as mock_settings:
+        mock_settings.return_value = MagicMock(BACKTEST_TIMEOUT=60)
+        result = await svc._run_strategy_subprocess(tmp_path, task_id="task123", fidelity_bars=250)
+
+    assert result == {"stdout": "done", "stderr": ""}
+    task_runner.register_process.assert_called_once_with("task123", "proc-handle")
+    task_runner.unregister_process.assert_called_once_with("task123")
+    env = pool_mock.run.call_args.kwargs["env"]
+    assert env["BACKTRADER_LOG_DIR"].endswith("logs/task_task123")
+    assert env["BACKTRADER_FIDELITY_BARS"] == "250"
@@ -0,0 +1,257 @@
+"""
+Tick-to-bar aggregation tests (seeding, incremental bars, chart serving).
+"""
+
+import asyncio
+import json
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.bar_aggregator import (
+    BarAggregator,
+    bar_start,
+    bar_time,
+    parse_source_timezones,
+)
+from app.services.quote_service import QuoteService, _ZmqTickReceiver
+from app.services.quote_stream_hub import QuoteStreamClient, QuoteStreamHub
+
+
+def _ts(text: str) -> float:
+    return datetime.fromisoformat(text).replace(tzinfo=timezone.utc).timestamp()
+
+
+def _gateway_bars() -> list[dict]:
+    return [
+        {"date": "2024-01-02 10:00:00", "open": 1, "high": 2, "low": 1, "close": 2, "volume": 5},
+        {"date": "2024-01-02 10:01:00", "open": 2, "high": 3, "low": 2, "close": 3, "volume": 7},
+    ]
+
+
+def _receiver(ticks: list[dict]) -> _ZmqTickReceiver:
+    receiver = _ZmqTickReceiver("MT5", "tcp://127.0.0.1:1", history_size=64)
+    _feed(receiver, ticks)
+    return receiver
+
+
+def _feed(receiver: _ZmqTickReceiver, ticks: list[dict]) -> None:
+    frames = [json.dumps(tick).encode() for tick in ticks]
+    receiver._drain_batch(lambda: frames.pop(0) if frames else None)
+
+
+def _tick(at: str, price: float, volume: float, symbol: str = "EURUSD") -> dict:
+    return {"symbol": symbol, "timestamp": _ts(at), "price": price, "volume": volume}
+
+
+class TestBarAggregator:
+    def test_ticks_extend_seeded_history(self):
+        aggregator = BarAggregator(capacity=10)
+        updates = []
+        aggregator.add_listener(lambda *args: updates.append(args))
+        assert aggregator.seed("MT5", "EURUSD", "M1", _gateway_bars(), 200)
+
+        receiver = _receiver([])
+        aggregator.bind("MT5", "EURUSD", "M1", "EURUSD", 0)
+        _feed(
+            receiver,
+            [
+                _tick("2024-01-02 10:01:20", 3.5, 100),
+                _tick("2024-01-02 10:01:40", 1.5, 103),
+                _tick("2024-01-02 10:00:59", 9.0, 104),  # late: ignored
+                _tick("2024-01-02 10:02:05", 2.5, 110),
+            ],
+        )
+        aggregator.ingest("MT5", "EURUSD", receiver)
+
+        bars = aggregator.chart("MT5", "EURUSD", "M1", 200)["bars"]
+        assert [b["date"] for b in bars] == [
+            "2024-01-02 10:00:00",
+            "2024-01-02 10:01:00",
+            "2024-01-02 10:02:00",
+        ]
+        assert bars[1] == {
+            "date": "2024-01-02 10:01:00",
+            "open": 2.0,
+            "high": 3.5,
+            "low": 1.5,
+            "close": 1.5,
+            "volume": 7 + 3,
+        }
+        assert (bars[2]["open"], bars[2]["close"], bars[2]["volume"]) == (2.5, 2.5, 6)
+        assert [(u[2], u[3]["date"]) for u in updates] == [("M1", "2024-01-02 10:02:00")]
+
+    def test_one_feed_drives_several_timeframes(self):
+        aggregator = BarAggregator()
+        receiver = _receiver([_tick("2024-01-02 09:59:00", 1.0, 0)])
+        for timeframe in ("M1", "M5"):
+            aggregator.seed("MT5", "EURUSD", timeframe, [], 100)
+            aggregator.bind("MT5", "EURUSD", timeframe, "EURUSD", 1)
+
+        _feed(
+            receiver,
+            [_tick("2024-01-02 10:00:10", 1.1, 1), _tick("2024-01-02 10:03:00", 1.3, 2)],
+        )
+        aggregator.ingest("MT5", "EURUSD", receiver)
+
+        assert aggregator.chart("MT5", "EURUSD", "M1", 100)["total"] == 2
+        (m5,) = aggregator.chart("MT5", "EURUSD", "M5", 100)["bars"]
+        assert (m5["date"], m5["open"], m5["high"], m5["close"]) == (
+            "2024-01-02 10:00:00",
+            1.1,
+            1.3,
+            1.3,
+        )
+
+    def test_reseed_keeps_tick_built_bars_and_rejects_unknown_dates(self):
+        aggregator = BarAggregator()
+        aggregator.seed("MT5", "EURUSD", "M1", _gateway_bars()[:1], 1)
+        receiver = _receiver([])
+        aggregator.bind("MT5", "EURUSD", "M1", "EURUSD", 0)
+        _feed(receiver, [_tick("2024-01-02 10:05:00", 4.0, 0)])
+        aggregator.ingest("MT5", "EURUSD", receiver)
+
+        assert aggregator.seed("MT5", "EURUSD", "M1", _gateway_bars(), 2)
+        dates = [b["date"][-8:] for b in aggregator.chart("MT5", "EURUSD", "M1", 10)["bars"]]
+        assert dates == ["10:00:00", "10:01:00", "10:05:00"]
+        assert aggregator.tick_key("MT5", "EURUSD", "M1") == "EURUSD"
+
+        assert not aggregator.seed("MT5", "EURUSD", "M1", [{"date": "2024.01.02 10:00"}], 5)
+        assert not aggregator.has_series("MT5", "EURUSD", "M1", 5)
+
+    def test_rolling_capacity(self):
+        aggregator = BarAggregator(capacity=3)
+        bars = [
+            {"date": 1_704_189_600 + 60 * i, "open": i, "high": i, "low": i, "close": i}
+            for i in range(10)
+        ]
+        aggregator.seed("MT5", "EURUSD", "M1", bars, 3)
+
+        assert [b["close"] for b in aggregator.chart("MT5", "EURUSD", "M1", 3)["bars"]] == [
+            7.0,
+            8.0,
+            9.0,
+        ]
+
+    def test_bar_time_formats(self):
+        assert bar_time("2024-01-02T10:00:00Z") == _ts("2024-01-02 10:00:00")
+        assert bar_time(1_704_189_600_000) == 1_704_189_600.0
+        assert bar_time("") is None
+
+
+def test_chart_requests_are_served_from_memory(monkeypatch):
+    QuoteService._instance = None
+    service = QuoteService()
+    # Gateway bars are MT5 server time (EET): 10:01 there is 08:01 UTC.
+    receiver = _receiver([_tick("2024-01-02 08:01:00", 3.0, 50, symbol="EURUSD.a")])
+    service._receivers = {"MT5": receiver}
+    service._subscribed_symbols = {"MT5": {"EURUSD"}}
+    receiver.add_listener(service._feed_bars)
+
+    commands = []
+
+    def fake_command(endpoint, command, payload, **kwargs):
+        commands.append(command)
+        return [dict(bar, datetime=bar.pop("date")) for bar in _gateway_bars()]
+
+    config = SimpleNamespace(command_endpoint="tcp://127.0.0.1:5555")
+    monkeypatch.setattr(service, "_get_live_trading_manager", lambda: None)
+    monkeypatch.setattr(service, "_find_gateway_config", lambda mgr, source: config)
+    monkeypatch.setattr(service, "_send_gateway_command", fake_command)
+
+    first = service.get_chart_data("MT5", "EURUSD", "M1", 200)
+    assert first["total"] == 2
+
+    _feed(receiver, [_tick("2024-01-02 08:02:30", 3.2, 60, symbol="EURUSD.a")])
+    second = service.get_chart_data("MT5", "EURUSD", "M1", 100)
+
+    assert commands == ["get_bars"]
+    assert second["bars"][-1]["date"] == "2024-01-02 10:02:00"
+    assert second["bars"][-1]["close"] == 3.2
+
+    passthrough = service.get_chart_data("MT5", "EURUSD", "W1", 100)
+    assert passthrough["total"] == 2
+    assert commands == ["get_bars", "get_bars"]
+
+
+@pytest.mark.asyncio
+async def test_forming_bar_updates_are_pushed():
+    hub = QuoteStreamHub()
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    client = QuoteStreamClient(send, max_rate=0)
+    chart = {"source": "MT5", "symbol": "EURUSD", "timeframe": "M1", "bars": [], "total": 0}
+    hub.subscribe_bars(client, chart)
+    hub.publish_bar("MT5", "EURUSD", "M5", {"close": 0.0})  # not subscribed
+    for close in (1.0, 2.0):
+        hub.publish_bar("MT5", "EURUSD", "M1", {"close": close})
+
+    writer = asyncio.create_task(client.run())
+    for _ in range(5):
+        await asyncio.sleep(0)
+    writer.cancel()
+
+    assert [m["type"] for m in sent] == ["bars", "bar"]
+    assert sent[1]["bar"] == {"close": 2.0}
+
+    hub.disconnect(client)
+    assert not client.bar_subscriptions
+    hub.publish_bar("MT5", "EURUSD", "M1", {"close": 3.0})
+    assert client.pending == 0
+
+
+def test_naive_server_time_bars_are_read_in_the_source_zone():
+    zones = parse_source_timezones("mt5=+2, CTP=Asia/Shanghai, BAD=Nowhere/Zone")
+    assert set(zones) == {"MT5", "CTP"}
+    aggregator = BarAggregator(source_timezones=zones)
+    # MT5 server time 12:01 is 10:01 UTC.
+    server_bars = [dict(bar, date=bar["date"].replace("10:", "12:")) for bar in _gateway_bars()]
+    aggregator.seed("MT5", "EURUSD", "M1", server_bars, 200)
+    receiver = _receiver([])
+    aggregator.bind("MT5", "EURUSD", "M1", "EURUSD", 0)
+    _feed(receiver, [_tick("2024-01-02 10:01:30", 4.0, 0), _tick("2024-01-02 10:02:10", 5.0, 0)])
+    aggregator.ingest("MT5", "EURUSD", receiver)
+
+    bars = aggregator.chart("MT5", "EURUSD", "M1", 200)["bars"]
+    # Labelled in server time, like the gateway's own bars.
+    assert [(b["date"][-8:], b["close"]) for b in bars] == [
+        ("12:00:00", 2.0),
+        ("12:01:00", 4.0),
+        ("12:02:00", 5.0),
+    ]
+    assert bar_time(1_704_189_600, zones["MT5"]) == 1_704_189_600 - 7200
+
+
+def test_daily_and_h4_bars_follow_the_server_day():
+    zones = parse_source_timezones("MT5=Europe/Athens")
+    aggregator = BarAggregator(source_timezones=zones)
+    daily = [
+        {"date": "2024-01-02 00:00:00", "open": 1, "high": 2, "low": 1, "close": 2, "volume": 0},
+        {"date": "2024-01-03 00:00:00", "open": 2, "high": 3, "low": 2, "close": 3, "volume": 0},
+    ]
+    aggregator.seed("MT5", "EURUSD", "D1", daily, 200)
+    aggregator.seed("MT5", "EURUSD", "H4", [dict(daily[1], date="2024-01-03 20:00:00")], 200)
+    receiver = _receiver([])
+    aggregator.bind("MT5", "EURUSD", "D1", "EURUSD", 0)
+    aggregator.bind("MT5", "EURUSD", "H4", "EURUSD", 0)
+    # 23:30 and 00:10 server time (EET, UTC+2).
+    _feed(receiver, [_tick("2024-01-03 21:30:00", 4.0, 0), _tick("2024-01-03 22:10:00", 5.0, 0)])
+    aggregator.ingest("MT5", "EURUSD", receiver)
+
+    bars = aggregator.chart("MT5", "EURUSD", "D1", 200)["bars"]
+    assert [(b["date"], b["close"]) for b in bars] == [
+        ("2024-01-02 00:00:00", 2.0),
+        ("2024-01-03 00:00:00", 4.0),
+        ("2024-01-04 00:00:00", 5.0),
+    ]
+    bars = aggregator.chart("MT5", "EURUSD", "H4", 200)["bars"]
+    assert [(b["date"], b["close"]) for b in bars] == [
+        ("2024-01-03 20:00:00", 4.0),
+        ("2024-01-04 00:00:00", 5.0),
+    ]
+    # Summer time (EEST, UTC+3): the server day starts at 21:00 UTC.
+    assert bar_start(_ts("2024-07-01 21:30:00"), 86400, zones["MT5"]) == _ts("2024-07-01 21:00:00")
@@ -0,0 +1,92 @@
+"""
+Shared columnar bar cache tests.
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.runtime_lib import bt_bar_cache
+
+
+def _write_csv(path: Path, rows: int = 10) -> Path:
+    times = pd.date_range("2024-01-01", periods=rows, freq="D", tz="UTC")
+    frame = pd.DataFrame(
+        {
+            "datetime": times.strftime("%Y-%m-%d %H:%M:%S"),
+            "open": np.arange(rows, dtype=float) + 1,
+            "close": np.arange(rows, dtype=float) + 2,
+        }
+    )
+    frame.to_csv(path, index=False)
+    return path
+
+
+class _CountingReader:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def __call__(self, path: Path) -> pd.DataFrame:
+        self.calls += 1
+        df = pd.read_csv(path)
+        df["datetime"] = pd.to_datetime(df["datetime"], utc=True)
+        return df.set_index("datetime")
+
+
+@pytest.fixture
+def cache_root(tmp_path: Path, monkeypatch) -> Path:
+    root = tmp_path / "bar_cache"
+    monkeypatch.setenv(bt_bar_cache.CACHE_DIR_ENV, str(root))
+    return root
+
+
+def test_csv_is_parsed_once_and_served_from_cache(tmp_path: Path, cache_root: Path):
+    csv_path = _write_csv(tmp_path / "AAA.csv")
+    reader = _CountingReader()
+
+    first = bt_bar_cache.load_bars(csv_path, reader, variant="v1")
+    second = bt_bar_cache.load_bars(csv_path, reader, variant="v1")
+
+    assert reader.calls == 1
+    pd.testing.assert_frame_equal(first, second)
+    assert str(first.index.tz) == "UTC"
+    assert first["open"].tolist() == [float(i) for i in range(1, 11)]
+    assert len(list(cache_root.iterdir())) == 1
+
+
+def test_date_window_and_bar_count_slice(tmp_path: Path, cache_root: Path):
+    csv_path = _write_csv(tmp_path / "AAA.csv")
+    reader = _CountingReader()
+
+    window = bt_bar_cache.load_bars(
+        csv_path,
+        reader,
+        start=pd.Timestamp("2024-01-03", tz="UTC"),
+        end=pd.Timestamp("2024-01-07", tz="UTC"),
+    )
+    assert window.index[0] == pd.Timestamp("2024-01-03", tz="UTC")
+    assert window.index[-1] == pd.Timestamp("2024-01-07", tz="UTC")
+
+    tail = bt_bar_cache.load_bars(csv_path, reader, end="2024-01-07", bar_count=2)
+    assert tail["open"].tolist() == [6.0, 7.0]
+    assert reader.calls == 1
+
+
+def test_modified_source_or_variant_invalidates_entry(tmp_path: Path, cache_root: Path):
+    csv_path = _write_csv(tmp_path / "AAA.csv")
+    reader = _CountingReader()
+    bt_bar_cache.load_bars(csv_path, reader)
+
+    _write_csv(csv_path, rows=12)
+    stat = csv_path.stat()
+    os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    refreshed = bt_bar_cache.load_bars(csv_path, reader)
+    bt_bar_cache.load_bars(csv_path, reader, variant="other")
+
+    assert len(refreshed) == 12
+    assert reader.calls == 3
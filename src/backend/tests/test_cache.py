@@ -1,6 +1,6 @@
 """Cache layer tests."""
 
-from datetime import datetime, timedelta
+import time
 
 import pytest
 
@@ -11,7 +11,6 @@ from app.db.cache import MemoryCache, get_cache
 def cache():
     """Provide a clean MemoryCache instance for each test."""
     instance = MemoryCache()
-    instance._cache.clear()
     instance._hits = 0
     instance._misses = 0
     return instance
@@ -49,11 +48,8 @@ class TestMemoryCache:
         assert await cache.get("b") is None
 
     async def test_ttl_expiry(self, cache: MemoryCache):
-        # Set with immediate expiry
-        cache._cache["expired"] = {
-            "value": "old",
-            "expire_at": datetime.now() - timedelta(seconds=1),
-        }
+        await cache.set("expired", "old", ttl=60)
+        cache._shard("expired").index["expired"].expire_at = time.monotonic() - 1
         assert await cache.get("expired") is None
 
     async def test_set_no_ttl(self, cache: MemoryCache):
@@ -68,6 +64,8 @@ class TestMemoryCache:
         assert stats["hits"] == 1
         assert stats["misses"] == 1
         assert stats["entries"] == 1
+        assert stats["bytes"] > 0
+        assert stats["namespaces"]["default"]["entries"] == 1
         assert stats["type"] == "memory"
 
     async def test_concurrent_access(self, cache: MemoryCache):
@@ -1,6 +1,6 @@
 import asyncio
 import json
-from datetime import datetime, timedelta
+import time
 from types import SimpleNamespace
 
 import pytest
@@ -10,51 +10,70 @@ import pytest
 async def test_memory_cache_cleanup_expired_entries():
     from app.db.cache import MemoryCache
 
-    cache = MemoryCache()
-    cache._cache.clear()
+    cache = MemoryCache(shards=1)
+    shard = cache._shard("expired")
 
+    await cache.set("expired", 1, ttl=60)
+    shard.index["expired"].expire_at = time.monotonic() - 1
     # Force cleanup to run by making last cleanup "old enough".
-    cache._last_cleanup = datetime.now() - timedelta(seconds=cache.CLEANUP_INTERVAL + 1)
-    cache._cache["expired"] = {"value": 1, "expire_at": datetime.now() - timedelta(seconds=1)}
+    shard.last_cleanup = time.monotonic() - cache.CLEANUP_INTERVAL - 1
 
     await cache.set("k", "v", ttl=60)
-    assert "expired" not in cache._cache
+    assert "expired" not in shard.index
+    assert shard.used_bytes == shard.index["k"].size
 
 
 @pytest.mark.asyncio
-async def test_memory_cache_max_entries_eviction(monkeypatch):
+async def test_memory_cache_evicts_by_bytes_not_entry_count():
     from app.db.cache import MemoryCache
 
-    cache = MemoryCache()
-    cache._cache.clear()
-    monkeypatch.setattr(cache, "MAX_ENTRIES", 2, raising=True)
-
-    await cache.set("k1", 1, ttl=60)
-    await cache.set("k2", 2, ttl=60)
-    await cache.set("k3", 3, ttl=60)
+    cache = MemoryCache(max_bytes=20_000, shards=1, namespace_quotas={})
+    for i in range(200):
+        await cache.set(f"small{i}", i, ttl=60)
+    await cache.set("big", "x" * 15_000, ttl=60)
+    await cache.set("huge", "x" * 50_000, ttl=60)
 
-    # Oldest should be evicted.
-    assert await cache.get("k1") is None
-    assert await cache.get("k2") == 2
-    assert await cache.get("k3") == 3
+    stats = await cache.get_stats()
+    assert stats["bytes"] <= 20_000
+    assert await cache.get("huge") is None
+    assert stats["rejections"] >= 1
 
 
 @pytest.mark.asyncio
-async def test_memory_cache_get_refreshes_lru(monkeypatch):
+async def test_memory_cache_admission_keeps_frequently_read_keys():
     from app.db.cache import MemoryCache
 
-    cache = MemoryCache()
-    cache._cache.clear()
-    monkeypatch.setattr(cache, "MAX_ENTRIES", 2, raising=True)
+    cache = MemoryCache(max_bytes=10_000, shards=1, namespace_quotas={})
+    for i in range(40):
+        await cache.set(f"hot{i}", "v" * 100, ttl=60)
+    for _ in range(5):
+        for i in range(40):
+            assert await cache.get(f"hot{i}") is not None
+
+    # A scan of one-off keys must not flush the popular ones.
+    for i in range(500):
+        await cache.set(f"scan{i}", "v" * 100, ttl=60)
+
+    hot_hits = [await cache.get(f"hot{i}") is not None for i in range(40)]
+    assert sum(hot_hits) >= 35
+
+
+@pytest.mark.asyncio
+async def test_memory_cache_namespace_quota_isolates_backtest_results():
+    from app.db.cache import MemoryCache
 
-    await cache.set("k1", 1, ttl=60)
-    await cache.set("k2", 2, ttl=60)
-    assert await cache.get("k1") == 1
-    await cache.set("k3", 3, ttl=60)
+    cache = MemoryCache(max_bytes=40_000, shards=2, namespace_quotas={"backtest:result": 0.5})
+    await cache.set("auth:user:1", {"id": 1}, ttl=60)
+    await cache.set("strategy:s1", {"name": "s1"}, ttl=60)
+    for i in range(50):
+        await cache.set(f"backtest:result:{i}", {"curve": [1.0] * 400}, ttl=60)
 
-    assert await cache.get("k1") == 1
-    assert await cache.get("k2") is None
-    assert await cache.get("k3") == 3
+    assert await cache.get("auth:user:1") == {"id": 1}
+    assert await cache.get("strategy:s1") == {"name": "s1"}
+    stats = await cache.get_stats()
+    assert stats["namespaces"]["backtest:result"]["bytes"] <= 20_000
+    assert stats["namespaces"]["default"]["entries"] == 2
+    assert stats["evictions"] + stats["rejections"] > 0
 
 
 @pytest.mark.asyncio
@@ -62,7 +81,6 @@ async def test_memory_cache_concurrent_access_keeps_consistent_state():
     from app.db.cache import MemoryCache
 
     cache = MemoryCache()
-    cache._cache.clear()
 
     async def worker(index: int):
         key = f"k{index % 5}"
@@ -72,7 +90,9 @@ async def test_memory_cache_concurrent_access_keeps_consistent_state():
 
     await asyncio.gather(*(worker(index) for index in range(50)))
 
-    assert len(cache._cache) <= cache.MAX_ENTRIES
+    stats = await cache.get_stats()
+    assert stats["entries"] == 5
+    assert stats["bytes"] == sum(shard.used_bytes for shard in cache._all_shards())
 
 
 @pytest.mark.asyncio
@@ -141,3 +161,164 @@ def test_get_cache_uses_redis_when_configured(monkeypatch):
 
     # Restore original singleton to prevent leaking into other tests
     cache_module._cache_instance = original_instance
+
+
+@pytest.mark.asyncio
+async def test_get_or_compute_coalesces_concurrent_misses():
+    from app.db.cache import MemoryCache, get_or_compute
+
+    cache = MemoryCache()
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"n": calls}
+
+    results = await asyncio.gather(
+        *(get_or_compute(cache, "coalesce", compute, ttl=60) for _ in range(20))
+    )
+
+    assert calls == 1
+    assert results == [{"n": 1}] * 20
+    assert await cache.acquire_lock("coalesce", 5) is not None
+
+
+@pytest.mark.asyncio
+async def test_get_or_compute_serves_stale_and_refreshes_in_background(monkeypatch):
+    import app.db.cache as cache_module
+
+    cache = cache_module.MemoryCache()
+    values = iter(["old", "new"])
+
+    async def compute():
+        return next(values)
+
+    assert await cache_module.get_or_compute(cache, "swr", compute, ttl=60, stale_ttl=60) == "old"
+
+    real_time = cache_module.time.time
+    monkeypatch.setattr(cache_module.time, "time", lambda: real_time() + 120)
+    assert await cache_module.get_or_compute(cache, "swr", compute, ttl=60, stale_ttl=60) == "old"
+
+    await asyncio.gather(*cache_module._background_refreshes)
+    assert await cache_module.get_or_compute(cache, "swr", compute, ttl=60, stale_ttl=60) == "new"
+
+
+@pytest.mark.asyncio
+async def test_get_or_compute_caches_none_and_honours_predicates():
+    from app.db.cache import MemoryCache, get_or_compute
+
+    cache = MemoryCache()
+    calls = []
+
+    async def missing():
+        calls.append("missing")
+        return None
+
+    assert await get_or_compute(cache, "neg", missing, ttl=60, negative_ttl=30) is None
+    assert await get_or_compute(cache, "neg", missing, ttl=60, negative_ttl=30) is None
+    assert calls == ["missing"]
+
+    async def running():
+        calls.append("running")
+        return {"status": "running"}
+
+    await get_or_compute(cache, "skip", running, ttl=60, cache_if=lambda v: False)
+    assert await cache.get("skip") is None
+
+    await cache.set("invalid", {"status": "stale"}, 60)
+    value = await get_or_compute(
+        cache, "invalid", running, ttl=60, is_valid=lambda v: v["status"] != "stale"
+    )
+    assert value == {"status": "running"}
+
+
+@pytest.mark.asyncio
+async def test_get_or_compute_waits_for_lock_held_elsewhere(monkeypatch):
+    import app.db.cache as cache_module
+
+    cache = cache_module.MemoryCache()
+    monkeypatch.setattr(cache_module, "_LOCK_POLL_INTERVAL", 0.001)
+    token = await cache.acquire_lock("remote", 30)
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        return "local"
+
+    async def other_process():
+        await asyncio.sleep(0.01)
+        await cache.set("remote", cache_module._pack_entry("remote", 60), 60)
+        await cache.release_lock("remote", token)
+
+    value, _ = await asyncio.gather(
+        cache_module.get_or_compute(cache, "remote", compute, ttl=60), other_process()
+    )
+
+    assert value == "remote"
+    assert calls == 0
+
+
+@pytest.mark.asyncio
+async def test_redis_cache_lock_uses_set_nx_and_token_checked_release(monkeypatch):
+    from app.db.cache import RedisCache
+
+    store: dict[str, str] = {}
+
+    class FakeRedis:
+        async def set(self, key, value, nx=False, ex=None):
+            if nx and key in store:
+                return None
+            store[key] = value
+            return True
+
+        async def eval(self, script, numkeys, key, token):
+            if store.get(key) == token:
+                del store[key]
+                return 1
+            return 0
+
+    import redis.asyncio as redis_asyncio
+
+    monkeypatch.setattr(
+        redis_asyncio, "from_url", lambda *_args, **_kwargs: FakeRedis(), raising=True
+    )
+
+    cache = RedisCache("redis://localhost:6379/0")
+    token = await cache.acquire_lock("k", 10)
+    assert token is not None
+    assert await cache.acquire_lock("k", 10) is None
+    assert await cache.release_lock("k", "someone-else") is False
+    assert await cache.release_lock("k", token) is True
+    assert await cache.acquire_lock("k", 10) is not None
+
+
+@pytest.mark.asyncio
+async def test_get_or_compute_survives_cancelling_the_first_caller():
+    from app.db.cache import MemoryCache, get_or_compute
+
+    cache = MemoryCache()
+    calls = 0
+    release = asyncio.Event()
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return "value"
+
+    leader = asyncio.create_task(get_or_compute(cache, "cancel", compute, ttl=60))
+    await asyncio.sleep(0)
+    waiters = [
+        asyncio.create_task(get_or_compute(cache, "cancel", compute, ttl=60)) for _ in range(3)
+    ]
+    await asyncio.sleep(0)
+    leader.cancel()
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*waiters) == ["value"] * 3
+    assert leader.cancelled()
+    assert calls == 1
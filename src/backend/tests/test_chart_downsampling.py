@@ -0,0 +1,209 @@
+"""
+Chart downsampling tests (LTTB, pyramid, OHLC buckets) and endpoint wiring.
+"""
+
+import math
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.api import analytics as analytics_api
+from app.services.analytics_service import AnalyticsService
+from app.services.chart_downsampling import (
+    build_lttb_pyramid,
+    clamp_max_points,
+    date_window,
+    lttb_indices,
+    merge_ohlc,
+    minmax_indices,
+    ohlc_buckets,
+    select_series_indices,
+)
+
+
+def _wave(n: int) -> list[float]:
+    return [100 + 10 * math.sin(i / 50) + (25 if i == n // 3 else 0) for i in range(n)]
+
+
+class TestLttb:
+    def test_keeps_endpoints_and_budget(self):
+        values = _wave(10_000)
+        indices = lttb_indices(values, 300)
+
+        assert len(indices) == 300
+        assert indices[0] == 0
+        assert indices[-1] == len(values) - 1
+        assert indices == sorted(set(indices))
+
+    def test_keeps_spike(self):
+        values = _wave(10_000)
+        assert len(values) // 3 in lttb_indices(values, 200)
+
+    def test_short_series_is_returned_unchanged(self):
+        assert lttb_indices([1.0, 2.0, 3.0], 10) == [0, 1, 2]
+
+    def test_samples_from_candidates(self):
+        values = _wave(1000)
+        candidates = list(range(0, 1000, 2))
+        indices = lttb_indices(values, 50, candidates)
+
+        assert len(indices) == 50
+        assert all(i % 2 == 0 for i in indices)
+
+
+class TestPyramid:
+    def test_levels_shrink_by_factor(self):
+        levels = build_lttb_pyramid(_wave(40_000), factor=4, min_points=500)
+
+        assert len(levels) == 3
+        for level, size in zip(levels, (10_000, 2_500, 625), strict=True):
+            assert size * 0.9 <= len(level) <= size + 2
+            assert level == sorted(set(level))
+        assert 40_000 // 3 in levels[-1]
+
+    def test_minmax_keeps_extremes_of_every_bucket(self):
+        values = [0.0, 5.0, 1.0, 2.0, -3.0, 4.0, 1.0, 1.0]
+
+        assert minmax_indices(values, 4) == [0, 1, 4, 5, 7]
+
+    def test_small_series_has_no_levels(self):
+        assert build_lttb_pyramid(_wave(1000)) == []
+
+    def test_select_uses_pyramid_and_keeps_window_edges(self):
+        values = _wave(40_000)
+        levels = build_lttb_pyramid(values)
+
+        indices = select_series_indices(values, 400, lo=1_000, hi=30_000, pyramid=levels)
+
+        assert len(indices) == 400
+        assert indices[0] == 1_000
+        assert indices[-1] == 29_999
+
+    def test_select_window_within_budget_is_dense(self):
+        assert select_series_indices(_wave(100), 50, lo=10, hi=40) == list(range(10, 40))
+
+
+class TestOhlcBuckets:
+    @staticmethod
+    def _bars(n: int) -> list[dict]:
+        return [
+            {
+                "date": f"2024-01-{i:04d}",
+                "open": float(i),
+                "high": float(i) + 1,
+                "low": float(i) - 1,
+                "close": float(i) + 0.5,
+                "volume": 10,
+            }
+            for i in range(n)
+        ]
+
+    def test_buckets_cover_all_bars(self):
+        bars = self._bars(1000)
+        buckets = ohlc_buckets([b["date"] for b in bars], 100)
+
+        assert len(buckets) <= 100
+        assert buckets[0][0] == 0
+        assert buckets[-1][1] == 1000
+        assert all(a[1] == b[0] for a, b in zip(buckets, buckets[1:], strict=False))
+
+    def test_signal_bars_stay_single(self):
+        bars = self._bars(1000)
+        signal_date = bars[555]["date"]
+        buckets = ohlc_buckets([b["date"] for b in bars], 100, keep_dates={signal_date})
+
+        assert (555, 556) in buckets
+        assert len(buckets) <= 102
+
+    def test_merge_ohlc(self):
+        bars = self._bars(10)
+        candle = merge_ohlc(bars, 2, 6)
+
+        assert candle == {
+            "date": bars[2]["date"],
+            "open": 2.0,
+            "high": 6.0,
+            "low": 1.0,
+            "close": 5.5,
+            "volume": 40,
+        }
+
+
+def test_date_window_and_clamp():
+    dates = ["2024-01-01", "2024-01-02", "2024-01-03", "2024-01-04"]
+
+    assert date_window(dates, "2024-01-02", "2024-01-03") == (1, 3)
+    assert date_window(dates, None, None) == (0, 4)
+    assert date_window(dates, "2024-02-01", None) == (4, 4)
+    assert clamp_max_points(None) is None
+    assert clamp_max_points(1) == 3
+    assert clamp_max_points(10**9) == 20000
+
+
+@pytest.mark.asyncio
+class TestChartEndpoints:
+    @staticmethod
+    def _fake_result(n: int) -> dict:
+        dates = [f"2024-{1 + i // 28:02d}-{1 + i % 28:02d}" for i in range(n)]
+        values = _wave(n)
+        klines = [
+            {"date": d, "open": v, "high": v + 1, "low": v - 1, "close": v, "volume": 1}
+            for d, v in zip(dates, values, strict=True)
+        ]
+        return {
+            "task_id": "t1",
+            "strategy_name": "s",
+            "symbol": "000001.SZ",
+            "start_date": dates[0],
+            "end_date": dates[-1],
+            "equity_curve": [
+                {"date": d, "total_assets": v, "cash": 0.0, "position_value": v}
+                for d, v in zip(dates, values, strict=True)
+            ],
+            "drawdown_curve": [
+                {"date": d, "drawdown": 0.0, "peak": v, "trough": v}
+                for d, v in zip(dates, values, strict=True)
+            ],
+            "trades": [],
+            "signals": [{"date": dates[100], "type": "buy", "price": 1.0, "size": 1}],
+            "klines": klines,
+            "log_indicators": {"ma": list(range(n))},
+            "monthly_returns": {},
+            "created_at": "2024-01-01",
+        }
+
+    async def test_detail_downsamples_curves(self):
+        fake = self._fake_result(300)
+        backtest_service = SimpleNamespace(get_chart_pyramid=AsyncMock(return_value=None))
+
+        with patch.object(analytics_api, "get_backtest_data", AsyncMock(return_value=fake)):
+            detail = await analytics_api.get_backtest_detail(
+                "t1",
+                max_points=50,
+                current_user=SimpleNamespace(sub="u1"),
+                service=AnalyticsService(),
+                backtest_service=backtest_service,
+            )
+
+        assert len(detail.equity_curve) == 50
+        assert [p.date for p in detail.drawdown_curve] == [p.date for p in detail.equity_curve]
+        backtest_service.get_chart_pyramid.assert_awaited_once_with("t1")
+
+    async def test_kline_buckets_keep_signal_bar_and_align_indicators(self):
+        fake = self._fake_result(300)
+
+        with patch.object(analytics_api, "get_backtest_data", AsyncMock(return_value=fake)):
+            kline = await analytics_api.get_kline_with_signals(
+                "t1",
+                max_points=30,
+                current_user=SimpleNamespace(sub="u1"),
+                service=AnalyticsService(),
+                backtest_service=object(),
+            )
+
+        dates = [k.date for k in kline.klines]
+        assert len(dates) <= 32
+        assert fake["klines"][100]["date"] in dates
+        assert len(kline.indicators["ma"]) == len(dates)
+        assert kline.indicators["ma"][-1] == 299
@@ -691,3 +691,79 @@ class TestToResponse:
         assert result.backtest_task_ids == ["task1", "task2"]
         assert result.is_favorite is True
         assert result.is_public is False
+
+
+class TestEquityAlignment:
+    """Test the shared date aligner behind equity comparisons"""
+
+    def test_forward_fills_and_uses_initial_capital(self):
+        from app.services.equity_alignment import align_equity_curves
+
+        aligned = align_equity_curves(
+            {
+                "a": (["2024-01-02", "2024-01-04"], [51000.0, 52000.0]),
+                "b": (["2024-01-01", "2024-01-03", "2024-01-04"], [1.0, 2.0, 3.0]),
+            },
+            initial_capital={"a": 50000.0, "b": None},
+        )
+
+        assert aligned.dates == ["2024-01-01", "2024-01-02", "2024-01-03", "2024-01-04"]
+        assert aligned.curves["a"].tolist() == [50000.0, 51000.0, 51000.0, 52000.0]
+        assert aligned.curves["b"].tolist() == [1.0, 1.0, 2.0, 3.0]
+        assert aligned.total().tolist() == [50001.0, 51001.0, 51002.0, 52003.0]
+
+    def test_unsorted_duplicate_and_short_inputs(self):
+        from app.services.equity_alignment import align_equity_curves
+
+        aligned = align_equity_curves(
+            {
+                "a": (["2024-01-03", "2024-01-01", "2024-01-03"], [3.0, 1.0, 4.0]),
+                "b": (["2024-01-02", "2024-01-05"], [7.0]),
+                "c": ([], []),
+            }
+        )
+
+        assert aligned.dates == ["2024-01-01", "2024-01-02", "2024-01-03"]
+        assert aligned.curves["a"].tolist() == [1.0, 1.0, 4.0]
+        assert aligned.curves["b"].tolist() == [100000.0, 7.0, 7.0]
+        assert aligned.curves["c"].tolist() == [100000.0] * 3
+
+    def test_compare_equity_uses_run_initial_cash(self):
+        service = ComparisonService()
+
+        result = service._compare_equity(
+            {
+                "task1": {
+                    "initial_cash": 20000.0,
+                    "equity_curve": [21000.0],
+                    "equity_dates": ["2024-01-02"],
+                },
+                "task2": {
+                    "equity_curve": [100.0, 101.0],
+                    "equity_dates": ["2024-01-01", "2024-01-02"],
+                },
+            }
+        )
+
+        assert result["curves"]["task1"] == [20000.0, 21000.0]
+        assert result["curves"]["task2"] == [100.0, 101.0]
+
+    def test_compare_equity_many_long_runs_is_fast(self):
+        import time
+
+        service = ComparisonService()
+        dates = [f"2000-01-01T{i:07d}" for i in range(20_000)]
+        backtest_results = {
+            f"task{k}": {
+                "equity_curve": [float(i) for i in range(k, 20_000, 2)],
+                "equity_dates": dates[k::2],
+            }
+            for k in range(50)
+        }
+
+        started = time.perf_counter()
+        result = service._compare_equity(backtest_results)
+
+        assert time.perf_counter() - started < 2.0
+        assert len(result["dates"]) == 20_000
+        assert result["curves"]["task1"][:3] == [100000.0, 1.0, 1.0]
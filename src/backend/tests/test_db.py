@@ -311,6 +311,52 @@ class TestDatabaseInitialization:
             assert lock_trading in (0, False)
             assert lock_running in (0, False)
 
+    async def test_ensure_schema_compatibility_moves_legacy_backtest_blobs(self):
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+            await conn.execute(
+                text(
+                    """
+                    CREATE TABLE backtest_results (
+                        id VARCHAR(36) NOT NULL PRIMARY KEY,
+                        task_id VARCHAR(36),
+                        total_return FLOAT,
+                        equity_curve JSON,
+                        equity_dates JSON,
+                        drawdown_curve JSON,
+                        trades JSON
+                    )
+                    """
+                )
+            )
+            await conn.execute(
+                text(
+                    """
+                    INSERT INTO backtest_results
+                        (id, task_id, total_return, equity_curve, equity_dates,
+                         drawdown_curve, trades)
+                    VALUES ('result-1', 'task-1', 0.1, '[1, 2]', '["d1", "d2"]', '[0, 0]', '[]')
+                    """
+                )
+            )
+
+        await ensure_schema_compatibility()
+
+        async with engine.begin() as conn:
+            blob = await conn.execute(
+                text("SELECT result_id, equity_curve, equity_dates FROM backtest_result_blobs")
+            )
+            assert blob.all() == [("result-1", "[1, 2]", '["d1", "d2"]')]
+            blob_columns = await conn.execute(text("PRAGMA table_info(backtest_result_blobs)"))
+            assert "chart_pyramid" in {row[1] for row in blob_columns.fetchall()}
+            result_columns = await conn.execute(text("PRAGMA table_info(backtest_results)"))
+            result_column_names = {row[1] for row in result_columns.fetchall()}
+            assert "equity_curve" not in result_column_names
+            assert "total_return" in result_column_names
+
+        # Idempotent on the next startup.
+        await ensure_schema_compatibility()
+
 
 @pytest.mark.asyncio
 class TestGetDb:
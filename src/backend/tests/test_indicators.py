@@ -0,0 +1,80 @@
+"""
+Vectorized indicator and indicator cache tests.
+"""
+
+import numpy as np
+import pytest
+
+from app.services.indicators import (
+    IndicatorCache,
+    IndicatorEngine,
+    atr,
+    bollinger,
+    ema,
+    rsi,
+    sma,
+)
+
+
+def _ema_loop(values: np.ndarray, period: int) -> np.ndarray:
+    alpha = 2.0 / (period + 1)
+    out = np.full(len(values), np.nan)
+    out[period - 1] = values[:period].mean()
+    for i in range(period, len(values)):
+        out[i] = out[i - 1] + alpha * (values[i] - out[i - 1])
+    return out
+
+
+@pytest.fixture
+def closes() -> np.ndarray:
+    return 100.0 + np.cumsum(np.random.default_rng(7).normal(size=20_000))
+
+
+def test_sma_window_matches_full_series(closes):
+    full = sma(closes, 20)
+    expected = np.convolve(closes, np.ones(20) / 20, mode="valid")
+
+    np.testing.assert_allclose(full[19:], expected, atol=1e-9)
+    assert np.isnan(full[:19]).all()
+    np.testing.assert_allclose(sma(closes, 20, 5_000, 5_010), full[5_000:5_010], rtol=1e-12)
+
+
+@pytest.mark.parametrize("period", [2, 12, 26])
+def test_blockwise_ema_matches_recursion(closes, period):
+    np.testing.assert_allclose(ema(closes, period), _ema_loop(closes, period), rtol=1e-10)
+
+
+def test_bollinger_bands(closes):
+    upper, mid, lower = bollinger(closes, lo=100, hi=200)
+    windows = np.lib.stride_tricks.sliding_window_view(closes[81:200], 20)
+
+    np.testing.assert_allclose(mid, windows.mean(axis=1), rtol=1e-10)
+    np.testing.assert_allclose(upper - mid, 2 * windows.std(axis=1), rtol=1e-8)
+    np.testing.assert_allclose(mid - lower, upper - mid)
+
+
+def test_rsi_and_atr_edges():
+    rising = np.arange(1.0, 31.0)
+    assert np.isnan(rsi(rising)[:14]).all()
+    assert (rsi(rising)[14:] == 100.0).all()
+    assert (rsi(np.full(30, 5.0))[14:] == 50.0).all()
+
+    highs, lows = rising + 1.0, rising - 1.0
+    # Each bar's true range is high - low = 2.
+    np.testing.assert_allclose(atr(highs, lows, rising)[13:], 2.0)
+
+
+def test_cache_reuses_engine_until_series_changes():
+    cache = IndicatorCache(max_entries=1)
+    built = []
+
+    def build():
+        built.append(1)
+        return IndicatorEngine.from_klines([{"close": 1.0}])
+
+    first = cache.get("t1", (1, "a"), build)
+    assert cache.get("t1", (1, "a"), build) is first
+    assert cache.get("t1", (2, "b"), build) is not first
+    cache.get("t2", (1, "a"), build)
+    cache.get("t1", (2, "b"), build)
+    assert len(built) == 4
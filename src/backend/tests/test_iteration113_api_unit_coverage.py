@@ -175,7 +175,7 @@ async def test_analytics_api_detail_kline_monthly_export_and_error():
         def process_trades(self, trades):
             return trades
 
-        def calculate_indicators(self, klines):
+        def calculate_indicators(self, klines, start=0, end=None, cache_key=None):
             return {"ma": [1]}
 
         def process_signals(self, signals):
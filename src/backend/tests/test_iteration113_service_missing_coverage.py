@@ -19,6 +19,7 @@ async def test_backtest_service_execute_backtest_missing_branches(tmp_path: Path
     """Cover _execute_backtest branches: tmp_logs cleanup, custom params write, parse_all_logs empty, persist copy, cleanup except."""
     from app.schemas.backtest import BacktestRequest, TaskStatus
     from app.services.backtest_service import BacktestService
+    from app.services.workspace_staging import stage_strategy_dir
 
     svc = BacktestService()
     svc.task_manager = AsyncMock()
@@ -66,31 +67,34 @@ async def test_backtest_service_execute_backtest_missing_branches(tmp_path: Path
             svc.task_manager.update_task_status = AsyncMock()
             with patch("app.services.backtest_service.ws_manager") as mock_ws:
                 mock_ws.send_to_task = AsyncMock()
-                # observe internal calls: tmp_logs cleanup, config overwrite, persist copytree
+                # observe internal calls: tmp_logs cleanup, config overwrite, datas copytree
                 with patch("shutil.rmtree") as mock_rmtree:
                     with (
                         patch("os.symlink", side_effect=OSError("symlink unavailable")),
                         patch("shutil.copytree") as mock_copytree,
+                        patch(
+                            "app.services.backtest_service.stage_strategy_dir",
+                            wraps=stage_strategy_dir,
+                        ) as mock_stage,
                     ):
 
-                        def _copytree_side_effect(src, dst, *args, **kwargs):
-                            if Path(dst).name == "s1":
-                                (Path(dst) / "logs").mkdir(parents=True, exist_ok=True)
-                            return dst
+                        def _stage_side_effect(src, dst, *args, **kwargs):
+                            report = stage_strategy_dir(src, dst, *args, **kwargs)
+                            (Path(dst) / "logs").mkdir(parents=True, exist_ok=True)
+                            return report
 
-                        mock_copytree.side_effect = _copytree_side_effect
+                        mock_stage.side_effect = _stage_side_effect
                         await svc._execute_backtest("t1", "u1", req)
-                        first_copy_args = mock_copytree.call_args_list[0].args
-                        expected_tmp_logs = first_copy_args[1] / "logs"
+                        stage_args = mock_stage.call_args_list[0].args
+                        expected_tmp_logs = stage_args[1] / "logs"
                         assert any(
                             call.args == (expected_tmp_logs,) and not call.kwargs
                             for call in mock_rmtree.call_args_list
                         )
-                        assert mock_copytree.call_count == 2
-                        second_copy_kwargs = mock_copytree.call_args_list[1].kwargs
-                        assert first_copy_args[0] == strategy_dir
-                        assert first_copy_args[1].name == "s1"
-                        assert second_copy_kwargs["dirs_exist_ok"] is True
+                        assert stage_args[0] == strategy_dir
+                        assert stage_args[1].name == "s1"
+                        assert mock_copytree.call_count == 1
+                        assert mock_copytree.call_args_list[0].kwargs["dirs_exist_ok"] is True
                         svc.task_manager.create_result.assert_awaited_once()
 
     # parse_all_logs empty -> raises -> status FAILED (covers the raise ValueError branch).
@@ -305,24 +309,14 @@ async def test_live_trading_manager_missing_branches(tmp_path: Path, monkeypatch
 
 @pytest.mark.asyncio
 async def test_monitoring_service_missing_branches(monkeypatch):
-    """Cover monitoring_service: early return, trigger path, all sleep branches, and POSITION gt threshold."""
+    """Cover monitoring intervals per alert type and POSITION gt threshold."""
+    from app.config import get_settings
     from app.models.alerts import AlertType
+    from app.services.alert_engine import rule_interval
     from app.services.monitoring_service import MonitoringService
 
     svc = _new_service_without_init(MonitoringService)
-    svc.alert_rule_repo = SimpleNamespace(get_by_id=AsyncMock())
-
-    # early return when rule not active
-    svc.alert_rule_repo.get_by_id.return_value = SimpleNamespace(is_active=False)
-    await svc._monitor_task("r1")
-
-    # Loop: make it run one iteration for each sleep branch then cancel via sleep raising CancelledError.
-    async def _sleep_cancel(_):
-        raise asyncio.CancelledError()
-
-    import asyncio
-
-    monkeypatch.setattr(asyncio, "sleep", _sleep_cancel)
+    settings = get_settings()
 
     rule = SimpleNamespace(
         id="r2",
@@ -332,24 +326,21 @@ async def test_monitoring_service_missing_branches(monkeypatch):
         trigger_config={},
         triggered_count=0,
     )
-    svc.alert_rule_repo.get_by_id = AsyncMock(return_value=rule)
-    svc._check_trigger = AsyncMock(return_value=True)
-    svc._trigger_alert = AsyncMock()
-    await svc._monitor_task("r2")
+    assert rule_interval(rule) == settings.MONITORING_SYSTEM_INTERVAL
 
     # ACCOUNT/POSITION branch
     rule.alert_type = AlertType.ACCOUNT
-    await svc._monitor_task("r2")
+    assert rule_interval(rule) == settings.MONITORING_ACCOUNT_INTERVAL
     rule.alert_type = AlertType.POSITION
-    await svc._monitor_task("r2")
+    assert rule_interval(rule) == settings.MONITORING_ACCOUNT_INTERVAL
 
     # STRATEGY branch
     rule.alert_type = AlertType.STRATEGY
-    await svc._monitor_task("r2")
+    assert rule_interval(rule) == settings.MONITORING_STRATEGY_INTERVAL
 
     # else branch (ORDER)
     rule.alert_type = AlertType.ORDER
-    await svc._monitor_task("r2")
+    assert rule_interval(rule) == settings.MONITORING_DEFAULT_INTERVAL
 
     # POSITION threshold condition gt branch
     rule.alert_type = AlertType.POSITION
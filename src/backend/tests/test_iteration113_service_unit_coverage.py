@@ -2,7 +2,7 @@
 Iteration 113 service unit coverage tests
 
 Tests:
-- Monitoring service monitoring task branches
+- Monitoring service alert engine trigger branches
 - Optimization service bayesian objective and exception paths
 - Parameter optimization service run optimization thread paths
 - Parameter optimization service worker and log parser branches
@@ -12,7 +12,6 @@ Tests:
 
 from __future__ import annotations
 
-import asyncio
 from datetime import datetime, timezone
 from types import SimpleNamespace
 from unittest.mock import AsyncMock, Mock, patch
@@ -51,24 +50,22 @@ async def test_monitoring_service_monitor_task_cancel_and_error_and_threshold_br
     svc.alert_repo.get_by_id = AsyncMock(return_value=SimpleNamespace(id="a1", user_id="u1"))
     svc.alert_repo.update = AsyncMock()
 
-    # CancelledError branch in _monitor_task.
-    svc._check_trigger = AsyncMock(return_value=False)
-    with (
-        patch(
-            "app.services.monitoring_service.asyncio.sleep",
-            new=AsyncMock(side_effect=asyncio.CancelledError()),
-        ),
-        patch("app.services.monitoring_service.ws_manager.send_to_task", new=AsyncMock()),
-    ):
-        await svc._monitor_task("r1")
-
-    # Exception branch in _monitor_task.
-    rule2 = SimpleNamespace(**{**rule.__dict__})
-    rule2.is_active = False
-    svc.alert_rule_repo.get_by_id = AsyncMock(side_effect=[rule, rule, rule2])
-    svc._check_trigger = AsyncMock(side_effect=RuntimeError("boom"))
-    with patch("app.services.monitoring_service.asyncio.sleep", new=AsyncMock(return_value=None)):
-        await svc._monitor_task("r1")
+    # Shared engine: triggered rules create alerts; trigger failures are logged.
+    from app.services.alert_engine import AlertEngine
+
+    engine = AlertEngine(svc)
+    svc._send_notification = AsyncMock()
+    svc._send_websocket_alert = AsyncMock()
+    rule.trigger_config = {"current_value": 2.0, "threshold": 2.0, "condition": "eq"}
+    assert await engine.evaluate([rule]) == ["r1"]
+    assert rule.triggered_count == 1
+    svc.alert_repo.create.assert_awaited_once()
+    assert svc.alert_repo.create.await_args.args[0].trigger_value == 2.0
+
+    svc._trigger_alert = AsyncMock(side_effect=RuntimeError("boom"))
+    assert await engine.evaluate([rule]) == []
+    del svc._send_notification, svc._send_websocket_alert, svc._trigger_alert
+    rule.trigger_config = {"current_value": 1.0, "threshold": 2.0, "condition": "eq"}
 
     # Threshold trigger else branches (ACCOUNT + POSITION) and notification/websocket push.
     rule_acc = SimpleNamespace(
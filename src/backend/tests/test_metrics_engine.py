@@ -0,0 +1,95 @@
+"""Vectorized metrics engine tests."""
+
+import numpy as np
+import pytest
+
+from app.services import metrics_engine
+from app.services.backtest_analyzers import FincoreAdapter
+from app.services.fincore_metrics_helper import (
+    calculate_extended_metrics,
+    calculate_extended_metrics_batch,
+    calculate_metrics_batch,
+    calculate_metrics_from_log_data,
+)
+from app.services.optimization_trial_runner import _aggregate_period_returns
+
+
+def _loop_drawdown_with_duration(equity):
+    peak = equity[0]
+    max_dd, max_dd_duration, current = 0.0, 0, 0
+    for value in equity:
+        if value > peak:
+            peak = value
+            current = 0
+        else:
+            dd = (value - peak) / peak if peak > 0 else 0
+            current += 1
+            if dd < max_dd:
+                max_dd, max_dd_duration = dd, current
+    return max_dd, max_dd_duration
+
+
+@pytest.fixture
+def runs():
+    rng = np.random.default_rng(7)
+    result = []
+    for length in (0, 1, 2, 7, 40, 130):
+        equity = (100000.0 * np.cumprod(1 + rng.normal(0, 0.01, length))).tolist()
+        trades = [
+            {"pnlcomm": float(pnl), "commission": 1.5, "barlen": 3}
+            for pnl in rng.normal(0, 50, length // 4)
+        ]
+        result.append({"equity_curve": equity, "trades": trades})
+    return result
+
+
+def test_batch_matches_single_run(runs):
+    assert calculate_extended_metrics_batch(runs) == [calculate_extended_metrics(r) for r in runs]
+    assert calculate_metrics_batch(runs) == [calculate_metrics_from_log_data(r) for r in runs]
+
+
+def test_drawdown_duration_matches_loop(runs):
+    adapter = FincoreAdapter()
+    for run in runs:
+        equity = run["equity_curve"]
+        if len(equity) < 2:
+            continue
+        expected_dd, expected_duration = _loop_drawdown_with_duration(equity)
+        dd, duration = adapter.calculate_max_drawdown_with_duration(equity)
+        assert dd == pytest.approx(expected_dd)
+        assert duration == expected_duration
+
+
+def test_window_returns_on_ragged_matrix():
+    curves = [[100.0, 110.0, 121.0, 133.1, 100.0, 90.0, 99.0], [100.0, 50.0, 100.0]]
+    matrix, lengths = metrics_engine.as_equity_matrix(curves)
+
+    weekly = metrics_engine.window_returns(matrix, lengths, 5)
+
+    assert weekly[0, 0] == pytest.approx(-0.1)
+    assert weekly[0, 1] == pytest.approx(0.1)
+    assert np.isnan(weekly[1]).all()
+
+
+def test_extended_metrics_values():
+    metrics = calculate_extended_metrics(
+        {
+            "equity_curve": [100.0, 120.0, 90.0, 99.0],
+            "trades": [{"pnlcomm": 10.0}, {"pnlcomm": -5.0}, {"pnlcomm": 0.0}],
+        }
+    )
+
+    assert metrics["max_drawdown"] == -25.0
+    assert metrics["max_drawdown_value"] == 30.0
+    assert metrics["daily_max_profit"] == 20.0
+    assert metrics["profit_factor"] == 2.0
+    assert metrics["losing_trades"] == 2
+
+
+def test_max_consecutive_and_compounding():
+    adapter = FincoreAdapter()
+    trades = [{"pnlcomm": p} for p in (1, 2, -1, 0, -3, 4, 5, 6)]
+
+    assert adapter.calculate_max_consecutive(trades, True) == 3
+    assert adapter.calculate_max_consecutive(trades, False) == 3
+    assert _aggregate_period_returns([0.1, 0.1, -0.5], 2) == pytest.approx([21.0, -50.0])
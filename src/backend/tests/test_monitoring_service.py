@@ -37,7 +37,6 @@ class TestMonitoringServiceInitialization:
         assert service.alert_rule_repo is not None
         assert service.live_trading_service is not None
         assert service.backtest_service is not None
-        assert service._monitoring_tasks == {}
         assert service._running is False
 
 
@@ -784,10 +783,10 @@ class TestTriggerAlert:
 
 @pytest.mark.asyncio
 class TestStartStopMonitoring:
-    """Test monitoring task start/stop."""
+    """Test rule registration with the shared alert engine."""
 
-    async def test_start_monitoring_new_task(self):
-        """Test starting new monitoring task."""
+    async def test_start_monitoring_registers_rule(self):
+        """Test starting monitoring hands the rule to the engine."""
         service = MonitoringService()
 
         mock_rule = Mock()
@@ -797,33 +796,11 @@ class TestStartStopMonitoring:
         service.alert_rule_repo = AsyncMock()
         service.alert_rule_repo.get_by_id = AsyncMock(return_value=mock_rule)
 
-        with patch("asyncio.create_task") as mock_create_task:
-            mock_task = Mock()
-
-            # _start_monitoring schedules _monitor_task via asyncio.create_task; when patched,
-            # close the coroutine to avoid "coroutine was never awaited" warnings.
-            def _create_task(coro):
-                try:
-                    coro.close()
-                except Exception:
-                    pass
-                return mock_task
-
-            mock_create_task.side_effect = _create_task
-
+        engine = Mock()
+        with patch("app.services.monitoring_service.get_alert_engine", return_value=engine):
             await service._start_monitoring("rule_123")
 
-            assert "rule_123" in service._monitoring_tasks
-
-    async def test_start_monitoring_already_exists(self):
-        """Test starting monitoring task that already exists."""
-        service = MonitoringService()
-        service._monitoring_tasks["rule_123"] = Mock()
-
-        await service._start_monitoring("rule_123")
-
-        # Should not create duplicate
-        assert len(service._monitoring_tasks) == 1
+        engine.upsert.assert_called_once_with(mock_rule)
 
     async def test_start_monitoring_inactive_rule(self):
         """Test starting monitoring for inactive rule."""
@@ -835,28 +812,19 @@ class TestStartStopMonitoring:
         service.alert_rule_repo = AsyncMock()
         service.alert_rule_repo.get_by_id = AsyncMock(return_value=mock_rule)
 
-        await service._start_monitoring("rule_123")
-
-        # Should not create task
-        assert "rule_123" not in service._monitoring_tasks
-
-    async def test_stop_monitoring_existing_task(self):
-        """Test stopping existing monitoring task."""
-        service = MonitoringService()
-
-        mock_task = Mock()
-        service._monitoring_tasks["rule_123"] = mock_task
-
-        await service._stop_monitoring("rule_123")
+        engine = Mock()
+        with patch("app.services.monitoring_service.get_alert_engine", return_value=engine):
+            await service._start_monitoring("rule_123")
 
-        assert "rule_123" not in service._monitoring_tasks
-        mock_task.cancel.assert_called_once()
+        engine.upsert.assert_not_called()
+        engine.remove.assert_called_once_with("rule_123")
 
-    async def test_stop_monitoring_nonexistent_task(self):
-        """Test stopping non-existent monitoring task."""
+    async def test_stop_monitoring_removes_rule(self):
+        """Test stopping monitoring removes the rule from the engine."""
         service = MonitoringService()
 
-        # Should not raise exception
-        await service._stop_monitoring("rule_123")
+        engine = Mock()
+        with patch("app.services.monitoring_service.get_alert_engine", return_value=engine):
+            await service._stop_monitoring("rule_123")
 
-        assert len(service._monitoring_tasks) == 0
+        engine.remove.assert_called_once_with("rule_123")
@@ -9,6 +9,7 @@ Tests:
 - Canceling optimization tasks
 """
 
+from collections.abc import Sequence
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -627,7 +628,7 @@ class TestOptimizationService:
         }
 
         grid = generate_param_grid(param_ranges)
-        assert isinstance(grid, list)
+        assert isinstance(grid, Sequence)
         assert len(grid) > 0
 
     async def test_submit_optimization_exists(self):
@@ -0,0 +1,179 @@
+"""Tests for in-process batch evaluation of optimization trials."""
+
+import sys
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services import optimization_batch_runner
+from app.services.optimization_batch_runner import request_batch_cancel, run_trial_batch
+
+RUN_PY = """
+from pathlib import Path
+
+import backtrader as bt
+import pandas as pd
+import yaml
+
+from strategy_sma_cross import SmaCross
+
+BASE_DIR = Path(__file__).resolve().parent
+
+
+def run():
+    config = yaml.safe_load((BASE_DIR / "config.yaml").read_text(encoding="utf-8"))
+    df = pd.read_csv(BASE_DIR / "bars.csv", index_col=0, parse_dates=True)
+    cerebro = bt.Cerebro()
+    cerebro.adddata(bt.feeds.PandasData(dataname=df))
+    cerebro.broker.setcash(config["backtest"]["initial_cash"])
+    cerebro.addstrategy(SmaCross, **config["params"])
+    cerebro.run()
+    if config["params"]["period"] == 13:
+        raise ValueError("unlucky period")
+
+
+if __name__ == "__main__":
+    run()
+"""
+
+STRATEGY_PY = """
+import backtrader as bt
+
+
+class SmaCross(bt.Strategy):
+    params = (("period", 5),)
+
+    def __init__(self):
+        self.cross = bt.indicators.CrossOver(self.data.close, bt.indicators.SMA(period=self.p.period))
+
+    def next(self):
+        if self.cross > 0 and not self.position:
+            self.buy()
+        elif self.cross < 0 and self.position:
+            self.close()
+"""
+
+
+@pytest.fixture
+def strategy_dir(tmp_path: Path) -> Path:
+    root = tmp_path / "strategies" / "sma_cross"
+    root.mkdir(parents=True)
+    (root / "run.py").write_text(RUN_PY, encoding="utf-8")
+    (root / "strategy_sma_cross.py").write_text(STRATEGY_PY, encoding="utf-8")
+    (root / "config.yaml").write_text(
+        "params:\n  period: 5\nbacktest:\n  initial_cash: 100000\n", encoding="utf-8"
+    )
+    rng = np.random.default_rng(7)
+    close = 100 + np.cumsum(rng.normal(0, 1, 300))
+    pd.DataFrame(
+        {
+            "open": close,
+            "high": close + 1,
+            "low": close - 1,
+            "close": close,
+            "volume": 1000.0,
+        },
+        index=pd.date_range("2024-01-01", periods=300, freq="D", name="datetime"),
+    ).to_csv(root / "bars.csv")
+    return root
+
+
+def test_batch_returns_metrics_for_each_trial(strategy_dir: Path, tmp_path: Path):
+    path_before = list(sys.path)
+
+    results = run_trial_batch(
+        str(strategy_dir),
+        [(0, {"period": 5}), (1, {"period": 13}), (2, {"period": 20})],
+        str(tmp_path / "tmp"),
+    )
+
+    assert [r["trial_index"] for r in results] == [0, 1, 2]
+    assert results[0]["success"] and results[2]["success"]
+    assert results[1]["success"] is False
+    assert "unlucky period" in results[1]["error"]
+    assert results[0]["metrics"]["trading_days"] == 300
+    assert results[0]["metrics"]["total_trades"] > 0
+    assert results[0]["metrics"] != results[2]["metrics"]
+    assert "artifact_path" not in results[0]
+    assert sys.path == path_before
+    assert "strategy_sma_cross" not in sys.modules
+    assert not (tmp_path / "tmp" / "batch_0").exists()
+
+
+def test_batch_parses_each_data_file_once(
+    strategy_dir: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    reads: list[str] = []
+    original_read_csv = pd.read_csv
+
+    def counting_read_csv(path, *args, **kwargs):
+        reads.append(str(path))
+        return original_read_csv(path, *args, **kwargs)
+
+    monkeypatch.setattr(pd, "read_csv", counting_read_csv)
+
+    results = run_trial_batch(
+        str(strategy_dir),
+        [(i, {"period": period}) for i, period in enumerate((5, 8, 20, 30))],
+        str(tmp_path / "tmp"),
+    )
+
+    assert all(r["success"] for r in results)
+    assert len(reads) == 1
+    assert pd.read_csv is counting_read_csv
+
+
+def test_batch_stops_before_the_next_trial_once_cancelled(
+    strategy_dir: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    tmp_base = tmp_path / "tmp"
+    tmp_base.mkdir()
+    ran: list[int] = []
+    original_run_trial = optimization_batch_runner._run_trial_in_process
+
+    def run_then_cancel(run_py, config_path, base_config, params, trial_index):
+        ran.append(trial_index)
+        request_batch_cancel(str(tmp_base))
+        return original_run_trial(run_py, config_path, base_config, params, trial_index)
+
+    monkeypatch.setattr(optimization_batch_runner, "_run_trial_in_process", run_then_cancel)
+
+    results = run_trial_batch(
+        str(strategy_dir),
+        [(0, {"period": 5}), (1, {"period": 8}), (2, {"period": 20})],
+        str(tmp_base),
+    )
+
+    assert ran == [0]
+    assert results[0]["success"]
+    assert [(r["trial_index"], r["error"]) for r in results[1:]] == [
+        (1, "cancelled"),
+        (2, "cancelled"),
+    ]
+
+
+def test_batch_hooks_do_not_leak_into_other_threads(strategy_dir: Path):
+    reads: list[str] = []
+    original_read_csv = pd.read_csv
+
+    def counting_read_csv(path, *args, **kwargs):
+        reads.append(str(path))
+        return original_read_csv(path, *args, **kwargs)
+
+    pd.read_csv = counting_read_csv
+    try:
+        with optimization_batch_runner._memoized_read_csv():
+            for _ in range(2):
+                worker = threading.Thread(target=pd.read_csv, args=(strategy_dir / "bars.csv",))
+                worker.start()
+                worker.join()
+            pd.read_csv(strategy_dir / "bars.csv")
+            pd.read_csv(strategy_dir / "bars.csv")
+    finally:
+        pd.read_csv = original_read_csv
+
+    # Two unmemoized reads from the other thread, one memoized read here.
+    assert len(reads) == 3
@@ -0,0 +1,297 @@
+"""Tests for successive-halving optimization."""
+
+import runpy
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+import app.services.param_optimization_service as param_optimization_service
+from app.schemas.backtest import TaskStatus
+from app.schemas.backtest_enhanced import BacktestRequest, OptimizationRequest
+from app.services.optimization_halving import (
+    FIDELITY_BARS_ENV,
+    FidelityIgnored,
+    bounded_map,
+    build_halving_pruner,
+    estimate_evaluations,
+    fidelity_schedule,
+    honours_fidelity,
+    run_successive_halving,
+    rung_sizes,
+)
+
+
+class TestFidelitySchedule:
+    def test_geometric_rungs_end_on_full_range(self):
+        assert fidelity_schedule(100, 3, 3) == [100, 300, None]
+
+    def test_rungs_longer_than_full_range_are_dropped(self):
+        assert fidelity_schedule(100, 3, 4, full_bars=500) == [100, 300, 500]
+        assert fidelity_schedule(100, 3, 3, full_bars=80) == [80]
+
+    def test_rung_sizes_and_total(self):
+        assert rung_sizes(27, 3, 3) == [27, 9, 3]
+        assert estimate_evaluations(27, 3, 3) == 39
+        assert rung_sizes(2, 3, 3) == [2, 1, 1]
+
+
+class TestRunSuccessiveHalving:
+    def test_promotes_top_fraction_and_reports_full_fidelity_only(self):
+        calls: list[tuple[int, int | None]] = []
+
+        def evaluate(params, bars):
+            calls.append((params["x"], bars))
+            return {"sharpe_ratio": float(params["x"])}
+
+        outcome = run_successive_halving(
+            ({"x": x} for x in range(9)),
+            9,
+            [10, None],
+            3,
+            evaluate,
+            lambda metrics: metrics["sharpe_ratio"],
+        )
+
+        assert outcome.rung_sizes == [9, 3]
+        assert outcome.evaluations == 12
+        assert [call for call in calls if call[1] is None] == [(8, None), (7, None), (6, None)]
+        assert [row["params"]["x"] for row in outcome.results] == [8, 7, 6]
+
+    def test_failures_are_not_promoted(self):
+        outcome = run_successive_halving(
+            [{"x": 1}, {"x": 2}],
+            2,
+            [10, None],
+            2,
+            lambda params, bars: None if params["x"] == 2 else {"v": 1.0},
+            lambda metrics: metrics["v"],
+        )
+
+        assert outcome.failures == 1
+        assert [row["params"] for row in outcome.results] == [{"x": 1}]
+
+    def test_stops_when_cancelled(self):
+        seen: list[int] = []
+        outcome = run_successive_halving(
+            [{"x": x} for x in range(5)],
+            5,
+            [10, None],
+            2,
+            lambda params, bars: seen.append(params["x"]) or {"v": 0.0},
+            lambda metrics: metrics["v"],
+            should_stop=lambda: len(seen) >= 2,
+        )
+
+        assert outcome.evaluations == 2
+        assert outcome.results == []
+
+    def test_falls_back_to_grid_when_fidelity_is_ignored(self):
+        calls: list[tuple[int, int | None]] = []
+
+        def evaluate(params, bars):
+            calls.append((params["x"], bars))
+            metrics = {"v": float(params["x"])}
+            if bars is not None:
+                raise FidelityIgnored(metrics)
+            return metrics
+
+        outcome = run_successive_halving(
+            [{"x": x} for x in range(4)],
+            4,
+            [10, None],
+            2,
+            evaluate,
+            lambda metrics: metrics["v"],
+        )
+
+        assert outcome.fidelity_ignored
+        assert calls == [(0, 10), (1, None), (2, None), (3, None)]
+        assert [row["params"]["x"] for row in outcome.results] == [0, 1, 2, 3]
+        assert outcome.rung_sizes == [4]
+
+    def test_rungs_run_in_parallel_through_map_fn(self):
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            outcome = run_successive_halving(
+                ({"x": x} for x in range(9)),
+                9,
+                [10, None],
+                3,
+                lambda params, bars: {"v": float(params["x"])},
+                lambda metrics: metrics["v"],
+                map_fn=lambda fn, items: bounded_map(executor, fn, items, 4),
+            )
+
+        assert outcome.rung_sizes == [9, 3]
+        assert [row["params"]["x"] for row in outcome.results] == [8, 7, 6]
+
+
+def test_honours_fidelity_reads_run_py(tmp_path):
+    assert not honours_fidelity(tmp_path)
+    (tmp_path / "run.py").write_text("import pandas as pd\n", encoding="utf-8")
+    assert not honours_fidelity(tmp_path)
+    (tmp_path / "run.py").write_text(f"os.environ.get('{FIDELITY_BARS_ENV}')\n", encoding="utf-8")
+    assert honours_fidelity(tmp_path)
+
+
+def test_build_halving_pruner_without_pruner_support():
+    class _NoPruners:
+        pass
+
+    assert build_halving_pruner(_NoPruners(), 100, 3) is None
+
+
+def _halving_request(**overrides) -> OptimizationRequest:
+    return OptimizationRequest(
+        strategy_id="test_strategy",
+        backtest_config=BacktestRequest(
+            strategy_id="test_strategy",
+            symbol="000001.SZ",
+            start_date="2024-01-01T00:00:00",
+            end_date="2024-12-31T00:00:00",
+            initial_cash=100000,
+            commission=0.001,
+        ),
+        method="grid",
+        param_grid={"fast": [1, 2, 3, 4, 5, 6, 7, 8, 9]},
+        early_stopping=True,
+        halving_min_bars=50,
+        halving_eta=3,
+        halving_rungs=2,
+        **overrides,
+    )
+
+
+def test_estimate_total_counts_every_rung():
+    with patch.object(param_optimization_service, "honours_fidelity", return_value=True):
+        assert (
+            param_optimization_service.estimate_backtest_optimization_total(_halving_request())
+            == 12
+        )
+    # Strategies that load their own data run the plain grid.
+    with patch.object(param_optimization_service, "honours_fidelity", return_value=False):
+        assert (
+            param_optimization_service.estimate_backtest_optimization_total(_halving_request()) == 9
+        )
+
+
+def test_halving_grid_runs_short_windows_first():
+    request = _halving_request()
+    bar_counts: list[int | None] = []
+    task_id = "halving-1"
+    param_optimization_service._set_task(
+        task_id,
+        param_optimization_service._build_backtest_optimization_runtime_task(request, 12),
+    )
+
+    def _fake_evaluate(user_id, req, params, bar_count, backtest_service):
+        bar_counts.append(bar_count)
+        return {"sharpe_ratio": float(params["fast"]), "total_return": 0.0, "max_drawdown": 0.0}
+
+    with (
+        patch.object(param_optimization_service, "BacktestService"),
+        patch.object(param_optimization_service, "_evaluate_backtest_params", _fake_evaluate),
+        patch.object(param_optimization_service, "_is_optimization_cancelled", return_value=False),
+    ):
+        param_optimization_service._run_backtest_halving_optimization(
+            task_id, "user-1", request, persist_to_db=False
+        )
+
+    task = param_optimization_service._get_task(task_id)
+    assert bar_counts == [50] * 9 + [None] * 3
+    assert task["completed"] == 12
+    assert [row["params"]["fast"] for row in task["results"]] == [9, 8, 7]
+
+
+def test_evaluate_flags_strategies_that_ignore_the_bar_window():
+    request = _halving_request()
+    seen: list[int | None] = []
+
+    async def _fake_run(user_id, backtest_request, backtest_service):
+        seen.append(backtest_request.fidelity_bars)
+        return SimpleNamespace(status=TaskStatus.COMPLETED, equity_curve=[1.0] * 200)
+
+    with (
+        patch.object(param_optimization_service, "_run_backtest_request", _fake_run),
+        patch.object(
+            param_optimization_service, "_extract_backtest_metrics", return_value={"v": 1.0}
+        ),
+    ):
+        assert param_optimization_service._evaluate_backtest_params(
+            "user-1", request, {"fast": 1}, None, object()
+        ) == {"v": 1.0}
+        with pytest.raises(FidelityIgnored):
+            param_optimization_service._evaluate_backtest_params(
+                "user-1", request, {"fast": 1}, 50, object()
+            )
+
+    assert seen == [None, 50]
+
+
+def test_unit_runtime_simulates_only_the_first_fidelity_bars(tmp_path, monkeypatch):
+    comminfo = pytest.importorskip("backtrader.comminfo")
+    if not hasattr(comminfo, "ComminfoFuturesPercent"):
+        pytest.skip("unit runtime needs the project's backtrader build")
+    from app.services.workspace_unit_runtime import _UNIT_RUN_PY
+
+    rows = ["datetime,open,high,low,close,volume"]
+    rows += [f"2024-01-{day:02d},{day},{day},{day},{day},1" for day in range(1, 21)]
+    (tmp_path / "TEST_D1.csv").write_text("\n".join(rows) + "\n", encoding="utf-8")
+    run_py = tmp_path / "run.py"
+    run_py.write_text(_UNIT_RUN_PY, encoding="utf-8")
+    config = {"data": {"directory_path": str(tmp_path), "symbol": "TEST", "timeframe": "1d"}}
+    namespace = runpy.run_path(str(run_py), run_name="unit_runtime")
+
+    full, _path = namespace["load_dataframe"](config)
+    monkeypatch.setenv(FIDELITY_BARS_ENV, "5")
+    short, _path = namespace["load_dataframe"](config)
+
+    assert len(full) == 20
+    assert list(short["close"]) == [1.0, 2.0, 3.0, 4.0, 5.0]
+
+
+def test_halving_optimization_passes_the_bar_window_to_trials(tmp_path):
+    task_id = "halving-unit"
+    param_optimization_service._set_task(
+        task_id,
+        param_optimization_service.build_initial_runtime_task(
+            strategy_id="unit",
+            param_ranges={},
+            total=12,
+            n_workers=2,
+            created_at="",
+            status=TaskStatus.RUNNING.value,
+        ),
+    )
+    windows: list[int | None] = []
+
+    def _fake_trial(strategy_dir, params, index, tmp_base, artifact_root, fidelity_bars=None):
+        windows.append(fidelity_bars)
+        assert (artifact_root is None) == (fidelity_bars is not None)
+        return {"success": True, "metrics": {"annual_return": float(params["fast"])}}
+
+    grid = param_optimization_service.generate_param_grid(
+        {"fast": {"start": 1, "end": 9, "step": 1, "type": "int"}}
+    )
+    with (
+        patch.object(param_optimization_service, "_run_single_trial", _fake_trial),
+        patch.object(param_optimization_service, "_is_optimization_cancelled", return_value=False),
+    ):
+        param_optimization_service._run_halving_optimization_thread(
+            task_id,
+            str(tmp_path),
+            grid,
+            2,
+            False,
+            str(tmp_path / "artifacts"),
+            schedule=[50, None],
+            eta=3,
+            metric="annual_return",
+        )
+
+    task = param_optimization_service._get_task(task_id)
+    assert (windows.count(50), windows.count(None)) == (9, 3)
+    assert task["status"] == TaskStatus.COMPLETED.value
+    assert task["completed"] == 12
+    assert sorted(row["params"]["fast"] for row in task["results"]) == [7, 8, 9]
@@ -1,3 +1,4 @@
+import json
 from pathlib import Path
 from types import SimpleNamespace
 from unittest.mock import Mock
@@ -195,6 +196,7 @@ def test_service_trial_wrapper_accepts_artifact_root_and_forwards_it():
         *,
         parse_trial_logs_fn,
         subprocess_module,
+        fidelity_bars,
     ):
         captured.update(
             strategy_dir=strategy_dir,
@@ -204,6 +206,7 @@ def test_service_trial_wrapper_accepts_artifact_root_and_forwards_it():
             artifact_root=artifact_root,
             parse_trial_logs_fn=parse_trial_logs_fn,
             subprocess_module=subprocess_module,
+            fidelity_bars=fidelity_bars,
         )
         return {"success": True}
 
@@ -215,6 +218,7 @@ def test_service_trial_wrapper_accepts_artifact_root_and_forwards_it():
             2,
             "/tmp/opt",
             "/tmp/artifacts",
+            fidelity_bars=250,
         )
     finally:
         param_optimization_service._trial_runner_run_single_trial = original
@@ -222,6 +226,7 @@ def test_service_trial_wrapper_accepts_artifact_root_and_forwards_it():
     assert result == {"success": True}
     assert captured["artifact_root"] == "/tmp/artifacts"
     assert captured["trial_index"] == 2
+    assert captured["fidelity_bars"] == 250
 
 
 def test_trial_runner_persists_artifacts_when_root_provided(tmp_path: Path):
@@ -503,3 +508,218 @@ def test_thread_runner_updates_manifest_and_summary(tmp_path: Path):
     assert '"trial_artifacts"' in manifest
     assert '"success_rate": 0.5' in summary
     assert '"status": "completed"' in summary
+
+
+def test_thread_runner_throttles_flushes_and_appends_trial_log(tmp_path: Path):
+    class DummyFuture:
+        def __init__(self, payload):
+            self.payload = payload
+
+        def result(self, timeout=None):
+            return self.payload
+
+        def cancel(self):
+            return None
+
+    class DummyExecutor:
+        def __init__(self, max_workers):
+            self.max_workers = max_workers
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, exc_type, exc, tb):
+            return False
+
+        def submit(self, fn, *args):
+            return DummyFuture(fn(*args))
+
+    artifact_root = tmp_path / "optimization_runs" / "task-6"
+    runtime_task = {"status": TaskStatus.RUNNING.value, "failed": 0, "results": []}
+    result_snapshots: list[int] = []
+    persist_calls: list[dict[str, object]] = []
+
+    def _update_task(_task_id, **kwargs):
+        if "results" in kwargs:
+            result_snapshots.append(len(kwargs["results"]))
+        runtime_task.update(kwargs)
+        return runtime_task
+
+    run_optimization_thread(
+        "task-6",
+        "strategy-dir",
+        [{"fast": value} for value in range(10)],
+        1,
+        persist_to_db=True,
+        artifact_root=str(artifact_root),
+        run_single_trial_fn=lambda strategy_dir, params, trial_index, tmp_base, root: {
+            "success": True,
+            "params": params,
+            "trial_index": trial_index,
+            "metrics": {"annual_return": float(trial_index)},
+        },
+        is_cancelled_fn=lambda task_id, persist_to_db: False,
+        persist_runtime_task_fn=lambda *args, **kwargs: persist_calls.append(kwargs) or True,
+        get_task_fn=lambda task_id: runtime_task,
+        update_task_fn=_update_task,
+        process_pool_executor_cls=DummyExecutor,
+        as_completed_fn=lambda futures: list(futures.keys()),
+        mkdtemp_fn=lambda prefix: str(tmp_path / "tmp_runner"),
+        rmtree_fn=lambda path, ignore_errors=True: None,
+        flush_interval=3600.0,
+    )
+
+    # One flush for the first trial, one final snapshot; no per-trial copies.
+    assert result_snapshots == [1, 10]
+    assert len(persist_calls) == 2
+    assert runtime_task["completed"] == 10
+    manifest = json.loads((artifact_root / "manifest.json").read_text(encoding="utf-8"))
+    assert [t["trial_index"] for t in manifest["trial_artifacts"]] == list(range(10))
+
+
+def test_thread_runner_bounds_in_flight_trials_and_stops_on_cancel():
+    class DummyFuture:
+        def __init__(self, payload):
+            self.payload = payload
+            self.cancelled = False
+
+        def result(self, timeout=None):
+            return self.payload
+
+        def cancel(self):
+            self.cancelled = True
+
+    submitted: list[int] = []
+    peak_in_flight: list[int] = []
+
+    class DummyExecutor:
+        def __init__(self, max_workers):
+            self.max_workers = max_workers
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, exc_type, exc, tb):
+            return False
+
+        def submit(self, fn, *args):
+            submitted.append(args[2])
+            return DummyFuture(fn(*args))
+
+    def _as_completed(futures):
+        peak_in_flight.append(len(futures))
+        return list(futures.keys())
+
+    def _grid():
+        for value in range(1_000_000):
+            yield {"fast": value}
+
+    runtime_task = {"status": TaskStatus.RUNNING.value, "failed": 0, "results": []}
+
+    def _update_task(_task_id, **kwargs):
+        runtime_task.update(kwargs)
+        return runtime_task
+
+    run_optimization_thread(
+        "task-7",
+        "strategy-dir",
+        _grid(),
+        2,
+        persist_to_db=False,
+        run_single_trial_fn=lambda strategy_dir, params, trial_index, tmp_base, root: {
+            "success": True,
+            "params": params,
+            "trial_index": trial_index,
+            "metrics": {"annual_return": 1.0},
+        },
+        is_cancelled_fn=lambda task_id, persist_to_db: runtime_task.get("completed", 0) >= 5,
+        persist_runtime_task_fn=lambda *args, **kwargs: True,
+        get_task_fn=lambda task_id: runtime_task,
+        update_task_fn=_update_task,
+        process_pool_executor_cls=DummyExecutor,
+        as_completed_fn=_as_completed,
+        mkdtemp_fn=lambda prefix: "/tmp/thread-runner-test",
+        rmtree_fn=lambda path, ignore_errors=True: None,
+    )
+
+    assert max(peak_in_flight) == 4
+    assert runtime_task["completed"] == 5
+    assert submitted == list(range(8))
+
+
+def test_thread_runner_batch_mode_reruns_only_top_trials_for_artifacts(tmp_path: Path):
+    class DummyFuture:
+        def __init__(self, payload):
+            self.payload = payload
+
+        def result(self, timeout=None):
+            return self.payload
+
+        def cancel(self):
+            return None
+
+    class DummyExecutor:
+        def __init__(self, max_workers):
+            self.max_workers = max_workers
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, exc_type, exc, tb):
+            return False
+
+        def submit(self, fn, *args):
+            return DummyFuture(fn(*args))
+
+    batches: list[list[int]] = []
+    reruns: list[int] = []
+
+    def _run_batch(strategy_dir, chunk, tmp_base):
+        batches.append([index for index, _params in chunk])
+        return [
+            {
+                "success": True,
+                "params": params,
+                "trial_index": index,
+                "metrics": {"annual_return": float(params["fast"])},
+            }
+            for index, params in chunk
+        ]
+
+    def _run_single(strategy_dir, params, trial_index, tmp_base, root):
+        reruns.append(trial_index)
+        return {"success": True, "artifact_path": f"{root}/trial_{trial_index + 1:04d}"}
+
+    runtime_task = {"status": TaskStatus.RUNNING.value, "failed": 0, "results": []}
+
+    def _update_task(_task_id, **kwargs):
+        runtime_task.update(kwargs)
+        return runtime_task
+
+    artifact_root = tmp_path / "optimization_runs" / "task-8"
+    run_optimization_thread(
+        "task-8",
+        "strategy-dir",
+        [{"fast": value} for value in range(10)],
+        2,
+        persist_to_db=False,
+        artifact_root=str(artifact_root),
+        run_single_trial_fn=_run_single,
+        is_cancelled_fn=lambda task_id, persist_to_db: False,
+        persist_runtime_task_fn=lambda *args, **kwargs: True,
+        get_task_fn=lambda task_id: runtime_task,
+        update_task_fn=_update_task,
+        process_pool_executor_cls=DummyExecutor,
+        as_completed_fn=lambda futures: list(futures.keys()),
+        mkdtemp_fn=lambda prefix: str(tmp_path / "tmp_runner"),
+        rmtree_fn=lambda path, ignore_errors=True: None,
+        run_trial_batch_fn=_run_batch,
+        batch_size=4,
+        artifact_top_k=2,
+    )
+
+    assert batches == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]]
+    assert sorted(reruns) == [8, 9]
+    assert runtime_task["completed"] == 10
+    with_artifacts = [r["trial_index"] for r in runtime_task["results"] if "artifact_path" in r]
+    assert sorted(with_artifacts) == [8, 9]
@@ -174,7 +174,7 @@ class TestGenerateParamGrid:
         result = generate_param_grid({})
         # itertools.product with no args returns [()] which becomes [{}]
         # This is expected behavior - empty dict represents one empty parameter combination
-        assert result == [{}]
+        assert list(result) == [{}]
 
     def test_step_larger_than_range(self):
         """Test step larger than range."""
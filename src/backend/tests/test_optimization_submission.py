@@ -11,11 +11,11 @@ from app.services.optimization_submission import generate_param_grid, submit_opt
 class TestGenerateParamGrid:
     def test_single_param(self):
         grid = generate_param_grid({"fast": {"start": 5, "end": 15, "step": 5}})
-        assert grid == [{"fast": 5.0}, {"fast": 10.0}, {"fast": 15.0}]
+        assert list(grid) == [{"fast": 5.0}, {"fast": 10.0}, {"fast": 15.0}]
 
     def test_int_type(self):
         grid = generate_param_grid({"period": {"start": 10, "end": 30, "step": 10, "type": "int"}})
-        assert grid == [{"period": 10}, {"period": 20}, {"period": 30}]
+        assert list(grid) == [{"period": 10}, {"period": 20}, {"period": 30}]
 
     def test_two_params_cartesian_product(self):
         grid = generate_param_grid(
@@ -30,7 +30,7 @@ class TestGenerateParamGrid:
 
     def test_single_value_range(self):
         grid = generate_param_grid({"x": {"start": 5, "end": 5, "step": 1}})
-        assert grid == [{"x": 5.0}]
+        assert list(grid) == [{"x": 5.0}]
 
     def test_float_step(self):
         grid = generate_param_grid({"x": {"start": 0.1, "end": 0.3, "step": 0.1}})
@@ -39,7 +39,33 @@ class TestGenerateParamGrid:
 
     def test_empty_params(self):
         grid = generate_param_grid({})
-        assert grid == [{}]
+        assert list(grid) == [{}]
+
+    def test_large_grid_is_lazy(self):
+        grid = generate_param_grid(
+            {
+                "a": {"start": 1, "end": 1000, "step": 1, "type": "int"},
+                "b": {"start": 1, "end": 1000, "step": 1, "type": "int"},
+                "c": {"start": 1, "end": 1000, "step": 1, "type": "int"},
+            }
+        )
+        assert len(grid) == 1_000_000_000
+        assert grid[0] == {"a": 1, "b": 1, "c": 1}
+        assert grid[1001] == {"a": 1, "b": 2, "c": 2}
+        assert grid[-1] == {"a": 1000, "b": 1000, "c": 1000}
+        assert next(iter(grid)) == grid[0]
+
+    def test_indexing_matches_iteration(self):
+        grid = generate_param_grid(
+            {
+                "a": {"start": 1, "end": 3, "step": 1, "type": "int"},
+                "b": {"start": 0.5, "end": 1.0, "step": 0.5},
+            }
+        )
+        assert [grid[i] for i in range(len(grid))] == list(grid)
+        assert grid[1:3] == list(grid)[1:3]
+        with pytest.raises(IndexError):
+            grid[len(grid)]
 
 
 class TestSubmitOptimization:
@@ -4,6 +4,10 @@ import threading
 from datetime import datetime, timedelta, timezone
 from unittest.mock import patch
 
+import pytest
+
+from app.models.optimization import OptimizationTask
+from app.services.optimization_execution_manager import OptimizationExecutionManager
 from app.services.optimization_task_state import (
     METRIC_NAMES,
     _runtime_tasks,
@@ -507,7 +511,145 @@ class TestBuildResultsResponse:
         assert resp["rows"] == []
         assert resp["best"] is None
 
+    def test_top_k_selection_matches_full_sort(self):
+        results = [
+            {"params": {"fast": i}, "metrics": {"annual_return": (i * 7) % 5, "max_drawdown": i}}
+            for i in range(20)
+        ]
+        task = {"status": "running", "results": results}
+
+        full = build_results_response("t1", task)["rows"]
+        top = build_results_response("t1", task, limit=3)["rows"]
+        lowest_dd = build_results_response(
+            "t1", task, sort_by="max_drawdown", descending=False, limit=2
+        )
+
+        assert top == full[:3]
+        assert [row["result_index"] for row in lowest_dd["rows"]] == [0, 1]
+        assert lowest_dd["best"]["max_drawdown"] == 0
+
+    def test_mixed_value_types_sort_without_error(self):
+        results = [
+            {"params": {"fast": 1}, "metrics": {"annual_return": None}},
+            {"params": {"fast": 2}, "metrics": {"annual_return": 3.0}},
+            {"params": {"fast": 3}, "metrics": {"annual_return": "n/a"}},
+            {"params": {"fast": 4}, "metrics": {"annual_return": float("nan")}},
+            {"params": {"fast": 5}, "metrics": {"annual_return": 7}},
+            {"params": {"fast": 6}, "metrics": {}},
+        ]
+        task = {"status": "completed", "results": results}
+
+        desc = build_results_response("t1", task)["rows"]
+        asc = build_results_response("t1", task, descending=False)["rows"]
+        top = build_results_response("t1", task, limit=2)["rows"]
+
+        assert [row["fast"] for row in desc] == [5, 2, 3, 1, 4, 6]
+        assert [row["fast"] for row in asc] == [2, 5, 3, 1, 4, 6]
+        assert top == desc[:2]
+
+    def test_offset_pages_through_sorted_rows(self):
+        results = [{"params": {"fast": i}, "metrics": {"annual_return": i}} for i in range(10)]
+        task = {"status": "completed", "results": results}
+
+        page = build_results_response("t1", task, limit=3, offset=3)["rows"]
+        tail = build_results_response("t1", task, offset=8)["rows"]
+
+        assert [row["fast"] for row in page] == [6, 5, 4]
+        assert [row["fast"] for row in tail] == [1, 0]
+
     def test_metric_names_constant(self):
         assert "sharpe_ratio" in METRIC_NAMES
         assert "total_return" in METRIC_NAMES
         assert "max_drawdown" in METRIC_NAMES
+
+
+@pytest.mark.asyncio
+class TestTrialStorage:
+    """Per-trial rows of ``optimization_trials`` against the test DB."""
+
+    async def _create(self, manager: OptimizationExecutionManager) -> str:
+        task = await manager.create_task("user1", "s1", 6, {"fast": {}}, 2)
+        return task.id
+
+    async def test_progress_appends_only_new_trials(self):
+        from sqlalchemy import select
+
+        from app.db.database import async_session_maker
+        from app.models.optimization import OptimizationTrial
+
+        manager = OptimizationExecutionManager()
+        task_id = await self._create(manager)
+        results = [{"params": {"fast": 1}, "metrics": {"annual_return": 1.0}, "trial_index": 0}]
+
+        await manager.update_progress(task_id, 1, 0, results)
+        results.append({"params": {"fast": 2}, "metrics": {"annual_return": 2.0}})
+        await manager.update_progress(task_id, 2, 0, results)
+        await manager.update_progress(task_id, 2, 0, results)
+
+        async with async_session_maker() as session:
+            rows = (
+                await session.scalars(
+                    select(OptimizationTrial).order_by(OptimizationTrial.result_index)
+                )
+            ).all()
+            task = await session.get(OptimizationTask, task_id)
+        assert [(row.result_index, row.params["fast"]) for row in rows] == [(0, 1), (1, 2)]
+        assert rows[0].trial_index == 0
+        assert rows[1].annual_return == 2.0
+        assert task.results == []
+        assert task.completed == 2
+
+    async def test_finished_task_takes_over_late_artifact_paths(self):
+        manager = OptimizationExecutionManager()
+        task_id = await self._create(manager)
+        results = [{"params": {"fast": i}, "metrics": {"annual_return": i}} for i in range(2)]
+        await manager.update_progress(task_id, 2, 0, results)
+
+        results[1]["artifact_path"] = "/artifacts/1"
+        await manager.update_progress(task_id, 2, 0, results, status="completed")
+
+        assert (await manager.get_trial(task_id, 1))["artifact_path"] == "/artifacts/1"
+        assert "artifact_path" not in await manager.get_trial(task_id, 0)
+        assert await manager.get_trial(task_id, 2) is None
+
+    async def test_list_trials_pages_in_sql_with_missing_values_last(self):
+        manager = OptimizationExecutionManager()
+        task_id = await self._create(manager)
+        values = [5.0, None, 9.0, "n/a", 1.0, 7.0]
+        results = [
+            {"params": {"fast": i, "label": f"p{i % 3}"}, "metrics": {"sharpe_ratio": value}}
+            for i, value in enumerate(values)
+        ]
+        await manager.update_progress(task_id, 6, 0, results, status="completed")
+
+        async def order(**kwargs):
+            page = await manager.list_trials(task_id, sort_by="sharpe_ratio", **kwargs)
+            return [index for index, _result in page]
+
+        assert await order() == [2, 5, 0, 4, 1, 3]
+        assert await order(descending=False) == [4, 0, 5, 2, 1, 3]
+        assert await order(limit=2, offset=3) == [4, 1]
+        assert await order(limit=2, offset=5) == [3]
+        assert await order(offset=6) == []
+
+        by_param = await manager.list_trials(task_id, sort_by="label", descending=False, limit=3)
+        assert [index for index, _result in by_param] == [0, 3, 1]
+        assert await manager.list_trials("missing-task") is None
+
+    async def test_legacy_json_results_are_still_served(self):
+        from app.db.database import async_session_maker
+
+        manager = OptimizationExecutionManager()
+        task_id = await self._create(manager)
+        async with async_session_maker() as session:
+            task = await session.get(OptimizationTask, task_id)
+            task.results = [
+                {"params": {"fast": 1}, "metrics": {"annual_return": 1.0}},
+                {"params": {"fast": 2}, "metrics": {"annual_return": 2.0}},
+            ]
+            await session.commit()
+
+        page = await manager.list_trials(task_id, limit=1)
+
+        assert [(index, result["params"]) for index, result in page] == [(1, {"fast": 2})]
+        assert (await manager.get_trial(task_id, 0))["params"] == {"fast": 1}
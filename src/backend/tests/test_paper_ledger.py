@@ -0,0 +1,258 @@
+"""
+Paper trading write-behind ledger tests (batched flush, WAL replay, service path).
+"""
+
+import json
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.db.sql_repository import SQLRepository
+from app.models.paper_trading import Account, Order, OrderStatus, PaperTrade, Position
+from app.services.paper_ledger import PaperLedger
+from app.services.paper_trading_service import PaperTradingService
+from app.utils.process_lease import ProcessLease
+
+
+async def _account(initial_cash: float = 10_000.0) -> Account:
+    return await SQLRepository(Account).create(
+        Account(
+            user_id="u1",
+            name="paper",
+            initial_cash=initial_cash,
+            current_cash=initial_cash,
+            total_equity=initial_cash,
+            commission_rate=0.0,
+        )
+    )
+
+
+async def _order(account_id: str, side: str = "buy", size: int = 10) -> Order:
+    return await SQLRepository(Order).create(
+        Order(account_id=account_id, symbol="000001.SZ", order_type="market", side=side, size=size)
+    )
+
+
+@pytest.mark.asyncio
+async def test_flush_coalesces_rows_into_one_transaction(tmp_path):
+    account = await _account()
+    ledger = PaperLedger(tmp_path, flush_interval=60, flush_batch=3)
+    await ledger.start()
+
+    ledger.record([("account", {"id": account.id, "current_cash": 9_000.0})])
+    ledger.record(
+        [
+            ("account", {"id": account.id, "current_cash": 8_000.0}),
+            ("position", {"id": "p1", "account_id": account.id, "symbol": "X", "size": 5}),
+        ]
+    )
+    assert ledger.stats()["pending_records"] == 3
+    assert ledger._wakeup.is_set()
+
+    assert await ledger.flush() == 3
+    assert (await SQLRepository(Account).get_by_id(account.id)).current_cash == 8_000.0
+    assert (await SQLRepository(Position).get_by_id("p1")).size == 5
+    assert ledger.stats()["lag_seconds"] == 0.0
+
+    # Rows already in the table are updated, not inserted twice.
+    ledger.record([("position", {"id": "p1", "account_id": account.id, "symbol": "X", "size": 7})])
+    await ledger.shutdown()
+    assert (await SQLRepository(Position).get_by_id("p1")).size == 7
+    assert [p.name for p in tmp_path.iterdir()] == ["writer.lock"]
+
+
+@pytest.mark.asyncio
+async def test_start_replays_wal_left_by_a_crash(tmp_path):
+    account = await _account()
+    crashed = PaperLedger(tmp_path, flush_interval=60)
+    await crashed.start()
+    crashed._task.cancel()
+    filled_at = datetime(2024, 1, 2, 10, 0, tzinfo=timezone.utc)
+    crashed.record(
+        [
+            ("account", {"id": account.id, "current_cash": 1.0}),
+            (
+                "trade",
+                {
+                    "id": "t1",
+                    "account_id": account.id,
+                    "order_id": "o1",
+                    "symbol": "X",
+                    "side": "buy",
+                    "size": 1,
+                    "price": 2.0,
+                    "created_at": filled_at,
+                },
+            ),
+        ]
+    )
+    crashed._wal.write('{"kind": "account", "row": {"id"')  # torn write
+    _crash(crashed)
+
+    ledger = PaperLedger(tmp_path, flush_interval=60)
+    await ledger.start()
+    try:
+        assert ledger.flushed_records == 2
+        assert (await SQLRepository(Account).get_by_id(account.id)).current_cash == 1.0
+        trade = await SQLRepository(PaperTrade).get_by_id("t1")
+        assert trade.created_at.replace(tzinfo=timezone.utc) == filled_at
+        assert not crashed.segment_dir.exists()
+        assert len(list(ledger.segment_dir.glob("*.wal"))) == 1  # the live segment
+    finally:
+        await ledger.shutdown()
+
+
+def _crash(ledger: PaperLedger) -> None:
+    # What the OS does when the process dies: files closed, leases dropped.
+    ledger._task.cancel()
+    ledger._wal.close()
+    ledger._segment_lease.release()
+    ledger._writer.release()
+
+
+@pytest.mark.asyncio
+async def test_ledgers_sharing_a_directory_have_one_writer(tmp_path):
+    account = await _account()
+    writer = PaperLedger(tmp_path, flush_interval=60)
+    other = PaperLedger(tmp_path, flush_interval=60)
+    await writer.start()
+    await other.start()
+    assert (writer.running, writer.standby) == (True, False)
+    assert (other.running, other.standby) == (False, True)
+
+    # A live process's segments are neither replayed nor deleted.
+    live = ProcessLease(tmp_path / "4242-live" / "lock")
+    assert live.acquire()
+    live_segment = tmp_path / "4242-live" / f"{1:012d}.wal"
+    row = {"id": account.id, "current_cash": 5.0}
+    live_segment.write_text(json.dumps({"kind": "account", "row": row}) + "\n")
+
+    writer.record([("account", {"id": account.id, "current_cash": 1.0})])
+    writer.record([("account", {"id": account.id, "current_cash": 2.0})])
+    await writer.flush()
+    writer.record([("account", {"id": account.id, "current_cash": 3.0})])
+    assert live_segment.exists()
+    _crash(writer)
+    await other.shutdown()
+
+    # The next writer replays the dead writer's segments only.
+    successor = PaperLedger(tmp_path, flush_interval=60)
+    await successor.start()
+    try:
+        assert successor.flushed_records == 1
+        assert (await SQLRepository(Account).get_by_id(account.id)).current_cash == 3.0
+        assert not writer.segment_dir.exists()
+        assert live_segment.exists()
+    finally:
+        await successor.shutdown()
+        live.release()
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_rows_and_reports_lag(tmp_path):
+    clock = [100.0]
+    ledger = PaperLedger(tmp_path, flush_interval=60, clock=lambda: clock[0])
+    await ledger.start()
+    ledger.record([("order", {"id": "o1", "status": OrderStatus.FILLED})])
+    clock[0] += 2.5
+
+    with patch.object(ledger, "_write", AsyncMock(side_effect=RuntimeError("locked"))):
+        with pytest.raises(RuntimeError):
+            await ledger.flush()
+
+    ledger.record([("order", {"id": "o1", "filled_size": 3})])
+    assert ledger.pending_row("order", "o1") == {
+        "id": "o1",
+        "status": OrderStatus.FILLED,
+        "filled_size": 3,
+    }
+    stats = ledger.stats()
+    assert (stats["pending_records"], stats["failed_flushes"]) == (2, 1)
+    assert stats["lag_seconds"] == 2.5
+    assert len(list(ledger.segment_dir.glob("*.wal"))) == 2
+    ledger._pending = {kind: {} for kind in ledger._pending}
+    ledger._pending_records = 0
+    await ledger.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_service_settles_fills_in_memory_until_flushed(tmp_path):
+    account = await _account()
+    buy = await _order(account.id)
+    sell = await _order(account.id, side="sell", size=4)
+    ledger = PaperLedger(tmp_path, flush_interval=60)
+    await ledger.start()
+    service = PaperTradingService()
+
+    with (
+        patch("app.services.paper_trading_service.get_paper_ledger", return_value=ledger),
+        patch.object(service, "_notify_account_update", new_callable=AsyncMock),
+        patch.object(service, "_notify_position_update", new_callable=AsyncMock),
+    ):
+        await service._settle_fill(buy, account, 100.0)
+        await service._settle_fill(sell, await _account_copy(account.id), 110.0)
+
+        cached = await service.get_account(account.id)
+        assert cached.current_cash == 10_000.0 - 1_000.0 + 440.0
+        assert (await service._get_position(account.id, "000001.SZ")).size == 6
+        assert (await SQLRepository(Account).get_by_id(account.id)).current_cash == 10_000.0
+        assert not await service.cancel_order(sell.id, "u1")
+
+        await ledger.shutdown()
+
+    stored = await SQLRepository(Account).get_by_id(account.id)
+    assert stored.current_cash == 9_440.0
+    (position,) = await SQLRepository(Position).list(filters={"account_id": account.id})
+    assert (position.size, position.market_value) == (6, 660.0)
+    assert (await SQLRepository(Order).get_by_id(sell.id)).status == OrderStatus.FILLED
+    assert len(await SQLRepository(PaperTrade).list(filters={"account_id": account.id})) == 2
+
+
+async def _account_copy(account_id: str) -> Account:
+    # A stale read from the database, as the order path does.
+    return await SQLRepository(Account).get_by_id(account_id)
+
+
+@pytest.mark.asyncio
+async def test_reads_and_reloads_see_unflushed_fills(tmp_path):
+    account = await _account()
+    buy = await _order(account.id)
+    ledger = PaperLedger(tmp_path, flush_interval=60)
+    await ledger.start()
+    service = PaperTradingService()
+    notified = AsyncMock()
+
+    with (
+        patch("app.services.paper_trading_service.get_paper_ledger", return_value=ledger),
+        patch.object(service, "_notify_account_update", new_callable=AsyncMock),
+        patch.object(service, "_notify_position_update", notified),
+    ):
+        await service._settle_fill(buy, account, 100.0)
+        other = await _order(account.id, size=2)
+        other.symbol = "000002.SZ"
+        await service._settle_fill(other, await _account_copy(account.id), 50.0)
+        # Every position of the account is pushed on each fill.
+        assert [call.args[0].symbol for call in notified.await_args_list[-2:]] == [
+            "000001.SZ",
+            "000002.SZ",
+        ]
+
+        order = await service.get_order(buy.id)
+        assert (order.status, order.filled_size) == (OrderStatus.FILLED, 10)
+        (listed,), _total = await service.list_orders({"id": buy.id})
+        assert listed.avg_fill_price == 100.0
+
+        # Soft delete drops the cached copies; a reload still sees the fills.
+        assert await service.delete_account(account.id, "u1")
+        assert ledger.cached_account(account.id) is None
+        reloaded = ledger.adopt_account(await _account_copy(account.id))
+        assert reloaded.current_cash == 10_000.0 - 1_000.0 - 100.0
+        assert not reloaded.is_active
+        positions = await ledger.positions(account.id, lambda: service._load_positions(account.id))
+        assert {symbol: p.size for symbol, p in positions.items()} == {
+            "000001.SZ": 10,
+            "000002.SZ": 2,
+        }
+
+        await ledger.shutdown()
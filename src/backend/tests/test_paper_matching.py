@@ -0,0 +1,254 @@
+"""
+Paper trading matching engine tests (order books, quote triggering, settlement).
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from app.db.sql_repository import SQLRepository
+from app.models.paper_trading import Account, Order, OrderStatus, PaperTrade
+from app.services.paper_matching import Fill, MatchingEngine, RestingOrder
+from app.services.paper_trading_service import PaperTradingService
+from app.services.risk_control_service import RiskControlConfig, init_risk_control_service
+
+
+@pytest.fixture(autouse=True)
+def _fresh_risk_control():
+    """Each test starts without per-account risk state."""
+    init_risk_control_service(RiskControlConfig())
+
+
+def _order(order_id, side="buy", order_type="limit", limit=None, stop=None, symbol="000001.SZ"):
+    return RestingOrder(
+        order_id=order_id,
+        account_id="acc",
+        symbol=symbol,
+        side=side,
+        order_type=order_type,
+        size=100,
+        limit_price=limit,
+        stop_price=stop,
+    )
+
+
+def _engine() -> tuple[MatchingEngine, list[Fill]]:
+    settled: list[Fill] = []
+
+    async def on_fills(fills):
+        settled.extend(fills)
+
+    return MatchingEngine(on_fills), settled
+
+
+def test_limits_fill_in_price_time_priority():
+    engine, _settled = _engine()
+    engine.add(_order("b1", limit=10.0))
+    engine.add(_order("b2", limit=10.2))
+    engine.add(_order("b3", limit=10.2))
+    engine.add(_order("s1", side="sell", limit=10.5))
+
+    assert engine.on_price("000001.SZ", 10.3) == []
+    fills = engine.on_price("000001.sz", 10.15, bid=10.1, ask=10.2)
+    assert [(f.order.order_id, f.price, f.marketable) for f in fills] == [
+        ("b2", 10.2, False),
+        ("b3", 10.2, False),
+    ]
+
+    assert [f.order.order_id for f in engine.on_price("000001.SZ", 10.6)] == ["s1"]
+    assert engine.order_count == 1
+    assert engine.last_price("000001.SZ") == 10.6
+
+
+def test_stops_trigger_and_stop_limits_rest_as_limits():
+    engine, _settled = _engine()
+    engine.add(_order("stop", side="sell", order_type="stop", stop=9.5))
+    engine.add(_order("stop-limit", side="buy", order_type="stop_limit", stop=11.0, limit=11.2))
+
+    # The stop-limit triggers above 11 but its limit is not reachable yet.
+    assert engine.on_price("000001.SZ", 11.5) == []
+    assert len(engine.book("000001.SZ")) == 2
+    assert [f.order.order_id for f in engine.on_price("000001.SZ", 11.1)] == ["stop-limit"]
+
+    (fill,) = engine.on_price("000001.SZ", 9.4)
+    assert (fill.order.order_id, fill.price, fill.marketable) == ("stop", 9.4, True)
+
+
+def test_cancel_and_compaction():
+    engine, _settled = _engine()
+    for i in range(100):
+        engine.add(_order(f"o{i}", limit=float(i)))
+    for i in range(99):
+        assert engine.cancel(f"o{i}")
+    assert not engine.cancel("o0")
+
+    book = engine.book("000001.SZ")
+    assert len(book) == 1
+    assert len(book.buy_limits.heap) < 100
+    assert [f.order.order_id for f in engine.on_price("000001.SZ", 50.0)] == ["o99"]
+
+
+@pytest.mark.asyncio
+async def test_ticks_dispatch_fills_to_the_loop():
+    engine, settled = _engine()
+    engine._loop = asyncio.get_running_loop()
+    engine.add(_order("b1", limit=1.10, symbol="EURUSD"))
+
+    engine._on_tick("MT5", {"symbol": "EURUSD", "bid": 1.09, "ask": 1.095})
+    assert engine.is_settling("b1")
+    assert not engine.cancel("b1")
+
+    await engine.shutdown()
+    for _ in range(3):
+        await asyncio.sleep(0)
+    assert [f.order.order_id for f in settled] == ["b1"]
+    assert not engine.is_settling("b1")
+
+
+def test_gateway_ticks_use_bid_and_ask_price_fields():
+    import json
+
+    from app.services.quote_service import _ZmqTickReceiver
+
+    engine, _settled = _engine()
+    engine.add(_order("b1", limit=1.112, symbol="EURUSD"))
+    engine.add(_order("s1", side="sell", limit=1.108, symbol="EURUSD"))
+    receiver = _ZmqTickReceiver("MT5", "tcp://127.0.0.1:1", history_size=8)
+    receiver.add_listener(engine._on_tick)
+    tick = {
+        "symbol": "EURUSD",
+        "exchange": "MT5",
+        "timestamp": 1_704_189_600.0,
+        "price": 1.11,
+        "bid_price": 1.105,
+        "ask_price": 1.115,
+        "volume": 10,
+    }
+    frames = [json.dumps(tick).encode()]
+    receiver._drain_batch(lambda: frames.pop(0) if frames else None)
+
+    # Last price 1.11 would cross both limits; the real bid/ask cross neither.
+    assert not engine.is_settling("b1")
+    assert not engine.is_settling("s1")
+    assert engine._quotes["EURUSD"] == (1.105, 1.115)
+
+
+@pytest.mark.asyncio
+async def test_service_rests_limit_orders_and_settles_fills():
+    service = PaperTradingService()
+    engine, _settled = _engine()
+    account = SimpleNamespace(
+        id="acc",
+        commission_rate=0.001,
+        slippage_rate=0.01,
+        current_cash=10_000.0,
+        total_equity=10_000.0,
+    )
+    order = Mock(id="o1", account_id="acc", status=OrderStatus.PENDING, side="buy", size=100)
+    service.account_repo = SimpleNamespace(get_by_id=AsyncMock(return_value=account))
+    service.order_repo = SimpleNamespace(create=AsyncMock(return_value=order))
+
+    with (
+        patch("app.services.paper_trading_service.get_matching_engine", return_value=engine),
+        patch.object(service, "_notify_order_update", new_callable=AsyncMock),
+        patch.object(service, "_process_order", new_callable=AsyncMock) as process,
+    ):
+        await service.submit_order("acc", "000001.SZ", "limit", "buy", 100, price=10.0)
+        with pytest.raises(ValueError, match="Stop price"):
+            await service.submit_order("acc", "000001.SZ", "stop", "sell", 100)
+
+    process.assert_not_called()
+    assert engine.order_count == 1
+
+    (fill,) = engine.on_price("000001.SZ", 9.9)
+    stop = Fill(_order("o2", order_type="stop", stop=9.0), 9.9, marketable=True)
+    service.order_repo.get_by_id = AsyncMock(side_effect=[order, order])
+    with patch.object(service, "_settle_fill", new_callable=AsyncMock) as settle:
+        await service.settle_resting_fills([fill, stop])
+
+    assert [call.args[2] for call in settle.await_args_list] == [9.9, pytest.approx(9.999)]
+
+
+@pytest.mark.asyncio
+async def test_fills_are_claimed_once_across_workers():
+    account = await SQLRepository(Account).create(
+        Account(
+            user_id="u1",
+            name="paper",
+            initial_cash=10_000.0,
+            current_cash=10_000.0,
+            commission_rate=0.0,
+        )
+    )
+    orders = [
+        await SQLRepository(Order).create(
+            Order(
+                account_id=account.id,
+                symbol="000001.SZ",
+                order_type="limit",
+                side="buy",
+                size=10,
+                price=10.0,
+            )
+        )
+        for _ in range(2)
+    ]
+    # Every worker's engine matches the same resting orders; the second
+    # worker read them before the first one settled.
+    fills = [Fill(_order(str(order.id), limit=10.0), 9.9, marketable=False) for order in orders]
+    stale = [await SQLRepository(Order).get_by_id(order.id) for order in orders]
+    worker = PaperTradingService()
+
+    with (
+        patch.object(PaperTradingService, "_notify_order_update", new_callable=AsyncMock),
+        patch.object(PaperTradingService, "_notify_account_update", new_callable=AsyncMock),
+        patch.object(PaperTradingService, "_notify_position_update", new_callable=AsyncMock),
+    ):
+        assert await worker.cancel_order(orders[1].id, "u1")
+        await worker.settle_resting_fills(fills)
+        for order in stale:
+            await PaperTradingService()._settle_fill(order, account, 9.9)
+        assert not await worker.cancel_order(orders[0].id, "u1")
+
+    trades = await SQLRepository(PaperTrade).list(filters={"account_id": account.id})
+    assert [trade.order_id for trade in trades] == [orders[0].id]
+    stored = [await SQLRepository(Order).get_by_id(order.id) for order in orders]
+    assert [order.status for order in stored] == [OrderStatus.FILLED, OrderStatus.CANCELLED]
+    assert (await SQLRepository(Account).get_by_id(account.id)).current_cash == 10_000.0 - 99.0
+
+
+@pytest.mark.asyncio
+async def test_writer_takes_orders_submitted_in_standby_workers():
+    account = await SQLRepository(Account).create(
+        Account(user_id="u1", name="paper", initial_cash=10_000.0, current_cash=10_000.0)
+    )
+    standby = PaperTradingService()
+    with (
+        patch(
+            "app.services.paper_trading_service.get_paper_ledger",
+            return_value=SimpleNamespace(standby=True, running=False),
+        ),
+        patch.object(PaperTradingService, "_notify_order_update", new_callable=AsyncMock),
+        patch.object(PaperTradingService, "_process_order", new_callable=AsyncMock) as process,
+    ):
+        market = await standby.submit_order(account.id, "000001.SZ", "market", "buy", 10)
+        limits = [
+            await standby.submit_order(account.id, "000001.SZ", "limit", "buy", 10, price=price)
+            for price in (9.0, 8.0)
+        ]
+        process.assert_not_called()
+
+        # The writer's engine reloads them; market orders are processed there.
+        engine = MatchingEngine(AsyncMock(), PaperTradingService().load_pending_orders)
+        await engine.reload()
+        await asyncio.sleep(0)
+        assert [call.args[0] for call in process.await_args_list] == [market.id]
+        assert engine.order_count == 2
+
+        # A cancel in a standby worker reaches the writer's books on the next reload.
+        assert await standby.cancel_order(limits[0].id, "u1")
+        await engine.reload()
+        assert engine.order_count == 1
+        assert engine.book("000001.SZ").buy_limits.top()[1].order_id == limits[1].id
@@ -23,6 +23,18 @@ from app.models.paper_trading import (
     OrderStatus,
 )
 from app.services.paper_trading_service import PaperTradingService
+from app.services.risk_control_service import (
+    RiskAlertType,
+    RiskControlConfig,
+    get_risk_control_service,
+    init_risk_control_service,
+)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_risk_control():
+    """Each test starts without per-account risk state."""
+    init_risk_control_service(RiskControlConfig())
 
 
 class TestPaperTradingServiceInitialization:
@@ -108,6 +120,7 @@ class TestSubmitOrder:
         mock_account = Mock()
         mock_account.id = "acc_123"
         mock_account.commission_rate = 0.001
+        mock_account.total_equity = 1_000_000.0
 
         mock_order = Mock()
         mock_order.id = "order_123"
@@ -119,11 +132,31 @@ class TestSubmitOrder:
 
         with patch.object(service, "_notify_order_update", new_callable=AsyncMock):
             result = await service.submit_order(
-                "acc_123", "BTC/USDT", "market", "buy", 10, price=50000.0
+                "acc_123", "BTC/USDT", "market", "buy", 1, price=50000.0
             )
 
             assert result is not None
 
+    async def test_submit_order_rejected_by_risk_control(self):
+        """Orders failing the pre-trade checks raise before the order is created."""
+        service = PaperTradingService()
+
+        mock_account = Mock()
+        mock_account.id = "acc_risk"
+        mock_account.commission_rate = 0.001
+        mock_account.total_equity = 100_000.0
+
+        service.account_repo = AsyncMock()
+        service.account_repo.get_by_id = AsyncMock(return_value=mock_account)
+        service.order_repo = AsyncMock()
+
+        with pytest.raises(ValueError, match="risk control"):
+            await service.submit_order("acc_risk", "BTC/USDT", "limit", "buy", 1, price=50000.0)
+
+        service.order_repo.create.assert_not_awaited()
+        (alert,) = get_risk_control_service().get_alerts(instance_id="acc_risk")
+        assert alert.alert_type == RiskAlertType.POSITION_LIMIT
+
     async def test_submit_order_account_not_found(self):
         """Test order submission with non-existent account raises ValueError."""
         service = PaperTradingService()
@@ -141,6 +174,7 @@ class TestSubmitOrder:
         mock_account = Mock()
         mock_account.id = "acc_123"
         mock_account.commission_rate = 0.001
+        mock_account.total_equity = 1_000_000.0
 
         mock_order = Mock()
         mock_order.id = "order_123"
@@ -156,7 +190,7 @@ class TestSubmitOrder:
                 "BTC/USDT",
                 "limit",
                 "buy",
-                10,
+                1,
                 price=49000.0,
                 stop_price=48000.0,
                 limit_price=51000.0,
@@ -187,15 +221,26 @@ class TestProcessOrder:
         mock_account.slippage_rate = 0.001
         mock_account.current_cash = 600000.0
         mock_account.commission_rate = 0.001
+        mock_account.total_equity = 600000.0
 
         service.order_repo = AsyncMock()
         service.order_repo.get_by_id = AsyncMock(return_value=mock_order)
 
+        async def _update_account(account, order, price, commission):
+            account.total_equity -= commission
+
         with patch.object(service, "_get_simulated_price", return_value=50000.0):
-            with patch.object(service, "_fill_order", new_callable=AsyncMock):
-                with patch.object(service, "_update_position", new_callable=AsyncMock):
-                    with patch.object(service, "_update_account", new_callable=AsyncMock):
-                        await service._process_order("order_123", "acc_123", mock_account)
+            with patch.object(service, "_claim_order", AsyncMock(return_value=True)):
+                with patch.object(service, "_fill_order", new_callable=AsyncMock):
+                    with patch.object(service, "_update_position", new_callable=AsyncMock):
+                        with patch.object(service, "_update_account", _update_account):
+                            await service._process_order("order_123", "acc_123", mock_account)
+
+        # The fill reaches the account's risk state
+        state = get_risk_control_service().get_exposure("acc_123")
+        assert state.trade_count == 1
+        assert state.positions == {"BTC/USDT": pytest.approx(10 * 50000.0 * 1.001)}
+        assert state.daily_pnl == pytest.approx(-10 * 50000.0 * 1.001 * 0.001)
 
     async def test_process_order_order_not_found(self):
         """Test processing of non-existent order logs without exception."""
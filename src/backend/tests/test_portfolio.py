@@ -587,8 +587,11 @@ class TestPortfolioEdgeCases:
         from pathlib import Path
 
         with patch("app.api.portfolio_api.get_live_trading_manager") as mock_get_mgr:
-            with patch("app.api.portfolio_api.find_latest_log_dir", return_value=Path("/tmp/test")):
-                with patch("app.api.portfolio_api.parse_value_log") as mock_parse:
+            with patch(
+                "app.services.portfolio_equity_service.find_latest_log_dir",
+                return_value=Path("/tmp/test"),
+            ):
+                with patch("app.services.portfolio_equity_service.parse_value_log") as mock_parse:
                     # Mock different date ranges for different strategies
                     mock_parse.side_effect = [
                         {
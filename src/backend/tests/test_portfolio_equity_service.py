@@ -0,0 +1,120 @@
+"""
+Incremental portfolio equity aggregation tests.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from app.services import backtest_log_tailer
+from app.services import portfolio_equity_service as module
+from app.services.equity_alignment import align_equity_curves
+from app.services.portfolio_equity_service import PortfolioEquityService
+
+VALUE_HEADER = "log_time\tdt\tvalue\tcash\n"
+
+
+def _append(path: Path, text: str) -> None:
+    with open(path, "a", encoding="utf-8") as handle:
+        handle.write(text)
+
+
+def _bars(values: dict[str, float]) -> str:
+    return "".join(f"t\t{dt} 00:00:00\t{value}\t0\n" for dt, value in values.items())
+
+
+@pytest.fixture()
+def strategies(tmp_path: Path):
+    """Two strategies with a flat ``logs/`` directory each."""
+    dirs = {}
+    for name in ("s1", "s2"):
+        logs = tmp_path / name / "logs"
+        logs.mkdir(parents=True)
+        _append(logs / "value.log", VALUE_HEADER)
+        dirs[name] = logs
+
+    with (
+        patch.object(module, "get_strategy_dir", side_effect=lambda sid: tmp_path / sid),
+        patch.object(module, "find_latest_log_dir", side_effect=lambda d: d / "logs"),
+    ):
+        yield dirs
+
+
+INSTANCES = [
+    {"id": "i1", "strategy_id": "s1"},
+    {"id": "i2", "strategy_id": "s2"},
+]
+
+
+def _expected(dirs: dict[str, Path]):
+    from app.services.log_parser_service import parse_value_log
+
+    data = {name: parse_value_log(logs) for name, logs in dirs.items()}
+    return align_equity_curves(
+        {f"i{name[1]}": (d["dates"], d["equity_curve"]) for name, d in data.items() if d["dates"]},
+        {f"i{name[1]}": d["equity_curve"][0] for name, d in data.items() if d["dates"]},
+    )
+
+
+def test_appended_bars_match_full_alignment(strategies):
+    service = PortfolioEquityService()
+    _append(strategies["s1"] / "value.log", _bars({"2024-01-01": 100, "2024-01-03": 110}))
+    _append(strategies["s2"] / "value.log", _bars({"2024-01-02": 50}))
+
+    first = service.equity(service.refresh(INSTANCES))
+    assert first.dates == ["2024-01-01", "2024-01-02", "2024-01-03"]
+    assert first.total.tolist() == [150.0, 150.0, 160.0]
+
+    # s2 reports the last date again (same-day update) plus two new bars.
+    _append(strategies["s2"] / "value.log", _bars({"2024-01-03": 55, "2024-01-04": 60}))
+    _append(strategies["s1"] / "value.log", _bars({"2024-01-05": 90}))
+
+    with patch.object(module, "align_equity_curves", wraps=module.align_equity_curves) as align:
+        second = service.equity(service.refresh(INSTANCES))
+    align.assert_not_called()
+
+    expected = _expected(strategies)
+    assert second.dates == expected.dates
+    assert second.curves["i1"].tolist() == expected.curves["i1"].tolist()
+    assert second.curves["i2"].tolist() == expected.curves["i2"].tolist()
+    assert second.total.tolist() == expected.total().tolist()
+    assert second.drawdown.tolist()[-1] == pytest.approx(-(170 - 150) / 170)
+
+
+def test_unchanged_logs_are_not_reread(strategies):
+    service = PortfolioEquityService()
+    _append(strategies["s1"] / "value.log", _bars({"2024-01-01": 100}))
+    service.equity(service.refresh(INSTANCES))
+
+    with patch.object(
+        backtest_log_tailer, "_value_point", wraps=backtest_log_tailer._value_point
+    ) as parse_row:
+        portfolio = service.equity(service.refresh(INSTANCES))
+
+    parse_row.assert_not_called()
+    assert portfolio.total.tolist() == [100.0]
+    assert list(portfolio.curves) == ["i1"]
+
+
+def test_out_of_order_and_rewritten_logs_realign(strategies):
+    service = PortfolioEquityService()
+    _append(strategies["s1"] / "value.log", _bars({"2024-01-02": 100, "2024-01-04": 120}))
+    _append(strategies["s2"] / "value.log", _bars({"2024-01-03": 10}))
+    service.equity(service.refresh(INSTANCES))
+
+    # A bar dated before the current timeline end forces a rebuild.
+    _append(strategies["s2"] / "value.log", _bars({"2024-01-01": 5}))
+    late = service.equity(service.refresh(INSTANCES))
+    assert late.dates[0] == "2024-01-01"
+
+    # A truncated file is no longer followed by offset but fully re-parsed.
+    (strategies["s1"] / "value.log").write_text(
+        VALUE_HEADER + _bars({"2024-01-02": 1}), encoding="utf-8"
+    )
+    rewritten = service.equity(service.refresh(INSTANCES))
+    expected = _expected(strategies)
+    assert rewritten.dates == expected.dates
+    assert rewritten.total.tolist() == expected.total().tolist()
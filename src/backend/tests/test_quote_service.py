@@ -53,6 +53,28 @@ def test_subscribe_symbols_on_gateway_tracks_only_mt5_accepted_symbols(monkeypat
     assert service._subscribed_symbols["MT5"] == {"EURUSD", "XAUUSD"}
 
 
+def test_ensure_symbol_feed_starts_receiver_and_subscribes(monkeypatch):
+    QuoteService._instance = None
+    service = QuoteService()
+    service._receivers = {}
+    service._subscribed_symbols = {}
+    receiver = SimpleNamespace(is_alive=True)
+
+    def ensure_receiver(source, mgr):
+        service._receivers[source] = receiver
+
+    def subscribe(source, symbols):
+        service._subscribed_symbols.setdefault(source, set()).update(symbols[:1])
+
+    monkeypatch.setattr(service, "_get_live_trading_manager", lambda: None)
+    monkeypatch.setattr(service, "_ensure_receiver", ensure_receiver)
+    monkeypatch.setattr(service, "_subscribe_symbols_on_gateway", subscribe)
+
+    assert service.ensure_symbol_feed("okx", ["BTC-USDT"]) is True
+    assert service.ensure_symbol_feed("OKX", ["BTC-USDT", "ETH-USDT"]) is False
+    assert service._receivers == {"OKX": receiver}
+
+
 class _DummyReceiver:
     def __init__(self) -> None:
         self.is_alive = False
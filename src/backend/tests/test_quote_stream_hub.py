@@ -0,0 +1,218 @@
+"""
+Quote WebSocket fan-out tests (conflation, deltas, slow consumers, routing).
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from app.services.quote_service import QuoteService, _ZmqTickReceiver
+from app.services.quote_stream_hub import QuoteStreamClient, QuoteStreamHub
+
+
+def _snapshot(source: str, *symbols: str) -> dict:
+    ticks = [
+        QuoteService._build_tick(source, source, symbol, {"name": symbol}, None, "")
+        for symbol in symbols
+    ]
+    return {"source": source, "ticks": ticks, "total": len(ticks)}
+
+
+class _Recorder:
+    def __init__(self) -> None:
+        self.messages: list[dict] = []
+
+    async def __call__(self, message: dict) -> None:
+        self.messages.append(message)
+
+
+async def _settle() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_ticks_are_conflated_into_per_symbol_deltas():
+    hub = QuoteStreamHub()
+    send = _Recorder()
+    client = QuoteStreamClient(send, max_rate=0)
+    hub.subscribe(client, _snapshot("MT5", "EURUSD", "XAUUSD"))
+
+    # Published from a receiver thread while the writer is not running.
+    def burst() -> None:
+        for price in (1.1, 1.2, 1.3):
+            hub.publish("MT5", {"symbol": "EURUSD", "price": price, "timestamp": 1})
+
+    thread = threading.Thread(target=burst)
+    thread.start()
+    thread.join()
+    await _settle()
+    assert client.pending == 1
+
+    writer = asyncio.create_task(client.run())
+    await _settle()
+    writer.cancel()
+
+    snapshot, quotes = send.messages
+    assert snapshot["type"] == "snapshot"
+    assert [t["symbol"] for t in snapshot["ticks"]] == ["EURUSD", "XAUUSD"]
+    assert quotes["type"] == "quotes"
+    (delta,) = quotes["ticks"]
+    assert delta["symbol"] == "EURUSD"
+    assert delta["last_price"] == 1.3
+    assert delta["status"] == "normal"
+    assert "name" not in delta and "bid_price" not in delta
+
+
+@pytest.mark.asyncio
+async def test_slow_consumer_is_dropped_with_bounded_outbox():
+    hub = QuoteStreamHub()
+    blocked = asyncio.Event()
+
+    async def stuck_send(message: dict) -> None:
+        await blocked.wait()
+
+    client = QuoteStreamClient(stuck_send, max_rate=0, send_timeout=0.05)
+    hub.subscribe(client, _snapshot("OKX", "BTC-USDT"))
+    writer = asyncio.create_task(client.run())
+
+    for i in range(1000):
+        hub.publish("OKX", {"symbol": "BTC-USDT", "price": 100 + i})
+        await asyncio.sleep(0)
+    assert client.pending <= 1
+
+    await asyncio.wait_for(writer, timeout=1.0)
+
+
+@pytest.mark.asyncio
+async def test_routing_to_broker_symbols_and_unsubscribe():
+    hub = QuoteStreamHub()
+    first, second = _Recorder(), _Recorder()
+    a = QuoteStreamClient(first, max_rate=0)
+    b = QuoteStreamClient(second, max_rate=0)
+    hub.subscribe(a, _snapshot("MT5", "EURUSD"))
+    hub.subscribe(b, _snapshot("MT5", "EURUSD", "GBPUSD"))
+    assert hub.subscriber_count("MT5") == 2
+
+    # Broker-suffixed symbol resolves to the requested one.
+    hub.publish("MT5", {"symbol": "EURUSD.a", "price": 1.05})
+    hub.publish("MT5", {"symbol": "GBPUSD", "price": 1.25})
+    await _settle()
+    assert a.pending == 1 and b.pending == 2
+
+    hub.unsubscribe(b)
+    assert b.pending == 0 and not b.subscriptions
+    hub.unsubscribe(a, "MT5")
+    assert hub.subscriber_count("MT5") == 0
+    hub.publish("MT5", {"symbol": "EURUSD", "price": 1.06})
+    await _settle()
+    assert a.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_subscribe_replays_ticks_newer_than_snapshot():
+    hub = QuoteStreamHub()
+    hub.publish("CTP", {"symbol": "rb2501", "price": 3500.0})
+
+    client = QuoteStreamClient(_Recorder(), max_rate=0)
+    hub.subscribe(client, _snapshot("CTP", "rb2501"))
+
+    assert client.pending == 1
+
+
+def test_receiver_notifies_listeners_on_seed():
+    seen = []
+    receiver = _ZmqTickReceiver("IB_WEB", "tcp://127.0.0.1:1")
+    receiver.add_listener(lambda source, payload: seen.append((source, payload["symbol"])))
+    receiver.add_listener(seen.append)  # failing listeners are isolated
+
+    receiver.seed_tick("AAPL", {"price": 1.0})
+
+    assert seen[0] == ("IB_WEB", "AAPL")
+
+
+@pytest.mark.asyncio
+async def test_websocket_endpoint_subscribes_and_cleans_up():
+    from types import SimpleNamespace
+    from unittest.mock import AsyncMock, MagicMock, patch
+
+    from fastapi import WebSocketDisconnect
+
+    from app.api import quote as quote_api
+
+    hub = QuoteStreamHub()
+    svc = MagicMock()
+    svc.open_quote_stream.return_value = _snapshot("MT5", "EURUSD")
+    incoming = ['{"action": "subscribe", "source": "MT5", "symbols": ["EURUSD"]}', "ping"]
+
+    async def receive_text():
+        if incoming:
+            return incoming.pop(0)
+        await asyncio.sleep(0.05)
+        raise WebSocketDisconnect()
+
+    ws = MagicMock()
+    ws.accept = AsyncMock()
+    ws.send_json = AsyncMock()
+    ws.receive_text = receive_text
+
+    with (
+        patch.object(
+            quote_api,
+            "get_websocket_current_user",
+            return_value=(SimpleNamespace(sub="u1"), "access-token"),
+        ),
+        patch.object(quote_api, "get_quote_service", return_value=svc),
+        patch.object(quote_api, "get_quote_stream_hub", return_value=hub),
+    ):
+        await quote_api.quote_stream_websocket(ws)
+
+    ws.accept.assert_awaited_once_with(subprotocol="access-token")
+    svc.open_quote_stream.assert_called_once_with("MT5", "u1", ["EURUSD"], hub.publish)
+    sent = [call.args[0]["type"] for call in ws.send_json.await_args_list]
+    assert sent == ["snapshot", "pong"]
+    assert hub.subscriber_count("MT5") == 0
+
+
+@pytest.mark.asyncio
+async def test_websocket_endpoint_logs_and_closes_on_writer_error(caplog):
+    from types import SimpleNamespace
+    from unittest.mock import AsyncMock, MagicMock, patch
+
+    from fastapi import status
+
+    from app.api import quote as quote_api
+
+    hub = QuoteStreamHub()
+    svc = MagicMock()
+    svc.open_quote_stream.return_value = _snapshot("MT5", "EURUSD")
+    incoming = ['{"action": "subscribe", "source": "MT5", "symbols": ["EURUSD"]}']
+
+    async def receive_text():
+        if incoming:
+            return incoming.pop(0)
+        await asyncio.Event().wait()
+
+    ws = MagicMock()
+    ws.accept = AsyncMock()
+    ws.send_json = AsyncMock(side_effect=TypeError("not JSON serializable"))
+    ws.receive_text = receive_text
+    ws.close = AsyncMock()
+
+    with (
+        patch.object(
+            quote_api,
+            "get_websocket_current_user",
+            return_value=(SimpleNamespace(sub="u1"), "access-token"),
+        ),
+        patch.object(quote_api, "get_quote_service", return_value=svc),
+        patch.object(quote_api, "get_quote_stream_hub", return_value=hub),
+        caplog.at_level("ERROR", logger=quote_api.logger.name),
+    ):
+        await asyncio.wait_for(quote_api.quote_stream_websocket(ws), timeout=5)
+
+    assert "Quote stream writer failed" in caplog.text
+    assert "not JSON serializable" in caplog.text
+    ws.close.assert_awaited_once_with(code=status.WS_1011_INTERNAL_ERROR)
+    assert hub.subscriber_count("MT5") == 0
@@ -190,19 +190,19 @@ class TestAlertManagement:
         assert len(strict_svc.get_alerts()) == 1
 
     def test_reset_daily_counters(self, svc: RiskControlService):
-        svc._daily_trades["a"] = 10
-        svc._daily_pnl["a"] = -500
-        svc._daily_trades["b"] = 5
+        svc.on_fill("a", "X", 100, pnl=-500)
+        svc.on_fill("b", "X", 100)
         svc.reset_daily_counters(instance_id="a")
-        assert "a" not in svc._daily_trades
-        assert "b" in svc._daily_trades
+        assert (svc.get_exposure("a").trade_count, svc.get_exposure("a").daily_pnl) == (0, 0.0)
+        assert svc.get_exposure("b").trade_count == 1
 
     def test_reset_all_counters(self, svc: RiskControlService):
-        svc._daily_trades["a"] = 10
-        svc._daily_pnl["a"] = -500
+        svc.on_fill("a", "X", 100, pnl=-500)
+        svc.on_fill("b", "X", 100)
         svc.reset_daily_counters()
-        assert len(svc._daily_trades) == 0
-        assert len(svc._daily_pnl) == 0
+        assert svc.get_exposure("a").trade_count == 0
+        assert svc.get_exposure("a").daily_pnl == 0.0
+        assert svc.get_exposure("b").trade_count == 0
 
 
 class TestConfigUpdate:
@@ -223,3 +223,76 @@ class TestGlobalInstance:
         svc = init_risk_control_service(custom)
         assert svc.config.max_daily_trades == 1
         assert get_risk_control_service() is svc
+
+
+class TestPreTradePipeline:
+    def test_fills_update_exposure_incrementally(self, strict_svc: RiskControlService):
+        strict_svc.update_balance("inst", 100000)
+        strict_svc.on_fill("inst", "AAPL", 8000)
+        strict_svc.on_fill("inst", "MSFT", -3000, pnl=-50)
+        strict_svc.on_fill("inst", "AAPL", -8000, pnl=200)
+
+        state = strict_svc.get_exposure("inst")
+        assert state.positions == {"MSFT": -3000}
+        assert state.total_exposure == 3000
+        assert (state.trade_count, state.daily_pnl, state.account_balance) == (3, 150, 100150)
+
+        strict_svc.update_position("inst", "MSFT", -2500)
+        assert state.total_exposure == 2500
+        strict_svc.reset_daily_counters("inst")
+        assert (state.trade_count, state.daily_pnl, state.initial_balance) == (0, 0.0, 100150)
+
+    def test_check_order_runs_enabled_checks_in_order(self, strict_svc: RiskControlService):
+        strict_svc.update_balance("inst", 100000)
+        assert strict_svc.check_order("inst", "AAPL", 9000) == (True, None)
+
+        ok, alert = strict_svc.check_order("inst", "AAPL", 20000)
+        assert not ok and "单笔" in alert.message
+
+        strict_svc.on_fill("inst", "AAPL", 9000)
+        ok, alert = strict_svc.check_order("inst", "AAPL", 2000)
+        assert not ok and alert.alert_type == RiskAlertType.POSITION_LIMIT
+
+        strict_svc.update_config(RiskControlConfig(enable_position_limit=False, max_daily_trades=1))
+        ok, alert = strict_svc.check_order("inst", "AAPL", 2000)
+        assert not ok and "交易次数" in alert.message
+
+    def test_check_order_takes_signed_value(self, strict_svc: RiskControlService):
+        strict_svc.update_balance("inst", 100000)
+        strict_svc.on_fill("inst", "AAPL", 9000)
+        strict_svc.on_fill("inst", "MSFT", -9000)
+        assert strict_svc.check_order("inst", "AAPL", -9000) == (True, None)
+        assert strict_svc.check_order("inst", "MSFT", 2000) == (True, None)
+        ok, alert = strict_svc.check_order("inst", "MSFT", -2000)
+        assert not ok and alert.alert_type == RiskAlertType.POSITION_LIMIT
+
+    async def test_legacy_counters_share_exposure_state(self, svc: RiskControlService):
+        svc.on_fill("inst", "AAPL", 100)
+        await svc.increment_trade_count("inst")
+        await svc.check_daily_loss("inst", 99000, 100000)
+        state = svc.get_exposure("inst")
+        assert (state.trade_count, state.daily_pnl) == (2, -1000)
+
+    def test_check_order_daily_loss(self, strict_svc: RiskControlService):
+        strict_svc.update_balance("inst", 100000)
+        strict_svc.on_fill("inst", "AAPL", 0, pnl=-2500)
+        # The warning comes with the fill; the pre-trade check has no side effects.
+        assert len(strict_svc.get_alerts(level=RiskAlertLevel.WARNING)) == 1
+        assert strict_svc.check_order("inst", "MSFT", 100)[0]
+        assert strict_svc.check_order("inst", "MSFT", 100)[0]
+        warnings = strict_svc.get_alerts(level=RiskAlertLevel.WARNING)
+        assert len(warnings) == 1  # warned once per day
+
+        strict_svc.update_balance("inst", 96900)
+        ok, alert = strict_svc.check_order("inst", "MSFT", 100)
+        assert not ok and alert.level == RiskAlertLevel.CRITICAL
+
+    def test_latency_stats(self, svc: RiskControlService):
+        for _ in range(100):
+            svc.check_order("inst", "AAPL", 100)
+        stats = svc.get_latency_stats()
+        assert set(stats) == {"order_size", "position_limit", "daily_loss", "trade_count", "total"}
+        total = stats["total"]
+        assert total["count"] == 100
+        assert sum(total["buckets"].values()) == 100
+        assert total["p50_us"] <= total["p99_us"]
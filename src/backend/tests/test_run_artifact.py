@@ -0,0 +1,105 @@
+"""Run artifact tests."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from app.services import run_artifact
+from app.services.log_parser_service import (
+    parse_data_log,
+    parse_log_dir,
+    parse_trade_log,
+    parse_value_log,
+)
+
+
+@pytest.fixture
+def log_dir(tmp_path: Path) -> Path:
+    directory = tmp_path / "logs" / "task_1"
+    directory.mkdir(parents=True)
+    (directory / "value.log").write_text(
+        "log_time\tdt\tvalue\tcash\n"
+        "t\t2024-01-01 00:00:00\t100000.0\t100000.0\n"
+        "t\t2024-01-02 00:00:00\t101000.0\t50000.0\n"
+        "t\t2024-01-03 00:00:00\t99000.0\t50000.0\n",
+        encoding="utf-8",
+    )
+    (directory / "trade.log").write_text(
+        "ref\tdtopen\tdtclose\tdata_name\tlong\tsize\tprice\tvalue\tcommission"
+        "\tpnl\tpnlcomm\tbarlen\tisclosed\n"
+        "1\t2024-01-01 00:00:00\t2024-01-03 00:00:00\tAAA\t1\t10\t100\t1000\t1\t5\t4\t2\t1\n",
+        encoding="utf-8",
+    )
+    (directory / "data.log").write_text(
+        "log_time\tdt\tdata_name\topen\thigh\tlow\tclose\tvolume\tsma\n"
+        "t\t2024-01-01 00:00:00\tAAA\t1\t2\t0.5\t1.5\t10\t1.2\n"
+        "t\t2024-01-02 00:00:00\tAAA\t1.5\t2.5\t1\t2\t20\t1.4\n",
+        encoding="utf-8",
+    )
+    (directory / "run_info.json").write_text('{"strategy": "s1"}', encoding="utf-8")
+    return directory
+
+
+def test_parse_log_dir_round_trips_through_artifact(log_dir: Path):
+    from_text = parse_log_dir(log_dir, write_artifact=True)
+
+    assert (log_dir / run_artifact.ARTIFACT_NAME).is_file()
+    from_artifact = parse_log_dir(log_dir)
+
+    assert from_artifact == from_text
+    assert from_artifact["run_info"] == {"strategy": "s1"}
+    assert from_artifact["trades"][0]["ref"] == 1
+    assert parse_data_log(log_dir)["indicators"] == {"sma": [1.2, 1.4]}
+
+
+def test_section_parsers_prefer_fresh_artifact(log_dir: Path, monkeypatch):
+    parse_log_dir(log_dir, write_artifact=True)
+
+    def _fail(*_args, **_kwargs):
+        raise AssertionError("text log should not be parsed")
+
+    monkeypatch.setattr("app.services.log_parser_service._parse_tsv", _fail)
+
+    assert parse_value_log(log_dir)["equity_curve"] == [100000.0, 101000.0, 99000.0]
+    assert len(parse_trade_log(log_dir)) == 1
+
+
+def test_changed_log_invalidates_artifact(log_dir: Path):
+    parse_log_dir(log_dir, write_artifact=True)
+
+    value_log = log_dir / "value.log"
+    value_log.write_text(
+        value_log.read_text(encoding="utf-8") + "t\t2024-01-04 00:00:00\t98000.0\t50000.0\n",
+        encoding="utf-8",
+    )
+    stat = value_log.stat()
+    os.utime(value_log, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert run_artifact.load_run_artifact(log_dir) is None
+    assert parse_value_log(log_dir)["equity_curve"][-1] == 98000.0
+
+
+def test_null_indicators_and_mixed_records_survive_round_trip(tmp_path: Path):
+    kline = {
+        "dates": ["2024-01-01", "2024-01-02"],
+        "ohlc": [[1.0, 2.0, 0.5, 2.5], [2.0, 3.0, 1.5, 3.5]],
+        "volumes": [10.0, 20.0],
+        "indicators": {"rsi": [None, 55.0]},
+    }
+    orders = [{"ref": 1, "size": 1.0}, {"ref": 2, "size": 3}]
+    value = {"dates": [], "equity_curve": [], "cash_curve": [], "drawdown_curve": []}
+
+    run_artifact.write_run_artifact(
+        tmp_path, value=value, trades=[], orders=orders, kline=kline, run_info={}
+    )
+    loaded = run_artifact.load_run_artifact(tmp_path)
+
+    assert loaded == {
+        "value": value,
+        "trades": [],
+        "orders": orders,
+        "kline": kline,
+        "run_info": {},
+    }
+    assert [type(order["size"]) for order in loaded["orders"]] == [float, int]
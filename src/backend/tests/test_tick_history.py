@@ -0,0 +1,112 @@
+"""
+Tick history ring buffer and batched receiver draining tests.
+"""
+
+import json
+import math
+from unittest.mock import patch
+
+import pytest
+
+from app.services import tick_history
+from app.services.quote_service import _ZmqTickReceiver
+from app.services.tick_history import TickRing, loads_tick, tick_values
+
+
+def _values(price: float, ts: float = 1.0) -> list[float]:
+    return tick_values({"timestamp": ts, "price": price})
+
+
+class TestTickRing:
+    def test_wraps_and_keeps_newest_ticks_oldest_first(self):
+        ring = TickRing(4)
+        for i in range(10):
+            ring.append(_values(float(i)))
+
+        history, sequence = ring.snapshot()
+
+        assert sequence == 10
+        assert history["price"].tolist() == [6.0, 7.0, 8.0, 9.0]
+        assert math.isnan(history["bid_price"][0])
+
+    def test_limit_and_since(self):
+        ring = TickRing(8)
+        for i in range(6):
+            ring.append(_values(float(i)))
+
+        assert ring.snapshot(limit=2)[0]["price"].tolist() == [4.0, 5.0]
+        _history, sequence = ring.snapshot()
+        ring.append(_values(6.0))
+        newer, next_sequence = ring.snapshot(since=sequence)
+        assert newer["price"].tolist() == [6.0]
+        assert next_sequence == 7
+        assert ring.snapshot(since=next_sequence)[0]["price"].tolist() == []
+
+    def test_lapped_slots_are_dropped(self):
+        ring = TickRing(4)
+        for i in range(4):
+            ring.append(_values(float(i)))
+
+        # Simulate the writer finishing one append and starting another
+        # during the copy.
+        real_data = ring._data
+
+        class _Racing:
+            def __getitem__(self, key):
+                block = real_data[key]
+                ring._written += 1
+                ring._claimed = ring._written + 1
+                return block
+
+        ring._data = _Racing()
+        history, _sequence = ring.snapshot()
+
+        assert history["price"].tolist() == [2.0, 3.0]
+
+    def test_tick_values_normalizes_millisecond_timestamps(self):
+        values = tick_values({"timestamp": 1_700_000_000_000, "price": "1.5", "volume": None})
+
+        assert values[0] == 1_700_000_000.0
+        assert values[1] == 1.5
+        assert math.isnan(values[6])
+
+
+@pytest.mark.parametrize("fast", [True, False])
+def test_loads_tick_with_and_without_orjson(fast):
+    raw = json.dumps({"symbol": "BTC-USDT", "price": 1.0}).encode()
+    with patch.object(tick_history, "orjson", tick_history.orjson if fast else None):
+        assert loads_tick(raw) == {"symbol": "BTC-USDT", "price": 1.0}
+        with pytest.raises(ValueError):
+            loads_tick(b"\xff{")
+
+
+def test_receiver_drains_batch_into_history_and_conflates_listeners():
+    frames = [
+        json.dumps({"symbol": "EURUSD", "price": p, "timestamp": 1}).encode()
+        for p in (1.1, 1.2, 1.3)
+    ]
+    frames[1:1] = [b"not json", b"[]", json.dumps({"price": 2}).encode()]
+    frames.append(json.dumps({"instrument_id": "XAUUSD", "price": 2400}).encode())
+    queue = list(frames)
+
+    receiver = _ZmqTickReceiver("MT5", "tcp://127.0.0.1:1", history_size=16)
+    seen = []
+    receiver.add_listener(lambda source, payload: seen.append(payload.get("price")))
+
+    consumed = receiver._drain_batch(lambda: queue.pop(0) if queue else None)
+
+    assert consumed == len(frames)
+    assert seen == [1.3, 2400]
+    assert receiver.get_tick("EURUSD")["price"] == 1.3
+    history, sequence = receiver.get_history("EURUSD")
+    assert history["price"].tolist() == [1.1, 1.2, 1.3]
+    assert sequence == 3
+    assert receiver.get_history("GBPUSD") is None
+
+
+def test_receiver_batch_is_bounded():
+    frame = json.dumps({"symbol": "EURUSD", "price": 1.0}).encode()
+    receiver = _ZmqTickReceiver("MT5", "tcp://127.0.0.1:1", history_size=4)
+    receiver.BATCH_SIZE = 5
+
+    assert receiver._drain_batch(lambda: frame) == 5
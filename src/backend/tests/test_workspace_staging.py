@@ -0,0 +1,125 @@
+"""
+Copy-free workspace staging tests.
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import stat
+from pathlib import Path
+
+import pytest
+
+from app.services import workspace_staging
+from app.services.workspace_staging import fingerprint_template, stage_strategy_dir
+
+
+@pytest.fixture(autouse=True)
+def snapshot_root(tmp_path: Path, monkeypatch):
+    root = tmp_path / "snapshots"
+    monkeypatch.setattr(workspace_staging, "_SNAPSHOT_ROOT", root)
+    monkeypatch.setattr(workspace_staging, "_LEASE_ROOT", tmp_path / "leases")
+    return root
+
+
+@pytest.fixture
+def template(tmp_path: Path) -> Path:
+    template_dir = tmp_path / "strategies" / "s1"
+    (template_dir / "logs" / "old").mkdir(parents=True)
+    (template_dir / "logs" / "old" / "value.log").write_text("stale", encoding="utf-8")
+    (template_dir / "__pycache__").mkdir()
+    (template_dir / "__pycache__" / "x.cpython-311.pyc").write_bytes(b"\0")
+    (template_dir / "run.py").write_text("print('run')\n", encoding="utf-8")
+    (template_dir / "config.yaml").write_text("params: {}\n", encoding="utf-8")
+    (template_dir / "strategy_s1.py").write_text("X = 1\n", encoding="utf-8")
+    (template_dir / "data").mkdir()
+    (template_dir / "data" / "bars.csv").write_bytes(b"x" * 4096)
+    return template_dir
+
+
+def test_stage_links_immutable_files_and_copies_private_ones(tmp_path: Path, template: Path):
+    target = tmp_path / "task"
+
+    report = stage_strategy_dir(template, target)
+
+    assert (target / "data" / "bars.csv").read_bytes() == b"x" * 4096
+    assert not (target / "logs").exists()
+    assert not (target / "__pycache__").exists()
+    assert (
+        report.bytes_copied
+        == (template / "run.py").stat().st_size + (template / "config.yaml").stat().st_size
+    )
+    assert report.files_linked == 2
+    assert report.snapshot_reused is False
+
+    # Private files are real copies: rewriting one must not leak into the template.
+    (target / "config.yaml").write_text("params: {p: 2}\n", encoding="utf-8")
+    assert (template / "config.yaml").read_text(encoding="utf-8") == "params: {}\n"
+    assert os.stat(target / "config.yaml").st_nlink == 1
+
+
+def test_unchanged_template_reuses_snapshot(tmp_path: Path, template: Path, snapshot_root: Path):
+    first = stage_strategy_dir(template, tmp_path / "task1")
+    second = stage_strategy_dir(template, tmp_path / "task2")
+
+    assert first.fingerprint == second.fingerprint
+    assert second.snapshot_reused is True
+    assert len(list(snapshot_root.iterdir())) == 1
+
+
+def test_template_change_creates_new_snapshot_and_prunes_old(
+    tmp_path: Path, template: Path, snapshot_root: Path
+):
+    before = fingerprint_template(template)
+    stage_strategy_dir(template, tmp_path / "task1")
+    shutil.rmtree(tmp_path / "task1")  # task finished
+
+    (template / "strategy_s1.py").write_text("X = 22\n", encoding="utf-8")
+    report = stage_strategy_dir(template, tmp_path / "task2")
+
+    assert report.fingerprint != before
+    assert report.snapshot_reused is False
+    assert (tmp_path / "task2" / "strategy_s1.py").read_text(encoding="utf-8") == "X = 22\n"
+    assert len(list(snapshot_root.iterdir())) == 1
+
+
+def test_fingerprint_ignores_logs_and_bytecode(template: Path):
+    before = fingerprint_template(template)
+    (template / "logs" / "new.log").write_text("more output", encoding="utf-8")
+    (template / "__pycache__" / "y.pyc").write_bytes(b"\1")
+    assert fingerprint_template(template) == before
+
+
+def test_snapshot_in_use_by_a_live_task_is_not_pruned(
+    tmp_path: Path, template: Path, snapshot_root: Path
+):
+    stage_strategy_dir(template, tmp_path / "task1")
+    (template / "strategy_s1.py").write_text("X = 22\n", encoding="utf-8")
+    stage_strategy_dir(template, tmp_path / "task2")
+
+    assert len(list(snapshot_root.iterdir())) == 2
+    assert (tmp_path / "task1" / "strategy_s1.py").read_text(encoding="utf-8") == "X = 1\n"
+
+    shutil.rmtree(tmp_path / "task1")
+    (template / "strategy_s1.py").write_text("X = 333\n", encoding="utf-8")
+    stage_strategy_dir(template, tmp_path / "task3")
+    # task2 still holds the second version; the first one is gone.
+    assert len(list(snapshot_root.iterdir())) == 2
+    assert (tmp_path / "task2" / "strategy_s1.py").read_text(encoding="utf-8") == "X = 22\n"
+
+
+def test_snapshot_files_are_read_only_and_repaired_if_modified(tmp_path: Path, template: Path):
+    stage_strategy_dir(template, tmp_path / "task1")
+    linked = tmp_path / "task1" / "strategy_s1.py"
+    assert stat.S_IMODE(linked.stat().st_mode) & 0o222 == 0
+
+    # A task that forces an in-place edit of a shared file.
+    os.chmod(linked, 0o644)
+    linked.write_text("X = 'corrupted'\n", encoding="utf-8")
+
+    report = stage_strategy_dir(template, tmp_path / "task2")
+
+    assert report.snapshot_reused is False
+    assert (tmp_path / "task2" / "strategy_s1.py").read_text(encoding="utf-8") == "X = 1\n"
+    assert (template / "strategy_s1.py").read_text(encoding="utf-8") == "X = 1\n"